@@ -0,0 +1,78 @@
+"""Micro-benchmark for dynamic attribute reads on the wrapper classes.
+
+Compares reading ``user.nickname`` and ``channel.name`` through the old
+reflective lookup (``dir(self)`` plus probing four prefixes with ``hasattr``)
+with the per-struct field tables that replaced it.
+
+Run with::
+
+    python benchmarks/bench_attribute_access.py
+"""
+
+import timeit
+from types import SimpleNamespace
+from typing import Any
+
+from pytalk.implementation.TeamTalkPy import TeamTalk5 as sdk
+
+from pytalk import _utils
+from pytalk.channel import Channel
+from pytalk.user import User
+
+NUMBER = 200_000
+
+
+def _legacy_get_tt_obj_attribute(obj: object, attr: str) -> object:
+    for field in _utils._EXPLICIT_FIELDS.get(attr, ()):
+        if hasattr(obj, field):
+            return getattr(obj, field)
+    sdk_name = "".join(part.capitalize() for part in attr.split("_"))
+    for prefix in ("n", "sz", "b", "u"):
+        if hasattr(obj, f"{prefix}{sdk_name}"):
+            return getattr(obj, f"{prefix}{sdk_name}")
+    if hasattr(obj, sdk_name):
+        return getattr(obj, sdk_name)
+    raise AttributeError(attr)
+
+
+def _legacy_getattr(self: Any, name: str, struct: object) -> object:  # noqa: ANN401
+    if name in dir(self):
+        return self.__dict__[name]
+    value = _legacy_get_tt_obj_attribute(struct, name)
+    if isinstance(value, (bytes, sdk.TTCHAR, sdk.TTCHAR_P)):
+        return sdk.ttstr(value)  # type: ignore [arg-type]
+    return value
+
+
+def main() -> None:
+    """Print the time per read of both lookups."""
+    sdk_user = sdk.User()
+    sdk_user.nUserID = 5
+    sdk_user.szNickname = sdk.ttstr("bench")  # type: ignore [arg-type]
+    sdk_channel = sdk.Channel()
+    sdk_channel.nChannelID = 1
+    sdk_channel.szName = sdk.ttstr("lobby")  # type: ignore [arg-type]
+    instance = SimpleNamespace(server=None)
+
+    user = User(instance, sdk_user)  # type: ignore [arg-type]
+    channel = Channel(instance, sdk_channel)  # type: ignore [arg-type]
+
+    cases = {
+        "user.nickname": (
+            lambda: user.nickname,
+            lambda: _legacy_getattr(user, "nickname", sdk_user),
+        ),
+        "channel.name": (
+            lambda: channel.name,
+            lambda: _legacy_getattr(channel, "name", sdk_channel),
+        ),
+    }
+    print(f"{'attribute':<16} {'legacy':>10} {'tables':>10}  (ns per read)")
+    for name, (current, legacy) in cases.items():
+        legacy_ns = timeit.timeit(legacy, number=NUMBER) / NUMBER * 1e9
+        current_ns = timeit.timeit(current, number=NUMBER) / NUMBER * 1e9
+        print(f"{name:<16} {legacy_ns:>10.0f} {current_ns:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
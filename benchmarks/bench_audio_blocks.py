@@ -0,0 +1,62 @@
+"""Compare copying audio samples into fresh bytes with the buffer pool.
+
+Simulates 30 speakers sending 20 ms blocks of 48 kHz mono audio for ten
+seconds. Each block is copied out of SDK memory, handed to a handler that reads
+the samples, and then dropped or given back to the pool.
+
+Run with::
+
+    python benchmarks/bench_audio_blocks.py
+"""
+
+import ctypes
+import time
+
+from pytalk.audio import AudioBufferPool
+
+SPEAKERS = 30
+SECONDS = 10
+SAMPLE_RATE = 48_000
+BLOCK_MSEC = 20
+BLOCK_BYTES = SAMPLE_RATE * BLOCK_MSEC // 1000 * 2
+BLOCKS = SPEAKERS * SECONDS * 1000 // BLOCK_MSEC
+
+
+def handler(samples: memoryview) -> int:
+    """Read the samples, like a handler looking at the audio."""
+    return samples[0]
+
+
+def run_bytes(address: int) -> tuple[float, int]:
+    """Copy every block into new bytes; return the time and allocations."""
+    start = time.perf_counter()
+    for _ in range(BLOCKS):
+        data = ctypes.string_at(address, BLOCK_BYTES)
+        handler(memoryview(data).cast("h"))
+    return time.perf_counter() - start, BLOCKS
+
+
+def run_pool(address: int) -> tuple[float, int]:
+    """Copy every block into a pooled buffer; return the time and allocations."""
+    pool = AudioBufferPool()
+    start = time.perf_counter()
+    for _ in range(BLOCKS):
+        buffer = pool.copy_from(address, BLOCK_BYTES)
+        handler(memoryview(buffer).cast("B").cast("h"))
+        pool.release(buffer)
+    return time.perf_counter() - start, pool.allocated
+
+
+def main() -> None:
+    """Print the time per block and the allocations of both copies."""
+    source = ctypes.create_string_buffer(BLOCK_BYTES)
+    address = ctypes.addressof(source)
+    print(f"{BLOCKS} blocks of {BLOCK_BYTES} bytes ({SPEAKERS} speakers, {SECONDS} s)")
+    print(f"{'copy':<8} {'us/block':>9} {'buffers allocated':>18}")
+    for name, run in (("bytes", run_bytes), ("pool", run_pool)):
+        elapsed, allocated = run(address)
+        print(f"{name:<8} {elapsed / BLOCKS * 1e6:>9.2f} {allocated:>18}")
+
+
+if __name__ == "__main__":
+    main()
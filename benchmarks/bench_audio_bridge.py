@@ -0,0 +1,119 @@
+"""Measure the delay and cost of relaying audio to another instance.
+
+Receives 20 ms blocks of 48 kHz mono audio in real time for two seconds and
+relays them in two ways: an ``on_muxed_audio`` handler passing
+``block.data`` to the other instance's `Streamer`, as bots did before, and an
+`AudioBridge`. The SDK is replaced by a function that notes when each block
+is inserted, so no server is needed. The delay is from a block being received
+to it being handed to the other SDK; the cost is the time spent on the
+receiving thread.
+
+Run with::
+
+    python benchmarks/bench_audio_bridge.py
+"""
+
+import asyncio
+import ctypes
+import time
+from collections.abc import Callable
+from unittest.mock import MagicMock, patch
+
+from pytalk.implementation.TeamTalkPy import TeamTalk5 as sdk
+
+from pytalk.audio import AudioBlock, AudioBufferPool
+from pytalk.bot import TeamTalkBot
+from pytalk.bridge import AudioBridge
+from pytalk.streamer import Pacing, Streamer
+
+SAMPLE_RATE = 48_000
+BLOCK_MSEC = 20
+BLOCK_SAMPLES = SAMPLE_RATE * BLOCK_MSEC // 1000
+BLOCK_BYTES = BLOCK_SAMPLES * 2
+BLOCKS = 100
+
+
+def make_block(source: ctypes.Array[ctypes.c_char]) -> sdk.AudioBlock:
+    """Return an SDK block pointing at `source`."""
+    block = sdk.AudioBlock()
+    block.nSampleRate = SAMPLE_RATE
+    block.nChannels = 1
+    block.nSamples = BLOCK_SAMPLES
+    block.lpRawAudio = ctypes.addressof(source)
+    return block
+
+
+async def receive(deliver: Callable[[], None]) -> tuple[list[float], float]:
+    """Deliver a block every 20 ms and return the receive times and cost."""
+    received = []
+    cost = 0.0
+    for _ in range(BLOCKS):
+        start = time.perf_counter()
+        received.append(start)
+        deliver()
+        cost += time.perf_counter() - start
+        await asyncio.sleep(BLOCK_MSEC / 1000)
+    # Let the last blocks through.
+    await asyncio.sleep(0.2)
+    return received, cost
+
+
+async def run_streamer(block: sdk.AudioBlock) -> tuple[list[float], float]:
+    """Relay through a handler and a streamer on the other instance."""
+    bot = TeamTalkBot()
+    bot.loop = asyncio.get_running_loop()
+    pool = AudioBufferPool()
+    streamer = Streamer(MagicMock(), SAMPLE_RATE, 1, Pacing(BLOCK_BYTES))
+
+    async def on_muxed_audio(audio: AudioBlock) -> None:
+        streamer.feed(audio.data)
+
+    bot.event(on_muxed_audio)
+
+    def deliver() -> None:
+        buffer = pool.copy_from(block.lpRawAudio, BLOCK_BYTES)
+        wrapper = AudioBlock(None, block, buffer, pool)
+        bot.dispatch("muxed_audio", wrapper)
+        wrapper._release()
+
+    result = await receive(deliver)
+    streamer.close()
+    return result
+
+
+async def run_bridge(block: sdk.AudioBlock) -> tuple[list[float], float]:
+    """Relay through an `AudioBridge`."""
+    bridge = AudioBridge(sdk.TT_MUXED_USERID, MagicMock())
+    result = await receive(lambda: bridge._feed(block, BLOCK_BYTES))
+    bridge.close()
+    return result
+
+
+def main() -> None:
+    """Print the delay and cost of both ways."""
+    source = ctypes.create_string_buffer(BLOCK_BYTES)
+    block = make_block(source)
+    print(f"{BLOCKS} blocks of {BLOCK_MSEC} ms")
+    print(f"{'relay':<9} {'mean ms':>8} {'max ms':>8} {'us/block':>9}")
+    for name, run in (("streamer", run_streamer), ("bridge", run_bridge)):
+        inserted: list[float] = []
+
+        def insert(_tt: object, _block: object, inserted: list = inserted) -> int:
+            inserted.append(time.perf_counter())
+            return 1
+
+        with (
+            patch.object(sdk, "_InsertAudioBlock", new=insert),
+            patch.object(Streamer, "_has_ffmpeg", return_value=False),
+            patch.object(Streamer, "_has_yt_dlp", return_value=False),
+        ):
+            received, cost = asyncio.run(run(block))
+        delays = [sent - got for got, sent in zip(received, inserted, strict=False)]
+        print(
+            f"{name:<9} {sum(delays) / len(delays) * 1e3:>8.1f} "
+            f"{max(delays) * 1e3:>8.1f} {cost / BLOCKS * 1e6:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
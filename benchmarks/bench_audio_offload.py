@@ -0,0 +1,176 @@
+"""Measure how long audio analysis holds up the event loop.
+
+Four users talk for five seconds, in 20 ms blocks of 48 kHz mono delivered in
+real time, and each 100 ms of a user's audio goes through a pure-Python
+analysis taking a few milliseconds. An ``on_user_audio`` handler gathering the
+windows and analysing them on the loop is compared with `AudioWorkerPool`,
+which analyses them in a worker process. A ticker task measures how late the
+loop wakes it up, which is what every other event waits for too. The SDK is
+replaced by fakes, so no server is needed.
+
+Run with::
+
+    python benchmarks/bench_audio_offload.py
+"""
+
+import array
+import asyncio
+import ctypes
+import math
+import statistics
+import time
+from unittest.mock import MagicMock, patch
+
+from pytalk.implementation.TeamTalkPy import TeamTalk5 as sdk
+
+from pytalk.audio import AudioBlock
+from pytalk.bot import TeamTalkBot
+from pytalk.instance import TeamTalkInstance
+from pytalk.offload import AudioResult, AudioWorkerPool
+
+SAMPLE_RATE = 48_000
+BLOCK_MSEC = 20
+WINDOW_MSEC = 100
+BLOCK_SAMPLES = SAMPLE_RATE * BLOCK_MSEC // 1000
+SECONDS = 5
+USERS = (1, 2, 3, 4)
+TICK = 0.005
+# How often the analysis goes over the samples, to make it take a while.
+ROUNDS = 8
+WINDOWS = len(USERS) * SECONDS * 1000 // WINDOW_MSEC
+
+
+def zero_crossings(samples: memoryview, sample_rate: int, channels: int) -> float:
+    """Return the sign changes per second, a stand-in for real analysis."""
+    pcm = array.array("h", samples)[::channels]
+    for _ in range(ROUNDS):
+        total = sum(1 for a, b in zip(pcm, pcm[1:], strict=False) if (a < 0) != (b < 0))
+    return total * sample_rate / len(pcm)
+
+
+async def measure_lag(stop: asyncio.Event, lags: list[float]) -> None:
+    """Note how late each wake-up of a short sleep is."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(TICK)
+        lags.append(time.perf_counter() - start - TICK)
+
+
+async def deliver(teamtalk: TeamTalkInstance) -> None:
+    """Hand a block of every user to the instance every 20 ms."""
+    samples = array.array(
+        "h",
+        (
+            int(8000 * math.sin(2 * math.pi * 200 * i / SAMPLE_RATE))
+            for i in range(BLOCK_SAMPLES)
+        ),
+    ).tobytes()
+    source = ctypes.create_string_buffer(samples, len(samples))
+    block = sdk.AudioBlock()
+    block.nSampleRate = SAMPLE_RATE
+    block.nChannels = 1
+    block.nSamples = BLOCK_SAMPLES
+    block.lpRawAudio = ctypes.addressof(source)
+    msg = sdk.TTMessage()
+    msg.nStreamType = sdk.StreamType.STREAMTYPE_VOICE
+    with (
+        patch("pytalk.instance._AcquireUserAudioBlock") as acquire,
+        patch("pytalk.instance._ReleaseUserAudioBlock"),
+    ):
+        acquire.return_value = ctypes.addressof(block)
+        start = time.perf_counter()
+        for n in range(SECONDS * 1000 // BLOCK_MSEC):
+            for user_id in USERS:
+                msg.nSource = user_id
+                teamtalk._on_user_audioblock(msg)
+            delay = start + (n + 1) * BLOCK_MSEC / 1000 - time.perf_counter()
+            await asyncio.sleep(max(delay, 0))
+
+
+def new_instance() -> TeamTalkInstance:
+    """Return an instance of a new bot, on the running loop, with four users."""
+    bot = TeamTalkBot()
+    bot.loop = asyncio.get_running_loop()
+    teamtalk = TeamTalkInstance(bot, MagicMock())
+    for user_id in USERS:
+        user = sdk.User()
+        user.nUserID = user_id
+        user.nChannelID = 1
+        teamtalk._state.users[user_id] = user
+    return teamtalk
+
+
+async def run(teamtalk: TeamTalkInstance, analysed: asyncio.Event) -> list[float]:
+    """Deliver the audio while measuring the loop, and return the lags."""
+    lags: list[float] = []
+    stop = asyncio.Event()
+    ticker = asyncio.create_task(measure_lag(stop, lags))
+    await deliver(teamtalk)
+    await asyncio.wait_for(analysed.wait(), 30)
+    stop.set()
+    await ticker
+    return lags
+
+
+async def run_handler() -> tuple[list[float], int]:
+    """Analyse each window in an ``on_user_audio`` handler."""
+    teamtalk = new_instance()
+    windows: dict[int, bytearray] = {}
+    results: list[float] = []
+    analysed = asyncio.Event()
+    window_bytes = SAMPLE_RATE * WINDOW_MSEC // 1000 * 2
+
+    async def on_user_audio(block: AudioBlock) -> None:
+        window = windows.setdefault(block.user.id, bytearray())
+        window += block.data
+        if len(window) >= window_bytes:
+            results.append(zero_crossings(memoryview(window), SAMPLE_RATE, 1))
+            window.clear()
+            if len(results) == WINDOWS:
+                analysed.set()
+
+    teamtalk.bot.event(on_user_audio)
+    return await run(teamtalk, analysed), len(results)
+
+
+async def run_pool() -> tuple[list[float], int]:
+    """Analyse each window in an `AudioWorkerPool`."""
+    teamtalk = new_instance()
+    results: list[float] = []
+    analysed = asyncio.Event()
+
+    async def on_audio_result(result: AudioResult) -> None:
+        results.append(result.value)
+        if len(results) == WINDOWS:
+            analysed.set()
+
+    teamtalk.bot.event(on_audio_result)
+    pool = AudioWorkerPool(zero_crossings, window_msec=WINDOW_MSEC)
+    try:
+        with patch("pytalk.instance.sdk._EnableAudioBlockEventEx"):
+            for user_id in USERS:
+                teamtalk.offload_audio(pool, user=user_id)
+        # Start the workers before measuring.
+        pool._executor.submit(int).result()
+        return await run(teamtalk, analysed), len(results)
+    finally:
+        pool.close()
+
+
+def main() -> None:
+    """Print the lag of the event loop with both approaches."""
+    print(
+        f"{len(USERS)} users, {SECONDS} s of {BLOCK_MSEC} ms blocks, "
+        f"analysed every {WINDOW_MSEC} ms"
+    )
+    print(f"{'analysis':<8} {'windows':>8} {'mean lag ms':>12} {'max lag ms':>11}")
+    for name, runner in (("handler", run_handler), ("pool", run_pool)):
+        lags, windows = asyncio.run(runner())
+        print(
+            f"{name:<8} {windows:>8} {statistics.fmean(lags) * 1e3:>12.2f} "
+            f"{max(lags) * 1e3:>11.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Compare a task per audio block with reading an audio stream.
+
+Simulates 30 speakers sending 20 ms blocks of 48 kHz mono audio for ten
+seconds. With ``on_user_audio`` every block is copied into a pooled buffer,
+wrapped and handed to a new handler task. With `AudioStream` the samples are
+written into the speaker's ring buffer and one reader per speaker pulls
+20 ms frames.
+
+Run with::
+
+    python benchmarks/bench_audio_streams.py
+"""
+
+import asyncio
+import ctypes
+import time
+
+from pytalk.implementation.TeamTalkPy import TeamTalk5 as sdk
+
+from pytalk.audio import AudioBlock, AudioBufferPool
+from pytalk.bot import TeamTalkBot
+from pytalk.ringbuffer import AudioStream
+
+SPEAKERS = 30
+SECONDS = 10
+SAMPLE_RATE = 48_000
+BLOCK_MSEC = 20
+BLOCK_SAMPLES = SAMPLE_RATE * BLOCK_MSEC // 1000
+BLOCK_BYTES = BLOCK_SAMPLES * 2
+ROUNDS = SECONDS * 1000 // BLOCK_MSEC
+BLOCKS = SPEAKERS * ROUNDS
+
+
+def make_block(source: ctypes.Array[ctypes.c_char]) -> sdk.AudioBlock:
+    """Return an SDK audio block of 20 ms whose samples are in `source`."""
+    block = sdk.AudioBlock()
+    block.nSampleRate = SAMPLE_RATE
+    block.nChannels = 1
+    block.nSamples = BLOCK_SAMPLES
+    block.lpRawAudio = ctypes.addressof(source)
+    return block
+
+
+async def run_events(block: sdk.AudioBlock) -> float:
+    """Dispatch every block to a handler task and return the time taken."""
+    bot = TeamTalkBot()
+    bot.loop = asyncio.get_running_loop()
+    pool = AudioBufferPool()
+    consumed = 0
+    done = asyncio.Event()
+
+    async def on_user_audio(audio: AudioBlock) -> None:
+        nonlocal consumed
+        consumed += len(audio.buffer)
+        if consumed == BLOCKS * BLOCK_SAMPLES:
+            done.set()
+
+    bot.event(on_user_audio)
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for _ in range(SPEAKERS):
+            buffer = pool.copy_from(block.lpRawAudio, BLOCK_BYTES)
+            wrapper = AudioBlock(None, block, buffer, pool)
+            bot.dispatch("user_audio", wrapper)
+            wrapper._release()
+        await asyncio.sleep(0)
+    await done.wait()
+    return time.perf_counter() - start
+
+
+async def run_streams(block: sdk.AudioBlock) -> float:
+    """Feed every block to a stream read by a task and return the time taken."""
+    streams = [AudioStream(user_id) for user_id in range(SPEAKERS)]
+    consumed = 0
+
+    async def reader(stream: AudioStream) -> None:
+        nonlocal consumed
+        async for frame in stream:
+            consumed += len(frame) // 2
+
+    readers = [asyncio.create_task(reader(stream)) for stream in streams]
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for stream in streams:
+            stream._feed(block, BLOCK_BYTES)
+        await asyncio.sleep(0)
+    for stream in streams:
+        stream.close()
+    await asyncio.gather(*readers)
+    elapsed = time.perf_counter() - start
+    if consumed != BLOCKS * BLOCK_SAMPLES:
+        raise RuntimeError("the readers did not get every sample")
+    return elapsed
+
+
+def main() -> None:
+    """Print the time per block of both ways of delivering audio."""
+    source = ctypes.create_string_buffer(BLOCK_BYTES)
+    block = make_block(source)
+    print(f"{BLOCKS} blocks of {BLOCK_BYTES} bytes ({SPEAKERS} speakers, {SECONDS} s)")
+    print(f"{'delivery':<10} {'us/block':>9}")
+    for name, run in (("events", run_events), ("streams", run_streams)):
+        elapsed = asyncio.run(run(block))
+        print(f"{name:<10} {elapsed / BLOCKS * 1e6:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
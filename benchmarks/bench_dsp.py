@@ -0,0 +1,74 @@
+"""Measure the cost of preparing received audio for transcription.
+
+Turns 20 ms blocks of 48 kHz stereo into 16 kHz mono and measures their RMS
+level, as a speech-to-text pipeline needs. A pure-Python loop over the
+samples, mixing down, resampling by linear interpolation and summing the
+squares, is compared with `AudioProcessor`, which also low-pass filters
+before resampling.
+
+Run with::
+
+    python benchmarks/bench_dsp.py
+"""
+
+import array
+import math
+import time
+
+from pytalk.dsp import AudioProcessor
+
+SAMPLE_RATE = 48_000
+TARGET_RATE = 16_000
+BLOCK_MSEC = 20
+BLOCKS = 500
+
+
+def run_python(block: bytes) -> float:
+    """Convert and measure each block with a loop over the samples."""
+    step = SAMPLE_RATE / TARGET_RATE
+    start = time.perf_counter()
+    for _ in range(BLOCKS):
+        samples = array.array("h", block)
+        mono = [(samples[i] + samples[i + 1]) / 2 for i in range(0, len(samples), 2)]
+        out = array.array("h")
+        position = 0.0
+        while position < len(mono) - 1:
+            index = int(position)
+            frac = position - index
+            out.append(round(mono[index] * (1 - frac) + mono[index + 1] * frac))
+            position += step
+        math.sqrt(sum(sample * sample for sample in out) / len(out))
+    return time.perf_counter() - start
+
+
+def run_processor(block: bytes) -> float:
+    """Convert and measure each block with `AudioProcessor`."""
+    processor = AudioProcessor(TARGET_RATE, 1)
+    start = time.perf_counter()
+    for _ in range(BLOCKS):
+        processor.process(block, SAMPLE_RATE, 2)
+        _ = processor.rms
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Print the time per block of both approaches."""
+    frames = SAMPLE_RATE * BLOCK_MSEC // 1000
+    block = array.array(
+        "h",
+        (
+            int(8000 * math.sin(2 * math.pi * 440 * (i // 2) / SAMPLE_RATE))
+            for i in range(frames * 2)
+        ),
+    ).tobytes()
+    print(f"{BLOCK_MSEC} ms blocks of {SAMPLE_RATE} Hz stereo to {TARGET_RATE} Hz mono")
+    print(f"{'processing':<10} {'us/block':>10} {'% of real time':>15}")
+    for name, run in (("python", run_python), ("numpy", run_processor)):
+        per_block = run(block) / BLOCKS
+        print(
+            f"{name:<10} {per_block * 1e6:>10.1f} {per_block / BLOCK_MSEC * 1e5:>15.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
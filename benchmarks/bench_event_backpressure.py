@@ -0,0 +1,58 @@
+"""Memory and task count under an event flood, with and without limits.
+
+Dispatches ``EVENTS`` events back to back to a handler that is slower than the
+flood, as happens with ``user_audio`` when a handler does real work. Without a
+limit every event becomes a pending task; with an `EventLimit` the number of
+tasks and waiting events stays bounded.
+
+Run with::
+
+    python benchmarks/bench_event_backpressure.py
+"""
+
+import asyncio
+import tracemalloc
+
+from pytalk.bot import TeamTalkBot
+from pytalk.scheduling import EventLimit
+
+EVENTS = 50_000
+
+
+async def run(limit: EventLimit | None) -> tuple[int, int, int]:
+    """Flood a slow handler and return the tasks, peak memory and drops."""
+    bot = TeamTalkBot()
+    bot.loop = asyncio.get_running_loop()
+
+    async def on_tick(_payload: bytes) -> None:
+        await asyncio.sleep(0.01)
+
+    bot.event(on_tick)
+    bot.set_event_limit("tick", limit)
+    tracemalloc.start()
+    for _ in range(EVENTS):
+        bot.dispatch("tick", bytes(320))
+    tasks = len(asyncio.all_tasks()) - 1
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # Limited handlers start their queued events as earlier ones finish.
+    while handlers := asyncio.all_tasks() - {asyncio.current_task()}:
+        await asyncio.wait(handlers)
+    dropped = bot.event_stats()["tick"].dropped if limit else 0
+    return tasks, peak, dropped
+
+
+def main() -> None:
+    """Print the task count and memory with and without a limit."""
+    print(f"{EVENTS} events")
+    print(f"{'limit':<28} {'tasks':>7} {'peak KiB':>10} {'dropped':>8}")
+    for name, limit in (
+        ("none", None),
+        ("concurrency=4, queue=256", EventLimit(concurrency=4, queue_size=256)),
+    ):
+        tasks, peak, dropped = asyncio.run(run(limit))
+        print(f"{name:<28} {tasks:>7} {peak / 1024:>10.0f} {dropped:>8}")
+
+
+if __name__ == "__main__":
+    main()
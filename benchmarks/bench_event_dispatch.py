@@ -0,0 +1,111 @@
+"""Micro-benchmark for routing SDK messages to their decoders.
+
+Compares the per-event cost of the ``if event == ...`` chain that
+``TeamTalkInstance._process_events`` used to walk with the decoder table that
+replaced it. Decoders are swapped for no-ops so only the routing is measured.
+
+Run with::
+
+    python benchmarks/bench_event_dispatch.py
+"""
+
+import timeit
+from collections.abc import Callable
+from types import SimpleNamespace
+
+from pytalk.implementation.TeamTalkPy import TeamTalk5 as sdk
+
+from pytalk.instance import TeamTalkInstance
+
+NUMBER = 200_000
+
+# The order in which the old if-chain compared events.
+LEGACY_ORDER = [
+    "CLIENTEVENT_NONE",
+    "CLIENTEVENT_USER_FIRSTVOICESTREAMPACKET",
+    "CLIENTEVENT_CMD_MYSELF_KICKED",
+    "CLIENTEVENT_CON_LOST",
+    "CLIENTEVENT_USER_STATECHANGE",
+    "CLIENTEVENT_USER_AUDIOBLOCK",
+    "CLIENTEVENT_CMD_USER_JOINED",
+    "CLIENTEVENT_CMD_USER_LEFT",
+    "CLIENTEVENT_CMD_USER_LOGGEDIN",
+    "CLIENTEVENT_CMD_USER_LOGGEDOUT",
+    "CLIENTEVENT_CMD_USER_UPDATE",
+    "CLIENTEVENT_CMD_USER_TEXTMSG",
+    "CLIENTEVENT_CMD_CHANNEL_NEW",
+    "CLIENTEVENT_CMD_CHANNEL_UPDATE",
+    "CLIENTEVENT_CMD_CHANNEL_REMOVE",
+    "CLIENTEVENT_CMD_FILE_NEW",
+    "CLIENTEVENT_CMD_FILE_REMOVE",
+    "CLIENTEVENT_FILETRANSFER",
+    "CLIENTEVENT_CMD_SERVER_UPDATE",
+    "CLIENTEVENT_CMD_SERVERSTATISTICS",
+    "CLIENTEVENT_CMD_USERACCOUNT_NEW",
+    "CLIENTEVENT_CMD_USERACCOUNT_REMOVE",
+    "CLIENTEVENT_CMD_USERACCOUNT",
+    "CLIENTEVENT_CMD_BANNEDUSER",
+]
+
+MEASURED = [
+    "CLIENTEVENT_USER_AUDIOBLOCK",
+    "CLIENTEVENT_CMD_USER_TEXTMSG",
+    "CLIENTEVENT_CMD_USER_UPDATE",
+    "CLIENTEVENT_CMD_BANNEDUSER",
+]
+
+
+def _noop(msg: object) -> None:
+    pass
+
+
+def _build_legacy_route() -> Callable[[sdk.TTMessage], None]:
+    # Generate the literal chain so every branch re-reads sdk.ClientEvent.<NAME>
+    # exactly like the old code did.
+    lines = ["def route(msg):", "    event = msg.nClientEvent"]
+    for name in LEGACY_ORDER:
+        lines += [
+            f"    if event == sdk.ClientEvent.{name}:",
+            "        noop(msg)",
+            "        return",
+        ]
+    namespace: dict[str, object] = {"sdk": sdk, "noop": _noop}
+    exec("\n".join(lines), namespace)  # noqa: S102
+    return namespace["route"]  # type: ignore [return-value]
+
+
+def _make_instance() -> TeamTalkInstance:
+    bot = SimpleNamespace(
+        dispatch=_noop,
+        _listeners={},
+        snapshot_events=False,
+        coalesce_window=None,
+        capture_all_audio=True,
+    )
+    server_info = SimpleNamespace(host="localhost")
+    instance = TeamTalkInstance(bot, server_info)  # type: ignore [arg-type]
+    instance._event_decoders = dict.fromkeys(instance._event_decoders, _noop)
+    return instance
+
+
+def _bench(route: Callable[[sdk.TTMessage], None], msg: sdk.TTMessage) -> float:
+    seconds = min(timeit.repeat(lambda: route(msg), number=NUMBER, repeat=5))
+    return seconds / NUMBER * 1e9
+
+
+def main() -> None:
+    """Print the per-event routing cost before and after."""
+    instance = _make_instance()
+    legacy_route = _build_legacy_route()
+    print(f"{'event':<40} {'if-chain (ns)':>14} {'table (ns)':>11}")
+    for name in MEASURED:
+        msg = sdk.TTMessage()
+        msg.nClientEvent = getattr(sdk.ClientEvent, name)
+        before = _bench(legacy_route, msg)
+        after = _bench(instance._process_message, msg)
+        print(f"{name:<40} {before:>14.0f} {after:>11.0f}")
+    instance.closeTeamTalk()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Memory benchmark for event wrappers versus event snapshots.
+
+Decodes 100,000 synthetic user update and text message events through a
+`TeamTalkInstance`, once with the default wrappers and once with
+``snapshot_events=True``. A handler keeps the most recent ``BACKLOG`` payloads,
+like a bot that queues events for later processing. ``tracemalloc`` reports the
+current and peak memory of each run.
+
+The SDK lookups are not exercised, so no server is needed::
+
+    python benchmarks/bench_event_snapshots.py
+"""
+
+import time
+import tracemalloc
+from collections import deque
+from types import SimpleNamespace
+from typing import Any
+
+from pytalk.implementation.TeamTalkPy import TeamTalk5 as sdk
+
+from pytalk.instance import TeamTalkInstance
+
+EVENTS = 100_000
+BACKLOG = 10_000
+
+
+def _make_messages() -> list[sdk.TTMessage]:
+    user_update = sdk.TTMessage()
+    user_update.nClientEvent = sdk.ClientEvent.CLIENTEVENT_CMD_USER_UPDATE
+    user_update.user.nUserID = 5
+    user_update.user.nChannelID = 1
+    user_update.user.szNickname = sdk.ttstr("bench")  # type: ignore [arg-type]
+    text = sdk.TTMessage()
+    text.nClientEvent = sdk.ClientEvent.CLIENTEVENT_CMD_USER_TEXTMSG
+    text.textmessage.nMsgType = sdk.TextMsgType.MSGTYPE_USER
+    text.textmessage.nFromUserID = 5
+    text.textmessage.szMessage = sdk.ttstr("hello")  # type: ignore [arg-type]
+    return [user_update, text]
+
+
+def run(snapshot_events: bool) -> tuple[float, int, int]:
+    """Decode the events and return the time taken and the memory used."""
+    backlog: deque[Any] = deque(maxlen=BACKLOG)
+    bot = SimpleNamespace(
+        dispatch=lambda _event, payload: backlog.append(payload),
+        _listeners={},
+        snapshot_events=snapshot_events,
+        coalesce_window=None,
+        capture_all_audio=True,
+    )
+    instance = TeamTalkInstance(bot, SimpleNamespace(host="localhost"))  # type: ignore [arg-type]
+    messages = _make_messages()
+    tracemalloc.start()
+    start = time.perf_counter()
+    for i in range(EVENTS):
+        instance._process_message(messages[i % len(messages)])
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, current, peak
+
+
+def main() -> None:
+    """Print the time and memory of both kinds of payload."""
+    print(f"{EVENTS} events, last {BACKLOG} kept")
+    print(f"{'payload':<10} {'seconds':>8} {'current KiB':>12} {'peak KiB':>10}")
+    for name, snapshot_events in (("wrappers", False), ("snapshots", True)):
+        elapsed, current, peak = run(snapshot_events)
+        print(
+            f"{name:<10} {elapsed:>8.2f} {current / 1024:>12.0f} {peak / 1024:>10.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
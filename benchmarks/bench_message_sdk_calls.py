@@ -0,0 +1,115 @@
+"""Count the SDK lookups made while dispatching one channel message.
+
+Wrappers used to resolve everything up front: the sender, the sender's
+channel, that channel's path and codec, and the target channel. Those fields
+are now resolved on first access and served from the instance's state mirror.
+This script counts the ``getUser``/``getChannel``/``getChannelPath`` calls made
+for a handler that only reads ``message.content`` and for one that touches
+every field, with a cold and a warm mirror.
+
+The SDK lookups are replaced with counting fakes, so no server is needed::
+
+    python benchmarks/bench_message_sdk_calls.py
+"""
+
+from collections import Counter
+from collections.abc import Callable
+from types import SimpleNamespace
+from typing import Any
+
+from pytalk.implementation.TeamTalkPy import TeamTalk5 as sdk
+
+from pytalk.instance import TeamTalkInstance
+from pytalk.message import ChannelMessage
+
+USER_ID = 5
+CHANNEL_ID = 1
+COUNTED = ("getUser", "getChannel", "getChannelPath")
+
+calls: Counter[str] = Counter()
+
+
+def _make_user() -> sdk.User:
+    user = sdk.User()
+    user.nUserID = USER_ID
+    user.nChannelID = CHANNEL_ID
+    return user
+
+
+def _make_channel() -> sdk.Channel:
+    channel = sdk.Channel()
+    channel.nChannelID = CHANNEL_ID
+    return channel
+
+
+FAKES: dict[str, Callable[..., Any]] = {
+    "getUser": lambda _self, _user_id: _make_user(),
+    "getChannel": lambda _self, _channel_id: _make_channel(),
+    "getChannelPath": lambda _self, _channel_id: "/",
+}
+
+
+def _counting(name: str) -> Callable[..., Any]:
+    def wrapper(*args: Any) -> Any:  # noqa: ANN401
+        calls[name] += 1
+        return FAKES[name](*args)
+
+    return wrapper
+
+
+def _make_message() -> sdk.TTMessage:
+    msg = sdk.TTMessage()
+    msg.nClientEvent = sdk.ClientEvent.CLIENTEVENT_CMD_USER_TEXTMSG
+    msg.textmessage.nMsgType = sdk.TextMsgType.MSGTYPE_CHANNEL
+    msg.textmessage.nFromUserID = USER_ID
+    msg.textmessage.nChannelID = CHANNEL_ID
+    msg.textmessage.szMessage = sdk.ttstr("hello")  # type: ignore [arg-type]
+    return msg
+
+
+def read_content(message: ChannelMessage) -> None:
+    """Read only the text of the message."""
+    _ = message.content
+
+
+def read_everything(message: ChannelMessage) -> None:
+    """Read every field of the message, its sender and its channel."""
+    _ = message.content
+    user = message.user
+    _ = user.channel.path, user.channel.audiocfg, user.server
+    _ = message.channel.path, message.channel.audiocfg
+
+
+def run(handler: Callable[[ChannelMessage], None], warm: bool) -> int:
+    """Dispatch one message to `handler` and return the SDK calls made."""
+    dispatched: list[ChannelMessage] = []
+    bot = SimpleNamespace(
+        dispatch=lambda _event, message: dispatched.append(message),
+        _listeners={},
+        snapshot_events=False,
+        coalesce_window=None,
+        capture_all_audio=True,
+    )
+    instance = TeamTalkInstance(bot, SimpleNamespace(host="localhost"))  # type: ignore [arg-type]
+    if warm:
+        instance._state.seed([_make_user()], [_make_channel()])
+        instance._state.store_path(CHANNEL_ID, "/")
+    calls.clear()
+    instance._process_message(_make_message())
+    handler(dispatched[0])
+    return sum(calls.values())
+
+
+def main() -> None:
+    """Print the SDK calls of both handlers with a cold and a warm mirror."""
+    for name in COUNTED:
+        setattr(sdk.TeamTalk, name, _counting(name))
+    print(f"{'handler':<16} {'mirror':<6} sdk calls")
+    for handler in (read_content, read_everything):
+        for warm in (False, True):
+            mirror = "warm" if warm else "cold"
+            print(f"{handler.__name__:<16} {mirror:<6} {run(handler, warm)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Measure the cost of mixing sources into one block.
+
+Mixes 20 ms blocks of 48 kHz stereo from several sources, each with its own
+gain and one ducking the others, and clips the sum to 16 bits. A pure-Python
+loop over the samples, as a handler could do with `array`, is compared with
+`Mixer`, which does the same with NumPy. The mixer's output is never started
+sending, so no server is needed.
+
+Run with::
+
+    python benchmarks/bench_mixer.py
+"""
+
+import array
+import time
+from unittest.mock import MagicMock, patch
+
+from pytalk.mixer import Mixer
+from pytalk.streamer import Streamer
+
+SAMPLE_RATE = 48_000
+CHANNELS = 2
+BLOCK_MSEC = 20
+SOURCES = 4
+BLOCKS = 200
+DUCK_GAIN = 0.3
+
+
+def run_python(blocks: list[bytes], gains: list[float]) -> float:
+    """Mix with a loop over the samples of each source."""
+    gains = [gains[0]] + [gain * DUCK_GAIN for gain in gains[1:]]
+    start = time.perf_counter()
+    for _ in range(BLOCKS):
+        mix = [0.0] * (len(blocks[0]) // 2)
+        for data, gain in zip(blocks, gains, strict=True):
+            for i, sample in enumerate(array.array("h", data)):
+                mix[i] += sample * gain
+        array.array("h", (max(-32768, min(32767, int(v))) for v in mix)).tobytes()
+    return time.perf_counter() - start
+
+
+def run_mixer(blocks: list[bytes], gains: list[float]) -> float:
+    """Mix with `Mixer`."""
+    with (
+        patch.object(Streamer, "_has_ffmpeg", return_value=False),
+        patch.object(Streamer, "_has_yt_dlp", return_value=False),
+    ):
+        mixer = Mixer(MagicMock(), SAMPLE_RATE, CHANNELS, BLOCK_MSEC)
+    mixer.duck_gain = DUCK_GAIN
+    sources = [mixer.add_source(gain=gain) for gain in gains[1:]]
+    sources.insert(0, mixer.add_source(gain=gains[0], duck=True))
+    pairs = list(zip(sources, blocks, strict=True))
+    out = mixer._np.zeros((mixer.frames, CHANNELS), dtype=mixer._np.float32)
+    start = time.perf_counter()
+    for _ in range(BLOCKS):
+        mixer._mix(pairs, out).tobytes()
+    elapsed = time.perf_counter() - start
+    mixer.close()
+    return elapsed
+
+
+def main() -> None:
+    """Print the time per mixed block of both approaches."""
+    frames = SAMPLE_RATE * BLOCK_MSEC // 1000
+    blocks = [
+        array.array("h", [n * 3000 - 5000] * (frames * CHANNELS)).tobytes()
+        for n in range(SOURCES)
+    ]
+    # The first source ducks the others.
+    gains = [1.0] + [0.8] * (SOURCES - 1)
+    print(f"{SOURCES} sources, {BLOCK_MSEC} ms blocks of {SAMPLE_RATE} Hz stereo")
+    print(f"{'mixing':<8} {'us/block':>10} {'% of real time':>15}")
+    for name, run in (("python", run_python), ("numpy", run_mixer)):
+        per_block = run(blocks, gains) / BLOCKS
+        print(
+            f"{name:<8} {per_block * 1e6:>10.1f} {per_block / BLOCK_MSEC * 1e5:>15.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Compare writing audio inside the handler with the background recorder.
+
+Simulates 30 speakers sending 20 ms blocks of 48 kHz mono audio for a minute.
+The handler either writes each block to the speaker's WAV file itself, as an
+``on_user_audio`` handler would, or feeds a `Recorder`. Only the time spent
+on the calling thread is reported, since that is what blocks the event loop.
+
+Run with::
+
+    python benchmarks/bench_recorder.py
+"""
+
+import tempfile
+import time
+import wave
+from pathlib import Path
+
+from pytalk.recorder import Recorder
+
+SPEAKERS = 30
+SECONDS = 60
+SAMPLE_RATE = 48_000
+BLOCK_MSEC = 20
+BLOCK_BYTES = SAMPLE_RATE * BLOCK_MSEC // 1000 * 2
+ROUNDS = SECONDS * 1000 // BLOCK_MSEC
+BLOCKS = SPEAKERS * ROUNDS
+
+
+def run_inline(directory: Path, data: bytes) -> float:
+    """Write every block to its speaker's file on the caller's thread."""
+    files = []
+    for speaker in range(SPEAKERS):
+        f = wave.open(str(directory / f"{speaker}.wav"), "wb")  # noqa: SIM115
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(SAMPLE_RATE)
+        files.append(f)
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for f in files:
+            f.writeframes(data)
+    elapsed = time.perf_counter() - start
+    for f in files:
+        f.close()
+    return elapsed
+
+
+def run_recorder(directory: Path, data: bytes) -> float:
+    """Feed every block to a `Recorder` and return the time spent feeding."""
+    recorder = Recorder(directory)
+    start = time.perf_counter()
+    for i in range(ROUNDS):
+        now = i * BLOCK_MSEC / 1000
+        for speaker in range(SPEAKERS):
+            recorder.feed(speaker, SAMPLE_RATE, 1, data, now)
+    elapsed = time.perf_counter() - start
+    recorder.close()
+    return elapsed
+
+
+def main() -> None:
+    """Print the time per block spent by the caller with both writers."""
+    data = bytes(BLOCK_BYTES)
+    print(f"{BLOCKS} blocks of {BLOCK_BYTES} bytes ({SPEAKERS} speakers, {SECONDS} s)")
+    print(f"{'writer':<10} {'us/block on caller':>19}")
+    for name, run in (("inline", run_inline), ("recorder", run_recorder)):
+        with tempfile.TemporaryDirectory() as directory:
+            elapsed = run(Path(directory), data)
+        print(f"{name:<10} {elapsed / BLOCKS * 1e6:>19.2f}")
+
+
+if __name__ == "__main__":
+    main()
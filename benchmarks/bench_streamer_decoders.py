@@ -0,0 +1,96 @@
+"""Measure what starting a streamer and a track costs before the first block.
+
+Compares checking for ffmpeg and yt-dlp in every `Streamer` with the check
+cached per process, and reading the first block of a WAV track from a child
+process with reading it in-process through `WaveDecoder`. ``cat`` stands in
+for ffmpeg, so the child process figures are a lower bound: ffmpeg itself
+loads far more before it writes anything. Nothing is sent, so no server is
+needed.
+
+Run with::
+
+    python benchmarks/bench_streamer_decoders.py
+"""
+
+import subprocess
+import tempfile
+import time
+import wave
+from pathlib import Path
+
+from pytalk import decoders
+
+STREAMERS = 20
+TRACKS = 50
+BLOCK_SIZE = 4 * 1024
+
+
+def run_uncached() -> float:
+    """Check for both programs once per streamer, as every streamer used to."""
+    start = time.perf_counter()
+    for _ in range(STREAMERS):
+        decoders._program_available.cache_clear()
+        decoders.ffmpeg_available()
+        decoders.yt_dlp_available()
+    return time.perf_counter() - start
+
+
+def run_cached() -> float:
+    """Check for both programs once per process."""
+    decoders._program_available.cache_clear()
+    start = time.perf_counter()
+    for _ in range(STREAMERS):
+        decoders.ffmpeg_available()
+        decoders.yt_dlp_available()
+    return time.perf_counter() - start
+
+
+def run_process(path: Path) -> float:
+    """Read the first block of each track from a child process."""
+    chunk = bytearray(BLOCK_SIZE)
+    start = time.perf_counter()
+    for _ in range(TRACKS):
+        process = subprocess.Popen(["cat", str(path)], stdout=subprocess.PIPE)  # noqa: S607
+        assert process.stdout is not None  # noqa: S101
+        process.stdout.readinto(chunk)  # type: ignore [attr-defined]
+        process.terminate()
+        process.wait()
+        process.stdout.close()
+    return time.perf_counter() - start
+
+
+def run_in_process(path: Path) -> float:
+    """Read the first block of each track with `WaveDecoder`."""
+    chunk = memoryview(bytearray(BLOCK_SIZE))
+    decoder = decoders.WaveDecoder()
+    start = time.perf_counter()
+    for _ in range(TRACKS):
+        source = decoder.open(str(path), 48000, 2)
+        assert source is not None  # noqa: S101
+        source.readinto(chunk)
+        source.close()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Print the cost per streamer and per track of each approach."""
+    print(f"{'program check':<16} {'ms/streamer':>12}")
+    for name, run in (("every streamer", run_uncached), ("once", run_cached)):
+        print(f"{name:<16} {run() / STREAMERS * 1e3:>12.3f}")
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "track.wav"
+        with wave.open(str(path), "wb") as file:
+            file.setnchannels(2)
+            file.setsampwidth(2)
+            file.setframerate(48000)
+            file.writeframes(bytes(48000 * 4 * 10))
+        print(f"{'first block':<16} {'ms/track':>12}")
+        for name, run in (
+            ("child process", run_process),
+            ("in-process", run_in_process),
+        ):
+            print(f"{name:<16} {run(path) / TRACKS * 1e3:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
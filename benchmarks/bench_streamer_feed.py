@@ -0,0 +1,85 @@
+"""Compare the old and the new path of samples through `Streamer.feed`.
+
+Relays 60 seconds of 48 kHz stereo audio in 20 ms frames, like a live
+microphone. The old path concatenated the frame to the pending bytes, sliced
+the result into chunk bytes objects, queued them and copied each chunk into a
+new ctypes array before inserting it. The new path copies the frame straight
+into a preallocated block whose address is handed to the SDK. Reports the time
+per frame and the peak of memory allocated on the way. The SDK is not called,
+so no server is needed::
+
+    python benchmarks/bench_streamer_feed.py
+"""
+
+import collections
+import ctypes
+import threading
+import time
+import tracemalloc
+
+from pytalk.streamer import _BlockRing
+
+SAMPLE_RATE = 48_000
+CHANNELS = 2
+FRAME_BYTES = SAMPLE_RATE * CHANNELS * 2 // 50  # 20 ms
+BLOCK_SIZE = 4 * 1024
+FRAMES = 60 * 50
+
+
+def run_old(frame: bytearray, _ring: _BlockRing) -> int:
+    """Feed the frames the way the streamer used to and return the blocks."""
+    queue: collections.deque[bytes] = collections.deque()
+    cond = threading.Condition()
+    current = b""
+    sent = 0
+    for _ in range(FRAMES):
+        current += frame
+        if len(current) >= BLOCK_SIZE:
+            chunks = [
+                current[i : i + BLOCK_SIZE] for i in range(0, len(current), BLOCK_SIZE)
+            ]
+            for chunk in chunks[:-1]:
+                with cond:
+                    queue.append(chunk)
+            current = chunks[-1]
+        while queue:
+            with cond:
+                chunk = queue.popleft()
+            block = (ctypes.c_char * len(chunk)).from_buffer_copy(chunk)
+            sent += len(block) > 0
+    return sent
+
+
+def run_new(frame: bytearray, ring: _BlockRing) -> int:
+    """Feed the frames into a block ring and return the blocks sent."""
+    view = memoryview(frame)
+    sent = 0
+    for _ in range(FRAMES):
+        ring.write(view)
+        while len(ring):
+            block = ring.peek()
+            sent += block is not None and ctypes.addressof(block[0]) > 0
+            ring.release()
+    return sent
+
+
+def main() -> None:
+    """Run both paths and print the time per frame and the peak memory."""
+    frame = bytearray(FRAME_BYTES)
+    # Preallocated once per streamer, so kept out of the measurement.
+    ring = _BlockRing(4, BLOCK_SIZE)
+    print(f"{FRAMES} frames of {FRAME_BYTES} bytes, {BLOCK_SIZE} byte blocks")
+    print(f"{'feed':<5} {'us/frame':>9} {'peak KiB':>9}")
+    for name, run in (("old", run_old), ("new", run_new)):
+        start = time.perf_counter()
+        run(frame, ring)
+        elapsed = time.perf_counter() - start
+        tracemalloc.start()
+        run(frame, ring)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{name:<5} {elapsed / FRAMES * 1e6:>9.2f} {peak / 1024:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Measure how evenly the streamer hands blocks to the SDK.
+
+A producer feeds two seconds of 48 kHz stereo audio as fast as it can, like
+ffmpeg decoding a file. The SDK is replaced by a queue that plays audio in real
+time and rejects blocks while it holds more than ``SDK_QUEUE`` seconds. The
+benchmark reports how much audio piled up in that queue and how many inserts
+were rejected. It compares inserting as fast as the SDK accepts, as the
+streamer used to, with the paced streamer::
+
+    python benchmarks/bench_streamer_pacing.py
+"""
+
+import time
+from unittest.mock import MagicMock, patch
+
+from pytalk.streamer import Pacing, Streamer
+
+SAMPLE_RATE = 48_000
+CHANNELS = 2
+BLOCK_SIZE = 3840  # 20 ms
+SECONDS = 2
+SDK_QUEUE = 0.5
+BYTES_PER_SECOND = SAMPLE_RATE * CHANNELS * 2
+
+
+class FakeSdkQueue:
+    """The SDK's audio queue, playing in real time and bounded to ``SDK_QUEUE``."""
+
+    def __init__(self) -> None:
+        """Start with an empty queue and no inserts."""
+        self.queued = 0.0
+        self.peak = 0.0
+        self.rejected = 0
+        self.inserted = 0
+        self._last = time.monotonic()
+
+    def insert(self, _tt: object, block: object) -> int:
+        """Queue a block like `_InsertAudioBlock`, or return 0 while full."""
+        now = time.monotonic()
+        self.queued = max(self.queued - (now - self._last), 0.0)
+        self._last = now
+        if self.queued >= SDK_QUEUE:
+            self.rejected += 1
+            return 0
+        self.queued += block.nSamples / SAMPLE_RATE  # type: ignore [attr-defined]
+        self.peak = max(self.peak, self.queued)
+        self.inserted += 1
+        return 1
+
+
+def run_unpaced(sdk_queue: FakeSdkQueue) -> None:
+    """Insert every block as soon as the queue accepts it."""
+    block = MagicMock(nSamples=BLOCK_SIZE // (2 * CHANNELS))
+    for _ in range(SECONDS * BYTES_PER_SECOND // BLOCK_SIZE):
+        while not sdk_queue.insert(None, block):
+            pass
+
+
+def run_paced(sdk_queue: FakeSdkQueue) -> None:
+    """Feed every block to a paced `Streamer` and wait until it sent them."""
+    blocks = SECONDS * BYTES_PER_SECOND // BLOCK_SIZE
+    with (
+        patch.object(Streamer, "_has_ffmpeg", return_value=False),
+        patch.object(Streamer, "_has_yt_dlp", return_value=False),
+        patch("pytalk.streamer.sdk._InsertAudioBlock", side_effect=sdk_queue.insert),
+    ):
+        streamer = Streamer(
+            MagicMock(), SAMPLE_RATE, CHANNELS, Pacing(BLOCK_SIZE, target_latency=0.06)
+        )
+        for _ in range(blocks):
+            streamer.feed(bytes(BLOCK_SIZE))
+        while sdk_queue.inserted < blocks:
+            time.sleep(0.01)
+        streamer.close()
+
+
+def main() -> None:
+    """Print the peak of the SDK queue and the rejected inserts of both ways."""
+    print(f"{SECONDS} s of audio in {BLOCK_SIZE} byte blocks")
+    print(f"{'insertion':<10} {'peak SDK queue (s)':>19} {'rejected inserts':>17}")
+    for name, run in (("unpaced", run_unpaced), ("paced", run_paced)):
+        sdk_queue = FakeSdkQueue()
+        run(sdk_queue)
+        print(f"{name:<10} {sdk_queue.peak:>19.3f} {sdk_queue.rejected:>17}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Measure the silence between two tracks.
+
+Plays two half-second raw PCM tracks. Either `Streamer.stream` is called for
+the second one as soon as the first has ended, which is the best a bot could
+do before, or both are queued with `Streamer.enqueue`. The SDK is replaced by
+a function that notes when each block arrives, and the gap is the longest
+time a block arrived after the previous one had finished playing. Opening a
+track is delayed to stand in for starting ffmpeg or resolving an url.
+
+Run with::
+
+    python benchmarks/bench_streamer_playlist.py
+"""
+
+import itertools
+import tempfile
+import threading
+import time
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from pytalk.decoders import AudioSource, PcmDecoder
+from pytalk.streamer import Pacing, Streamer
+
+SAMPLE_RATE = 48_000
+CHANNELS = 2
+BLOCK_SIZE = 4 * 1024
+TRACK_BYTES = SAMPLE_RATE * CHANNELS * 2 // 2
+FRAMES = TRACK_BYTES // (CHANNELS * 2)
+ROUNDS = 5
+# Seconds to open a track: in-process, and roughly starting ffmpeg on a url.
+OPEN_DELAYS = (0.0, 0.25)
+
+
+class _Sink:
+    """Stands in for the SDK, noting when each block arrives."""
+
+    def __init__(self) -> None:
+        """Start with no blocks."""
+        self.blocks: list[tuple[float, int]] = []
+        self.played = 0
+        self.first_done = threading.Event()
+        self.both_done = threading.Event()
+
+    def insert(self, _tt: object, block: object) -> int:
+        """Note a block, and whether the first or both tracks were sent."""
+        samples = block.nSamples  # type: ignore [attr-defined]
+        if samples:
+            self.blocks.append((time.perf_counter(), samples))
+            self.played += samples
+        elif self.played >= FRAMES:
+            self.first_done.set()
+        if self.played >= 2 * FRAMES:
+            self.both_done.set()
+        return 1
+
+    def gap(self) -> float:
+        """Return the longest wait for a block after the previous one played."""
+        return max(
+            (later - sent - samples / SAMPLE_RATE)
+            for (sent, samples), (later, _) in itertools.pairwise(self.blocks)
+        )
+
+
+class _SlowDecoder(PcmDecoder):
+    """Takes `delay` seconds to open a track, like starting ffmpeg would."""
+
+    def __init__(self, delay: float) -> None:
+        """Set the delay."""
+        self.delay = delay
+
+    def open(self, path: str, sample_rate: int, channels: int) -> AudioSource | None:
+        """Wait, then open the track."""
+        time.sleep(self.delay)
+        return super().open(path, sample_rate, channels)
+
+
+def run(first: str, second: str, queued: bool, delay: float) -> float:
+    """Play both tracks and return the longest gap."""
+    sink = _Sink()
+    with patch("pytalk.streamer.sdk._InsertAudioBlock", side_effect=sink.insert):
+        streamer = Streamer(MagicMock(), SAMPLE_RATE, CHANNELS, Pacing(BLOCK_SIZE))
+        streamer.decoders = [_SlowDecoder(delay)]
+        if queued:
+            streamer.enqueue(first)
+            streamer.enqueue(second)
+        else:
+            streamer.stream(first)
+            # The end marker of the first track has been sent.
+            sink.first_done.wait()
+            streamer.stream(second)
+        sink.both_done.wait()
+        streamer.close()
+    return sink.gap()
+
+
+def main() -> None:
+    """Print the average gap of each approach."""
+    with tempfile.TemporaryDirectory() as directory:
+        first = Path(directory) / "first.pcm"
+        second = Path(directory) / "second.pcm"
+        first.write_bytes(bytes(TRACK_BYTES))
+        second.write_bytes(bytes(TRACK_BYTES))
+        print(f"{'next track':<10} {'open ms':>8} {'gap ms':>8}")
+        with (
+            patch.object(Streamer, "_has_ffmpeg", return_value=False),
+            patch.object(Streamer, "_has_yt_dlp", return_value=False),
+        ):
+            for delay in OPEN_DELAYS:
+                for name, queued in (("stream", False), ("enqueue", True)):
+                    gaps = [
+                        run(str(first), str(second), queued, delay)
+                        for _ in range(ROUNDS)
+                    ]
+                    print(
+                        f"{name:<10} {delay * 1e3:>8.0f} "
+                        f"{sum(gaps) / ROUNDS * 1e3:>8.1f}"
+                    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Measure the cost of the streamer's block queue.
+
+Compares popping the head of a list with ``blocks = blocks[1:]``, as the
+streamer used to, with the bounded `_BlockRing`, for a backlog of queued
+blocks. Then reports the CPU time used by idle streamers, whose threads now
+sleep on a condition instead of spinning. The SDK is not called, so no server
+is needed::
+
+    python benchmarks/bench_streamer_queue.py
+"""
+
+import time
+from unittest.mock import MagicMock, patch
+
+from pytalk.streamer import Streamer, _BlockRing
+
+BACKLOG = 2000
+BLOCKS = 100_000
+IDLE_STREAMERS = 8
+IDLE_SECONDS = 1.0
+
+
+def run_list(block: bytes) -> float:
+    """Pass the blocks through a list, as the streamer used to."""
+    blocks = [block] * BACKLOG
+    start = time.perf_counter()
+    for _ in range(BLOCKS):
+        blocks.append(block)
+        _ = blocks[0]
+        blocks = blocks[1:]
+    return time.perf_counter() - start
+
+
+def run_ring(block: bytes) -> float:
+    """Pass the blocks through a `_BlockRing`."""
+    ring = _BlockRing(BACKLOG + 1, len(block))
+    for _ in range(BACKLOG):
+        ring.write(block)
+    start = time.perf_counter()
+    for _ in range(BLOCKS):
+        ring.write(block)
+        ring.peek()
+        ring.release()
+    return time.perf_counter() - start
+
+
+def idle_cpu() -> float:
+    """Return the CPU time idle streamers use in `IDLE_SECONDS`."""
+    with (
+        patch.object(Streamer, "_has_ffmpeg", return_value=False),
+        patch.object(Streamer, "_has_yt_dlp", return_value=False),
+    ):
+        streamers = [Streamer(MagicMock()) for _ in range(IDLE_STREAMERS)]
+    start = time.process_time()
+    time.sleep(IDLE_SECONDS)
+    used = time.process_time() - start
+    for streamer in streamers:
+        streamer.close()
+    return used
+
+
+def main() -> None:
+    """Print the time per block of both queues and the idle CPU use."""
+    block = bytes(4096)
+    print(f"{BLOCKS} blocks through a backlog of {BACKLOG}")
+    print(f"{'queue':<6} {'us/block':>9}")
+    for name, run in (("list", run_list), ("ring", run_ring)):
+        print(f"{name:<6} {run(block) / BLOCKS * 1e6:>9.2f}")
+    print(
+        f"CPU seconds used by {IDLE_STREAMERS} idle streamers in "
+        f"{IDLE_SECONDS} s: {idle_cpu():.4f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Measure an update storm with and without a coalescing window.
+
+Feeds ``UPDATES`` user update events for ``USERS`` users through a
+`TeamTalkInstance` in bursts of ``BURST`` events, yielding to the event loop
+between bursts like the event pump does. Reports how many ``user_update``
+events reached the bot and how long decoding took.
+
+The SDK is not exercised, so no server is needed::
+
+    python benchmarks/bench_update_coalescing.py
+"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+from pytalk.implementation.TeamTalkPy import TeamTalk5 as sdk
+
+from pytalk.instance import TeamTalkInstance
+
+USERS = 200
+UPDATES = 100_000
+BURST = 100
+
+
+def _make_update(user_id: int) -> sdk.TTMessage:
+    msg = sdk.TTMessage()
+    msg.nClientEvent = sdk.ClientEvent.CLIENTEVENT_CMD_USER_UPDATE
+    msg.user.nUserID = user_id
+    msg.user.nChannelID = 1
+    return msg
+
+
+async def run(window: float | None) -> tuple[float, int]:
+    """Feed the storm and return the time taken and the events delivered."""
+    delivered = 0
+
+    def dispatch(_event: str, *_args: object, **_kwargs: object) -> None:
+        nonlocal delivered
+        delivered += 1
+
+    bot = SimpleNamespace(
+        dispatch=dispatch,
+        _listeners={},
+        snapshot_events=False,
+        coalesce_window=window,
+        capture_all_audio=True,
+    )
+    instance = TeamTalkInstance(bot, SimpleNamespace(host="localhost"))  # type: ignore [arg-type]
+    messages = [_make_update(user_id) for user_id in range(1, USERS + 1)]
+    start = time.perf_counter()
+    for i in range(UPDATES):
+        instance._process_message(messages[i % USERS])
+        if i % BURST == 0:
+            await asyncio.sleep(0)
+    elapsed = time.perf_counter() - start
+    await asyncio.sleep((window or 0) * 2)
+    return elapsed, delivered
+
+
+def main() -> None:
+    """Print the delivered events and decoding time with each window."""
+    print(f"{UPDATES} updates for {USERS} users")
+    print(f"{'window':<8} {'seconds':>8} {'delivered':>10}")
+    for window in (None, 0.25):
+        elapsed, delivered = asyncio.run(run(window))
+        print(f"{window!s:<8} {elapsed:>8.2f} {delivered:>10}")
+
+
+if __name__ == "__main__":
+    main()
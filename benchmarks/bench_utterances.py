@@ -0,0 +1,149 @@
+"""Measure the cost of cutting received speech into utterances.
+
+Delivers a minute of 20 ms blocks of 48 kHz mono, in which a user speaks for
+two seconds and pauses for one, and collects each stretch of speech. An
+``on_user_audio`` handler measuring every block in Python and buffering the
+voiced ones, as speech-to-text bots do, is compared with `Segmenter`, which
+does the same on the capture path and dispatches one ``on_utterance`` event
+per stretch. The SDK is replaced by fakes, so no server is needed.
+
+Run with::
+
+    python benchmarks/bench_utterances.py
+"""
+
+import array
+import asyncio
+import ctypes
+import math
+import time
+from unittest.mock import MagicMock, patch
+
+from pytalk.implementation.TeamTalkPy import TeamTalk5 as sdk
+
+from pytalk.audio import AudioBlock
+from pytalk.bot import TeamTalkBot
+from pytalk.instance import TeamTalkInstance
+from pytalk.segmenter import Segmenter, Utterance
+
+SAMPLE_RATE = 48_000
+BLOCK_MSEC = 20
+BLOCK_SAMPLES = SAMPLE_RATE * BLOCK_MSEC // 1000
+SECONDS = 60
+USER_ID = 5
+THRESHOLD = 10 ** (-40 / 20) * 32768
+HANGOVER_BLOCKS = 25
+
+
+def make_blocks() -> list[ctypes.Array[ctypes.c_char]]:
+    """Return the samples of every block: two seconds of tone, one of silence."""
+    tone = array.array(
+        "h",
+        (
+            int(8000 * math.sin(2 * math.pi * 200 * i / SAMPLE_RATE))
+            for i in range(BLOCK_SAMPLES)
+        ),
+    ).tobytes()
+    silence = bytes(BLOCK_SAMPLES * 2)
+    blocks_per_second = 1000 // BLOCK_MSEC
+    return [
+        ctypes.create_string_buffer(
+            tone if n % (3 * blocks_per_second) < 2 * blocks_per_second else silence,
+            BLOCK_SAMPLES * 2,
+        )
+        for n in range(SECONDS * blocks_per_second)
+    ]
+
+
+async def deliver(teamtalk: TeamTalkInstance, blocks: list) -> float:
+    """Hand every block to the instance and return the time it took."""
+    block = sdk.AudioBlock()
+    block.nSampleRate = SAMPLE_RATE
+    block.nChannels = 1
+    block.nSamples = BLOCK_SAMPLES
+    msg = sdk.TTMessage()
+    msg.nSource = USER_ID
+    msg.nStreamType = sdk.StreamType.STREAMTYPE_VOICE
+    with (
+        patch("pytalk.instance._AcquireUserAudioBlock") as acquire,
+        patch("pytalk.instance._ReleaseUserAudioBlock"),
+    ):
+        acquire.return_value = ctypes.addressof(block)
+        start = time.perf_counter()
+        for samples in blocks:
+            block.lpRawAudio = ctypes.addressof(samples)
+            teamtalk._on_user_audioblock(msg)
+            # Let the handlers scheduled for the block run.
+            await asyncio.sleep(0)
+        return time.perf_counter() - start
+
+
+def new_instance() -> TeamTalkInstance:
+    """Return an instance of a new bot, on the running loop."""
+    bot = TeamTalkBot()
+    bot.loop = asyncio.get_running_loop()
+    teamtalk = TeamTalkInstance(bot, MagicMock())
+    user = sdk.User()
+    user.nUserID = USER_ID
+    user.nChannelID = 1
+    teamtalk._state.users[USER_ID] = user
+    return teamtalk
+
+
+async def run_handler(blocks: list) -> tuple[float, int, int]:
+    """Segment in an ``on_user_audio`` handler."""
+    teamtalk = new_instance()
+    utterances: list[bytes] = []
+    calls = 0
+    buffer = bytearray()
+    silent = HANGOVER_BLOCKS
+
+    async def on_user_audio(block: AudioBlock) -> None:
+        nonlocal calls, buffer, silent
+        calls += 1
+        samples = block.buffer
+        rms = math.sqrt(sum(sample * sample for sample in samples) / len(samples))
+        if rms >= THRESHOLD:
+            silent = 0
+            buffer += samples
+        elif buffer:
+            silent += 1
+            if silent >= HANGOVER_BLOCKS:
+                utterances.append(bytes(buffer))
+                buffer = bytearray()
+
+    teamtalk.bot.event(on_user_audio)
+    elapsed = await deliver(teamtalk, blocks)
+    return elapsed, calls, len(utterances)
+
+
+async def run_segmenter(blocks: list) -> tuple[float, int, int]:
+    """Segment with a `Segmenter`."""
+    teamtalk = new_instance()
+    utterances: list[Utterance] = []
+
+    async def on_utterance(utterance: Utterance) -> None:
+        utterances.append(utterance)
+
+    teamtalk.bot.event(on_utterance)
+    with patch("pytalk.instance.sdk._EnableAudioBlockEventEx"):
+        teamtalk.segment_audio(Segmenter(), user=USER_ID)
+    elapsed = await deliver(teamtalk, blocks)
+    await asyncio.sleep(0)
+    return elapsed, len(utterances), len(utterances)
+
+
+def main() -> None:
+    """Print the time per block and the number of handler calls of both ways."""
+    blocks = make_blocks()
+    print(f"{SECONDS} s of {BLOCK_MSEC} ms blocks, 2 s of speech every 3 s")
+    print(
+        f"{'segmenting':<10} {'us/block':>9} {'handler calls':>14} {'utterances':>11}"
+    )
+    for name, run in (("handler", run_handler), ("segmenter", run_segmenter)):
+        elapsed, calls, count = asyncio.run(run(blocks))
+        print(f"{name:<10} {elapsed / len(blocks) * 1e6:>9.1f} {calls:>14} {count:>11}")
+
+
+if __name__ == "__main__":
+    main()
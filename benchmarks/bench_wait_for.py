@@ -0,0 +1,94 @@
+"""Benchmark dispatch cost with many parked ``wait_for`` futures.
+
+Parks one waiter per user (``WAITERS`` in total) for the ``message`` event and
+then dispatches messages from random users, resolving and re-parking the
+matching waiter each time. The old dispatch ran every predicate on every
+message; the listener registry only looks at the sender's waiters.
+
+Run with::
+
+    python benchmarks/bench_wait_for.py
+"""
+
+import asyncio
+import random
+import time
+from collections.abc import Callable
+from types import SimpleNamespace
+from typing import Any
+
+from pytalk._listeners import ListenerRegistry
+
+WAITERS = 500
+EVENTS = 20_000
+
+_Legacy = dict[str, list[tuple[asyncio.Future[Any], Callable[..., bool]]]]
+
+
+def _legacy_resolve(listeners: _Legacy, event: str, args: tuple[Any, ...]) -> None:
+    waiting = listeners.get(event)
+    if not waiting:
+        return
+    removed = []
+    for i, (future, condition) in enumerate(waiting):
+        if future.cancelled():
+            removed.append(i)
+            continue
+        if condition(*args):
+            future.set_result(args[0])
+            removed.append(i)
+    if len(removed) == len(waiting):
+        listeners.pop(event)
+    else:
+        for idx in reversed(removed):
+            del waiting[idx]
+
+
+async def run_legacy(messages: list[SimpleNamespace]) -> float:
+    """Dispatch the messages to a list of predicates and return the time taken."""
+    loop = asyncio.get_running_loop()
+    listeners: _Legacy = {}
+
+    def park(user_id: int) -> None:
+        listeners.setdefault("message", []).append(
+            (loop.create_future(), lambda m: m.from_id == user_id)
+        )
+
+    for user_id in range(WAITERS):
+        park(user_id)
+    start = time.perf_counter()
+    for message in messages:
+        _legacy_resolve(listeners, "message", (message,))
+        park(message.from_id)
+    return time.perf_counter() - start
+
+
+async def run_indexed(messages: list[SimpleNamespace]) -> float:
+    """Dispatch the messages to a `ListenerRegistry` and return the time taken."""
+    loop = asyncio.get_running_loop()
+    registry = ListenerRegistry()
+    for user_id in range(WAITERS):
+        registry.add("message", loop.create_future(), user_id=user_id)
+    start = time.perf_counter()
+    for message in messages:
+        registry.resolve("message", (message,))
+        registry.add("message", loop.create_future(), user_id=message.from_id)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Print the time per dispatch of both approaches."""
+    rng = random.Random(0)  # noqa: S311 - reproducible senders, not security
+    messages = [
+        SimpleNamespace(from_id=rng.randrange(WAITERS), channel_id=0)
+        for _ in range(EVENTS)
+    ]
+    legacy = asyncio.run(run_legacy(messages))
+    indexed = asyncio.run(run_indexed(messages))
+    print(f"{WAITERS} waiters, {EVENTS} messages")
+    print(f"linear scan  {legacy / EVENTS * 1e6:8.1f} us per dispatch")
+    print(f"indexed      {indexed / EVENTS * 1e6:8.1f} us per dispatch")
+
+
+if __name__ == "__main__":
+    main()
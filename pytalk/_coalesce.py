@@ -0,0 +1,96 @@
+"""Coalescing of bursts of user and channel update events."""
+
+import asyncio
+from collections.abc import Callable
+from typing import Any
+
+from ._state import _copy
+from .implementation.TeamTalkPy import TeamTalk5 as sdk
+
+_Key = tuple[str, int]
+_Deliver = Callable[[str, Any, int], None]
+
+
+class UpdateCoalescer:
+    """Holds back update events to deliver only the latest one per object.
+
+    The first update for a user or channel opens a window. Updates for the
+    same object that arrive while it is open replace the held struct. When the
+    window closes the latest struct is delivered together with the number of
+    updates it replaced. If the user leaves or logs out, or the channel is
+    removed, the held update is delivered right away so it does not arrive
+    after that event.
+    """
+
+    def __init__(self, window: float, deliver: _Deliver) -> None:
+        """Initialize the coalescer.
+
+        Args:
+            window: How long to hold back an update, in seconds.
+            deliver: Called with the event name, the latest struct and the
+                number of updates it replaced.
+
+        """
+        self.window = window
+        self._deliver = deliver
+        self._pending: dict[_Key, list[Any]] = {}
+        event = sdk.ClientEvent
+        self._flush_on: dict[int, Callable[[sdk.TTMessage], _Key]] = {
+            event.CLIENTEVENT_CMD_USER_LEFT: _user_key,
+            event.CLIENTEVENT_CMD_USER_LOGGEDOUT: _user_key,
+            event.CLIENTEVENT_CMD_CHANNEL_REMOVE: _channel_key,
+        }
+
+    def push(self, event: str, key: int, struct: Any) -> None:  # noqa: ANN401
+        """Hold back an update, or deliver it now if no event loop is running.
+
+        Args:
+            event: The name of the event, e.g. ``user_update``.
+            key: The ID of the user or channel.
+            struct: The SDK struct carried by the event.
+
+        """
+        pending = self._pending.get((event, key))
+        if pending is not None:
+            pending[0] = _copy(struct)
+            pending[1] += 1
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._deliver(event, struct, 0)
+            return
+        handle = loop.call_later(self.window, self._flush, (event, key))
+        self._pending[(event, key)] = [_copy(struct), 0, handle]
+
+    def observe(self, msg: sdk.TTMessage) -> None:
+        """Deliver a held update early if `msg` ends the object's updates."""
+        key_of = self._flush_on.get(msg.nClientEvent)
+        if key_of is not None and self._pending:
+            key = key_of(msg)
+            pending = self._pending.get(key)
+            if pending is not None:
+                pending[2].cancel()
+                self._flush(key)
+
+    def clear(self) -> None:
+        """Drop every held update and cancel its timer.
+
+        Called when the session ends, since the held updates describe users
+        and channels of a server the instance is no longer on.
+        """
+        for _, _, handle in self._pending.values():
+            handle.cancel()
+        self._pending.clear()
+
+    def _flush(self, key: _Key) -> None:
+        struct, replaced, _ = self._pending.pop(key)
+        self._deliver(key[0], struct, replaced)
+
+
+def _user_key(msg: sdk.TTMessage) -> _Key:
+    return ("user_update", msg.user.nUserID)
+
+
+def _channel_key(msg: sdk.TTMessage) -> _Key:
+    return ("channel_update", msg.channel.nChannelID)
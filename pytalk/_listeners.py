@@ -0,0 +1,244 @@
+"""Registry of the futures parked by `TeamTalkBot.wait_for`."""
+
+import asyncio
+from collections.abc import Callable
+from typing import Any, TypeVar
+
+from .snapshot import AudioBlockSnapshot, UserSnapshot
+
+_Extractor = Callable[..., int]
+_Key = TypeVar("_Key")
+
+# Discriminators in the order they are preferred as index key; the first one
+# given to wait_for is indexed, the others are compared after the lookup.
+KEYS = ("cmd_id", "transfer_id", "user_id", "channel_id")
+
+
+def _first_id(obj: Any, *_: object) -> int:  # noqa: ANN401
+    return obj.id  # type: ignore [no-any-return]
+
+
+def _user_channel_id(user: Any, *_: object) -> int:  # noqa: ANN401
+    if type(user) is UserSnapshot:
+        return user.channel_id
+    # Read the struct rather than resolving the wrapper's channel.
+    return user._user.nChannelID  # type: ignore [no-any-return]
+
+
+def _second_id(_: object, obj: Any, *__: object) -> int:  # noqa: ANN401
+    return obj.id  # type: ignore [no-any-return]
+
+
+def _second_arg(_: object, value: int, *__: object) -> int:
+    return value
+
+
+def _message_user_id(message: Any) -> int:  # noqa: ANN401
+    return message.from_id  # type: ignore [no-any-return]
+
+
+def _message_channel_id(message: Any) -> int:  # noqa: ANN401
+    return getattr(message, "channel_id", 0)
+
+
+def _audio_user_id(block: Any) -> int:  # noqa: ANN401
+    if type(block) is AudioBlockSnapshot:
+        return block.user_id
+    return block.user.id  # type: ignore [no-any-return]
+
+
+def _transfer_id(transfer: Any) -> int:  # noqa: ANN401
+    return transfer.transfer_id  # type: ignore [no-any-return]
+
+
+_USER_EVENT: dict[str, _Extractor] = {
+    "user_id": _first_id,
+    "channel_id": _user_channel_id,
+}
+_USER_MOVE_EVENT: dict[str, _Extractor] = {
+    "user_id": _first_id,
+    "channel_id": _second_id,
+}
+_CHANNEL_EVENT: dict[str, _Extractor] = {"channel_id": _first_id}
+_COMMAND_EVENT: dict[str, _Extractor] = {"cmd_id": _second_arg}
+
+# How to read each discriminator from the arguments of an event.
+EXTRACTORS: dict[str, dict[str, _Extractor]] = {
+    "message": {"user_id": _message_user_id, "channel_id": _message_channel_id},
+    "user_audio": {"user_id": _audio_user_id},
+    "user_join": _USER_MOVE_EVENT,
+    "user_left": _USER_MOVE_EVENT,
+    "user_login": _USER_EVENT,
+    "user_logout": _USER_EVENT,
+    "user_update": _USER_EVENT,
+    "channel_new": _CHANNEL_EVENT,
+    "channel_update": _CHANNEL_EVENT,
+    "channel_delete": _CHANNEL_EVENT,
+    "my_kicked_from_channel": _CHANNEL_EVENT,
+    "file_transfer_progress": {"transfer_id": _transfer_id},
+    "command_success": _COMMAND_EVENT,
+    "command_error": _COMMAND_EVENT,
+}
+
+
+class _Listener:
+    __slots__ = ("check", "future", "index", "keys")
+
+    def __init__(
+        self,
+        future: asyncio.Future[Any],
+        check: Callable[..., bool] | None,
+        keys: dict[str, int],
+        index: tuple[str, int] | None,
+    ) -> None:
+        self.future = future
+        self.check = check
+        self.keys = keys
+        self.index = index
+
+
+class ListenerRegistry:
+    """Futures waiting for an event, indexed by the IDs they wait for.
+
+    A waiter for the messages of one user is stored under
+    ``("user_id", <id>)``, so dispatching a message only looks at the waiters
+    for its sender and the waiters without any ID, instead of running every
+    predicate. Buckets are insertion ordered dicts, so resolving or cancelling
+    a waiter removes it in constant time.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty registry."""
+        self._unkeyed: dict[str, dict[_Listener, None]] = {}
+        self._keyed: dict[str, dict[tuple[str, int], dict[_Listener, None]]] = {}
+        self._counts: dict[str, int] = {}
+
+    def __contains__(self, event: object) -> bool:
+        """Check if anything is waiting for `event`."""
+        return event in self._counts
+
+    def __len__(self) -> int:
+        """Return the number of waiting futures."""
+        return sum(self._counts.values())
+
+    def add(
+        self,
+        event: str,
+        future: asyncio.Future[Any],
+        check: Callable[..., bool] | None = None,
+        **keys: int | None,
+    ) -> None:
+        """Park a future until `event` is dispatched with matching arguments.
+
+        The future is removed again once it is done, including when it is
+        cancelled by a timeout.
+
+        Args:
+            event: The name of the event, without the ``on_`` prefix.
+            future: The future to resolve.
+            check: An optional predicate called with the event's arguments.
+            **keys: IDs the event has to match, see `KEYS`. None is ignored.
+
+        Raises:
+            ValueError: If the event does not carry one of the given IDs.
+
+        """
+        wanted = {name: value for name, value in keys.items() if value is not None}
+        extractors = EXTRACTORS.get(event, {})
+        for name in wanted:
+            if name not in extractors:
+                raise ValueError(f"Event {event!r} cannot be filtered by {name}")
+        index_name = next((name for name in KEYS if name in wanted), None)
+        index = None if index_name is None else (index_name, wanted.pop(index_name))
+        listener = _Listener(future, check, wanted, index)
+        if index is None:
+            bucket = self._unkeyed.setdefault(event, {})
+        else:
+            bucket = self._keyed.setdefault(event, {}).setdefault(index, {})
+        bucket[listener] = None
+        self._counts[event] = self._counts.get(event, 0) + 1
+        future.add_done_callback(lambda _: self._discard(event, listener))
+
+    def resolve(self, event: str, args: tuple[Any, ...]) -> None:
+        """Resolve the futures waiting for `event` that match `args`.
+
+        Args:
+            event: The name of the event.
+            args: The arguments the event is dispatched with.
+
+        """
+        if event not in self._counts:
+            return
+        candidates: list[_Listener] = []
+        keyed = self._keyed.get(event)
+        if keyed:
+            for name, extractor in EXTRACTORS[event].items():
+                try:
+                    value = extractor(*args)
+                except Exception:  # noqa: BLE001, S112
+                    continue
+                bucket = keyed.get((name, value))
+                if bucket:
+                    candidates.extend(bucket)
+        unkeyed = self._unkeyed.get(event)
+        if unkeyed:
+            candidates.extend(unkeyed)
+        for listener in candidates:
+            self._resolve(event, listener, args)
+
+    def _resolve(self, event: str, listener: _Listener, args: tuple[Any, ...]) -> None:
+        future = listener.future
+        if future.done():
+            self._discard(event, listener)
+            return
+        if listener.keys and not self._matches(event, listener.keys, args):
+            return
+        try:
+            result = listener.check is None or listener.check(*args)
+        except Exception as exc:  # noqa: BLE001
+            future.set_exception(exc)
+        else:
+            if not result:
+                return
+            if len(args) == 0:
+                future.set_result(None)
+            elif len(args) == 1:
+                future.set_result(args[0])
+            else:
+                future.set_result(args)
+        self._discard(event, listener)
+
+    @staticmethod
+    def _matches(event: str, keys: dict[str, int], args: tuple[Any, ...]) -> bool:
+        extractors = EXTRACTORS[event]
+        try:
+            return all(extractors[name](*args) == value for name, value in keys.items())
+        except Exception:  # noqa: BLE001
+            return False
+
+    def _discard(self, event: str, listener: _Listener) -> None:
+        if listener.index is None:
+            removed = _remove(self._unkeyed, event, listener)
+        else:
+            keyed = self._keyed.get(event)
+            removed = keyed is not None and _remove(keyed, listener.index, listener)
+            if removed and not keyed:
+                del self._keyed[event]
+        if not removed:
+            return
+        self._counts[event] -= 1
+        if not self._counts[event]:
+            del self._counts[event]
+
+
+def _remove(
+    buckets: dict[_Key, dict[_Listener, None]], key: _Key, listener: _Listener
+) -> bool:
+    """Remove a listener from its bucket, and the bucket once it is empty."""
+    bucket = buckets.get(key)
+    if bucket is None or listener not in bucket:
+        return False
+    del bucket[listener]
+    if not bucket:
+        del buckets[key]
+    return True
@@ -0,0 +1,148 @@
+"""Local mirror of the users and channels known to a TeamTalkInstance."""
+
+from collections.abc import Callable, Iterable
+from typing import TypeVar
+
+from .implementation.TeamTalkPy import TeamTalk5 as sdk
+
+_StructT = TypeVar("_StructT", sdk.User, sdk.Channel)
+
+
+def _copy(struct: _StructT) -> _StructT:
+    return type(struct).from_buffer_copy(struct)
+
+
+class StateMirror:
+    """Keeps copies of the SDK's user and channel structs up to date.
+
+    The mirror is seeded at login and then follows the events the server sends,
+    so looking up a user or channel is a dict hit instead of a round trip into
+    the SDK. Lookups hand out copies, since wrappers are free to modify them.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty mirror."""
+        self.users: dict[int, sdk.User] = {}
+        self.channels: dict[int, sdk.Channel] = {}
+        self.paths: dict[int, str] = {}
+        self.seeded = False
+        event = sdk.ClientEvent
+        self._observers: dict[int, Callable[[sdk.TTMessage], None]] = {
+            event.CLIENTEVENT_USER_STATECHANGE: self._on_user,
+            event.CLIENTEVENT_CMD_USER_UPDATE: self._on_user,
+            event.CLIENTEVENT_CMD_USER_JOINED: self._on_user,
+            event.CLIENTEVENT_CMD_USER_LEFT: self._on_user_left,
+            event.CLIENTEVENT_CMD_USER_LOGGEDIN: self._on_user,
+            event.CLIENTEVENT_CMD_USER_LOGGEDOUT: self._on_user_loggedout,
+            event.CLIENTEVENT_CMD_CHANNEL_NEW: self._on_channel_new,
+            event.CLIENTEVENT_CMD_CHANNEL_UPDATE: self._on_channel_update,
+            event.CLIENTEVENT_CMD_CHANNEL_REMOVE: self._on_channel_remove,
+            event.CLIENTEVENT_CON_LOST: self._on_reset,
+            event.CLIENTEVENT_CMD_MYSELF_LOGGEDOUT: self._on_reset,
+        }
+
+    def seed(self, users: Iterable[sdk.User], channels: Iterable[sdk.Channel]) -> None:
+        """Replace the mirror's contents with a full snapshot from the SDK.
+
+        Args:
+            users: Every user on the server.
+            channels: Every channel on the server.
+
+        """
+        self.clear()
+        for channel in channels:
+            self.store_channel(channel)
+        for user in users:
+            self.store_user(user)
+        self.seeded = True
+
+    def clear(self) -> None:
+        """Forget everything, e.g. after the connection was lost."""
+        self.users.clear()
+        self.channels.clear()
+        self.paths.clear()
+        self.seeded = False
+
+    def observe(self, msg: sdk.TTMessage) -> None:
+        """Apply a message from the SDK to the mirror.
+
+        Args:
+            msg: The message. Events that do not affect users or channels are
+                ignored.
+
+        """
+        observer = self._observers.get(msg.nClientEvent)
+        if observer is not None:
+            observer(msg)
+
+    def user(self, user_id: int) -> sdk.User | None:
+        """Get a copy of a user's struct.
+
+        Args:
+            user_id: The ID of the user.
+
+        Returns:
+            The copy, or None if the user is not in the mirror.
+
+        """
+        user = self.users.get(user_id)
+        return None if user is None else _copy(user)
+
+    def channel(self, channel_id: int) -> sdk.Channel | None:
+        """Get a copy of a channel's struct.
+
+        Args:
+            channel_id: The ID of the channel.
+
+        Returns:
+            The copy, or None if the channel is not in the mirror.
+
+        """
+        channel = self.channels.get(channel_id)
+        return None if channel is None else _copy(channel)
+
+    def path(self, channel_id: int) -> str | None:
+        """Get the cached path of a channel, if any."""
+        return self.paths.get(channel_id)
+
+    def store_user(self, user: sdk.User) -> None:
+        """Store a copy of a user's struct. Empty structs are ignored."""
+        if user.nUserID:
+            self.users[user.nUserID] = _copy(user)
+
+    def store_channel(self, channel: sdk.Channel) -> None:
+        """Store a copy of a channel's struct. Empty structs are ignored."""
+        if channel.nChannelID:
+            self.channels[channel.nChannelID] = _copy(channel)
+
+    def store_path(self, channel_id: int, path: str) -> None:
+        """Cache the path of a channel that is in the mirror."""
+        if channel_id in self.channels:
+            self.paths[channel_id] = path
+
+    def _on_user(self, msg: sdk.TTMessage) -> None:
+        self.store_user(msg.user)
+
+    def _on_user_left(self, msg: sdk.TTMessage) -> None:
+        user = _copy(msg.user)
+        if user.nChannelID == msg.nSource:
+            user.nChannelID = 0
+        self.store_user(user)
+
+    def _on_user_loggedout(self, msg: sdk.TTMessage) -> None:
+        self.users.pop(msg.user.nUserID, None)
+
+    def _on_channel_new(self, msg: sdk.TTMessage) -> None:
+        self.store_channel(msg.channel)
+
+    def _on_channel_update(self, msg: sdk.TTMessage) -> None:
+        self.store_channel(msg.channel)
+        # A rename changes the path of every sub channel as well.
+        self.paths.clear()
+
+    def _on_channel_remove(self, msg: sdk.TTMessage) -> None:
+        self.channels.pop(msg.channel.nChannelID, None)
+        self.paths.clear()
+
+    def _on_reset(self, msg: sdk.TTMessage) -> None:  # noqa: ARG002
+        self.clear()
@@ -1,10 +1,18 @@
 import asyncio
+import contextlib
+import ctypes
+import functools
 import math
 import time
 from collections.abc import Callable
-from typing import Any, cast
+from contextlib import AbstractContextManager
+from typing import TYPE_CHECKING, Any, cast
 
 from .implementation.TeamTalkPy import TeamTalk5 as sdk
+from .scheduling import _check_not_inline
+
+if TYPE_CHECKING:
+    from .instance import TeamTalkInstance
 
 
 def timestamp() -> int:
@@ -14,18 +22,52 @@ def timestamp() -> int:
 DEF_WAIT = 1500
 
 
+def _exclusive_messages(ttclient: sdk.TeamTalk) -> AbstractContextManager[Any]:
+    # Instances with an event reader thread must pause it while we poll.
+    exclusive = getattr(ttclient, "_exclusive_messages", None)
+    if exclusive is None:
+        return contextlib.nullcontext()
+    return cast("AbstractContextManager[Any]", exclusive())
+
+
+def _next_message(ttclient: sdk.TeamTalk, timeout: int) -> sdk.TTMessage:
+    # Instances with an event reader thread hand us the messages it reads.
+    next_message = getattr(ttclient, "_next_message", None)
+    if next_message is None:
+        return ttclient.getMessage(timeout)
+    return cast("sdk.TTMessage", next_message(timeout))
+
+
+def _skip(ttclient: sdk.TeamTalk, msg: sdk.TTMessage) -> None:
+    # Messages read while polling that we are not waiting for still have to
+    # reach the instance: its event pump if one runs, or its state mirror.
+    skip = getattr(ttclient, "_skip_message", None)
+    if skip is not None:
+        skip(msg)
+
+
 def _wait_for_event(
     ttclient: sdk.TeamTalk,
     event: sdk.ClientEvent | list[sdk.ClientEvent],
     timeout: int = DEF_WAIT,
+) -> tuple[bool, sdk.TTMessage]:
+    with _exclusive_messages(ttclient):
+        return _poll_for_event(ttclient, event, timeout)
+
+
+def _poll_for_event(
+    ttclient: sdk.TeamTalk,
+    event: sdk.ClientEvent | list[sdk.ClientEvent],
+    timeout: int,
 ) -> tuple[bool, sdk.TTMessage]:
     events = event if isinstance(event, list) else [event]
-    msg = ttclient.getMessage(timeout)
+    msg = _next_message(ttclient, timeout)
     end = timestamp() + timeout
     while msg.nClientEvent not in events:
+        _skip(ttclient, msg)
         if timestamp() >= end:
             return False, cast("Any", sdk.TTMessage())
-        msg = ttclient.getMessage(timeout)
+        msg = _next_message(ttclient, timeout)
 
     return True, msg
 
@@ -42,79 +84,212 @@ def _wait_for_cmd_success(
         )
         if result and msg.nSource == cmdid:
             return result, msg
+        if result:
+            _skip(ttclient, msg)
 
     return False, cast("Any", sdk.TTMessage())
 
 
 def _wait_for_cmd(
     ttclient: sdk.TeamTalk, cmdid: int, timeout: int
+) -> tuple[bool, sdk.TTMessage | sdk.ClientErrorMsg]:
+    with _exclusive_messages(ttclient):
+        return _poll_for_cmd(ttclient, cmdid, timeout)
+
+
+def _poll_for_cmd(
+    ttclient: sdk.TeamTalk, cmdid: int, timeout: int
 ) -> tuple[bool, sdk.TTMessage | sdk.ClientErrorMsg]:
     end = timestamp() + timeout
     while True:
-        msg = ttclient.getMessage()
-        if msg.nClientEvent == sdk.ClientEvent.CLIENTEVENT_CMD_ERROR:
-            if msg.nSource == cmdid:
+        msg = _next_message(ttclient, max(end - timestamp(), 0))
+        if msg.nSource == cmdid:
+            if msg.nClientEvent == sdk.ClientEvent.CLIENTEVENT_CMD_ERROR:
                 return False, msg.clienterrormsg
-        elif (
-            msg.nClientEvent == sdk.ClientEvent.CLIENTEVENT_CMD_SUCCESS
-            and msg.nSource == cmdid
-        ):
-            return True, msg
+            if msg.nClientEvent == sdk.ClientEvent.CLIENTEVENT_CMD_SUCCESS:
+                return True, msg
+        _skip(ttclient, msg)
         if timestamp() >= end:
             return False, sdk.TTMessage()
 
 
+async def _async_wait_for_cmd(
+    teamtalk: "TeamTalkInstance",
+    cmdid: int,
+    timeout: int,  # noqa: ASYNC109 - milliseconds, like the synchronous _wait_for_cmd
+) -> tuple[bool, sdk.TTMessage | sdk.ClientErrorMsg]:
+    """Wait for the server to answer a command without blocking the event loop.
+
+    The future is resolved by the instance's event pump when it sees the
+    CLIENTEVENT_CMD_SUCCESS or CLIENTEVENT_CMD_ERROR message for `cmdid`, so
+    other events keep flowing while we wait.
+
+    Args:
+        teamtalk: The instance the command was sent on.
+        cmdid: The command ID returned by the SDK.
+        timeout: The time to wait in milliseconds.
+
+    Returns:
+        A (success, message) tuple. On failure the message is the
+        sdk.ClientErrorMsg sent by the server.
+
+    Raises:
+        TimeoutError: If the server did not answer within `timeout`.
+        RuntimeError: If called from an inline handler.
+
+    """
+    _check_not_inline("A command")
+    future = teamtalk._expect_command(cmdid)
+    try:
+        async with asyncio.timeout(timeout / 1000):
+            reply: tuple[bool, sdk.TTMessage | sdk.ClientErrorMsg] = await future
+        return reply
+    finally:
+        teamtalk._pending_commands.pop(cmdid, None)
+
+
+async def _async_wait_for_event(
+    teamtalk: "TeamTalkInstance",
+    event: sdk.ClientEvent | list[sdk.ClientEvent],
+    timeout: int = DEF_WAIT,  # noqa: ASYNC109 - milliseconds, like _wait_for_event
+) -> sdk.TTMessage:
+    """Wait for one of the given client events without blocking the event loop.
+
+    Args:
+        teamtalk: The instance to wait on.
+        event: The event or events to wait for.
+        timeout: The time to wait in milliseconds.
+
+    Returns:
+        The first matching message seen by the event pump.
+
+    Raises:
+        TimeoutError: If none of the events arrived within `timeout`.
+        RuntimeError: If called from an inline handler.
+
+    """
+    _check_not_inline("A client event")
+    events = event if isinstance(event, list) else [event]
+    future = teamtalk._expect_events(events)
+    try:
+        async with asyncio.timeout(timeout / 1000):
+            return await future
+    finally:
+        teamtalk._forget_event_waiter(events, future)
+
+
 def _get_abs_time_diff(t1: float, t2: float) -> int:
     t1 = int(round(t1 * 1000))
     t2 = int(round(t2 * 1000))
     return abs(t1 - t2)
 
 
-def _get_explicit_attribute(obj: object, attr: str) -> object | None:
-    field_candidates = {
-        "id": ("nChannelID", "nDeviceID", "nUserID"),
-        "name": ("szName", "szDeviceName"),
-        "type": ("szDeviceType",),
-        "max_input_channels": ("nMaxInputChannels",),
-        "max_output_channels": ("nMaxOutputChannels",),
-        "sound_system": ("nSoundSystem",),
-    }
+_EXPLICIT_FIELDS: dict[str, tuple[str, ...]] = {
+    "id": ("nChannelID", "nDeviceID", "nUserID"),
+    "user_id": ("nUserID",),
+    "name": ("szName", "szDeviceName"),
+    "type": ("szDeviceType",),
+    "max_input_channels": ("nMaxInputChannels",),
+    "max_output_channels": ("nMaxOutputChannels",),
+    "sound_system": ("nSoundSystem",),
+}
+_FIELD_PREFIXES = ("n", "sz", "b", "u")
 
-    candidates = field_candidates.get(attr)
-    if candidates:
-        for field in candidates:
-            if hasattr(obj, field):
-                return cast("object", getattr(obj, field))
 
-    return None
+class _FieldProbe(ctypes.Structure):
+    _fields_ = [("value", ctypes.c_int)]
 
 
-def _get_tt_obj_attribute(obj: object, attr: str) -> object:
-    # Direct mappings for common Pythonic names to SDK names
-    explicit_val = _get_explicit_attribute(obj, attr)
-    if explicit_val is not None:
-        return explicit_val
+_CFIELD_TYPE = type(_FieldProbe.value)
+
+# Per ctypes type: Pythonic name -> field name, or None if there is no such field.
+_field_getters: dict[type, dict[str, str | None]] = {}
+_field_setters: dict[type, dict[str, str | None]] = {}
+_class_attribute_names: dict[type, frozenset[str]] = {}
 
-    # General logic for other attributes
+
+def _class_attributes(cls: type[Any]) -> frozenset[str]:
+    # Names defined on the class itself, bypassing any metaclass __dir__.
+    # Cached in a table rather than functools.cache: the wrapper classes
+    # define __eq__, so type checkers do not see their types as hashable.
+    try:
+        return _class_attribute_names[cls]
+    except KeyError:
+        names = frozenset(name for klass in cls.__mro__ for name in vars(klass))
+        _class_attribute_names[cls] = names
+        return names
+
+
+@functools.cache
+def _struct_fields(struct_type: type) -> frozenset[str]:
+    return frozenset(
+        name
+        for name in dir(struct_type)
+        if isinstance(getattr(struct_type, name, None), _CFIELD_TYPE)
+    )
+
+
+def _getter_candidates(attr: str) -> list[str]:
     # Convert Pythonic 'attr' to SDK-style 'Name' (e.g., 'max_users' -> 'MaxUsers')
-    sdk_name_parts = [part.capitalize() for part in attr.split("_")]
-    sdk_name = "".join(sdk_name_parts)
+    sdk_name = "".join(part.capitalize() for part in attr.split("_"))
+    candidates = [*_EXPLICIT_FIELDS.get(attr, ())]
+    candidates += [f"{prefix}{sdk_name}" for prefix in _FIELD_PREFIXES]
+    # Try without prefix, then with a lowercase first letter (e.g., 'payload')
+    candidates.append(sdk_name)
+    if sdk_name:
+        candidates.append(f"{sdk_name[0].lower()}{sdk_name[1:]}")
+    return candidates
+
+
+def _setter_names(attr: str) -> list[str]:
+    # Convert Pythonic 'attr' to SDK-style names (e.g., 'user_id' -> 'nUserID')
+    name = "".join(
+        "ID" if part.lower() == "id" else part.capitalize() for part in attr.split("_")
+    )
+    names = [f"{prefix}{name}" for prefix in _FIELD_PREFIXES]
+    if name:
+        names.append(f"{name[0].lower()}{name[1:]}")
+    return names
+
+
+def _setter_candidates(attr: str) -> list[str]:
+    return _setter_names(attr) + _getter_candidates(attr)
 
-    # Try common prefixes
-    prefixes = ["n", "sz", "b", "u"]
-    for prefix in prefixes:
-        full_sdk_attr = f"{prefix}{sdk_name}"
-        if hasattr(obj, full_sdk_attr):
-            return getattr(obj, full_sdk_attr)
 
-    # Try without prefix (e.g., 'payload')
-    if hasattr(obj, sdk_name):
-        return getattr(obj, sdk_name)
+def _is_struct(obj: object) -> bool:
+    # Checks the real type, as mocks with a spec pass isinstance checks.
+    return issubclass(type(obj), (ctypes.Structure, ctypes.Union))
 
-    # Try lowercase first letter (e.g., 'payload' -> 'payload')
-    if sdk_name and hasattr(obj, f"{sdk_name[0].lower()}{sdk_name[1:]}"):
-        return getattr(obj, f"{sdk_name[0].lower()}{sdk_name[1:]}")
 
+def _resolve_field(struct_type: type, candidates: list[str]) -> str | None:
+    fields = _struct_fields(struct_type)
+    for candidate in candidates:
+        if candidate in fields:
+            return candidate
+    return None
+
+
+def _get_tt_obj_attribute(obj: object, attr: str) -> object:
+    table = _field_getters.get(type(obj))
+    if table is None:
+        if not _is_struct(obj):
+            return _probe_tt_obj_attribute(obj, attr)
+        table = _field_getters[type(obj)] = {}
+    try:
+        field = table[attr]
+    except KeyError:
+        field = table[attr] = _resolve_field(type(obj), _getter_candidates(attr))
+    if field is None:
+        raise AttributeError(f"Could not find attribute {attr} in {obj}")
+    return getattr(obj, field)
+
+
+def _probe_tt_obj_attribute(obj: object, attr: str) -> object:
+    # Objects that are not ctypes structs may grow attributes at any time, so
+    # they are probed every time instead of going through the field tables.
+    for candidate in _getter_candidates(attr):
+        if hasattr(obj, candidate):
+            return getattr(obj, candidate)
     raise AttributeError(f"Could not find attribute {attr} in {obj}")
 
 
@@ -179,38 +354,34 @@ def ref_volume_to_percent(volume: int) -> int:
 
 
 def _set_tt_obj_attribute(obj: object, attr: str, value: object) -> None:
-    name = ""
-    for name_part in attr.split("_"):
-        if name_part.lower() == "id":
-            name += "ID"
-        else:
-            name += name_part.capitalize()
-    try:
-        setattr(obj, f"n{name}", value)
-        return
-    except AttributeError:
-        pass
-    try:
-        setattr(obj, f"sz{name}", value)
-        return
-    except AttributeError:
-        pass
-    try:
-        setattr(obj, f"b{name}", value)
-        return
-    except AttributeError:
-        pass
-    try:
-        setattr(obj, f"u{name}", value)
-        return
-    except AttributeError:
-        pass
+    if _is_struct(obj):
+        _set_struct_attribute(obj, attr, value)
+    else:
+        _probe_set_tt_obj_attribute(obj, attr, value)
+
+
+def _set_struct_attribute(obj: object, attr: str, value: object) -> None:
+    table = _field_setters.setdefault(type(obj), {})
     try:
-        setattr(obj, f"{name[0].lower()}{name[1:]}", value)
+        field = table[attr]
+    except KeyError:
+        field = table[attr] = _resolve_field(type(obj), _setter_candidates(attr))
+    if field is None:
+        raise AttributeError(f"Could not set attribute {attr} in {obj}")
+    if isinstance(value, str) and isinstance(getattr(obj, field), (bytes, str)):
+        value = sdk.ttstr(value)  # type: ignore [arg-type]
+    setattr(obj, field, value)
+
+
+def _probe_set_tt_obj_attribute(obj: object, attr: str, value: object) -> None:
+    # Objects that are not ctypes structs take the first name they accept.
+    for name in _setter_names(attr):
+        try:
+            setattr(obj, name, value)
+        except AttributeError:
+            continue
         return
-    except AttributeError:
-        pass
-    raise AttributeError(f"Could not set attribute {name} in {obj}")
+    raise AttributeError(f"Could not set attribute {attr} in {obj}")
 
 
 def _tt_attr_to_py_attr(attr: str) -> str:
@@ -32,13 +32,18 @@ Example:
 import ctypes
 from typing import TYPE_CHECKING, Any
 
-from ._utils import _get_tt_obj_attribute
+from ._utils import _class_attributes, _get_tt_obj_attribute
 from .implementation.TeamTalkPy import TeamTalk5 as sdk
 
 if TYPE_CHECKING:
+    import numpy as np
+
+    from .dsp import AudioProcessor
     from .instance import TeamTalkInstance
     from .user import User as TeamTalkUser
 
+AudioBuffer = ctypes.Array[ctypes.c_char]
+
 _AcquireUserAudioBlock = sdk.function_factory(
     sdk.dll.TT_AcquireUserAudioBlock,
     [sdk.POINTER(sdk.AudioBlock), [sdk._TTInstance, sdk.StreamType, sdk.INT32]],  # type: ignore [attr-defined]
@@ -49,9 +54,76 @@ _ReleaseUserAudioBlock = sdk.function_factory(
 )
 
 
+class AudioBufferPool:
+    """A pool of reusable buffers for the samples of audio blocks.
+
+    Audio blocks of one stream almost always have the same size, so buffers
+    are kept per size and handed out again once the block they were used for
+    has been handled. This avoids allocating a new buffer for every block.
+    The buffers are ctypes char arrays, so the samples are copied with a
+    single ``memmove`` and expose the buffer protocol.
+
+    Attributes:
+        max_buffers: The most free buffers kept per size.
+        allocated: The number of buffers created so far.
+        reused: The number of times a free buffer was handed out again.
+
+    """
+
+    def __init__(self, max_buffers: int = 64) -> None:
+        """Initialize an empty pool.
+
+        Args:
+            max_buffers: The most free buffers kept per size. Defaults to 64.
+
+        """
+        self.max_buffers = max_buffers
+        self.allocated = 0
+        self.reused = 0
+        self._free: dict[int, list[AudioBuffer]] = {}
+
+    def copy_from(self, address: int, size: int) -> "AudioBuffer":
+        """Copy `size` bytes at `address` into a buffer from the pool.
+
+        Args:
+            address: The address of the data.
+            size: The number of bytes to copy.
+
+        Returns:
+            The buffer holding the copy.
+
+        """
+        free = self._free.get(size)
+        if free:
+            buffer = free.pop()
+            self.reused += 1
+        else:
+            buffer = (ctypes.c_char * size)()
+            self.allocated += 1
+        if size:
+            ctypes.memmove(buffer, address, size)
+        return buffer
+
+    def release(self, buffer: "AudioBuffer") -> None:
+        """Give a buffer back to the pool.
+
+        Args:
+            buffer: A buffer returned by `copy_from` that is no longer used.
+
+        """
+        free = self._free.setdefault(len(buffer), [])
+        if len(free) < self.max_buffers:
+            free.append(buffer)
+
+
 class AudioBlock:
     """Represents an audio block for the on_user_audio event.
 
+    The samples are copied out of the SDK into a pooled buffer before the
+    SDK's block is released. `buffer` and `array` give access to that buffer
+    without another copy, but only until the handler returns: afterwards the
+    buffer is reused for a later block. Use `data` to keep the samples.
+
     Attributes:
         user: The user that the audio is from.
         id: The stream ID of the audio block.
@@ -62,35 +134,117 @@ class AudioBlock:
 
     """
 
-    def __init__(self, user: "TeamTalkUser | None", block: sdk.AudioBlock) -> None:
+    def __init__(
+        self,
+        user: "TeamTalkUser | None",
+        block: sdk.AudioBlock,
+        buffer: "AudioBuffer | None" = None,
+        pool: AudioBufferPool | None = None,
+    ) -> None:
         """Represent an audio block for the on_user_audio event.
 
         Args:
             user: The user that the audio is from.
             block: The underlying AudioBlock object.
+            buffer: The samples, copied while the SDK block was acquired.
+            pool: The pool to give `buffer` back to once the block is handled.
 
         """
         self._user = user
         self._block = block
         self.id = block.nStreamID
         self.data_pointer = block.lpRawAudio
-        self._data = b""
+        self._buffer = buffer
+        self._pool = pool
+        self._refs = 1
+        self._data: bytes | None = None
 
     @property
     def data(self) -> bytes:
         """The audio data.
 
         Returns:
-            The audio data.
+            A copy of the 16-bit PCM samples that stays valid after the
+            handler returns.
 
         """
         if self._data is None:
-            total_samples = self._block.nSamples * self._block.nChannels
-            buffer_type = ctypes.c_short * total_samples
-            buffer_ptr = ctypes.cast(self.data_pointer, ctypes.POINTER(buffer_type))
-            self._data = bytes(buffer_ptr.contents)
+            self._data = bytes(self.buffer)
         return self._data
 
+    @property
+    def buffer(self) -> memoryview:
+        """The 16-bit PCM samples, without copying them.
+
+        The view is only valid until the handler returns.
+
+        Returns:
+            A memoryview of interleaved signed 16-bit samples.
+
+        Raises:
+            ValueError: If the buffer has already been reused.
+
+        """
+        if self._buffer is None:
+            if self._data is not None:
+                return memoryview(self._data).cast("h")
+            raise ValueError("The audio block's buffer has already been reused")
+        return memoryview(self._buffer).cast("B").cast("h")
+
+    def array(self) -> "np.ndarray[Any, np.dtype[np.int16]]":
+        """Get the samples as a NumPy array, without copying them.
+
+        The array is only valid until the handler returns. Call ``.copy()`` on
+        it to keep the samples.
+
+        Returns:
+            A 1-D int16 array of interleaved samples.
+
+        Raises:
+            ImportError: If NumPy is not installed.
+
+        """
+        try:
+            import numpy as np  # noqa: PLC0415
+        except ImportError as exc:
+            raise ImportError(
+                "AudioBlock.array requires numpy, install py-talk-ex[numpy]"
+            ) from exc
+        return np.frombuffer(self.buffer, dtype=np.int16)
+
+    def process(
+        self, processor: "AudioProcessor"
+    ) -> "np.ndarray[Any, np.dtype[np.int16]]":
+        """Run the samples through an audio processor.
+
+        Use one processor per user, as it carries the state of the stream
+        from block to block.
+
+        Args:
+            processor: The processor of the stream this block belongs to.
+
+        Returns:
+            A new 1-D int16 array of the processed samples, which stays valid
+            after the handler returns.
+
+        """
+        return processor.process(self.buffer, self.sample_rate, self.channels)
+
+    def _retain(self) -> None:
+        self._refs += 1
+
+    def _release(self) -> None:
+        self._refs -= 1
+        if self._refs or self._buffer is None:
+            return
+        if self._pool is not None:
+            self._pool.release(self._buffer)
+            self._buffer = None
+
+    def _pin(self) -> None:
+        """Keep the buffer for good, e.g. when handed out by wait_for."""
+        self._pool = None
+
     @property
     def user(self) -> "TeamTalkUser | None":
         """The user that the audio is from."""
@@ -110,8 +264,8 @@ class AudioBlock:
                 This is the default behavior. # noqa
 
         """
-        if name in dir(self):
-            return self.__dict__[name]
+        if name in _class_attributes(type(self)):
+            return object.__getattribute__(self, name)
         return _get_tt_obj_attribute(self._block, name)
 
 
@@ -130,15 +284,23 @@ class MuxedAudioBlock(AudioBlock):
 
     """
 
-    def __init__(self, teamtalk: "TeamTalkInstance", block: sdk.AudioBlock) -> None:
+    def __init__(
+        self,
+        teamtalk: "TeamTalkInstance",
+        block: sdk.AudioBlock,
+        buffer: "AudioBuffer | None" = None,
+        pool: AudioBufferPool | None = None,
+    ) -> None:
         """Represent an audio block for the on_muxed_audio event.
 
         Args:
             teamtalk: The TeamTalkInstance this block belongs to.
             block: The underlying AudioBlock object.
+            buffer: The samples, copied while the SDK block was acquired.
+            pool: The pool to give `buffer` back to once the block is handled.
 
         """
-        super().__init__(None, block)
+        super().__init__(None, block, buffer, pool)
         self.teamtalk = teamtalk
 
     @property
@@ -15,8 +15,11 @@ from typing import Any, Self, TypeVar
 if sys.platform.startswith("linux"):
     import uvloop
 
+from ._listeners import ListenerRegistry
+from .audio import AudioBlock
 from .enums import TeamTalkServerInfo
-from .instance import TeamTalkInstance
+from .instance import MAX_EVENTS_PER_PASS, TeamTalkInstance
+from .scheduling import EventLimit, EventScheduler, EventStats, _check_not_inline
 
 T = TypeVar("T")
 Coro = Coroutine[Any, Any, T]
@@ -34,24 +37,83 @@ class _LoopSentinel:
 _loop: Any = _LoopSentinel()
 _log = logging.getLogger(__name__)
 
+_MIN_IDLE_INTERVAL = 0.001
+# Events whose AudioBlock argument lends its buffer to the handler.
+_AUDIO_EVENTS = frozenset({"on_user_audio", "on_muxed_audio"})
+
 
 class TeamTalkBot:
     """A class that represents a TeamTalk bot."""
 
-    def __init__(self, client_name: str | None = "PyTalk") -> None:
+    def __init__(  # noqa: PLR0913 - the options after client_name are keyword-only
+        self,
+        client_name: str | None = "PyTalk",
+        *,
+        max_idle_interval: float = 0.02,
+        threaded_events: bool = False,
+        event_queue_size: int = 1000,
+        snapshot_events: bool = False,
+        event_limits: dict[str, EventLimit] | None = None,
+        coalesce_window: float | None = None,
+        capture_all_audio: bool = True,
+    ) -> None:
         """Initialize a TeamTalkBot object.
 
         Args:
             client_name (Optional[str]): The name of the client. Defaults to
                 "Teamtalk.py".
+            max_idle_interval (float): The longest time in seconds the event pump
+                sleeps when every server is idle. The pump starts parking for
+                1 ms and doubles the delay up to this value while no events
+                arrive. Defaults to 0.02.
+            threaded_events (bool): Whether to read SDK events in a dedicated
+                thread per server instead of polling them from the event loop.
+                The loop then sleeps until an event actually arrives. Defaults
+                to False.
+            event_queue_size (int): The maximum number of events per server that
+                may wait to be processed when `threaded_events` is enabled.
+                Defaults to 1000.
+            snapshot_events (bool): Whether user, channel, message, audio and
+                file transfer events receive read-only objects from
+                `pytalk.snapshot` instead of the regular wrappers. Snapshots
+                copy the event data once and hold no SDK structs, which keeps
+                memory use low when events are queued or stored. Defaults to
+                False.
+            event_limits (Optional[dict[str, EventLimit]]): Concurrency and
+                queue limits for the handlers of individual events, keyed by
+                event name, see `set_event_limit`. Events without a limit start
+                a task per dispatch. Defaults to None.
+            coalesce_window (Optional[float]): If set, ``on_user_update`` and
+                ``on_channel_update`` are delivered at most once per user or
+                channel in this many seconds, with the latest state and a
+                ``coalesced`` keyword argument holding the number of updates
+                that were skipped. Handlers must then accept that argument.
+                Defaults to None, delivering every update.
+            capture_all_audio (bool): Whether the audio of every user who
+                talks is received while an ``on_user_audio`` or
+                ``on_muxed_audio`` handler exists. Set it to False to receive
+                only the users, channels and muxed stream requested with
+                `TeamTalkInstance.capture_audio` or `open_audio_stream`.
+                Defaults to True.
 
         """
         self.client_name = client_name
+        self.max_idle_interval = max_idle_interval
+        self.threaded_events = threaded_events
+        self.event_queue_size = event_queue_size
+        self.snapshot_events = snapshot_events
+        self.coalesce_window = coalesce_window
+        self.capture_all_audio = capture_all_audio
+        self._event_queue: asyncio.Queue[tuple[TeamTalkInstance, Any]] | None = None
         self.loop: asyncio.AbstractEventLoop = _loop
         self.teamtalks: list[TeamTalkInstance] = []
-        self._listeners: dict[
-            str, list[tuple[asyncio.Future[Any], Callable[..., bool]]]
-        ] = {}
+        self._pumping = False
+        self._listeners = ListenerRegistry()
+        self._scheduler = EventScheduler(
+            self._run_event, lambda: self.loop, self._discard_event
+        )
+        for event, limit in (event_limits or {}).items():
+            self.set_event_limit(event, limit)
 
     async def add_server(
         self,
@@ -79,6 +141,11 @@ class TeamTalkBot:
             server = TeamTalkServerInfo.from_dict(server)
         _log.debug("Adding server: %s, %s", self, server)
         tt = TeamTalkInstance(self, server, reconnect, backoff_config)
+        # Add the instance first so a running event pump can deliver the
+        # connect and login replies instead of a worker thread polling for them.
+        self.teamtalks.append(tt)
+        if self._event_queue is not None:
+            tt._start_event_reader(self.loop, self._event_queue, self.event_queue_size)
         successful_initial_connection = await tt.initial_connect_loop()
         if not successful_initial_connection:
             _log.error(
@@ -88,7 +155,6 @@ class TeamTalkBot:
                 server.host,
                 server.tcp_port,
             )
-        self.teamtalks.append(tt)
 
     async def add_servers(
         self,
@@ -155,6 +221,7 @@ class TeamTalkBot:
 
         """
         for teamtalk in self.teamtalks:
+            teamtalk._stop_event_reader()
             teamtalk.disconnect()
             teamtalk.closeTeamTalk()
 
@@ -211,6 +278,13 @@ class TeamTalkBot:
         except Exception:  # noqa: BLE001
             with contextlib.suppress(asyncio.CancelledError):
                 await self.on_error(event_name, *args, **kwargs)
+        finally:
+            if event_name in _AUDIO_EVENTS and isinstance(args[0], AudioBlock):
+                args[0]._release()
+
+    def _discard_event(self, event_name: str, args: tuple[Any, ...]) -> None:
+        if event_name in _AUDIO_EVENTS and isinstance(args[0], AudioBlock):
+            args[0]._release()
 
     def _schedule_event(
         self,
@@ -218,7 +292,13 @@ class TeamTalkBot:
         event_name: str,
         *args: object,
         **kwargs: object,
-    ) -> asyncio.Task[Any]:
+    ) -> asyncio.Task[Any] | None:
+        if event_name in _AUDIO_EVENTS and isinstance(args[0], AudioBlock):
+            args[0]._retain()
+        queue = self._scheduler.get(event_name)
+        if queue is not None:
+            queue.submit((coro, args, kwargs))
+            return None
         wrapped = self._run_event(coro, event_name, *args, **kwargs)
         return self.loop.create_task(wrapped, name=f"teamtalk.py: {event_name}")
 
@@ -245,7 +325,107 @@ class TeamTalkBot:
         """
         _log.exception("Ignoring exception in %s", event_method)
 
-    def dispatch(self, event: str, /, *args: object, **kwargs: object) -> None:  # noqa: C901, PLR0912
+    async def wait_for(  # noqa: PLR0913 - the IDs are keyword-only filters
+        self,
+        event: str,
+        /,
+        *,
+        check: Callable[..., bool] | None = None,
+        timeout: float | None = None,  # noqa: ASYNC109 - seconds, like asyncio.wait_for
+        user_id: int | None = None,
+        channel_id: int | None = None,
+        cmd_id: int | None = None,
+        transfer_id: int | None = None,
+    ) -> Any:  # noqa: ANN401
+        """|coro| .
+
+        Wait for the next dispatch of an event.
+
+        Waiters are indexed by the IDs passed in, so a bot can keep hundreds
+        of them parked, e.g. one dialog per user, without slowing down the
+        dispatch of unrelated events. Prefer these filters over doing the same
+        comparison in `check`.
+
+        Example:
+        -------
+
+        .. code-block:: python3
+
+            @bot.event
+            async def on_message(message):
+                if message.content == "!name":
+                    message.reply("What is your name?")
+                    answer = await bot.wait_for(
+                        "message", user_id=message.from_id, timeout=60
+                    )
+
+        Args:
+            event (str): The name of the event, without the ``on_`` prefix.
+            check (Optional[Callable[..., bool]]): A predicate called with the
+                event's arguments. The wait ends when it returns True. If it
+                raises, the exception is propagated to the waiter.
+            timeout (Optional[float]): Seconds to wait before giving up.
+                Defaults to waiting forever.
+            user_id (Optional[int]): Only match events about this user, e.g.
+                the sender of a message or the user joining a channel.
+            channel_id (Optional[int]): Only match events about this channel.
+            cmd_id (Optional[int]): Only match the ``command_success`` or
+                ``command_error`` event of this command.
+            transfer_id (Optional[int]): Only match the
+                ``file_transfer_progress`` events of this transfer.
+
+        Returns:
+            The event's argument, a tuple of its arguments if it has several,
+            or None if it has none.
+
+        Raises:
+            ValueError: If the event does not carry one of the given IDs.
+            TimeoutError: If the timeout expired.
+            RuntimeError: If called from an inline handler, see
+                `pytalk.scheduling.EventLimit`.
+
+        """
+        _check_not_inline("wait_for")
+        future: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+        self._listeners.add(
+            event,
+            future,
+            check,
+            cmd_id=cmd_id,
+            transfer_id=transfer_id,
+            user_id=user_id,
+            channel_id=channel_id,
+        )
+        return await asyncio.wait_for(future, timeout)
+
+    def set_event_limit(self, event: str, limit: EventLimit | None) -> None:
+        """Limit how the handlers of an event are scheduled.
+
+        Without a limit, every dispatch starts a new task for the handler. With
+        one, at most `limit.concurrency` handlers run at once, up to
+        `limit.queue_size` events wait for a slot, and `limit.overflow` decides
+        what happens to the rest. See :mod:`pytalk.scheduling`.
+
+        Args:
+            event (str): The name of the event, without the ``on_`` prefix.
+            limit (Optional[EventLimit]): The limit, or None to remove it.
+
+        """
+        self._scheduler.set_limit("on_" + event, limit)
+
+    def event_stats(self) -> dict[str, EventStats]:
+        """Get the queue metrics of the events that have a limit.
+
+        Returns:
+            dict[str, EventStats]: The metrics, keyed by event name.
+
+        """
+        return {
+            method.removeprefix("on_"): stats
+            for method, stats in self._scheduler.stats().items()
+        }
+
+    def dispatch(self, event: str, /, *args: object, **kwargs: object) -> None:
         """Dispatch an event to all listeners. This is called internally.
 
         Args:
@@ -257,34 +437,10 @@ class TeamTalkBot:
         _log.debug("Dispatching event %s", event)
         method = "on_" + event
 
-        listeners = self._listeners.get(event)
-        if listeners:
-            removed = []
-            for i, (future, condition) in enumerate(listeners):
-                if future.cancelled():
-                    removed.append(i)
-                    continue
-
-                try:
-                    result = condition(*args)
-                except Exception as exc:  # noqa: BLE001
-                    future.set_exception(exc)
-                    removed.append(i)
-                else:
-                    if result:
-                        if len(args) == 0:
-                            future.set_result(None)
-                        elif len(args) == 1:
-                            future.set_result(args[0])
-                        else:
-                            future.set_result(args)
-                        removed.append(i)
-
-            if len(removed) == len(listeners):
-                self._listeners.pop(event)
-            else:
-                for idx in reversed(removed):
-                    del listeners[idx]
+        if event in self._listeners:
+            if method in _AUDIO_EVENTS and isinstance(args[0], AudioBlock):
+                args[0]._pin()
+            self._listeners.resolve(event, args)
 
         try:
             coro = getattr(self, method)
@@ -294,18 +450,64 @@ class TeamTalkBot:
             self._schedule_event(coro, method, *args, **kwargs)
 
     async def _start(self) -> None:
+        self._pumping = True
         self.dispatch("ready")
         try:
-            while True:
-                for teamtalk in self.teamtalks:
-                    await teamtalk._process_events()
-                await asyncio.sleep(0.001)
+            if self.threaded_events:
+                await self._pump_queued_events()
+            else:
+                await self._poll_events()
         except KeyboardInterrupt:
             for teamtalk in self.teamtalks:
                 teamtalk.doLogout()
                 self.dispatch("my_logout", teamtalk.server)
                 teamtalk.disconnect()
                 self.dispatch("my_disconnect", teamtalk.server)
+        finally:
+            self._pumping = False
+
+    async def _poll_events(self) -> None:
+        idle_delay = _MIN_IDLE_INTERVAL
+        while True:
+            processed = 0
+            for teamtalk in self.teamtalks:
+                processed += await teamtalk._process_events(
+                    stop=self._scheduler.is_blocked
+                )
+                if self._scheduler.needs_pump:
+                    await self._scheduler.drain()
+            if processed:
+                idle_delay = _MIN_IDLE_INTERVAL
+                await asyncio.sleep(0)
+                continue
+            await asyncio.sleep(idle_delay)
+            idle_delay = min(idle_delay * 2, self.max_idle_interval)
+
+    async def _pump_queued_events(self) -> None:
+        queue: asyncio.Queue[tuple[TeamTalkInstance, Any]] = asyncio.Queue()
+        self._event_queue = queue
+        for teamtalk in self.teamtalks:
+            teamtalk._start_event_reader(self.loop, queue, self.event_queue_size)
+        try:
+            while True:
+                teamtalk, msg = await queue.get()
+                teamtalk._process_queued_message(msg)
+                for _ in range(MAX_EVENTS_PER_PASS - 1):
+                    if self._scheduler.is_blocked():
+                        break
+                    try:
+                        teamtalk, msg = queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        break
+                    teamtalk._process_queued_message(msg)
+                if self._scheduler.needs_pump:
+                    await self._scheduler.drain()
+                # Let the scheduled handlers run before taking the next batch.
+                await asyncio.sleep(0)
+        finally:
+            self._event_queue = None
+            for teamtalk in self.teamtalks:
+                teamtalk._stop_event_reader()
 
     async def _do_after_delay(self, delay: float, func: Callable[..., Any]) -> None:  # noqa: ARG002
         await asyncio.sleep(delay)
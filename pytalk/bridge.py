@@ -0,0 +1,121 @@
+"""Relaying received audio from one server to another.
+
+`TeamTalkInstance.bridge_audio` connects the audio of one user, or the muxed
+stream of the bot's channel, to another instance. Each block is handed to the
+other instance's SDK while it is still acquired on the receiving side:
+there is no event, no task, no `bytes` copy and no queue in between, and the
+receiving SDK copies the samples once as it queues them for sending. The
+bridge itself adds no buffering, so the delay is that of the two SDKs.
+
+Example:
+-------
+
+    .. code-block:: python3
+
+        @bot.event
+        async def on_my_login(server):
+            if server.teamtalk_instance is lobby:
+                bridge = lobby.bridge_audio(relay, muxed=True)
+
+"""
+
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING
+
+from .implementation.TeamTalkPy import TeamTalk5 as sdk
+from .streamer import _allocate_stream_id, _release_stream_id
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from .instance import TeamTalkInstance
+
+
+class AudioBridge:
+    """Sends the audio one instance receives from a user to another instance.
+
+    Attributes:
+        user_id: The ID of the relayed user, or `sdk.TT_MUXED_USERID`.
+        target: The instance the audio is sent from.
+        stream_id: The stream ID the audio is sent with.
+        blocks: The number of blocks relayed.
+        dropped: The number of blocks the target's SDK refused because its
+            queue was full.
+        latency: How many seconds of relayed audio were still queued for
+            sending when the last block was handed over. It grows when blocks
+            arrive in bursts, and is 0 while they arrive in real time.
+        max_latency: The highest `latency` seen.
+
+    """
+
+    def __init__(
+        self,
+        user_id: int,
+        target: TeamTalkInstance,
+        on_close: Callable[[AudioBridge], None] | None = None,
+    ) -> None:
+        """Create a bridge. Use `TeamTalkInstance.bridge_audio`.
+
+        Args:
+            user_id: The ID of the relayed user, or `sdk.TT_MUXED_USERID`.
+            target: The instance to send the audio from.
+            on_close: Called once when the bridge is closed.
+
+        """
+        self.user_id = user_id
+        self.target = target
+        self.stream_id = _allocate_stream_id()
+        self.blocks = 0
+        self.dropped = 0
+        self.latency = 0.0
+        self.max_latency = 0.0
+        self._on_close = on_close
+        self._closed = False
+        # When the audio handed over so far will have been sent.
+        self._queued_until = 0.0
+        self._block = sdk.AudioBlock()
+        self._block.nStreamID = self.stream_id
+        self._block.uStreamTypes = sdk.StreamType.STREAMTYPE_VOICE
+
+    @property
+    def closed(self) -> bool:
+        """Whether the bridge has been closed."""
+        return self._closed
+
+    def close(self) -> None:
+        """Stop relaying and release the capture of the user."""
+        if self._closed:
+            return
+        self._closed = True
+        _release_stream_id(self.stream_id)
+        if self._on_close is not None:
+            self._on_close(self)
+
+    def _feed(self, block: sdk.AudioBlock, size: int) -> None:
+        """Hand an acquired SDK block to the target. Called under the SDK lock."""
+        if self._closed or not size or not block.nSampleRate:
+            return
+        out = self._block
+        out.nSampleRate = block.nSampleRate
+        out.nChannels = block.nChannels
+        out.nSamples = block.nSamples
+        out.lpRawAudio = block.lpRawAudio
+        if not sdk._InsertAudioBlock(self.target._tt, out):
+            self.dropped += 1
+            return
+        self.blocks += 1
+        now = time.monotonic()
+        self.latency = max(self._queued_until - now, 0.0)
+        self.max_latency = max(self.max_latency, self.latency)
+        self._queued_until = max(self._queued_until, now) + (
+            block.nSamples / block.nSampleRate
+        )
+
+    def __repr__(self) -> str:
+        """Return a representation of the bridge."""
+        return (
+            f"<AudioBridge user_id={self.user_id} blocks={self.blocks} "
+            f"dropped={self.dropped} closed={self._closed}>"
+        )
@@ -0,0 +1,161 @@
+"""Reference-counted subscriptions to received audio blocks.
+
+The SDK only copies a user's audio into an audio block when the block event is
+enabled for that user. `TeamTalkInstance.capture_audio` enables it for one user,
+for every user of one channel, or for the muxed stream only, and returns an
+`AudioCapture` that disables it again once every consumer of that target has
+released its capture.
+
+Example:
+-------
+
+    .. code-block:: python3
+
+        bot = pytalk.TeamTalkBot(capture_all_audio=False)
+
+        @bot.event
+        async def on_my_login(server):
+            teamtalk = server.teamtalk_instance
+            teamtalk.capture_audio(user=teamtalk.get_user(5))
+
+        @bot.event
+        async def on_user_audio(block):
+            ...  # only ever called for user 5
+
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from types import TracebackType
+
+
+class CaptureRegistry:
+    """Counts the consumers of each user, channel and the muxed stream.
+
+    Attributes:
+        users: The number of captures per user ID.
+        channels: The number of captures per channel ID.
+        muxed: The number of captures of the muxed stream.
+
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty registry."""
+        self.users: Counter[int] = Counter()
+        self.channels: Counter[int] = Counter()
+        self.muxed = 0
+
+    def __bool__(self) -> bool:
+        """Whether any capture is held."""
+        return bool(self.users or self.channels or self.muxed)
+
+    def add(self, user_id: int | None, channel_id: int | None, muxed: bool) -> None:
+        """Count a capture of the given target."""
+        if user_id is not None:
+            self.users[user_id] += 1
+        if channel_id is not None:
+            self.channels[channel_id] += 1
+        if muxed:
+            self.muxed += 1
+
+    def remove(self, user_id: int | None, channel_id: int | None, muxed: bool) -> None:
+        """Forget a capture of the given target."""
+        if user_id is not None:
+            self.users[user_id] -= 1
+            if self.users[user_id] <= 0:
+                del self.users[user_id]
+        if channel_id is not None:
+            self.channels[channel_id] -= 1
+            if self.channels[channel_id] <= 0:
+                del self.channels[channel_id]
+        if muxed:
+            self.muxed = max(self.muxed - 1, 0)
+
+    def wants(self, user_id: int, channel_id: int) -> bool:
+        """Check if the audio of a user in a channel is captured.
+
+        Args:
+            user_id: The ID of the user.
+            channel_id: The ID of the channel the user is in, or 0.
+
+        Returns:
+            bool: True if the user or their channel is captured.
+
+        """
+        return user_id in self.users or (
+            channel_id != 0 and channel_id in self.channels
+        )
+
+
+class AudioCapture:
+    """A held subscription to the audio blocks of a user, channel or the mix.
+
+    Release it with `release`, or use it as a context manager. Releasing twice
+    has no effect.
+
+    Attributes:
+        user_id: The ID of the captured user, or None.
+        channel_id: The ID of the captured channel, or None.
+        muxed: Whether the muxed stream is captured.
+
+    """
+
+    def __init__(
+        self,
+        user_id: int | None,
+        channel_id: int | None,
+        muxed: bool,
+        on_release: Callable[[AudioCapture], None],
+    ) -> None:
+        """Create a capture. Use `TeamTalkInstance.capture_audio`.
+
+        Args:
+            user_id: The ID of the captured user, or None.
+            channel_id: The ID of the captured channel, or None.
+            muxed: Whether the muxed stream is captured.
+            on_release: Called once when the capture is released.
+
+        """
+        self.user_id = user_id
+        self.channel_id = channel_id
+        self.muxed = muxed
+        self._on_release: Callable[[AudioCapture], None] | None = on_release
+
+    @property
+    def released(self) -> bool:
+        """Whether the capture has been released."""
+        return self._on_release is None
+
+    def release(self) -> None:
+        """Give up the capture."""
+        on_release, self._on_release = self._on_release, None
+        if on_release is not None:
+            on_release(self)
+
+    def __enter__(self) -> AudioCapture:
+        """Return the capture itself."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Release the capture."""
+        self.release()
+
+    def __repr__(self) -> str:
+        """Return a representation of the capture."""
+        if self.muxed:
+            target = "muxed"
+        elif self.user_id is not None:
+            target = f"user_id={self.user_id}"
+        else:
+            target = f"channel_id={self.channel_id}"
+        return f"<AudioCapture {target} released={self.released}>"
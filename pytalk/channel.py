@@ -1,8 +1,15 @@
 """Channel module for pytalk."""
 
+from functools import cached_property
 from typing import TYPE_CHECKING, Any, cast
 
-from ._utils import _get_tt_obj_attribute, _set_tt_obj_attribute, _wait_for_cmd
+from ._utils import (
+    _async_wait_for_cmd,
+    _class_attributes,
+    _get_tt_obj_attribute,
+    _set_tt_obj_attribute,
+    _wait_for_cmd,
+)
 from .codec import AudioCodecConfig
 from .exceptions import PytalkPermissionError
 from .implementation.TeamTalkPy import TeamTalk5 as sdk
@@ -31,14 +38,21 @@ class Channel:
         self.teamtalk = teamtalk
         if isinstance(channel, int):
             self.id = channel
-            self._channel, self.path = self.teamtalk._get_channel_info(self.id)
+            self._channel = self.teamtalk._get_channel_struct(self.id)
 
         elif isinstance(channel, sdk.Channel):
             self._channel = channel
             self.id = channel.nChannelID
-            self._channel, self.path = self.teamtalk._get_channel_info(self.id)
         self.server = self.teamtalk.server
-        self._audiocfg = AudioCodecConfig(self._channel.audiocfg)
+
+    @cached_property
+    def path(self) -> str:
+        """The full path of the channel, resolved on first access."""
+        return self.teamtalk._get_channel_path(self.id)
+
+    @cached_property
+    def _audiocfg(self) -> AudioCodecConfig:
+        return AudioCodecConfig(self._channel.audiocfg)
 
     @property
     def audiocfg(self) -> AudioCodecConfig:
@@ -116,6 +130,34 @@ class Channel:
             bool: True if the channel was updated successfully.
 
         """
+        cmd_result, cmd_err = _wait_for_cmd(self.teamtalk, self._send_update(), 2000)
+        if not cmd_result:
+            self._raise_update_error(cmd_err)
+        return True
+
+    async def async_update(self) -> bool:
+        """Update the channel information without blocking the event loop.
+
+        Awaitable variant of :meth:`update`.
+
+        Raises:
+            PytalkPermissionError: If the bot does not have permission
+                to update the channel.
+            ValueError: If the channel could not be updated.
+            TimeoutError: If the server did not answer in time.
+
+        Returns:
+            bool: True if the channel was updated successfully.
+
+        """
+        cmd_result, cmd_err = await _async_wait_for_cmd(
+            self.teamtalk, self._send_update(), 2000
+        )
+        if not cmd_result:
+            self._raise_update_error(cmd_err)
+        return True
+
+    def _send_update(self) -> int:
         if not self.teamtalk.has_permission(
             cast("int", Permission.MODIFY_CHANNELS)
         ) or not sdk._IsChannelOperator(
@@ -124,31 +166,34 @@ class Channel:
             raise PytalkPermissionError(
                 "the bot does not have permission to update the channel."
             )
-        # Ensure changes to audiocfg and videocodec objects are reflected in _channel
-        self._channel.audiocfg = self._audiocfg.payload
+        # Ensure changes to the audiocfg object are reflected in _channel. It
+        # can only have been changed if it was accessed.
+        if "_audiocfg" in self.__dict__:
+            self._channel.audiocfg = self._audiocfg.payload
 
         result = sdk._DoUpdateChannel(self.teamtalk._tt, self._channel)
         if result == -1:
             raise ValueError("Channel could not be updated")
-        cmd_result, cmd_err = _wait_for_cmd(self.teamtalk, result, 2000)
-        if not cmd_result:
-            err_nr = cmd_err.nErrorNo
-            if err_nr == sdk.ClientError.CMDERR_NOT_LOGGEDIN:
-                raise PytalkPermissionError("The bot is not logged in")
-            if err_nr == sdk.ClientError.CMDERR_NOT_AUTHORIZED:
-                raise PytalkPermissionError(
-                    "The bot does not have permission to update channels"
-                )
-            if err_nr == sdk.ClientError.CMDERR_CHANNEL_NOT_FOUND:
-                raise ValueError("Channel could not be found")
-            if err_nr == sdk.ClientError.CMDERR_CHANNEL_ALREADY_EXISTS:
-                raise ValueError("Channel already exists")
-            if err_nr == sdk.ClientError.CMDERR_CHANNEL_HAS_USERS:
-                raise ValueError("Channel has users and can therefore not be updated")
-        return True
+        return cast("int", result)
+
+    def _raise_update_error(self, cmd_err: Any) -> None:  # noqa: ANN401
+        err_nr = cmd_err.nErrorNo
+        if err_nr == sdk.ClientError.CMDERR_NOT_LOGGEDIN:
+            raise PytalkPermissionError("The bot is not logged in")
+        if err_nr == sdk.ClientError.CMDERR_NOT_AUTHORIZED:
+            raise PytalkPermissionError(
+                "The bot does not have permission to update channels"
+            )
+        if err_nr == sdk.ClientError.CMDERR_CHANNEL_NOT_FOUND:
+            raise ValueError("Channel could not be found")
+        if err_nr == sdk.ClientError.CMDERR_CHANNEL_ALREADY_EXISTS:
+            raise ValueError("Channel already exists")
+        if err_nr == sdk.ClientError.CMDERR_CHANNEL_HAS_USERS:
+            raise ValueError("Channel has users and can therefore not be updated")
 
     def _refresh(self) -> None:
         self._channel, self.path = self.teamtalk._get_channel_info(self.id)
+        self.__dict__.pop("_audiocfg", None)
 
     async def send_message(self, content: str, **kwargs: Any) -> None:  # noqa: ANN401
         """Send a message to the channel.
@@ -264,8 +309,8 @@ class Channel:
                 This is the default behavior. # noqa
 
         """
-        if name in dir(self):
-            return self.__dict__[name]
+        if name in _class_attributes(type(self)):
+            return object.__getattribute__(self, name)
         value = _get_tt_obj_attribute(self._channel, name)
         if isinstance(value, (bytes, sdk.TTCHAR, sdk.TTCHAR_P)):
             return sdk.ttstr(cast("sdk.TTCHAR_P", value))
@@ -283,15 +328,12 @@ class Channel:
                 This is the default behavior. # noqa
 
         """
-        if name in dir(self) or name in [
-            "teamtalk",
-            "id",
-            "server",
-            "path",
-            "_channel",
-            "_audiocfg",
-        ]:
-            self.__dict__[name] = value
+        if (
+            name in self.__dict__
+            or name in _class_attributes(type(self))
+            or name in ["teamtalk", "id", "server", "_channel"]
+        ):
+            object.__setattr__(self, name, value)
         else:
             _get_tt_obj_attribute(self._channel, name)
             _set_tt_obj_attribute(self._channel, name, value)
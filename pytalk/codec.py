@@ -2,7 +2,11 @@
 
 from typing import cast
 
-from ._utils import _get_tt_obj_attribute, _set_tt_obj_attribute
+from ._utils import (
+    _class_attributes,
+    _get_tt_obj_attribute,
+    _set_tt_obj_attribute,
+)
 from .implementation.TeamTalkPy import TeamTalk5 as sdk
 
 
@@ -31,8 +35,8 @@ class AudioCodecConfig:
             AttributeError: If the attribute does not exist.
 
         """
-        if name in dir(self):
-            return self.__dict__[name]
+        if name in _class_attributes(type(self)):
+            return object.__getattribute__(self, name)
         value = _get_tt_obj_attribute(self.payload, name)
         if isinstance(value, (bytes, sdk.TTCHAR, sdk.TTCHAR_P)):
             return sdk.ttstr(cast("sdk.TTCHAR_P", value))
@@ -49,8 +53,12 @@ class AudioCodecConfig:
             AttributeError: If the attribute does not exist.
 
         """
-        if name in dir(self) or name == "payload":
-            self.__dict__[name] = value
+        if (
+            name in self.__dict__
+            or name in _class_attributes(type(self))
+            or name == "payload"
+        ):
+            object.__setattr__(self, name, value)
         else:
             _get_tt_obj_attribute(self.payload, name)  # Check if attribute exists
             _set_tt_obj_attribute(self.payload, name, value)
@@ -81,8 +89,8 @@ class VideoCodecConfig:
             AttributeError: If the attribute does not exist.
 
         """
-        if name in dir(self):
-            return self.__dict__[name]
+        if name in _class_attributes(type(self)):
+            return object.__getattribute__(self, name)
         value = _get_tt_obj_attribute(self.payload, name)
         if isinstance(value, (bytes, sdk.TTCHAR, sdk.TTCHAR_P)):
             return sdk.ttstr(cast("sdk.TTCHAR_P", value))
@@ -99,8 +107,12 @@ class VideoCodecConfig:
             AttributeError: If the attribute does not exist.
 
         """
-        if name in dir(self) or name == "payload":
-            self.__dict__[name] = value
+        if (
+            name in self.__dict__
+            or name in _class_attributes(type(self))
+            or name == "payload"
+        ):
+            object.__setattr__(self, name, value)
         else:
             _get_tt_obj_attribute(self.payload, name)  # Check if attribute exists
             _set_tt_obj_attribute(self.payload, name, value)
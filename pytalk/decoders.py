@@ -0,0 +1,359 @@
+"""Decoders that turn a file or an url into PCM for the `Streamer`.
+
+A `Streamer` asks each of its decoders in turn to open a path. The first one
+that recognises the path returns an `AudioSource` the streamer reads 16-bit PCM
+from, at the streamer's sample rate and channel count.
+
+`WaveDecoder` and `PcmDecoder` read in-process, without starting any program,
+as long as the file already has the streamer's format. Everything else goes
+through `FFmpegDecoder`, which runs ffmpeg (and yt-dlp for urls). Whether
+those programs are installed is checked once per process.
+
+Example:
+-------
+
+    .. code-block:: python3
+
+        streamer = pytalk.Streamer.get_streamer_for_channel(channel)
+        # Only play files that need no conversion.
+        streamer.decoders = [pytalk.decoders.WaveDecoder()]
+
+"""
+
+from __future__ import annotations
+
+import functools
+import multiprocessing
+import subprocess
+import wave
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Protocol
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
+
+_SAMPLE_BYTES = 2
+
+
+class AudioSource(Protocol):
+    """Decoded 16-bit PCM, read by the streamer."""
+
+    def readinto(self, buffer: memoryview) -> int:
+        """Read samples into `buffer` and return the byte count, 0 at the end."""
+        ...
+
+    def close(self) -> None:
+        """Release the file or program the samples come from."""
+        ...
+
+
+class Decoder(Protocol):
+    """Opens paths the streamer is asked to play."""
+
+    def open(self, path: str, sample_rate: int, channels: int) -> AudioSource | None:
+        """Open a path for decoding.
+
+        Args:
+            path: The file or url to play.
+            sample_rate: The sample rate the samples must have.
+            channels: The channel count the samples must have.
+
+        Returns:
+            AudioSource | None: The decoded samples, or None if the decoder
+                does not handle the path, so the next decoder is tried.
+
+        Raises:
+            RuntimeError: If the decoder handles the path but cannot play it.
+
+        """
+        ...
+
+
+class _FileSource:
+    """Reads a fixed number of bytes from an open file."""
+
+    def __init__(self, file: IO[bytes], size: int | None) -> None:
+        self._file = file
+        self._remaining = size
+
+    def readinto(self, buffer: memoryview) -> int:
+        if self._remaining is not None:
+            buffer = buffer[: self._remaining]
+        size = self._file.readinto(buffer) or 0  # type: ignore [attr-defined]
+        if self._remaining is not None:
+            self._remaining -= size
+        return size
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def _is_url(path: str) -> bool:
+    return path.startswith("http")
+
+
+class WaveDecoder:
+    """Reads 16-bit PCM WAV files in the streamer's format in-process.
+
+    Files with another sample rate, channel count or sample width are left to
+    the next decoder.
+    """
+
+    def open(self, path: str, sample_rate: int, channels: int) -> AudioSource | None:
+        """Open a WAV file that needs no conversion.
+
+        Args:
+            path: The file to play.
+            sample_rate: The sample rate the samples must have.
+            channels: The channel count the samples must have.
+
+        Returns:
+            AudioSource | None: The samples, or None if the path is not such a
+                file.
+
+        """
+        if _is_url(path) or Path(path).suffix.lower() != ".wav":
+            return None
+        file = Path(path).open("rb")  # noqa: SIM115
+        try:
+            # Parsing the header leaves the file at the start of the samples.
+            reader = wave.open(file, "rb")  # noqa: SIM115
+            if (
+                reader.getsampwidth() != _SAMPLE_BYTES
+                or reader.getframerate() != sample_rate
+                or reader.getnchannels() != channels
+            ):
+                file.close()
+                return None
+        except (EOFError, wave.Error):
+            file.close()
+            return None
+        return _FileSource(file, reader.getnframes() * channels * _SAMPLE_BYTES)
+
+
+class PcmDecoder:
+    """Reads raw ``.pcm`` and ``.raw`` files in-process.
+
+    The samples must already be 16-bit little-endian PCM in the streamer's
+    format, as there is no header to check.
+    """
+
+    extensions = (".pcm", ".raw")
+
+    def open(self, path: str, sample_rate: int, channels: int) -> AudioSource | None:  # noqa: ARG002
+        """Open a raw PCM file.
+
+        Args:
+            path: The file to play.
+            sample_rate: The sample rate of the samples.
+            channels: The channel count of the samples.
+
+        Returns:
+            AudioSource | None: The samples, or None if the path is not a raw
+                PCM file.
+
+        """
+        if _is_url(path) or Path(path).suffix.lower() not in self.extensions:
+            return None
+        return _FileSource(Path(path).open("rb"), None)  # noqa: SIM115
+
+
+@functools.cache
+def _program_available(*command: str) -> bool:
+    try:
+        result = subprocess.run(
+            command,
+            check=False,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+    except FileNotFoundError:
+        return False
+    return result.returncode == 0
+
+
+def ffmpeg_available() -> bool:
+    """Check if ffmpeg is installed. The result is cached for the process."""
+    return _program_available("ffmpeg", "-version")
+
+
+def yt_dlp_available() -> bool:
+    """Check if yt-dlp is installed. The result is cached for the process."""
+    return _program_available("yt-dlp", "--version")
+
+
+def _shutdown(process: subprocess.Popen[bytes]) -> None:
+    process.terminate()
+    try:
+        process.wait(timeout=2)
+    except subprocess.TimeoutExpired:
+        process.kill()
+    finally:
+        if process.stdout:
+            process.stdout.close()
+        if process.stderr:
+            process.stderr.close()
+
+
+class _ProcessSource:
+    """Reads the output of ffmpeg, fed by yt-dlp for urls."""
+
+    def __init__(self, processes: Sequence[subprocess.Popen[bytes]]) -> None:
+        # The process whose output is read comes first.
+        self._processes = processes
+        stdout = processes[0].stdout
+        assert stdout is not None  # noqa: S101
+        self._readinto = stdout.readinto  # type: ignore [attr-defined]
+
+    def readinto(self, buffer: memoryview) -> int:
+        return self._readinto(buffer) or 0
+
+    def close(self) -> None:
+        for process in self._processes:
+            _shutdown(process)
+
+
+class FFmpegDecoder:
+    """Converts any file ffmpeg can read, and urls through yt-dlp.
+
+    Each stream starts one ffmpeg process, plus one yt-dlp process for urls.
+    The decoder handles every path, so it belongs last.
+    """
+
+    def open(self, path: str, sample_rate: int, channels: int) -> AudioSource:
+        """Start ffmpeg on a file or an url.
+
+        Args:
+            path: The file or url to play.
+            sample_rate: The sample rate to convert to.
+            channels: The channel count to convert to.
+
+        Returns:
+            AudioSource: The output of ffmpeg.
+
+        Raises:
+            RuntimeError: If ffmpeg, or yt-dlp for an url, is not installed.
+
+        """
+        if not ffmpeg_available():
+            raise RuntimeError(
+                "Could not convert file to wav. ffmpeg is not installed."
+            )
+        command = [
+            "ffmpeg",
+            "-i",
+            "pipe:0" if _is_url(path) else path,
+            "-f",
+            "s16le",
+            "-acodec",
+            "pcm_s16le",
+            "-ar",
+            str(sample_rate),
+            "-ac",
+            str(channels),
+            "-threads",
+            str(multiprocessing.cpu_count()),
+            "-hide_banner",
+            "-loglevel",
+            "error",
+            "-",
+        ]
+        if not _is_url(path):
+            return _ProcessSource([subprocess.Popen(command, stdout=subprocess.PIPE)])
+        if not yt_dlp_available():
+            raise RuntimeError("Could not download file. yt-dlp is not installed.")
+        yt_dlp_process = subprocess.Popen(
+            [  # noqa: S607
+                "yt-dlp",
+                "-f",
+                "bestaudio",
+                "--extract-audio",
+                "--audio-format",
+                "best",
+                "--audio-quality",
+                "0",
+                "--quiet",
+                "-o",
+                "-",
+                path,
+            ],
+            stdout=subprocess.PIPE,
+        )
+        ffmpeg_process = subprocess.Popen(
+            command, stdin=yt_dlp_process.stdout, stdout=subprocess.PIPE
+        )
+        return _ProcessSource([ffmpeg_process, yt_dlp_process])
+
+
+def open_source(
+    decoders: Iterable[Decoder], path: str, sample_rate: int, channels: int
+) -> AudioSource:
+    """Open a path with the first decoder that handles it.
+
+    Args:
+        decoders: The decoders to try, in order.
+        path: The file or url to play.
+        sample_rate: The sample rate the samples must have.
+        channels: The channel count the samples must have.
+
+    Returns:
+        AudioSource: The decoded samples.
+
+    Raises:
+        RuntimeError: If no decoder can play the path.
+
+    """
+    for decoder in decoders:
+        source = decoder.open(path, sample_rate, channels)
+        if source is not None:
+            return source
+    raise RuntimeError(f"No decoder can play {path}.")
+
+
+def search(query: str) -> str | None:
+    """Look a song up with yt-dlp.
+
+    Args:
+        query: The search terms.
+
+    Returns:
+        str | None: The url of the best audio of the first result, or None if
+            nothing was found.
+
+    Raises:
+        RuntimeError: If yt-dlp is not installed.
+
+    """
+    if not yt_dlp_available():
+        raise RuntimeError("Could not search. yt-dlp is not installed.")
+    result = subprocess.run(
+        [  # noqa: S607
+            "yt-dlp",
+            "-f",
+            "bestaudio",
+            "--extract-audio",
+            "--audio-format",
+            "best",
+            "--audio-quality",
+            "0",
+            "--quiet",
+            "--get-url",
+            f"ytsearch:{query}",
+        ],
+        check=False,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    # Only the first line: a result can have a separate video url.
+    urls = result.stdout.decode("utf-8").split()
+    return urls[0] if urls else None
+
+
+def default_decoders() -> list[Decoder]:
+    """Return the decoders a new `Streamer` uses.
+
+    Returns:
+        list[Decoder]: `WaveDecoder`, `PcmDecoder` and `FFmpegDecoder`.
+
+    """
+    return [WaveDecoder(), PcmDecoder(), FFmpegDecoder()]
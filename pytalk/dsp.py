@@ -0,0 +1,375 @@
+"""Processing 16-bit PCM a block at a time with NumPy.
+
+An `AudioProcessor` converts the audio a bot receives or sends: it mixes the
+channels down (or a mono source up), resamples to another rate, applies a
+gain and measures the level of the result, which also drives a simple voice
+activity detector. Every step works on the whole block at once. A processor
+keeps the state of its stream between blocks, so use one per stream.
+
+`AudioBlock.process` runs a received block through a processor, and
+`Streamer.processor` processes everything a streamer sends.
+
+Processing uses NumPy, from the ``numpy`` extra.
+
+Example:
+-------
+
+    .. code-block:: python3
+
+        processors = {}
+
+        @bot.event
+        async def on_user_audio(block):
+            if block.user.id not in processors:
+                processors[block.user.id] = AudioProcessor(16000, 1)
+            processor = processors[block.user.id]
+            samples = block.process(processor)  # 16 kHz mono int16
+            if processor.speaking:
+                transcriber.feed(samples)
+
+"""
+
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from types import ModuleType
+
+    import numpy as np
+
+_SAMPLE_BYTES = 2
+_FULL_SCALE = 32768.0
+_INT16_MIN = -32768
+_INT16_MAX = 32767
+
+
+def _numpy(name: str) -> ModuleType:
+    try:
+        import numpy as np  # noqa: PLC0415
+    except ImportError as exc:
+        raise ImportError(f"{name} requires numpy, install py-talk-ex[numpy]") from exc
+    return np
+
+
+def to_dbfs(level: float) -> float:
+    """Convert a level relative to full scale to dBFS.
+
+    Args:
+        level: A level between 0 and 1, such as `AudioProcessor.rms`.
+
+    Returns:
+        float: The level in dBFS, or minus infinity for silence.
+
+    """
+    return 20 * math.log10(level) if level > 0 else -math.inf
+
+
+class VoiceActivityDetector:
+    """Decides whether a stream holds speech from the level of its blocks.
+
+    A block is voiced when its RMS level reaches `threshold`. Speech starts
+    once `attack` seconds of voiced blocks arrived in a row, and ends once
+    `hangover` seconds passed without one, so the pauses between words do
+    not end it.
+
+    Attributes:
+        threshold: The RMS level, in dBFS, of a voiced block.
+        attack: How many seconds of voiced blocks start speech.
+        hangover: How many seconds without a voiced block end speech.
+        speaking: Whether the stream currently holds speech.
+
+    """
+
+    def __init__(
+        self, threshold: float = -40.0, attack: float = 0.04, hangover: float = 0.3
+    ) -> None:
+        """Create a detector.
+
+        Args:
+            threshold: The RMS level, in dBFS, of a voiced block. Defaults to
+                -40.
+            attack: How many seconds of voiced blocks start speech. Defaults
+                to 0.04.
+            hangover: How many seconds without a voiced block end speech.
+                Defaults to 0.3.
+
+        """
+        self.threshold = threshold
+        self.attack = attack
+        self.hangover = hangover
+        self.speaking = False
+        self._voiced = 0.0
+        self._silent = 0.0
+
+    def update(self, rms: float, duration: float) -> bool:
+        """Feed the level of the next block.
+
+        Args:
+            rms: The RMS level of the block, relative to full scale.
+            duration: The length of the block in seconds.
+
+        Returns:
+            bool: Whether the stream holds speech after this block.
+
+        """
+        if to_dbfs(rms) >= self.threshold:
+            self._voiced += duration
+            self._silent = 0.0
+            if self._voiced >= self.attack:
+                self.speaking = True
+            return self.speaking
+        self._silent += duration
+        if not self.speaking:
+            self._voiced = 0.0
+        elif self._silent >= self.hangover:
+            self.speaking = False
+            self._voiced = 0.0
+        return self.speaking
+
+    def reset(self) -> None:
+        """Forget the stream, e.g. when another one starts."""
+        self.speaking = False
+        self._voiced = 0.0
+        self._silent = 0.0
+
+
+class Resampler:
+    """Changes the sample rate of a stream, a block at a time.
+
+    When lowering the rate, a windowed-sinc low-pass filter first removes
+    what the new rate cannot hold, so it does not fold back as aliasing. The
+    samples are then linearly interpolated at the new rate. The filter's
+    history and the position between two input samples carry over from block
+    to block, so the output has no seams.
+
+    Attributes:
+        from_rate: The sample rate of the input.
+        to_rate: The sample rate of the output.
+        channels: The channel count of the stream.
+
+    """
+
+    def __init__(
+        self, from_rate: int, to_rate: int, channels: int = 1, taps: int = 33
+    ) -> None:
+        """Create a resampler.
+
+        Args:
+            from_rate: The sample rate of the input.
+            to_rate: The sample rate of the output.
+            channels: The channel count of the stream. Defaults to 1.
+            taps: The length of the low-pass filter. Defaults to 33.
+
+        Raises:
+            ImportError: If NumPy is not installed.
+
+        """
+        np = _numpy("Resampler")
+        self._np = np
+        self.from_rate = from_rate
+        self.to_rate = to_rate
+        self.channels = channels
+        self._step = from_rate / to_rate
+        # Lowering the rate by a whole factor needs no interpolation.
+        self._decimation = from_rate // to_rate if from_rate % to_rate == 0 else 0
+        self._filter: Any = None
+        if to_rate < from_rate:
+            # Keep a margin below the new Nyquist frequency for the slope.
+            cutoff = 0.45 * to_rate / from_rate
+            n = np.arange(taps) - (taps - 1) / 2
+            kernel = np.sinc(2 * cutoff * n) * np.blackman(taps)
+            self._filter = (kernel / kernel.sum()).astype(np.float32)
+            self._history = np.zeros((taps - 1, channels), dtype=np.float32)
+        self._last: Any = None
+        self._pos = 0.0
+
+    def process(self, frames: np.ndarray[Any, Any]) -> np.ndarray[Any, Any]:
+        """Resample the next block.
+
+        Args:
+            frames: A float32 array of shape (frames, channels).
+
+        Returns:
+            The resampled float32 frames, with the same layout.
+
+        """
+        if not len(frames):
+            return frames
+        if self._filter is not None:
+            frames = self._filtered(frames)
+        out: np.ndarray[Any, Any]
+        if self._decimation:
+            # Every n-th filtered sample falls on an output sample.
+            start = int(self._pos)
+            self._pos = (start - len(frames)) % self._decimation
+            out = frames[start :: self._decimation]
+            return out
+        if self._last is not None:
+            frames = self._np.concatenate((self._last, frames))
+        end = len(frames) - 1
+        count = max(math.floor((end - self._pos) / self._step) + 1, 0)
+        positions = self._pos + self._np.arange(count) * self._step
+        index = positions.astype(self._np.intp)
+        frac = (positions - index).astype(self._np.float32)[:, None]
+        after = self._np.minimum(index + 1, end)
+        out = frames[index] * (1 - frac) + frames[after] * frac
+        self._pos += count * self._step - end
+        self._last = frames[end:]
+        return out
+
+    def _filtered(self, frames: np.ndarray[Any, Any]) -> np.ndarray[Any, Any]:
+        padded = self._np.concatenate((self._history, frames))
+        self._history = padded[len(frames) :]
+        filtered: np.ndarray[Any, Any] = self._np.empty_like(frames)
+        for channel in range(frames.shape[1]):
+            filtered[:, channel] = self._np.convolve(
+                padded[:, channel], self._filter, "valid"
+            )
+        return filtered
+
+    def reset(self) -> None:
+        """Forget the stream, e.g. when another one starts."""
+        if self._filter is not None:
+            self._history[:] = 0
+        self._last = None
+        self._pos = 0.0
+
+
+class AudioProcessor:
+    """Converts and measures a stream of 16-bit PCM, a block at a time.
+
+    Blocks are mixed to `channels`, resampled to `sample_rate`, multiplied by
+    `gain`, rounded and clipped back to 16 bits. Mixing down averages the
+    channels; a mono stream is mixed up by copying it to every channel. A
+    sample split between two blocks is kept until the next one.
+
+    Attributes:
+        sample_rate: The rate to resample to, or None to keep the input's.
+        channels: The channel count to mix to, or None to keep the input's.
+        gain: The linear gain applied to the samples.
+        vad: The voice activity detector fed with the level of each block.
+        rms: The RMS level of the last block, relative to full scale.
+        peak: The peak level of the last block, relative to full scale.
+
+    """
+
+    def __init__(
+        self,
+        sample_rate: int | None = None,
+        channels: int | None = None,
+        gain: float = 1.0,
+        vad: VoiceActivityDetector | None = None,
+    ) -> None:
+        """Create a processor.
+
+        Args:
+            sample_rate: The rate to resample to. Defaults to the input's.
+            channels: The channel count to mix to. Defaults to the input's.
+            gain: The linear gain. Defaults to 1.0.
+            vad: The voice activity detector to use. Defaults to a
+                `VoiceActivityDetector` with its default settings.
+
+        Raises:
+            ImportError: If NumPy is not installed.
+
+        """
+        self._np = _numpy("AudioProcessor")
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.gain = gain
+        self.vad = vad if vad is not None else VoiceActivityDetector()
+        self.rms = 0.0
+        self.peak = 0.0
+        self._resampler: Resampler | None = None
+        self._partial = b""
+
+    @property
+    def speaking(self) -> bool:
+        """Whether the stream holds speech, according to `vad`."""
+        return self.vad.speaking
+
+    def process(
+        self, data: bytes | bytearray | memoryview, sample_rate: int, channels: int
+    ) -> np.ndarray[Any, np.dtype[np.int16]]:
+        """Process the next block.
+
+        Args:
+            data: Interleaved 16-bit samples in any object supporting the
+                buffer protocol, e.g. bytes, a memoryview or an int16 array.
+            sample_rate: The sample rate of `data`.
+            channels: The channel count of `data`.
+
+        Returns:
+            A new 1-D int16 array of interleaved samples.
+
+        Raises:
+            ValueError: If the channels cannot be mixed to `channels`.
+
+        """
+        np = self._np
+        raw = memoryview(data).cast("B")
+        if self._partial:
+            raw = memoryview(self._partial + raw)
+        frame_bytes = channels * _SAMPLE_BYTES
+        usable = len(raw) - len(raw) % frame_bytes
+        self._partial = bytes(raw[usable:])
+        frames = (
+            np.frombuffer(raw[:usable], dtype=np.int16)
+            .reshape(-1, channels)
+            .astype(np.float32)
+        )
+        frames = self._mix(frames, channels)
+        rate = self.sample_rate or sample_rate
+        if rate != sample_rate:
+            frames = self._resampler_for(sample_rate, rate, frames.shape[1]).process(
+                frames
+            )
+        if self.gain != 1:
+            frames *= self.gain
+        self._measure(frames, rate)
+        np.rint(frames, out=frames)
+        np.clip(frames, _INT16_MIN, _INT16_MAX, out=frames)
+        return frames.astype(np.int16).ravel()
+
+    def reset(self) -> None:
+        """Forget the stream, e.g. when another one starts."""
+        self._partial = b""
+        if self._resampler is not None:
+            self._resampler.reset()
+        self.vad.reset()
+        self.rms = self.peak = 0.0
+
+    def _mix(self, frames: np.ndarray[Any, Any], channels: int) -> np.ndarray[Any, Any]:
+        target = self.channels or channels
+        mixed: np.ndarray[Any, Any]
+        if target == channels:
+            mixed = frames
+        elif target == 1:
+            # A product is much faster than `mean` over such a short axis.
+            weights = self._np.full((channels, 1), 1 / channels, self._np.float32)
+            mixed = frames @ weights
+        elif channels == 1:
+            mixed = self._np.repeat(frames, target, axis=1)
+        else:
+            raise ValueError(f"Cannot mix {channels} channels to {target}")
+        return mixed
+
+    def _resampler_for(self, from_rate: int, to_rate: int, channels: int) -> Resampler:
+        resampler = self._resampler
+        if resampler is None or (
+            resampler.from_rate,
+            resampler.to_rate,
+            resampler.channels,
+        ) != (from_rate, to_rate, channels):
+            resampler = self._resampler = Resampler(from_rate, to_rate, channels)
+        return resampler
+
+    def _measure(self, frames: np.ndarray[Any, Any], rate: int) -> None:
+        if not frames.size:
+            return
+        flat = frames.ravel()
+        self.peak = min(float(self._np.abs(flat).max()) / _FULL_SCALE, 1.0)
+        self.rms = min(math.sqrt(float(flat @ flat) / flat.size) / _FULL_SCALE, 1.0)
+        self.vad.update(self.rms, len(frames) / rate)
@@ -9,18 +9,25 @@ In addition, it's also here that events are dispatched.
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import ctypes
 import logging
+import queue
 import sys
 import threading
 import time
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, cast
+from typing import TYPE_CHECKING, Any, TypeVar, cast
 
 if TYPE_CHECKING:
-    from collections.abc import Callable
+    from collections.abc import Callable, Iterator
 
+from ._coalesce import UpdateCoalescer
+from ._state import StateMirror
 from ._utils import (
+    DEF_WAIT,
+    _async_wait_for_cmd,
+    _async_wait_for_event,
     _do_after,
     _wait_for_cmd,
     _wait_for_event,
@@ -29,11 +36,15 @@ from ._utils import (
 )
 from .audio import (
     AudioBlock,
+    AudioBuffer,
+    AudioBufferPool,
     MuxedAudioBlock,
     _AcquireUserAudioBlock,
     _ReleaseUserAudioBlock,
 )
 from .backoff import Backoff, BackoffConfig
+from .bridge import AudioBridge
+from .capture import AudioCapture, CaptureRegistry
 
 if TYPE_CHECKING:
     from .bot import TeamTalkBot
@@ -52,22 +63,51 @@ from .message import (
     Message,
 )
 from .permission import Permission
+from .ringbuffer import AudioStream
 from .server import Server as TeamTalkServer
+from .snapshot import (
+    AudioBlockSnapshot,
+    ChannelSnapshot,
+    FileTransferSnapshot,
+    MessageSnapshot,
+    UserSnapshot,
+)
 from .statistics import Statistics as TeamTalkServerStatistics
 from .tt_file import FileTransfer, RemoteFile
 
 if TYPE_CHECKING:
+    from .offload import AudioWorkerPool
+    from .recorder import Recorder
+    from .segmenter import Segmenter, Utterance
     from .subscription import Subscription
 from .user import User as TeamTalkUser
 from .user_account import BannedUserAccount as TeamTalkBannedUserAccount
 from .user_account import UserAccount as TeamTalkUserAccount
 
 DEFAULT_SOUND_DEVICE_COUNT = 2
+MAX_EVENTS_PER_PASS = 1000
+EVENT_READER_WAIT_MSEC = 100
 PERCENTAGE_MIN = 0
 PERCENTAGE_MAX = 100
 
 _log = logging.getLogger(__name__)
 
+_SamplesT = TypeVar("_SamplesT", bytes, AudioBuffer)
+_RouteT = TypeVar("_RouteT")
+
+_CONNECT_RESULT_EVENTS: list[sdk.ClientEvent] = [
+    sdk.ClientEvent.CLIENTEVENT_CON_SUCCESS,
+    sdk.ClientEvent.CLIENTEVENT_CON_FAILED,
+    sdk.ClientEvent.CLIENTEVENT_CON_CRYPT_ERROR,
+]
+
+_TEXT_MESSAGE_CLASSES: dict[int, type[Message]] = {
+    sdk.TextMsgType.MSGTYPE_USER: DirectMessage,
+    sdk.TextMsgType.MSGTYPE_CHANNEL: ChannelMessage,
+    sdk.TextMsgType.MSGTYPE_BROADCAST: BroadcastMessage,
+    sdk.TextMsgType.MSGTYPE_CUSTOM: CustomMessage,
+}
+
 
 class TeamTalkInstance(sdk.TeamTalk):
     """Represents a TeamTalk5 instance."""
@@ -105,8 +145,44 @@ class TeamTalkInstance(sdk.TeamTalk):
         self.banned_users: list[TeamTalkBannedUserAccount] = []
         self._current_input_device_id: int | None = -1
         self._audio_sdk_lock = threading.Lock()
+        self._audio_pool = AudioBufferPool()
+        # Audio streams and bridges fed while a user's block is acquired.
+        self._audio_streams: dict[int, list[AudioStream | AudioBridge]] = {}
+        self._audio_captures = CaptureRegistry()
+        self._recorders: list[tuple[AudioCapture, Recorder]] = []
+        self._segmenters: list[tuple[AudioCapture, Segmenter]] = []
+        self._offloads: list[tuple[AudioCapture, AudioWorkerPool]] = []
+        self._capture_all_audio = bot.capture_all_audio
         self.reconnect_enabled = reconnect
         self._file_transfer_callbacks: dict[int, Callable[[FileTransfer], None]] = {}
+        self._event_reader: threading.Thread | None = None
+        self._event_reader_stop = threading.Event()
+        self._event_reader_slots: threading.BoundedSemaphore | None = None
+        self._event_reader_target: (
+            tuple[
+                asyncio.AbstractEventLoop,
+                asyncio.Queue[tuple[TeamTalkInstance, sdk.TTMessage]],
+            ]
+            | None
+        ) = None
+        # Held by a synchronous wait while it takes the reader's messages.
+        self._message_lock = threading.Lock()
+        self._diverted: queue.SimpleQueue[sdk.TTMessage] | None = None
+        self._divert_lock = threading.Lock()
+        # Messages read during a synchronous wait hold no reader slot. This
+        # counts those of them queued for the loop, so handling them does not
+        # free a slot.
+        self._unslotted = 0
+        self._event_decoders = self._build_event_decoders()
+        self._snapshot_events = bot.snapshot_events
+        if self._snapshot_events:
+            self._event_decoders.update(self._build_snapshot_decoders())
+        self._coalescer: UpdateCoalescer | None = None
+        if bot.coalesce_window is not None and bot.coalesce_window > 0:
+            self._coalescer = UpdateCoalescer(bot.coalesce_window, self._deliver_update)
+        self._state = StateMirror()
+        self._pending_commands: dict[int, asyncio.Future[Any]] = {}
+        self._event_waiters: dict[int, list[asyncio.Future[sdk.TTMessage]]] = {}
 
         if isinstance(backoff_config, dict):
             self._backoff = Backoff(config=BackoffConfig(**backoff_config))
@@ -124,19 +200,43 @@ class TeamTalkInstance(sdk.TeamTalk):
             bool: True if the connection was successful, False otherwise.
 
         """
-        if not super().connect(
-            sdk.ttstr(self.server_info.host),  # type: ignore [arg-type]
-            self.server_info.tcp_port,
-            self.server_info.udp_port,
-            bEncrypted=self.server_info.encrypted,
-        ):
+        if not self._start_connect():
             return False
-        result, msg = _wait_for_event(
-            self, cast("sdk.ClientEvent", sdk.ClientEvent.CLIENTEVENT_CON_SUCCESS)
-        )
+        result, msg = _wait_for_event(self, _CONNECT_RESULT_EVENTS)
         if not result:
             return False
+        return self._finish_connect(msg)
+
+    async def async_connect(self) -> bool:
+        """Make a single attempt to connect to the server without blocking.
+
+        Awaitable variant of :meth:`connect`. The result is delivered by the
+        bot's event pump, so this requires the instance to be added to a running
+        pytalk.Bot.
+
+        Returns:
+            bool: True if the connection was successful, False otherwise.
+
+        """
+        if not self._start_connect():
+            return False
+        try:
+            msg = await _async_wait_for_event(self, _CONNECT_RESULT_EVENTS)
+        except TimeoutError:
+            return False
+        return self._finish_connect(msg)
+
+    def _start_connect(self) -> bool:
+        return bool(
+            super().connect(
+                sdk.ttstr(self.server_info.host),  # type: ignore [arg-type]
+                self.server_info.tcp_port,
+                self.server_info.udp_port,
+                bEncrypted=self.server_info.encrypted,
+            )
+        )
 
+    def _finish_connect(self, msg: sdk.TTMessage) -> bool:
         if msg.nClientEvent == sdk.ClientEvent.CLIENTEVENT_CON_SUCCESS:
             self.bot.dispatch("my_connect", self)
             self.connected = True
@@ -162,18 +262,55 @@ class TeamTalkInstance(sdk.TeamTalk):
             bool: True if the login was successful, False otherwise.
 
         """
-        super().doLogin(
-            sdk.ttstr(self.server_info.nickname),  # type: ignore [arg-type]
-            sdk.ttstr(self.server_info.username),  # type: ignore [arg-type]
-            sdk.ttstr(self.server_info.password),
-            sdk.ttstr(self.bot.client_name),  # type: ignore [arg-type]
-        )
-        result, msg = _wait_for_event(
+        self._send_login()
+        result, _ = _wait_for_event(
             self,
             cast("sdk.ClientEvent", sdk.ClientEvent.CLIENTEVENT_CMD_MYSELF_LOGGEDIN),
         )
         if not result:
             return False
+        self._finish_login(join_channel_on_login)
+        return True
+
+    async def async_login(self, join_channel_on_login: bool = True) -> bool:
+        """Make a single attempt to log in to the server without blocking.
+
+        Awaitable variant of :meth:`login`. Waits until the server has answered
+        the login command, which also means the initial user and channel lists
+        have arrived.
+
+        Args:
+            join_channel_on_login: Whether to join the channel on login or not.
+
+        Returns:
+            bool: True if the login was successful, False otherwise.
+
+        """
+        cmd_id = self._send_login()
+        if cmd_id == -1:
+            return False
+        try:
+            result, _ = await _async_wait_for_cmd(self, cmd_id, DEF_WAIT)
+        except TimeoutError:
+            return False
+        if not result:
+            return False
+        self._finish_login(join_channel_on_login)
+        return True
+
+    def _send_login(self) -> int:
+        return cast(
+            "int",
+            super().doLogin(
+                sdk.ttstr(self.server_info.nickname),  # type: ignore [arg-type]
+                sdk.ttstr(self.server_info.username),  # type: ignore [arg-type]
+                sdk.ttstr(self.server_info.password),
+                sdk.ttstr(self.bot.client_name),  # type: ignore [arg-type]
+            ),
+        )
+
+    def _finish_login(self, join_channel_on_login: bool) -> None:
+        self._state.seed(super().getServerUsers(), super().getServerChannels())
         self.bot.dispatch("my_login", self)
         self.logged_in = True
 
@@ -182,17 +319,50 @@ class TeamTalkInstance(sdk.TeamTalk):
             if channel_id_to_join > 0:  # Only join if channel_id is strictly positive
                 self.join_channel_by_id(channel_id_to_join)
         self.init_time = time.time()
-        return True
 
     def logout(self) -> None:
         """Log out of the server."""
         super().doLogout()
         self.logged_in = False
+        self._end_session()
+        self._state.clear()
 
     def disconnect(self) -> None:
         """Disconnects from the server."""
         super().disconnect()
         self.connected = False
+        self._end_session()
+        self._state.clear()
+
+    def _end_session(self) -> None:
+        """Let go of what only made sense while logged in to the server.
+
+        Held updates are dropped, and the audio of every user is finished and
+        its consumers closed, since user IDs are only valid for one session.
+        All of it belongs to the event loop, so when the session ends on
+        another thread while the loop runs, such as in the executor a
+        reconnect disconnects in, the teardown is handed to the loop.
+        """
+        loop = self.bot.loop
+        # Before the bot runs, `loop` is a placeholder that is not a loop.
+        if isinstance(loop, asyncio.AbstractEventLoop) and loop.is_running():
+            try:
+                on_loop = asyncio.get_running_loop() is loop
+            except RuntimeError:
+                on_loop = False
+            if not on_loop:
+                loop.call_soon_threadsafe(self._tear_down_session)
+                return
+        self._tear_down_session()
+
+    def _tear_down_session(self) -> None:
+        if self._coalescer is not None:
+            self._coalescer.clear()
+        # Ask the segmenters and pools who was speaking: the state mirror is
+        # already empty when the connection was lost.
+        self._end_utterances(forget=True)
+        self._flush_offloads()
+        self._close_audio()
 
     async def force_reconnect(self) -> bool:
         """Manually forces a new attempt to connect and log in to the server.
@@ -570,7 +740,7 @@ class TeamTalkInstance(sdk.TeamTalk):
 
         """
         if isinstance(user, int):
-            sdk_user = super().getUser(user)
+            sdk_user = self._get_user_info(user)
             return bool(sdk_user.uUserType == sdk.UserType.USERTYPE_ADMIN)
         if isinstance(user, TeamTalkUser):
             return user.user_type == sdk.UserType.USERTYPE_ADMIN
@@ -692,7 +862,7 @@ class TeamTalkInstance(sdk.TeamTalk):
             raise ValueError("Channel not found")
         return TeamTalkChannel(self, result)
 
-    def create_channel(  # noqa: C901, PLR0913
+    def create_channel(  # noqa: PLR0913
         self,
         name: str,
         parent_channel: TeamTalkChannel | int,
@@ -737,6 +907,88 @@ class TeamTalkInstance(sdk.TeamTalk):
             bool: True if the channel was created, False otherwise.
 
         """
+        cmd_id = self._send_make_channel(
+            name,
+            parent_channel,
+            topic,
+            password,
+            channel_type,
+            disk_quota,
+            max_users,
+            timeout_media_file_msec,
+            timeout_voice_msec,
+            op_password,
+            user_data,
+            audiocfg,
+        )
+        cmd_result, cmd_err = _wait_for_cmd(self, cmd_id, 2000)
+        if not cmd_result:
+            self._raise_create_channel_error(cmd_err)
+        return True
+
+    async def async_create_channel(  # noqa: PLR0913
+        self,
+        name: str,
+        parent_channel: TeamTalkChannel | int,
+        topic: str = "",
+        password: str = "",
+        channel_type: int = ChannelType.DEFAULT,
+        disk_quota: int = 0,
+        max_users: int = 0,
+        timeout_media_file_msec: int = 0,
+        timeout_voice_msec: int = 0,
+        op_password: str = "",
+        user_data: int = 0,
+        audiocfg: AudioCodecConfig | None = None,
+    ) -> bool:
+        """Create a channel without blocking the event loop.
+
+        Awaitable variant of :meth:`create_channel`, see it for the arguments.
+
+        Raises:
+            PytalkPermissionError: If the bot does not have permission
+                to create channels.
+            ValueError: If the channel could not be created.
+            TimeoutError: If the server did not answer in time.
+
+        Returns:
+            bool: True if the channel was created.
+
+        """
+        cmd_id = self._send_make_channel(
+            name,
+            parent_channel,
+            topic,
+            password,
+            channel_type,
+            disk_quota,
+            max_users,
+            timeout_media_file_msec,
+            timeout_voice_msec,
+            op_password,
+            user_data,
+            audiocfg,
+        )
+        cmd_result, cmd_err = await _async_wait_for_cmd(self, cmd_id, 2000)
+        if not cmd_result:
+            self._raise_create_channel_error(cmd_err)
+        return True
+
+    def _send_make_channel(  # noqa: PLR0913
+        self,
+        name: str,
+        parent_channel: TeamTalkChannel | int,
+        topic: str,
+        password: str,
+        channel_type: int,
+        disk_quota: int,
+        max_users: int,
+        timeout_media_file_msec: int,
+        timeout_voice_msec: int,
+        op_password: str,
+        user_data: int,
+        audiocfg: AudioCodecConfig | None,
+    ) -> int:
         if not self.has_permission(cast("int", Permission.MODIFY_CHANNELS)):
             raise PytalkPermissionError(
                 "The bot does not have permission to create channels"
@@ -763,25 +1015,24 @@ class TeamTalkInstance(sdk.TeamTalk):
         result = sdk._DoMakeChannel(self._tt, new_channel)
         if result == -1:
             raise ValueError("Channel could not be created")
-        cmd_result, cmd_err = _wait_for_cmd(self, result, 2000)
-        if not cmd_result:
-            err_nr = cmd_err.nErrorNo
-            if err_nr == sdk.ClientError.CMDERR_NOT_LOGGEDIN:
-                raise PytalkPermissionError("The bot is not logged in")
-            if err_nr == sdk.ClientError.CMDERR_NOT_AUTHORIZED:
-                raise PytalkPermissionError(
-                    "The bot does not have permission to create channels"
-                )
-            if err_nr == sdk.ClientError.CMDERR_CHANNEL_ALREADY_EXISTS:
-                raise ValueError("Channel already exists")
-            if err_nr == sdk.ClientError.CMDERR_CHANNEL_NOT_FOUND:
-                raise ValueError(
-                    "Combined channel path is too long. "
-                    "Try using a shorter channel name"
-                )
-            if err_nr == sdk.ClientError.CMDERR_INCORRECT_CHANNEL_PASSWORD:
-                raise ValueError("Channel password too long")
-        return True
+        return cast("int", result)
+
+    def _raise_create_channel_error(self, cmd_err: Any) -> None:  # noqa: ANN401
+        err_nr = cmd_err.nErrorNo
+        if err_nr == sdk.ClientError.CMDERR_NOT_LOGGEDIN:
+            raise PytalkPermissionError("The bot is not logged in")
+        if err_nr == sdk.ClientError.CMDERR_NOT_AUTHORIZED:
+            raise PytalkPermissionError(
+                "The bot does not have permission to create channels"
+            )
+        if err_nr == sdk.ClientError.CMDERR_CHANNEL_ALREADY_EXISTS:
+            raise ValueError("Channel already exists")
+        if err_nr == sdk.ClientError.CMDERR_CHANNEL_NOT_FOUND:
+            raise ValueError(
+                "Combined channel path is too long. Try using a shorter channel name"
+            )
+        if err_nr == sdk.ClientError.CMDERR_INCORRECT_CHANNEL_PASSWORD:
+            raise ValueError("Channel password too long")
 
     def delete_channel(self, channel: TeamTalkChannel | int) -> bool:
         """Delete a channel.
@@ -799,6 +1050,39 @@ class TeamTalkInstance(sdk.TeamTalk):
             bool: True if the channel was deleted.
 
         """
+        cmd_result, cmd_err = _wait_for_cmd(
+            self, self._send_remove_channel(channel), 2000
+        )
+        if not cmd_result:
+            self._raise_delete_channel_error(cmd_err)
+        return True
+
+    async def async_delete_channel(self, channel: TeamTalkChannel | int) -> bool:
+        """Delete a channel without blocking the event loop.
+
+        Awaitable variant of :meth:`delete_channel`.
+
+        Args:
+            channel: The channel to delete.
+
+        Raises:
+            PytalkPermissionError: If the bot doesn't have the permission to delete the
+                channel.
+            ValueError: If the channel is not found.
+            TimeoutError: If the server did not answer in time.
+
+        Returns:
+            bool: True if the channel was deleted.
+
+        """
+        cmd_result, cmd_err = await _async_wait_for_cmd(
+            self, self._send_remove_channel(channel), 2000
+        )
+        if not cmd_result:
+            self._raise_delete_channel_error(cmd_err)
+        return True
+
+    def _send_remove_channel(self, channel: TeamTalkChannel | int) -> int:
         if not self.has_permission(cast("int", Permission.MODIFY_CHANNELS)):
             raise PytalkPermissionError(
                 "The bot does not have permission to delete channels"
@@ -808,18 +1092,18 @@ class TeamTalkInstance(sdk.TeamTalk):
         result = sdk._DoRemoveChannel(self._tt, channel)
         if result == -1:
             raise ValueError("Channel could not be deleted")
-        cmd_result, cmd_err = _wait_for_cmd(self, result, 2000)
-        if not cmd_result:
-            err_nr = cmd_err.nErrorNo
-            if err_nr == sdk.ClientError.CMDERR_NOT_LOGGEDIN:
-                raise PytalkPermissionError("The bot is not logged in")
-            if err_nr == sdk.ClientError.CMDERR_NOT_AUTHORIZED:
-                raise PytalkPermissionError(
-                    "The bot does not have permission to delete channels"
-                )
-            if err_nr == sdk.ClientError.CMDERR_CHANNEL_NOT_FOUND:
-                raise ValueError("Channel not found.")
-        return True
+        return cast("int", result)
+
+    def _raise_delete_channel_error(self, cmd_err: Any) -> None:  # noqa: ANN401
+        err_nr = cmd_err.nErrorNo
+        if err_nr == sdk.ClientError.CMDERR_NOT_LOGGEDIN:
+            raise PytalkPermissionError("The bot is not logged in")
+        if err_nr == sdk.ClientError.CMDERR_NOT_AUTHORIZED:
+            raise PytalkPermissionError(
+                "The bot does not have permission to delete channels"
+            )
+        if err_nr == sdk.ClientError.CMDERR_CHANNEL_NOT_FOUND:
+            raise ValueError("Channel not found.")
 
     def make_channel_operator(
         self,
@@ -844,43 +1128,42 @@ class TeamTalkInstance(sdk.TeamTalk):
             bool: True if the user was made the channel operator, False otherwise.
 
         """
-        if isinstance(user, int):
-            user_obj: TeamTalkUser = self.get_user(user)
-        else:
-            user_obj = user
-        if isinstance(channel, int):
-            channel_obj: TeamTalkChannel = self.get_channel(channel)
-        else:
-            channel_obj = channel
-        result = sdk._DoChannelOpEx(
-            self._tt,
-            user_obj.id,
-            channel_obj.id,
-            sdk.ttstr(operator_password),  # type: ignore [arg-type]
-            True,
-        )
-        if result == -1:
-            raise PytalkPermissionError(
-                "The bot does not have the permission to make a user the channel "
-                "operator"
-            )
+        cmd_id = self._send_channel_op(user, channel, operator_password, True)
+        cmd_result, cmd_err = _wait_for_cmd(self, cmd_id, 2000)
+        if not cmd_result:
+            self._raise_channel_op_error(cmd_err)
             return False
-        cmd_result, cmd_err = _wait_for_cmd(self, result, 2000)
+        return True
+
+    async def async_make_channel_operator(
+        self,
+        user: TeamTalkUser | int,
+        channel: TeamTalkChannel | int,
+        operator_password: str = "",
+    ) -> bool:
+        """Make a user the channel operator without blocking the event loop.
+
+        Awaitable variant of :meth:`make_channel_operator`.
+
+        Args:
+            user: The user to make the channel operator.
+            channel: The channel to make the user the channel operator in.
+            operator_password: The operator password of the channel.
+
+        Raises:
+            PytalkPermissionError: If the bot doesn't have the permission to make a user
+                the channel operator.
+            ValueError: If the user or channel is not found.
+            TimeoutError: If the server did not answer in time.
+
+        Returns:
+            bool: True if the user was made the channel operator, False otherwise.
+
+        """
+        cmd_id = self._send_channel_op(user, channel, operator_password, True)
+        cmd_result, cmd_err = await _async_wait_for_cmd(self, cmd_id, 2000)
         if not cmd_result:
-            err_nr = cmd_err.nErrorNo
-            if err_nr == sdk.ClientError.CMDERR_NOT_LOGGEDIN:
-                raise PytalkPermissionError("The bot is not logged in")
-            if err_nr == sdk.ClientError.CMDERR_NOT_AUTHORIZED:
-                raise PytalkPermissionError(
-                    "The bot does not have permission to make a user the channel "
-                    "operator"
-                )
-            if err_nr == sdk.ClientError.CMDERR_CHANNEL_NOT_FOUND:
-                raise ValueError("The channel does not exist")
-            if err_nr == sdk.ClientError.CMDERR_USER_NOT_FOUND:
-                raise ValueError("The user does not exist")
-            if err_nr == sdk.ClientError.CMDERR_INCORRECT_OP_PASSWORD:
-                raise ValueError("The operator password is incorrect")
+            self._raise_channel_op_error(cmd_err)
             return False
         return True
 
@@ -907,6 +1190,52 @@ class TeamTalkInstance(sdk.TeamTalk):
             bool: True if the user was removed as the channel operator, False otherwise.
 
         """
+        cmd_id = self._send_channel_op(user, channel, operator_password, False)
+        cmd_result, cmd_err = _wait_for_cmd(self, cmd_id, 2000)
+        if not cmd_result:
+            self._raise_channel_op_error(cmd_err)
+            return False
+        return True
+
+    async def async_remove_channel_operator(
+        self,
+        user: TeamTalkUser | int,
+        channel: TeamTalkChannel | int,
+        operator_password: str = "",
+    ) -> bool:
+        """Remove a user as the channel operator without blocking the event loop.
+
+        Awaitable variant of :meth:`remove_channel_operator`.
+
+        Args:
+            user: The user to remove as the channel operator.
+            channel: The channel to remove the user as the channel operator from.
+            operator_password: The operator password of the channel.
+
+        Raises:
+            PytalkPermissionError: If the bot doesn't have the permission to make a user
+                the channel operator.
+            ValueError: If the channel or user does not exist.
+            TimeoutError: If the server did not answer in time.
+
+        Returns:
+            bool: True if the user was removed as the channel operator, False otherwise.
+
+        """
+        cmd_id = self._send_channel_op(user, channel, operator_password, False)
+        cmd_result, cmd_err = await _async_wait_for_cmd(self, cmd_id, 2000)
+        if not cmd_result:
+            self._raise_channel_op_error(cmd_err)
+            return False
+        return True
+
+    def _send_channel_op(
+        self,
+        user: TeamTalkUser | int,
+        channel: TeamTalkChannel | int,
+        operator_password: str,
+        make_operator: bool,
+    ) -> int:
         if isinstance(user, int):
             user_obj: TeamTalkUser = self.get_user(user)
         else:
@@ -920,32 +1249,29 @@ class TeamTalkInstance(sdk.TeamTalk):
             user_obj.id,
             channel_obj.id,
             sdk.ttstr(operator_password),  # type: ignore [arg-type]
-            False,
+            make_operator,
         )
         if result == -1:
             raise PytalkPermissionError(
                 "The bot does not have the permission to make a user the channel "
                 "operator"
             )
-            return False
-        cmd_result, cmd_err = _wait_for_cmd(self, result, 2000)
-        if not cmd_result:
-            err_nr = cmd_err.nErrorNo
-            if err_nr == sdk.ClientError.CMDERR_NOT_LOGGEDIN:
-                raise PytalkPermissionError("The bot is not logged in")
-            if err_nr == sdk.ClientError.CMDERR_NOT_AUTHORIZED:
-                raise PytalkPermissionError(
-                    "The bot does not have permission to make a user the channel "
-                    "operator"
-                )
-            if err_nr == sdk.ClientError.CMDERR_CHANNEL_NOT_FOUND:
-                raise ValueError("The channel does not exist")
-            if err_nr == sdk.ClientError.CMDERR_USER_NOT_FOUND:
-                raise ValueError("The user does not exist")
-            if err_nr == sdk.ClientError.CMDERR_INCORRECT_OP_PASSWORD:
-                raise ValueError("The operator password is incorrect")
-            return False
-        return True
+        return cast("int", result)
+
+    def _raise_channel_op_error(self, cmd_err: Any) -> None:  # noqa: ANN401
+        err_nr = cmd_err.nErrorNo
+        if err_nr == sdk.ClientError.CMDERR_NOT_LOGGEDIN:
+            raise PytalkPermissionError("The bot is not logged in")
+        if err_nr == sdk.ClientError.CMDERR_NOT_AUTHORIZED:
+            raise PytalkPermissionError(
+                "The bot does not have permission to make a user the channel operator"
+            )
+        if err_nr == sdk.ClientError.CMDERR_CHANNEL_NOT_FOUND:
+            raise ValueError("The channel does not exist")
+        if err_nr == sdk.ClientError.CMDERR_USER_NOT_FOUND:
+            raise ValueError("The user does not exist")
+        if err_nr == sdk.ClientError.CMDERR_INCORRECT_OP_PASSWORD:
+            raise ValueError("The operator password is incorrect")
 
     def get_user(self, user_id: int) -> TeamTalkUser:
         """Get a user by its ID.
@@ -959,66 +1285,488 @@ class TeamTalkInstance(sdk.TeamTalk):
         """
         return TeamTalkUser(self, user_id)
 
-    def create_user_account(
+    def capture_audio(
         self,
-        username: str,
-        password: str,
-        usertype: UserType,
-        user_rights: int | None = None,
-        note: str = "",
-    ) -> bool:
-        """Create a user account on the server.
+        user: TeamTalkUser | int | None = None,
+        channel: TeamTalkChannel | int | None = None,
+        muxed: bool = False,
+    ) -> AudioCapture:
+        """Receive the audio blocks of one user, one channel or the muxed stream.
+
+        Captures are reference counted: the SDK keeps copying a target's audio
+        until every capture of it has been released. With
+        ``TeamTalkBot(capture_all_audio=False)`` captures and audio streams are
+        the only way audio is received, so ``on_user_audio`` is no longer fed
+        the audio of every user who talks.
 
         Args:
-            username (str): The username for the new account.
-            password (str): The password for the new account.
-            usertype (UserType): The type of user account (e.g.,
-                `pytalk.UserType.DEFAULT` or `pytalk.UserType.ADMIN`).
-            user_rights (Optional[int], optional): Specific rights to assign,
-                as a bitmask of `pytalk.Permission` values. If `None`
-                (default), `uUserRights` is sent as `0`, and server
-                defaults based on `usertype` will apply.
-            note (str, optional): An optional note for the user account.
-                If this argument is not provided when calling the
-                function, it defaults to an empty string, which means
-                no note will be set.
+            user: The user to capture.
+            channel: The channel whose users to capture.
+            muxed: Whether to capture the muxed stream of the bot's channel.
 
         Returns:
-            bool: True if the command to create the account was
-                successfully dispatched.
+            AudioCapture: The capture. Release it when the audio is no longer
+                needed.
 
         Raises:
-            ValueError: If username or password is invalid.
-            PytalkPermissionError: If the bot lacks permission to create accounts
-                or is not logged in.
+            ValueError: If not exactly one target is given.
 
         """
-        account = sdk.UserAccount()
-        account.szUsername = sdk.ttstr(username)  # type: ignore [arg-type]
-        account.szPassword = sdk.ttstr(password)  # type: ignore [arg-type]
-        account.uUserType = usertype
-        account.szNote = sdk.ttstr(note)  # type: ignore [arg-type]
+        if (user is not None) + (channel is not None) + muxed != 1:
+            raise ValueError("Exactly one of user, channel or muxed must be given")
+        user_id = user.user_id if isinstance(user, TeamTalkUser) else user
+        channel_id = channel.id if isinstance(channel, TeamTalkChannel) else channel
+        capture = AudioCapture(user_id, channel_id, muxed, self._release_capture)
+        self._audio_captures.add(user_id, channel_id, muxed)
+        for target in self._capture_targets(capture):
+            self._enable_audio_blocks(target, True)
+        return capture
+
+    def _release_capture(self, capture: AudioCapture) -> None:
+        self._audio_captures.remove(capture.user_id, capture.channel_id, capture.muxed)
+        if self._recorders or self._segmenters or self._offloads:
+            with self._audio_sdk_lock:
+                self._recorders = [
+                    route for route in self._recorders if route[0] is not capture
+                ]
+                self._segmenters = [
+                    route for route in self._segmenters if route[0] is not capture
+                ]
+                self._offloads = [
+                    route for route in self._offloads if route[0] is not capture
+                ]
+        for target in self._capture_targets(capture):
+            if not self._wants_audio(target):
+                self._enable_audio_blocks(target, False)
+
+    def record_audio(
+        self,
+        recorder: Recorder,
+        user: TeamTalkUser | int | None = None,
+        channel: TeamTalkChannel | int | None = None,
+        muxed: bool = False,
+    ) -> AudioCapture:
+        """Record the audio of one user, one channel or the muxed stream.
 
-        if user_rights is not None:
-            account.uUserRights = user_rights
+        The samples are handed to `recorder` as they arrive, which writes each
+        speaker to their own files from its writer thread. One recorder can
+        record several targets, also of several instances.
 
-        result = sdk._DoNewUserAccount(self._tt, account)
-        if result == -1:
-            raise ValueError("Username or password is invalid")
-        cmd_result, cmd_err = _wait_for_cmd(self, result, 2000)
-        if not cmd_result:
-            err_nr = cmd_err.nErrorNo
-            if err_nr == sdk.ClientError.CMDERR_INVALID_USERNAME:
-                raise ValueError("Username is invalid")
-            if err_nr == sdk.ClientError.CMDERR_NOT_AUTHORIZED:
-                raise PytalkPermissionError(
-                    "The bot does not have permission to create a user account"
-                )
-            if err_nr == sdk.ClientError.CMDERR_NOT_LOGGEDIN:
-                raise PytalkPermissionError("The bot is not logged in")
-        return True
+        Args:
+            recorder: The recorder to feed.
+            user: The user to record.
+            channel: The channel whose users to record.
+            muxed: Whether to record the muxed stream of the bot's channel.
 
-    def delete_user_account(self, username: str) -> bool:
+        Returns:
+            AudioCapture: The capture feeding the recorder. Release it to stop
+                recording the target; closing the recorder releases it too.
+                It is also released when the connection ends, or when the
+                captured user logs out.
+
+        Raises:
+            ValueError: If not exactly one target is given.
+
+        """
+        capture = self.capture_audio(user=user, channel=channel, muxed=muxed)
+        with self._audio_sdk_lock:
+            self._recorders = [*self._recorders, (capture, recorder)]
+        recorder._captures.append(capture)
+        return capture
+
+    def segment_audio(
+        self,
+        segmenter: Segmenter,
+        user: TeamTalkUser | int | None = None,
+        channel: TeamTalkChannel | int | None = None,
+        muxed: bool = False,
+    ) -> AudioCapture:
+        """Cut the audio of one user, one channel or the muxed stream into utterances.
+
+        The samples are handed to `segmenter` as they arrive, and each
+        finished stretch of speech is dispatched as one ``on_utterance`` event
+        with a `pytalk.segmenter.Utterance`, without an event per audio block.
+        One segmenter can segment several targets, also of several instances.
+
+        Args:
+            segmenter: The segmenter to feed.
+            user: The user to segment.
+            channel: The channel whose users to segment.
+            muxed: Whether to segment the muxed stream of the bot's channel.
+
+        Returns:
+            AudioCapture: The capture feeding the segmenter. Release it to stop
+                segmenting the target; closing the segmenter releases it too.
+                It is also released when the connection ends, or when the
+                captured user logs out.
+
+        Raises:
+            ValueError: If not exactly one target is given.
+
+        """
+        capture = self.capture_audio(user=user, channel=channel, muxed=muxed)
+        with self._audio_sdk_lock:
+            self._segmenters = [*self._segmenters, (capture, segmenter)]
+        segmenter._captures.append(capture)
+        return capture
+
+    def offload_audio(
+        self,
+        pool: AudioWorkerPool,
+        user: TeamTalkUser | int | None = None,
+        channel: TeamTalkChannel | int | None = None,
+        muxed: bool = False,
+    ) -> AudioCapture:
+        """Analyse the audio of one user, one channel or the muxed stream in a pool.
+
+        The samples are copied into the shared memory of `pool` as they
+        arrive, and what its function returns for each window is dispatched
+        as an ``on_audio_result`` event with a `pytalk.offload.AudioResult`.
+        One pool can analyse several targets, also of several instances.
+
+        Args:
+            pool: The worker pool to feed.
+            user: The user to analyse.
+            channel: The channel whose users to analyse.
+            muxed: Whether to analyse the muxed stream of the bot's channel.
+
+        Returns:
+            AudioCapture: The capture feeding the pool. Release it to stop
+                analysing the target; closing the pool releases it too.
+                It is also released when the connection ends, or when the
+                captured user logs out.
+
+        Raises:
+            ValueError: If not exactly one target is given.
+
+        """
+        capture = self.capture_audio(user=user, channel=channel, muxed=muxed)
+        with self._audio_sdk_lock:
+            self._offloads = [*self._offloads, (capture, pool)]
+        pool._captures.append(capture)
+        return capture
+
+    def _routes_for(
+        self, routes: list[tuple[AudioCapture, _RouteT]], source_id: int
+    ) -> Iterator[_RouteT]:
+        """Yield the consumers whose capture covers the audio of `source_id`."""
+        channel_id = None
+        for capture, consumer in routes:
+            if capture.muxed:
+                if source_id != sdk.TT_MUXED_USERID:
+                    continue
+            elif capture.user_id is not None:
+                if source_id != capture.user_id:
+                    continue
+            else:
+                if channel_id is None:
+                    user = self._state.users.get(source_id)
+                    channel_id = user.nChannelID if user is not None else 0
+                if channel_id != capture.channel_id:
+                    continue
+            yield consumer
+
+    def _feed_recorders(self, source_id: int, block: sdk.AudioBlock, size: int) -> None:
+        """Hand the samples of an acquired SDK block to the matching recorders."""
+        samples = memoryview((ctypes.c_char * size).from_address(block.lpRawAudio))
+        now = time.monotonic()
+        track = "muxed" if source_id == sdk.TT_MUXED_USERID else source_id
+        for recorder in self._routes_for(self._recorders, source_id):
+            recorder.feed(track, block.nSampleRate, block.nChannels, samples, now)
+
+    def _feed_segmenters(
+        self, source_id: int, block: sdk.AudioBlock, size: int
+    ) -> list[Utterance]:
+        """Hand the samples of an acquired SDK block to the matching segmenters.
+
+        Returns:
+            The utterances the block ended.
+
+        """
+        samples = memoryview((ctypes.c_char * size).from_address(block.lpRawAudio))
+        utterances = []
+        for segmenter in self._routes_for(self._segmenters, source_id):
+            utterance = segmenter.feed(self, source_id, block, samples)
+            if utterance is not None:
+                utterances.append(utterance)
+        return utterances
+
+    def _flush_offloads(self, user_id: int | None = None) -> None:
+        """Send the windows of a user who stopped talking, or of all, to the workers."""
+        if not self._offloads:
+            return
+        with self._audio_sdk_lock:
+            pools = {id(route[1]): route[1] for route in self._offloads}
+            for pool in pools.values():
+                if user_id is None:
+                    pool._flush_all(self)
+                else:
+                    pool._flush(self, user_id)
+
+    def _end_utterances(self, user_id: int | None = None, forget: bool = False) -> None:
+        """Dispatch the utterances a user, or everyone, was in the middle of."""
+        if not self._segmenters:
+            return
+        utterances = []
+        with self._audio_sdk_lock:
+            segmenters = {id(route[1]): route[1] for route in self._segmenters}
+            for segmenter in segmenters.values():
+                if user_id is None:
+                    speaker_ids = segmenter._speaker_ids(self)
+                else:
+                    speaker_ids = [user_id]
+                for speaker_id in speaker_ids:
+                    utterance = segmenter.end(self, speaker_id)
+                    if utterance is not None:
+                        utterances.append(utterance)
+                    if forget:
+                        segmenter.forget(self, speaker_id)
+        for utterance in utterances:
+            self.bot.dispatch("utterance", utterance)
+
+    def _capture_targets(self, capture: AudioCapture) -> list[int]:
+        """Return the IDs whose audio block events `capture` affects."""
+        if capture.muxed:
+            return [sdk.TT_MUXED_USERID]
+        if capture.user_id is not None:
+            return [capture.user_id]
+        return [
+            user_id
+            for user_id, user in self._state.users.items()
+            if user.nChannelID == capture.channel_id
+        ]
+
+    def _enable_audio_blocks(self, user_id: int, enable: bool) -> None:
+        sdk._EnableAudioBlockEventEx(
+            self._tt, user_id, sdk.StreamType.STREAMTYPE_VOICE, None, enable
+        )
+
+    def open_audio_stream(
+        self,
+        user: TeamTalkUser | int,
+        buffer_msec: int = 2000,
+        frame_msec: int = 20,
+    ) -> AudioStream:
+        """Open a pull-based stream of the audio a user sends.
+
+        The samples are written into the stream's ring buffer as they arrive,
+        without dispatching an event per audio block. Read them with
+        `AudioStream.read` or ``async for``, and close the stream when done.
+        The stream holds a capture of the user, see `capture_audio`. It is
+        closed when the user logs out or the connection ends.
+
+        Args:
+            user: The user, or `sdk.TT_MUXED_USERID` for the mixed audio of
+                the bot's channel.
+            buffer_msec: The length of audio the stream holds before the
+                oldest samples are overwritten. Defaults to 2000.
+            frame_msec: The length of the frames yielded by ``async for``.
+                Defaults to 20.
+
+        Returns:
+            AudioStream: The stream.
+
+        """
+        user_id = user.user_id if isinstance(user, TeamTalkUser) else user
+        if user_id == sdk.TT_MUXED_USERID:
+            capture = self.capture_audio(muxed=True)
+        else:
+            capture = self.capture_audio(user=user_id)
+        stream = AudioStream(
+            user_id,
+            buffer_msec,
+            frame_msec,
+            on_close=lambda stream: self._close_audio_stream(stream, capture),
+        )
+        with self._audio_sdk_lock:
+            self._audio_streams.setdefault(user_id, []).append(stream)
+        return stream
+
+    def bridge_audio(
+        self,
+        target: TeamTalkInstance,
+        user: TeamTalkUser | int | None = None,
+        muxed: bool = False,
+    ) -> AudioBridge:
+        """Send the audio of a user, or of this bot's channel, from another instance.
+
+        Each received block is handed to the target's SDK before it is
+        released here, without dispatching an event, so relaying adds no
+        buffering of its own. The bridge holds a capture of the user, see
+        `capture_audio`. It is closed when the user logs out or the
+        connection ends.
+
+        Args:
+            target: The instance to send the audio from, e.g. connected to
+                another server.
+            user: The user to relay.
+            muxed: Whether to relay the muxed stream of the bot's channel.
+
+        Returns:
+            AudioBridge: The bridge, with its latency and drop counters.
+                Close it to stop relaying.
+
+        Raises:
+            ValueError: If not exactly one of `user` and `muxed` is given.
+
+        """
+        if (user is not None) + muxed != 1:
+            raise ValueError("Exactly one of user or muxed must be given")
+        if muxed:
+            user_id = sdk.TT_MUXED_USERID
+            capture = self.capture_audio(muxed=True)
+        else:
+            user_id = user.user_id if isinstance(user, TeamTalkUser) else user
+            capture = self.capture_audio(user=user_id)
+        bridge = AudioBridge(
+            user_id,
+            target,
+            on_close=lambda bridge: self._close_audio_stream(bridge, capture),
+        )
+        with self._audio_sdk_lock:
+            self._audio_streams.setdefault(user_id, []).append(bridge)
+        return bridge
+
+    def _close_audio(self, user_id: int | None = None) -> None:
+        """Close the audio consumers of a user who logged out, or of everyone.
+
+        Audio streams and bridges are closed, and the captures feeding
+        recorders, segmenters and worker pools are released. Captures of a
+        channel or the muxed stream are only released when the session ends.
+        """
+        with self._audio_sdk_lock:
+            if user_id is None:
+                streams = [s for group in self._audio_streams.values() for s in group]
+            else:
+                streams = list(self._audio_streams.get(user_id, ()))
+            captures = [
+                capture
+                for capture, _ in (*self._recorders, *self._segmenters, *self._offloads)
+                if user_id is None or capture.user_id == user_id
+            ]
+        for stream in streams:
+            stream.close()
+        for capture in captures:
+            capture.release()
+
+    def _close_audio_stream(
+        self, stream: AudioStream | AudioBridge, capture: AudioCapture
+    ) -> None:
+        with self._audio_sdk_lock:
+            streams = self._audio_streams.get(stream.user_id, [])
+            if stream in streams:
+                streams.remove(stream)
+            if not streams:
+                self._audio_streams.pop(stream.user_id, None)
+        capture.release()
+
+    def create_user_account(
+        self,
+        username: str,
+        password: str,
+        usertype: UserType,
+        user_rights: int | None = None,
+        note: str = "",
+    ) -> bool:
+        """Create a user account on the server.
+
+        Args:
+            username (str): The username for the new account.
+            password (str): The password for the new account.
+            usertype (UserType): The type of user account (e.g.,
+                `pytalk.UserType.DEFAULT` or `pytalk.UserType.ADMIN`).
+            user_rights (Optional[int], optional): Specific rights to assign,
+                as a bitmask of `pytalk.Permission` values. If `None`
+                (default), `uUserRights` is sent as `0`, and server
+                defaults based on `usertype` will apply.
+            note (str, optional): An optional note for the user account.
+                If this argument is not provided when calling the
+                function, it defaults to an empty string, which means
+                no note will be set.
+
+        Returns:
+            bool: True if the command to create the account was
+                successfully dispatched.
+
+        Raises:
+            ValueError: If username or password is invalid.
+            PytalkPermissionError: If the bot lacks permission to create accounts
+                or is not logged in.
+
+        """
+        cmd_id = self._send_new_user_account(
+            username, password, usertype, user_rights, note
+        )
+        cmd_result, cmd_err = _wait_for_cmd(self, cmd_id, 2000)
+        if not cmd_result:
+            self._raise_create_user_account_error(cmd_err)
+        return True
+
+    async def async_create_user_account(
+        self,
+        username: str,
+        password: str,
+        usertype: UserType,
+        user_rights: int | None = None,
+        note: str = "",
+    ) -> bool:
+        """Create a user account without blocking the event loop.
+
+        Awaitable variant of :meth:`create_user_account`, see it for the
+        arguments.
+
+        Returns:
+            bool: True if the account was created.
+
+        Raises:
+            ValueError: If username or password is invalid.
+            PytalkPermissionError: If the bot lacks permission to create accounts
+                or is not logged in.
+            TimeoutError: If the server did not answer in time.
+
+        """
+        cmd_id = self._send_new_user_account(
+            username, password, usertype, user_rights, note
+        )
+        cmd_result, cmd_err = await _async_wait_for_cmd(self, cmd_id, 2000)
+        if not cmd_result:
+            self._raise_create_user_account_error(cmd_err)
+        return True
+
+    def _send_new_user_account(
+        self,
+        username: str,
+        password: str,
+        usertype: UserType,
+        user_rights: int | None,
+        note: str,
+    ) -> int:
+        account = sdk.UserAccount()
+        account.szUsername = sdk.ttstr(username)  # type: ignore [arg-type]
+        account.szPassword = sdk.ttstr(password)  # type: ignore [arg-type]
+        account.uUserType = usertype
+        account.szNote = sdk.ttstr(note)  # type: ignore [arg-type]
+
+        if user_rights is not None:
+            account.uUserRights = user_rights
+
+        result = sdk._DoNewUserAccount(self._tt, account)
+        if result == -1:
+            raise ValueError("Username or password is invalid")
+        return cast("int", result)
+
+    def _raise_create_user_account_error(self, cmd_err: Any) -> None:  # noqa: ANN401
+        err_nr = cmd_err.nErrorNo
+        if err_nr == sdk.ClientError.CMDERR_INVALID_USERNAME:
+            raise ValueError("Username is invalid")
+        if err_nr == sdk.ClientError.CMDERR_NOT_AUTHORIZED:
+            raise PytalkPermissionError(
+                "The bot does not have permission to create a user account"
+            )
+        if err_nr == sdk.ClientError.CMDERR_NOT_LOGGEDIN:
+            raise PytalkPermissionError("The bot is not logged in")
+
+    def delete_user_account(self, username: str) -> bool:
         """Delete a user account.
 
         Args:
@@ -1033,24 +1781,55 @@ class TeamTalkInstance(sdk.TeamTalk):
                 account.
 
         """
+        cmd_id = self._send_delete_user_account(username)
+        cmd_result, cmd_err = _wait_for_cmd(self, cmd_id, 2000)
+        if not cmd_result:
+            self._raise_delete_user_account_error(cmd_err)
+        return True
+
+    async def async_delete_user_account(self, username: str) -> bool:
+        """Delete a user account without blocking the event loop.
+
+        Awaitable variant of :meth:`delete_user_account`.
+
+        Args:
+            username: The username of the user account to delete.
+
+        Returns:
+            bool: True if the user account was deleted.
+
+        Raises:
+            ValueError: If the username is empty or the user account does not exist.
+            PytalkPermissionError: If the user does not have permission to delete a user
+                account.
+            TimeoutError: If the server did not answer in time.
+
+        """
+        cmd_id = self._send_delete_user_account(username)
+        cmd_result, cmd_err = await _async_wait_for_cmd(self, cmd_id, 2000)
+        if not cmd_result:
+            self._raise_delete_user_account_error(cmd_err)
+        return True
+
+    def _send_delete_user_account(self, username: str) -> int:
         if not username:
             raise ValueError("Username is empty")
         username = sdk.ttstr(username)  # type: ignore [arg-type]
         result = sdk._DoDeleteUserAccount(self._tt, username)
         if result == -1:
             raise ValueError("User account does not exist")
-        cmd_result, cmd_err = _wait_for_cmd(self, result, 2000)
-        if not cmd_result:
-            err_nr = cmd_err.nErrorNo
-            if err_nr == sdk.ClientError.CMDERR_NOT_AUTHORIZED:
-                raise PytalkPermissionError(
-                    "The bot does not have permission to delete a user account"
-                )
-            if err_nr == sdk.ClientError.CMDERR_NOT_LOGGEDIN:
-                raise PytalkPermissionError("The bot is not logged in")
-            if err_nr == sdk.ClientError.CMDERR_ACCOUNT_NOT_FOUND:
-                raise ValueError("User account does not exist")
-        return True
+        return cast("int", result)
+
+    def _raise_delete_user_account_error(self, cmd_err: Any) -> None:  # noqa: ANN401
+        err_nr = cmd_err.nErrorNo
+        if err_nr == sdk.ClientError.CMDERR_NOT_AUTHORIZED:
+            raise PytalkPermissionError(
+                "The bot does not have permission to delete a user account"
+            )
+        if err_nr == sdk.ClientError.CMDERR_NOT_LOGGEDIN:
+            raise PytalkPermissionError("The bot is not logged in")
+        if err_nr == sdk.ClientError.CMDERR_ACCOUNT_NOT_FOUND:
+            raise ValueError("User account does not exist")
 
     async def list_user_accounts(self) -> list[TeamTalkUserAccount]:
         """List all user accounts on the server.
@@ -1069,7 +1848,7 @@ class TeamTalkInstance(sdk.TeamTalk):
         result = sdk._DoListUserAccounts(self._tt, 0, 1000000)
         if result == -1:
             raise ValueError("Unknown error")
-        await asyncio.sleep(1)
+        await self._await_listing(result)
         return self.user_accounts
 
     def upload_file(
@@ -1254,6 +2033,41 @@ class TeamTalkInstance(sdk.TeamTalk):
             ValueError: If the user or channel is not found.
 
         """
+        cmd_result, cmd_err = _wait_for_cmd(
+            self, self._send_kick_user(user, channel), 2000
+        )
+        if not cmd_result:
+            self._raise_kick_user_error(cmd_err)
+        return cmd_result
+
+    async def async_kick_user(
+        self, user: TeamTalkUser | int, channel: TeamTalkChannel | int
+    ) -> bool:
+        """Kicks a user from a channel or the server without blocking the event loop.
+
+        Awaitable variant of :meth:`kick_user`.
+
+        Args:
+            user: The user to kick.
+            channel: The channel to kick the user from. If 0, the user will be kicked
+                from the server. # noqa
+
+        Raises:
+            PytalkPermissionError: If the bot does not have permission to kick users.
+            ValueError: If the user or channel is not found.
+            TimeoutError: If the server did not answer in time.
+
+        """
+        cmd_result, cmd_err = await _async_wait_for_cmd(
+            self, self._send_kick_user(user, channel), 2000
+        )
+        if not cmd_result:
+            self._raise_kick_user_error(cmd_err)
+        return cmd_result
+
+    def _send_kick_user(
+        self, user: TeamTalkUser | int, channel: TeamTalkChannel | int
+    ) -> int:
         if channel == 0:  # server
             if not self.has_permission(cast("int", Permission.KICK_USERS)):
                 raise PytalkPermissionError("You do not have permission to kick users")
@@ -1274,16 +2088,15 @@ class TeamTalkInstance(sdk.TeamTalk):
 
         if result == -1:
             raise ValueError("SDK failed to dispatch the kick command.")
+        return result
 
-        cmd_result, cmd_err = _wait_for_cmd(self, result, 2000)
-        if not cmd_result:
-            err_nr = cmd_err.nErrorNo
-            if err_nr == sdk.ClientError.CMDERR_USER_NOT_FOUND:
-                raise ValueError("User not found")
-            if err_nr == sdk.ClientError.CMDERR_CHANNEL_NOT_FOUND:
-                raise ValueError("Channel not found")
-            raise TeamTalkError(f"Kick command failed with server error: {err_nr}")
-        return cmd_result
+    def _raise_kick_user_error(self, cmd_err: Any) -> None:  # noqa: ANN401
+        err_nr = cmd_err.nErrorNo
+        if err_nr == sdk.ClientError.CMDERR_USER_NOT_FOUND:
+            raise ValueError("User not found")
+        if err_nr == sdk.ClientError.CMDERR_CHANNEL_NOT_FOUND:
+            raise ValueError("Channel not found")
+        raise TeamTalkError(f"Kick command failed with server error: {err_nr}")
 
     def ban_user(
         self, user: TeamTalkUser | int, channel: TeamTalkChannel | int
@@ -1301,20 +2114,54 @@ class TeamTalkInstance(sdk.TeamTalk):
             ValueError: If the user is not found.
 
         """
+        cmd_result, cmd_err = _wait_for_cmd(
+            self, self._send_ban_user(user, channel), 2000
+        )
+        if not cmd_result:
+            self._raise_ban_user_error(cmd_err)
+        return cmd_result
+
+    async def async_ban_user(
+        self, user: TeamTalkUser | int, channel: TeamTalkChannel | int
+    ) -> bool:
+        """Bans a user from a channel or the server without blocking the event loop.
+
+        Awaitable variant of :meth:`ban_user`.
+
+        Args:
+            user: The user to ban.
+            channel: The channel to ban the user from. If 0, the user will be banned
+                from the server. # noqa
+
+        Raises:
+            PytalkPermissionError: If the bot does not have permission to ban users.
+            ValueError: If the user is not found.
+            TimeoutError: If the server did not answer in time.
+
+        """
+        cmd_result, cmd_err = await _async_wait_for_cmd(
+            self, self._send_ban_user(user, channel), 2000
+        )
+        if not cmd_result:
+            self._raise_ban_user_error(cmd_err)
+        return cmd_result
+
+    def _send_ban_user(
+        self, user: TeamTalkUser | int, channel: TeamTalkChannel | int
+    ) -> int:
         if not self.has_permission(cast("int", Permission.BAN_USERS)):
             raise PytalkPermissionError("You do not have permission to ban users")
         _log.debug("Banning user %s from channel %s", user, channel)
         result = self._do_cmd(user, channel, sdk._DoBanUser)
         if result == -1:
             raise ValueError("SDK failed to dispatch the ban command.")
+        return result
 
-        cmd_result, cmd_err = _wait_for_cmd(self, result, 2000)
-        if not cmd_result:
-            err_nr = cmd_err.nErrorNo
-            if err_nr == sdk.ClientError.CMDERR_USER_NOT_FOUND:
-                raise ValueError("User not found")
-            raise TeamTalkError(f"Ban command failed with server error: {err_nr}")
-        return cmd_result
+    def _raise_ban_user_error(self, cmd_err: Any) -> None:  # noqa: ANN401
+        err_nr = cmd_err.nErrorNo
+        if err_nr == sdk.ClientError.CMDERR_USER_NOT_FOUND:
+            raise ValueError("User not found")
+        raise TeamTalkError(f"Ban command failed with server error: {err_nr}")
 
     def unban_user(self, ip: str, channel: TeamTalkChannel | int) -> None:
         """Unbans a user from the server.
@@ -1357,9 +2204,18 @@ class TeamTalkInstance(sdk.TeamTalk):
         result = sdk._DoListBans(self._tt, 0, 0, 1000000)
         if result == -1:
             raise ValueError("Unknown error")
-        await asyncio.sleep(1)
+        await self._await_listing(result)
         return self.banned_users
 
+    async def _await_listing(self, cmd_id: int) -> None:
+        # The entries arrive as separate events before the command completes,
+        # so once the command is answered the listing is complete.
+        if not self._is_pumped():
+            await asyncio.sleep(1)
+            return
+        with contextlib.suppress(TimeoutError):
+            await _async_wait_for_cmd(self, cmd_id, DEF_WAIT)
+
     def get_server_statistics(self, timeout: int) -> TeamTalkServerStatistics:
         """Get the statistics from the server.
 
@@ -1385,6 +2241,39 @@ class TeamTalkInstance(sdk.TeamTalk):
             raise TimeoutError("The request for server statistics timed out.")
         return TeamTalkServerStatistics(self, msg.serverstatistics)
 
+    async def async_get_server_statistics(
+        self,
+        timeout: int,  # noqa: ASYNC109 - the same argument as get_server_statistics
+    ) -> TeamTalkServerStatistics:
+        """Get the statistics from the server without blocking the event loop.
+
+        Awaitable variant of :meth:`get_server_statistics`.
+
+        Args:
+            timeout: The time to wait before assuming that getting the servers
+                statistics failed.
+
+        Raises:
+            TimeoutError: If the server statistics are not received with in the given
+                time.
+
+        Returns:
+            The pytalk.statistics object representing the servers statistics.
+
+        """
+        sdk._DoQueryServerStats(self._tt)
+        try:
+            msg = await _async_wait_for_event(
+                self,
+                cast(
+                    "sdk.ClientEvent", sdk.ClientEvent.CLIENTEVENT_CMD_SERVERSTATISTICS
+                ),
+                timeout * 1000,
+            )
+        except TimeoutError:
+            raise TimeoutError("The request for server statistics timed out.") from None
+        return TeamTalkServerStatistics(self, msg.serverstatistics)
+
     async def _send_message(self, message: sdk.TextMessage, **kwargs: object) -> None:
         """Send a message.
 
@@ -1409,228 +2298,774 @@ class TeamTalkInstance(sdk.TeamTalk):
             lambda: self.doTextMessage(message),
         )
 
-    async def _process_events(self) -> None:  # noqa: C901, PLR0911, PLR0912, PLR0915
-        """Process events from the server.
+    async def _process_events(
+        self,
+        max_events: int = MAX_EVENTS_PER_PASS,
+        stop: Callable[[], bool] | None = None,
+    ) -> int:
+        """Drain all pending events from the server without blocking.
+
+        Messages are fetched from the SDK with a zero timeout until its queue is
+        empty or `max_events` messages have been handled, so a quiet server never
+        stalls the event loop.
 
         This is automatically called by pytalk.Bot.
+
+        Args:
+            max_events: The maximum number of messages to handle in one pass. This
+                keeps a single busy server from starving the others.
+            stop: Checked after every message; the pass ends early once it
+                returns True, e.g. when a blocking event queue is full.
+
+        Returns:
+            int: The number of messages that were processed.
+
         """
-        msg = super().getMessage(100)
-        event = msg.nClientEvent
+        processed = 0
+        while processed < max_events:
+            msg = super().getMessage(0)
+            if msg.nClientEvent == sdk.ClientEvent.CLIENTEVENT_NONE:
+                break
+            processed += 1
+            self._process_message(msg)
+            if stop is not None and stop():
+                break
+        return processed
+
+    def _start_event_reader(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        queue: asyncio.Queue[tuple[TeamTalkInstance, sdk.TTMessage]],
+        max_pending: int,
+    ) -> None:
+        """Start a thread that reads SDK messages off the event loop.
+
+        The thread blocks in `getMessage` and hands every message to `queue` on
+        `loop`. At most `max_pending` messages of this instance may sit in the
+        queue; once that many are pending the thread stops reading and the SDK
+        buffers further events itself. While a synchronous wait takes the
+        messages, the thread reads regardless, since the wait may be holding
+        up the loop that would free the slots.
+
+        This is automatically called by pytalk.Bot when `threaded_events` is
+        enabled.
 
-        if event == sdk.ClientEvent.CLIENTEVENT_NONE:
+        Args:
+            loop: The event loop that consumes the queue.
+            queue: The queue shared by all instances of the bot.
+            max_pending: The maximum number of unprocessed messages.
+
+        """
+        if self._event_reader is not None:
             return
-        if event == sdk.ClientEvent.CLIENTEVENT_USER_FIRSTVOICESTREAMPACKET:
+        self._event_reader_stop.clear()
+        self._event_reader_slots = threading.BoundedSemaphore(max_pending)
+        self._unslotted = 0
+        self._event_reader_target = (loop, queue)
+        self._event_reader = threading.Thread(
+            target=self._read_events,
+            args=(loop, queue, self._event_reader_slots),
+            name=f"pytalk event reader: {self.server_info.host}",
+            daemon=True,
+        )
+        self._event_reader.start()
+
+    def _stop_event_reader(self) -> None:
+        """Stop the event reader thread and wait for it to exit."""
+        if self._event_reader is None:
             return
+        self._event_reader_stop.set()
+        self._event_reader.join(timeout=2 * EVENT_READER_WAIT_MSEC / 1000)
+        self._event_reader = None
+        self._event_reader_slots = None
+        self._event_reader_target = None
 
-        if event == sdk.ClientEvent.CLIENTEVENT_CMD_MYSELF_KICKED:
-            self.connected = False
-            self.logged_in = False
+    def _read_events(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        queue: asyncio.Queue[tuple[TeamTalkInstance, sdk.TTMessage]],
+        slots: threading.BoundedSemaphore,
+    ) -> None:
+        wait = EVENT_READER_WAIT_MSEC / 1000
+        while not self._event_reader_stop.is_set():
+            slotted = self._diverted is None
+            if slotted and not slots.acquire(timeout=wait):
+                continue
+            if self._event_reader_stop.is_set():
+                return
+            msg = super().getMessage(EVENT_READER_WAIT_MSEC)
+            if msg.nClientEvent == sdk.ClientEvent.CLIENTEVENT_NONE:
+                if slotted:
+                    slots.release()
+                continue
+            with self._divert_lock:
+                diverted = self._diverted
+                if diverted is not None:
+                    # A synchronous wait takes it, without a slot.
+                    if slotted:
+                        slots.release()
+                    diverted.put(msg)
+                    continue
+                if not slotted:
+                    self._unslotted += 1
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, (self, msg))
+            except RuntimeError:
+                # The loop was closed under us; there is no one left to consume.
+                return
 
-            self.bot.dispatch(
-                "my_kicked_from_channel", TeamTalkChannel(self, msg.nSource)
-            )
+    def _process_queued_message(self, msg: sdk.TTMessage) -> None:
+        """Handle a message delivered by the event reader thread.
 
-            if self.reconnect_enabled:
-                _log.info(
-                    "Kicked from %s. Attempting to reconnect...",
-                    self.server_info.host,
-                )
-                asyncio.create_task(self._reconnect())
+        Args:
+            msg: The message to handle.
+
+        """
+        if self._unslotted:
+            with self._divert_lock:
+                unslotted = self._unslotted > 0
+                if unslotted:
+                    self._unslotted -= 1
+            if unslotted:
+                self._process_message(msg)
+                return
+        if self._event_reader_slots is not None:
+            with contextlib.suppress(ValueError):
+                self._event_reader_slots.release()
+        self._process_message(msg)
+
+    @contextlib.contextmanager
+    def _exclusive_messages(self) -> Iterator[None]:
+        """Hand the SDK messages to a synchronous wait instead of the event loop.
+
+        Used by the synchronous helpers that wait for a specific SDK message.
+        While the event reader thread runs, it keeps reading the SDK and the
+        helper receives its messages through `_next_message`, so the helper
+        never waits for the reader to return from the SDK. Messages the helper
+        did not read are queued for the event loop afterwards.
+        """
+        with self._message_lock:
+            target = self._event_reader_target
+            if target is None:
+                yield
+                return
+            with self._divert_lock:
+                self._diverted = queue.SimpleQueue()
+            try:
+                yield
+            finally:
+                with self._divert_lock:
+                    diverted, self._diverted = self._diverted, None
+                while not diverted.empty():
+                    self._queue_unslotted(target, diverted.get_nowait())
+
+    def _queue_unslotted(
+        self,
+        target: tuple[
+            asyncio.AbstractEventLoop,
+            asyncio.Queue[tuple[TeamTalkInstance, sdk.TTMessage]],
+        ],
+        msg: sdk.TTMessage,
+    ) -> None:
+        """Queue a message read during a synchronous wait for the event loop."""
+        loop, events = target
+        with self._divert_lock:
+            self._unslotted += 1
+        try:
+            loop.call_soon_threadsafe(events.put_nowait, (self, msg))
+        except RuntimeError:
+            # The loop was closed under us; there is no one left to handle it.
+            with self._divert_lock:
+                self._unslotted -= 1
+
+    def _skip_message(self, msg: sdk.TTMessage) -> None:
+        """Deliver a message a synchronous wait read but was not waiting for.
+
+        While the bot pumps this instance's events, the message is handled on
+        the event loop once the wait returns, like any other, so waiting for a
+        command does not swallow the events that arrive meanwhile. With the
+        event reader running it joins the reader's queue, behind the messages
+        read before it. Otherwise only the state mirror sees it.
+
+        Args:
+            msg: The message.
+
+        """
+        if msg.nClientEvent == sdk.ClientEvent.CLIENTEVENT_NONE:
             return
-        if event == sdk.ClientEvent.CLIENTEVENT_CON_LOST:
-            self.connected = False
-            self.logged_in = False
-            self.bot.dispatch("my_connection_lost", self)
-            if self.reconnect_enabled:
-                _log.info(
-                    "Connection lost to %s. Attempting to reconnect...",
-                    self.server_info.host,
-                )
-                asyncio.create_task(self._reconnect())
+        target = self._event_reader_target
+        if target is not None:
+            self._queue_unslotted(target, msg)
             return
+        if self._is_pumped():
+            # A closed loop raises; then there is no one left to handle it.
+            with contextlib.suppress(RuntimeError):
+                self.bot.loop.call_soon_threadsafe(self._process_message, msg)
+                return
+        self._state.observe(msg)
 
-        if event == sdk.ClientEvent.CLIENTEVENT_USER_STATECHANGE:
-            user_id = msg.user.nUserID
-            current_user_state = msg.user.uUserState
-            if current_user_state & sdk.UserState.USERSTATE_VOICE:
-                if self.bot._listeners.get("user_audio") or self.bot._listeners.get(
-                    "muxed_audio"
-                ):
-                    sdk._EnableAudioBlockEventEx(
-                        self._tt,
-                        user_id,
-                        sdk.StreamType.STREAMTYPE_VOICE,
-                        None,
-                        True,
-                    )
-            else:
-                sdk._EnableAudioBlockEventEx(
-                    self._tt, user_id, sdk.StreamType.STREAMTYPE_VOICE, None, False
-                )
+    def _next_message(self, timeout: int) -> sdk.TTMessage:
+        """Get the next SDK message for a synchronous wait.
+
+        Args:
+            timeout: The time to wait in milliseconds.
+
+        Returns:
+            The message, or an empty one if none arrived in time.
+
+        """
+        diverted = self._diverted
+        if diverted is None:
+            return super().getMessage(timeout)
+        try:
+            return diverted.get(timeout=max(timeout, 0) / 1000)
+        except queue.Empty:
+            return sdk.TTMessage()
+
+    def register_event_decoder(
+        self,
+        event: int,
+        decoder: Callable[[sdk.TTMessage], None],
+        replace: bool = False,
+    ) -> None:
+        """Register a decoder for an SDK client event.
+
+        Decoders are looked up in a table keyed by the event code, so they cost
+        the same regardless of how many are registered. This can be used to
+        handle events that pytalk does not decode itself.
+
+        Example:
+            >>> def on_hotkey(msg):
+            ...     bot.dispatch("hotkey", msg.nSource, msg.bActive)
+            >>> teamtalk.register_event_decoder(
+            ...     sdk.ClientEvent.CLIENTEVENT_HOTKEY, on_hotkey
+            ... )
+
+        Args:
+            event: The `sdk.ClientEvent` code to decode.
+            decoder: A callable that receives the raw `sdk.TTMessage`.
+            replace: Whether to replace a decoder pytalk already provides for the
+                event. Defaults to False.
+
+        Raises:
+            ValueError: If the event already has a decoder and `replace` is False.
+
+        """
+        current = self._event_decoders.get(event)
+        if current is not None and current != self._ignore_event and not replace:
+            raise ValueError(f"Event {event} already has a decoder")
+        self._event_decoders[event] = decoder
+
+    def unregister_event_decoder(self, event: int) -> None:
+        """Remove the decoder for an SDK client event.
+
+        Events without a decoder are logged as unhandled.
+
+        Args:
+            event: The `sdk.ClientEvent` code.
+
+        """
+        self._event_decoders.pop(event, None)
+
+    def _build_event_decoders(self) -> dict[int, Callable[[sdk.TTMessage], None]]:
+        event = sdk.ClientEvent
+        return {
+            # Ordered roughly by frequency; lookups do not depend on it.
+            event.CLIENTEVENT_USER_AUDIOBLOCK: self._on_user_audioblock,
+            event.CLIENTEVENT_CMD_USER_TEXTMSG: self._on_user_textmsg,
+            event.CLIENTEVENT_USER_STATECHANGE: self._on_user_statechange,
+            event.CLIENTEVENT_CMD_USER_UPDATE: self._on_user_update,
+            event.CLIENTEVENT_CMD_USER_JOINED: self._on_user_joined,
+            event.CLIENTEVENT_CMD_USER_LEFT: self._on_user_left,
+            event.CLIENTEVENT_CMD_USER_LOGGEDIN: self._on_user_loggedin,
+            event.CLIENTEVENT_CMD_USER_LOGGEDOUT: self._on_user_loggedout,
+            event.CLIENTEVENT_FILETRANSFER: self._on_filetransfer,
+            event.CLIENTEVENT_CMD_CHANNEL_NEW: self._on_channel_new,
+            event.CLIENTEVENT_CMD_CHANNEL_UPDATE: self._on_channel_update,
+            event.CLIENTEVENT_CMD_CHANNEL_REMOVE: self._on_channel_remove,
+            event.CLIENTEVENT_CMD_FILE_NEW: self._on_file_new,
+            event.CLIENTEVENT_CMD_FILE_REMOVE: self._on_file_remove,
+            event.CLIENTEVENT_CMD_SERVER_UPDATE: self._on_server_update,
+            event.CLIENTEVENT_CMD_SERVERSTATISTICS: self._on_serverstatistics,
+            event.CLIENTEVENT_CMD_USERACCOUNT_NEW: self._on_useraccount_new,
+            event.CLIENTEVENT_CMD_USERACCOUNT_REMOVE: self._on_useraccount_remove,
+            event.CLIENTEVENT_CMD_USERACCOUNT: self._on_useraccount,
+            event.CLIENTEVENT_CMD_BANNEDUSER: self._on_banneduser,
+            event.CLIENTEVENT_CMD_MYSELF_KICKED: self._on_myself_kicked,
+            event.CLIENTEVENT_CON_LOST: self._on_con_lost,
+            event.CLIENTEVENT_CMD_SUCCESS: self._on_cmd_success,
+            event.CLIENTEVENT_CMD_ERROR: self._on_cmd_error,
+            event.CLIENTEVENT_NONE: self._ignore_event,
+            event.CLIENTEVENT_USER_FIRSTVOICESTREAMPACKET: self._ignore_event,
+            event.CLIENTEVENT_CMD_PROCESSING: self._ignore_event,
+            event.CLIENTEVENT_AUDIOINPUT: self._ignore_event,
+            # Handled by whoever awaits them, see async_connect and async_login.
+            event.CLIENTEVENT_CON_SUCCESS: self._ignore_event,
+            event.CLIENTEVENT_CON_FAILED: self._ignore_event,
+            event.CLIENTEVENT_CON_CRYPT_ERROR: self._ignore_event,
+            event.CLIENTEVENT_CMD_MYSELF_LOGGEDIN: self._ignore_event,
+        }
+
+    def _process_message(self, msg: sdk.TTMessage) -> None:
+        """Handle a single message fetched from the SDK.
+
+        Args:
+            msg: The message to handle.
+
+        """
+        if self._event_waiters:
+            self._resolve_event_waiters(msg)
+        self._state.observe(msg)
+        if self._coalescer is not None:
+            self._coalescer.observe(msg)
+        decoder = self._event_decoders.get(msg.nClientEvent)
+        if decoder is None:
+            _log.warning("Unhandled event: %s", msg.nClientEvent)
             return
-        if event == sdk.ClientEvent.CLIENTEVENT_USER_AUDIOBLOCK:
-            sdk_audio_block_ptr = None
-            py_sdk_audio_block_struct_instance = None
-            source_id = msg.nSource
-            with self._audio_sdk_lock:
-                stream_type_enum = sdk.StreamType(msg.nStreamType)
-                sdk_audio_block_ptr = _AcquireUserAudioBlock(
-                    self._tt, stream_type_enum, source_id
-                )
-                if not sdk_audio_block_ptr:
-                    return
-                py_sdk_audio_block_struct_instance = sdk.AudioBlock()
-                try:
-                    ctypes.memmove(
-                        ctypes.addressof(py_sdk_audio_block_struct_instance),
-                        sdk_audio_block_ptr,
-                        ctypes.sizeof(py_sdk_audio_block_struct_instance),
-                    )
-                except OSError:
-                    _ReleaseUserAudioBlock(self._tt, sdk_audio_block_ptr)
-                    return
-                _ReleaseUserAudioBlock(self._tt, sdk_audio_block_ptr)
-            py_audio_block_wrapper: AudioBlock | MuxedAudioBlock | None = None
+        decoder(msg)
+
+    def _expect_command(self, cmd_id: int) -> asyncio.Future[Any]:
+        """Return a future resolved when the server answers the command `cmd_id`.
+
+        The future's result is a (success, message) tuple, matching what
+        `_wait_for_cmd` returns.
+        """
+        future = self._pending_commands.get(cmd_id)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._pending_commands[cmd_id] = future
+        return future
+
+    def _expect_events(
+        self, events: list[sdk.ClientEvent]
+    ) -> asyncio.Future[sdk.TTMessage]:
+        """Return a future resolved with the first message matching `events`."""
+        future: asyncio.Future[sdk.TTMessage] = (
+            asyncio.get_running_loop().create_future()
+        )
+        for event in events:
+            self._event_waiters.setdefault(event, []).append(future)
+        return future
+
+    def _forget_event_waiter(
+        self, events: list[sdk.ClientEvent], future: asyncio.Future[sdk.TTMessage]
+    ) -> None:
+        for event in events:
+            waiters = self._event_waiters.get(event)
+            if waiters is None:
+                continue
+            with contextlib.suppress(ValueError):
+                waiters.remove(future)
+            if not waiters:
+                del self._event_waiters[event]
+
+    def _resolve_event_waiters(self, msg: sdk.TTMessage) -> None:
+        waiters = self._event_waiters.pop(msg.nClientEvent, None)
+        if waiters is None:
+            return
+        for future in waiters:
+            if not future.done():
+                future.set_result(msg)
+
+    def _resolve_command(self, cmd_id: int, result: tuple[bool, Any]) -> None:
+        future = self._pending_commands.pop(cmd_id, None)
+        if future is not None and not future.done():
+            future.set_result(result)
+
+    def _ignore_event(self, msg: sdk.TTMessage) -> None:
+        pass
+
+    def _on_cmd_success(self, msg: sdk.TTMessage) -> None:
+        if self._pending_commands:
+            self._resolve_command(msg.nSource, (True, msg))
+        self.bot.dispatch("command_success", self, msg.nSource)
+
+    def _on_cmd_error(self, msg: sdk.TTMessage) -> None:
+        if self._pending_commands:
+            self._resolve_command(msg.nSource, (False, msg.clienterrormsg))
+        self.bot.dispatch(
+            "command_error", self, msg.nSource, msg.clienterrormsg.nErrorNo
+        )
+
+    def _on_myself_kicked(self, msg: sdk.TTMessage) -> None:
+        self.connected = False
+        self.logged_in = False
+
+        self.bot.dispatch("my_kicked_from_channel", TeamTalkChannel(self, msg.nSource))
+
+        if self.reconnect_enabled:
+            _log.info(
+                "Kicked from %s. Attempting to reconnect...",
+                self.server_info.host,
+            )
+            asyncio.create_task(self._reconnect())
+
+    def _on_con_lost(self, msg: sdk.TTMessage) -> None:  # noqa: ARG002
+        self.connected = False
+        self.logged_in = False
+        self._end_session()
+        self.bot.dispatch("my_connection_lost", self)
+        if self.reconnect_enabled:
+            _log.info(
+                "Connection lost to %s. Attempting to reconnect...",
+                self.server_info.host,
+            )
+            asyncio.create_task(self._reconnect())
+
+    def _on_user_statechange(self, msg: sdk.TTMessage) -> None:
+        user_id = msg.user.nUserID
+        current_user_state = msg.user.uUserState
+        if current_user_state & sdk.UserState.USERSTATE_VOICE:
+            if self._wants_audio(user_id, msg.user.nChannelID):
+                self._enable_audio_blocks(user_id, True)
+        else:
+            self._enable_audio_blocks(user_id, False)
+            self._end_utterances(user_id)
+            self._flush_offloads(user_id)
+
+    def _wants_audio(self, user_id: int, channel_id: int | None = None) -> bool:
+        """Check if anything consumes the audio blocks of `user_id`.
+
+        Args:
+            user_id: The ID of the user, or `sdk.TT_MUXED_USERID`.
+            channel_id: The channel the user is in. Looked up in the state
+                mirror if not given.
+
+        Returns:
+            bool: True if the user is captured, or if all audio is captured and
+                a handler or waiter wants it.
+
+        """
+        captures = self._audio_captures
+        if user_id == sdk.TT_MUXED_USERID:
+            return captures.muxed > 0 or (
+                self._capture_all_audio and self._wants_audio_event("muxed_audio")
+            )
+        if captures:
+            if channel_id is None:
+                user = self._state.users.get(user_id)
+                channel_id = user.nChannelID if user is not None else 0
+            if captures.wants(user_id, channel_id):
+                return True
+        return self._capture_all_audio and self._wants_audio_event("user_audio")
+
+    def _wants_audio_event(self, event: str) -> bool:
+        return event in self.bot._listeners or hasattr(self.bot, "on_" + event)
+
+    def _copy_audio_block(
+        self,
+        msg: sdk.TTMessage,
+        copy_samples: Callable[[sdk.AudioBlock, int], _SamplesT] | None,
+    ) -> tuple[sdk.AudioBlock, _SamplesT | None] | None:
+        """Copy the audio block announced by `msg` out of the SDK.
+
+        The samples are also written to the audio streams open for the block's
+        user. Both happen before the block is released, since the SDK reuses
+        the memory afterwards.
+
+        Args:
+            msg: The CLIENTEVENT_USER_AUDIOBLOCK message.
+            copy_samples: Called with the copied struct and the size of its
+                samples in bytes to copy them, or None to skip the copy.
+
+        Returns:
+            The copied struct and samples, or None if the SDK no longer has
+            the block.
+
+        """
+        utterances: list[Utterance] = []
+        with self._audio_sdk_lock:
+            stream_type_enum = sdk.StreamType(msg.nStreamType)
+            sdk_audio_block_ptr = _AcquireUserAudioBlock(
+                self._tt, stream_type_enum, msg.nSource
+            )
+            if not sdk_audio_block_ptr:
+                return None
+            py_sdk_audio_block_struct_instance = sdk.AudioBlock()
             try:
-                if source_id == sdk.TT_MUXED_USERID:
-                    py_audio_block_wrapper = MuxedAudioBlock(
-                        self, py_sdk_audio_block_struct_instance
-                    )
-                    self.bot.dispatch("muxed_audio", py_audio_block_wrapper)
-                else:
-                    user = TeamTalkUser(self, source_id)
-                    py_audio_block_wrapper = AudioBlock(
-                        user, py_sdk_audio_block_struct_instance
-                    )
-                    self.bot.dispatch("user_audio", py_audio_block_wrapper)
-            except Exception as e:  # noqa: BLE001
-                _log.exception(
-                    "CLIENTEVENT_USER_AUDIOBLOCK: Error during Python wrapper "
-                    "creation or dispatch for source_id %s. Error: %s",
-                    source_id,
-                    e,
+                ctypes.memmove(
+                    ctypes.addressof(py_sdk_audio_block_struct_instance),
+                    sdk_audio_block_ptr,
+                    ctypes.sizeof(py_sdk_audio_block_struct_instance),
                 )
+                block = py_sdk_audio_block_struct_instance
+                size = block.nSamples * block.nChannels * 2 if block.lpRawAudio else 0
+                streams = self._audio_streams.get(msg.nSource)
+                if streams:
+                    for stream in streams:
+                        stream._feed(block, size)
+                if self._recorders and size:
+                    self._feed_recorders(msg.nSource, block, size)
+                if self._segmenters and size:
+                    utterances = self._feed_segmenters(msg.nSource, block, size)
+                if self._offloads and size:
+                    for pool in self._routes_for(self._offloads, msg.nSource):
+                        pool._feed(self, msg.nSource, block, size)
+                data = None if copy_samples is None else copy_samples(block, size)
+            except OSError:
+                return None
+            finally:
+                _ReleaseUserAudioBlock(self._tt, sdk_audio_block_ptr)
+        for utterance in utterances:
+            self.bot.dispatch("utterance", utterance)
+        return py_sdk_audio_block_struct_instance, data
+
+    def _copy_pooled_samples(self, block: sdk.AudioBlock, size: int) -> AudioBuffer:
+        return self._audio_pool.copy_from(block.lpRawAudio or 0, size)
+
+    @staticmethod
+    def _copy_samples(block: sdk.AudioBlock, size: int) -> bytes:
+        return ctypes.string_at(block.lpRawAudio, size) if size else b""
+
+    def _on_user_audioblock(self, msg: sdk.TTMessage) -> None:
+        source_id = msg.nSource
+        pool = self._audio_pool
+        event = "muxed_audio" if source_id == sdk.TT_MUXED_USERID else "user_audio"
+        # Audio streams are fed while the block is copied; a wrapper is only
+        # built if a handler or wait_for wants the event.
+        dispatch = self._wants_audio_event(event)
+        copied = self._copy_audio_block(
+            msg, self._copy_pooled_samples if dispatch else None
+        )
+        if copied is None or not dispatch:
             return
-        if event == sdk.ClientEvent.CLIENTEVENT_CMD_USER_JOINED:
-            user_joined = TeamTalkUser(self, msg.user)
-            if user_joined.id == super().getMyUserID() and self.bot._listeners.get(
-                "muxed_audio"
-            ):
-                sdk._EnableAudioBlockEventEx(
-                    self._tt,
-                    sdk.TT_MUXED_USERID,
-                    sdk.StreamType.STREAMTYPE_VOICE,
-                    None,
-                    True,
+        py_sdk_audio_block_struct_instance, buffer = copied
+        py_audio_block_wrapper: AudioBlock | MuxedAudioBlock | None = None
+        try:
+            if source_id == sdk.TT_MUXED_USERID:
+                py_audio_block_wrapper = MuxedAudioBlock(
+                    self, py_sdk_audio_block_struct_instance, buffer, pool
                 )
-            self.bot.dispatch("user_join", user_joined, user_joined.channel)
-            return
-        if event == sdk.ClientEvent.CLIENTEVENT_CMD_USER_LEFT:
-            user_left = TeamTalkUser(self, msg.user)
-            channel_left_from = TeamTalkChannel(self, msg.nSource)
-            if user_left.id == super().getMyUserID():
-                sdk._EnableAudioBlockEventEx(
-                    self._tt,
-                    sdk.TT_MUXED_USERID,
-                    sdk.StreamType.STREAMTYPE_VOICE,
-                    None,
-                    False,
+                self.bot.dispatch("muxed_audio", py_audio_block_wrapper)
+            else:
+                user = TeamTalkUser(self, source_id)
+                py_audio_block_wrapper = AudioBlock(
+                    user, py_sdk_audio_block_struct_instance, buffer, pool
                 )
-            self.bot.dispatch("user_left", user_left, channel_left_from)
-            return
-        if event == sdk.ClientEvent.CLIENTEVENT_CMD_USER_LOGGEDIN:
-            self.bot.dispatch("user_login", TeamTalkUser(self, msg.user))
-            return
-        if event == sdk.ClientEvent.CLIENTEVENT_CMD_USER_LOGGEDOUT:
-            self.bot.dispatch("user_logout", TeamTalkUser(self, msg.user))
-            return
-        if event == sdk.ClientEvent.CLIENTEVENT_CMD_USER_UPDATE:
-            self.bot.dispatch("user_update", TeamTalkUser(self, msg.user))
+                self.bot.dispatch("user_audio", py_audio_block_wrapper)
+        except Exception as e:  # noqa: BLE001
+            _log.exception(
+                "CLIENTEVENT_USER_AUDIOBLOCK: Error during Python wrapper "
+                "creation or dispatch for source_id %s. Error: %s",
+                source_id,
+                e,
+            )
+        finally:
+            # Drop our own reference; the buffer is reused once the handlers
+            # that were scheduled for the block have returned.
+            if py_audio_block_wrapper is not None:
+                py_audio_block_wrapper._release()
+
+    def _on_user_joined(self, msg: sdk.TTMessage) -> None:
+        user_joined = TeamTalkUser(self, msg.user)
+        self._audio_on_join(user_joined.id, msg.user.nChannelID)
+        self.bot.dispatch("user_join", user_joined, user_joined.channel)
+
+    def _on_user_left(self, msg: sdk.TTMessage) -> None:
+        user_left = TeamTalkUser(self, msg.user)
+        channel_left_from = TeamTalkChannel(self, msg.nSource)
+        self._audio_on_leave(user_left.id)
+        self.bot.dispatch("user_left", user_left, channel_left_from)
+
+    def _audio_on_join(self, user_id: int, channel_id: int) -> None:
+        if user_id == super().getMyUserID():
+            if self._wants_audio(sdk.TT_MUXED_USERID):
+                self._enable_audio_blocks(sdk.TT_MUXED_USERID, True)
+        elif channel_id in self._audio_captures.channels:
+            self._enable_audio_blocks(user_id, True)
+
+    def _audio_on_leave(self, user_id: int) -> None:
+        if user_id == super().getMyUserID():
+            self._enable_audio_blocks(sdk.TT_MUXED_USERID, False)
+            self._end_utterances(sdk.TT_MUXED_USERID)
+            self._flush_offloads(sdk.TT_MUXED_USERID)
             return
+        self._end_utterances(user_id, forget=True)
+        self._flush_offloads(user_id)
+        if self._audio_captures.channels and not self._wants_audio(user_id, 0):
+            self._enable_audio_blocks(user_id, False)
 
-        if event == sdk.ClientEvent.CLIENTEVENT_CMD_USER_TEXTMSG:
-            message: Message | None = None
-            if msg.textmessage.nMsgType == sdk.TextMsgType.MSGTYPE_USER:
-                message = DirectMessage(self, msg.textmessage)
-            elif msg.textmessage.nMsgType == sdk.TextMsgType.MSGTYPE_CHANNEL:
-                message = ChannelMessage(self, msg.textmessage)
-            elif msg.textmessage.nMsgType == sdk.TextMsgType.MSGTYPE_BROADCAST:
-                message = BroadcastMessage(self, msg.textmessage)
-            elif msg.textmessage.nMsgType == sdk.TextMsgType.MSGTYPE_CUSTOM:
-                message = CustomMessage(self, msg.textmessage)
-            if message:
-                self.bot.dispatch("message", message)
-            return
+    def _on_user_loggedin(self, msg: sdk.TTMessage) -> None:
+        self.bot.dispatch("user_login", TeamTalkUser(self, msg.user))
 
-        if event == sdk.ClientEvent.CLIENTEVENT_CMD_CHANNEL_NEW:
-            self.bot.dispatch("channel_new", TeamTalkChannel(self, msg.channel))
-            return
-        if event == sdk.ClientEvent.CLIENTEVENT_CMD_CHANNEL_UPDATE:
-            self.bot.dispatch("channel_update", TeamTalkChannel(self, msg.channel))
-            return
-        if event == sdk.ClientEvent.CLIENTEVENT_CMD_CHANNEL_REMOVE:
-            self.bot.dispatch("channel_delete", TeamTalkChannel(self, msg.channel))
-            return
+    def _on_user_loggedout(self, msg: sdk.TTMessage) -> None:
+        self._close_audio(msg.user.nUserID)
+        self.bot.dispatch("user_logout", TeamTalkUser(self, msg.user))
 
-        if event == sdk.ClientEvent.CLIENTEVENT_CMD_FILE_NEW:
-            self.bot.dispatch("file_new", RemoteFile(self, msg.remotefile))
-            return
-        if event == sdk.ClientEvent.CLIENTEVENT_CMD_FILE_REMOVE:
-            self.bot.dispatch("file_delete", RemoteFile(self, msg.remotefile))
+    def _on_user_update(self, msg: sdk.TTMessage) -> None:
+        if self._coalescer is not None:
+            self._coalescer.push("user_update", msg.user.nUserID, msg.user)
             return
+        self.bot.dispatch("user_update", TeamTalkUser(self, msg.user))
 
-        if event == sdk.ClientEvent.CLIENTEVENT_FILETRANSFER:
-            transfer_id = msg.filetransfer.nTransferID
-            sdk_file_transfer = sdk.FileTransfer()
-            sdk._GetFileTransferInfo(self._tt, transfer_id, sdk_file_transfer)
-            file_transfer = FileTransfer(self, sdk_file_transfer)
-            if transfer_id in self._file_transfer_callbacks:
-                self._file_transfer_callbacks[transfer_id](file_transfer)
-            self.bot.dispatch("file_transfer_progress", file_transfer)
-            return
+    def _on_user_textmsg(self, msg: sdk.TTMessage) -> None:
+        message_class = _TEXT_MESSAGE_CLASSES.get(msg.textmessage.nMsgType)
+        if message_class is not None:
+            self.bot.dispatch("message", message_class(self, msg.textmessage))
 
-        if event == sdk.ClientEvent.CLIENTEVENT_CMD_SERVER_UPDATE:
-            self.bot.dispatch("server_update", self)
-            return
-        if event == sdk.ClientEvent.CLIENTEVENT_CMD_SERVERSTATISTICS:
-            self.bot.dispatch(
-                "server_statistics",
-                TeamTalkServerStatistics(self, msg.serverstatistics),
-            )
+    def _on_channel_new(self, msg: sdk.TTMessage) -> None:
+        self.bot.dispatch("channel_new", TeamTalkChannel(self, msg.channel))
+
+    def _on_channel_update(self, msg: sdk.TTMessage) -> None:
+        if self._coalescer is not None:
+            self._coalescer.push("channel_update", msg.channel.nChannelID, msg.channel)
             return
+        self.bot.dispatch("channel_update", TeamTalkChannel(self, msg.channel))
+
+    def _deliver_update(
+        self, event: str, struct: sdk.User | sdk.Channel, replaced: int
+    ) -> None:
+        payload: object
+        if event == "user_update":
+            if self._snapshot_events:
+                payload = UserSnapshot(self, struct)
+            else:
+                payload = TeamTalkUser(self, struct)
+        elif self._snapshot_events:
+            payload = self._channel_snapshot(struct)
+        else:
+            payload = TeamTalkChannel(self, struct)
+        self.bot.dispatch(event, payload, coalesced=replaced)
+
+    def _on_channel_remove(self, msg: sdk.TTMessage) -> None:
+        self.bot.dispatch("channel_delete", TeamTalkChannel(self, msg.channel))
+
+    def _on_file_new(self, msg: sdk.TTMessage) -> None:
+        self.bot.dispatch("file_new", RemoteFile(self, msg.remotefile))
+
+    def _on_file_remove(self, msg: sdk.TTMessage) -> None:
+        self.bot.dispatch("file_delete", RemoteFile(self, msg.remotefile))
+
+    def _on_filetransfer(self, msg: sdk.TTMessage) -> None:
+        transfer_id = msg.filetransfer.nTransferID
+        sdk_file_transfer = sdk.FileTransfer()
+        sdk._GetFileTransferInfo(self._tt, transfer_id, sdk_file_transfer)
+        file_transfer = FileTransfer(self, sdk_file_transfer)
+        if transfer_id in self._file_transfer_callbacks:
+            self._file_transfer_callbacks[transfer_id](file_transfer)
+        self.bot.dispatch("file_transfer_progress", file_transfer)
 
-        if event == sdk.ClientEvent.CLIENTEVENT_CMD_USERACCOUNT_NEW:
-            account = TeamTalkUserAccount(self, msg.useraccount)
-            self.bot.dispatch("user_account_new", account)
+    def _build_snapshot_decoders(
+        self,
+    ) -> dict[int, Callable[[sdk.TTMessage], None]]:
+        event = sdk.ClientEvent
+        return {
+            event.CLIENTEVENT_USER_AUDIOBLOCK: self._on_user_audioblock_snapshot,
+            event.CLIENTEVENT_CMD_USER_TEXTMSG: self._on_user_textmsg_snapshot,
+            event.CLIENTEVENT_CMD_USER_UPDATE: self._on_user_update_snapshot,
+            event.CLIENTEVENT_CMD_USER_JOINED: self._on_user_joined_snapshot,
+            event.CLIENTEVENT_CMD_USER_LEFT: self._on_user_left_snapshot,
+            event.CLIENTEVENT_CMD_USER_LOGGEDIN: self._on_user_loggedin_snapshot,
+            event.CLIENTEVENT_CMD_USER_LOGGEDOUT: self._on_user_loggedout_snapshot,
+            event.CLIENTEVENT_FILETRANSFER: self._on_filetransfer_snapshot,
+            event.CLIENTEVENT_CMD_CHANNEL_NEW: self._on_channel_new_snapshot,
+            event.CLIENTEVENT_CMD_CHANNEL_UPDATE: self._on_channel_update_snapshot,
+            event.CLIENTEVENT_CMD_CHANNEL_REMOVE: self._on_channel_remove_snapshot,
+        }
+
+    def _channel_snapshot(self, channel: sdk.Channel) -> ChannelSnapshot:
+        channel_id = channel.nChannelID
+        path = self._state.path(channel_id) if channel_id else ""
+        if path is None:
+            path = self._get_channel_path(channel_id)
+        return ChannelSnapshot(self, channel, path)
+
+    def _on_user_audioblock_snapshot(self, msg: sdk.TTMessage) -> None:
+        source_id = msg.nSource
+        event = "muxed_audio" if source_id == sdk.TT_MUXED_USERID else "user_audio"
+        dispatch = self._wants_audio_event(event)
+        copied = self._copy_audio_block(msg, self._copy_samples if dispatch else None)
+        if copied is None or not dispatch:
             return
-        if event == sdk.ClientEvent.CLIENTEVENT_CMD_USERACCOUNT_REMOVE:
-            account = TeamTalkUserAccount(self, msg.useraccount)
-            self.bot.dispatch("user_account_remove", account)
+        block, data = copied
+        snapshot = AudioBlockSnapshot(self, source_id, block, data or b"")
+        self.bot.dispatch(event, snapshot)
+
+    def _on_user_textmsg_snapshot(self, msg: sdk.TTMessage) -> None:
+        if msg.textmessage.nMsgType in _TEXT_MESSAGE_CLASSES:
+            self.bot.dispatch("message", MessageSnapshot(self, msg.textmessage))
+
+    def _on_user_update_snapshot(self, msg: sdk.TTMessage) -> None:
+        if self._coalescer is not None:
+            self._coalescer.push("user_update", msg.user.nUserID, msg.user)
             return
-        if event == sdk.ClientEvent.CLIENTEVENT_CMD_USERACCOUNT:  # Internal
-            account = TeamTalkUserAccount(self, msg.useraccount)
-            self.user_accounts.append(account)
+        self.bot.dispatch("user_update", UserSnapshot(self, msg.user))
+
+    def _on_user_joined_snapshot(self, msg: sdk.TTMessage) -> None:
+        user = UserSnapshot(self, msg.user)
+        self._audio_on_join(user.id, msg.user.nChannelID)
+        channel = self._channel_snapshot(self._get_channel_struct(user.channel_id))
+        self.bot.dispatch("user_join", user, channel)
+
+    def _on_user_left_snapshot(self, msg: sdk.TTMessage) -> None:
+        user = UserSnapshot(self, msg.user)
+        channel = self._channel_snapshot(self._get_channel_struct(msg.nSource))
+        self._audio_on_leave(user.id)
+        self.bot.dispatch("user_left", user, channel)
+
+    def _on_user_loggedin_snapshot(self, msg: sdk.TTMessage) -> None:
+        self.bot.dispatch("user_login", UserSnapshot(self, msg.user))
+
+    def _on_user_loggedout_snapshot(self, msg: sdk.TTMessage) -> None:
+        self._close_audio(msg.user.nUserID)
+        self.bot.dispatch("user_logout", UserSnapshot(self, msg.user))
+
+    def _on_channel_new_snapshot(self, msg: sdk.TTMessage) -> None:
+        self.bot.dispatch("channel_new", self._channel_snapshot(msg.channel))
+
+    def _on_channel_update_snapshot(self, msg: sdk.TTMessage) -> None:
+        if self._coalescer is not None:
+            self._coalescer.push("channel_update", msg.channel.nChannelID, msg.channel)
             return
-        if event == sdk.ClientEvent.CLIENTEVENT_CMD_BANNEDUSER:  # Internal
-            banned_user_struct = sdk.BannedUser()
-            ctypes.memmove(
-                ctypes.byref(banned_user_struct),
-                ctypes.byref(msg.useraccount),
-                ctypes.sizeof(sdk.BannedUser),
-            )
-            banned_user = TeamTalkBannedUserAccount(
-                self, cast("Any", banned_user_struct)
+        self.bot.dispatch("channel_update", self._channel_snapshot(msg.channel))
+
+    def _on_channel_remove_snapshot(self, msg: sdk.TTMessage) -> None:
+        # The channel is gone from the SDK by now, so its path cannot be looked up.
+        self.bot.dispatch("channel_delete", ChannelSnapshot(self, msg.channel, ""))
+
+    def _on_filetransfer_snapshot(self, msg: sdk.TTMessage) -> None:
+        transfer_id = msg.filetransfer.nTransferID
+        sdk_file_transfer = sdk.FileTransfer()
+        sdk._GetFileTransferInfo(self._tt, transfer_id, sdk_file_transfer)
+        if transfer_id in self._file_transfer_callbacks:
+            # Callbacks registered by upload_file/download_file expect the wrapper.
+            self._file_transfer_callbacks[transfer_id](
+                FileTransfer(self, sdk_file_transfer)
             )
-            self.banned_users.append(banned_user)
-            return
+        self.bot.dispatch(
+            "file_transfer_progress", FileTransferSnapshot(self, sdk_file_transfer)
+        )
 
-        if event not in (
-            sdk.ClientEvent.CLIENTEVENT_CMD_PROCESSING,
-            sdk.ClientEvent.CLIENTEVENT_CMD_ERROR,
-            sdk.ClientEvent.CLIENTEVENT_CMD_SUCCESS,
-            sdk.ClientEvent.CLIENTEVENT_AUDIOINPUT,
-        ):
-            _log.warning("Unhandled event: %s", event)
+    def _on_server_update(self, msg: sdk.TTMessage) -> None:  # noqa: ARG002
+        self.bot.dispatch("server_update", self)
+
+    def _on_serverstatistics(self, msg: sdk.TTMessage) -> None:
+        self.bot.dispatch(
+            "server_statistics",
+            TeamTalkServerStatistics(self, msg.serverstatistics),
+        )
+
+    def _on_useraccount_new(self, msg: sdk.TTMessage) -> None:
+        account = TeamTalkUserAccount(self, msg.useraccount)
+        self.bot.dispatch("user_account_new", account)
+
+    def _on_useraccount_remove(self, msg: sdk.TTMessage) -> None:
+        account = TeamTalkUserAccount(self, msg.useraccount)
+        self.bot.dispatch("user_account_remove", account)
+
+    def _on_useraccount(self, msg: sdk.TTMessage) -> None:  # Internal
+        account = TeamTalkUserAccount(self, msg.useraccount)
+        self.user_accounts.append(account)
+
+    def _on_banneduser(self, msg: sdk.TTMessage) -> None:  # Internal
+        banned_user_struct = sdk.BannedUser()
+        ctypes.memmove(
+            ctypes.byref(banned_user_struct),
+            ctypes.byref(msg.useraccount),
+            ctypes.sizeof(sdk.BannedUser),
+        )
+        banned_user = TeamTalkBannedUserAccount(self, cast("Any", banned_user_struct))
+        self.banned_users.append(banned_user)
 
     async def initial_connect_loop(self) -> bool:
         """Attempt to establish an initial connection and login to the server.
@@ -1649,14 +3084,14 @@ class TeamTalkInstance(sdk.TeamTalk):
         self._backoff.reset()
 
         while True:
-            connected_ok = await self.bot.loop.run_in_executor(None, self.connect)
+            connected_ok = await self._attempt_connect()
 
             if connected_ok:
                 _log.info(
                     "Successfully connected to %s. Attempting login...",
                     self.server_info.host,
                 )
-                logged_in_ok = await self.bot.loop.run_in_executor(None, self.login)
+                logged_in_ok = await self._attempt_login()
                 if logged_in_ok:
                     _log.info("Successfully logged in to %s.", self.server_info.host)
                     self._backoff.reset()
@@ -1712,16 +3147,14 @@ class TeamTalkInstance(sdk.TeamTalk):
 
             await self.bot.loop.run_in_executor(None, self.disconnect)
 
-            connected_ok = await self.bot.loop.run_in_executor(None, self.connect)
+            connected_ok = await self._attempt_connect()
 
             if connected_ok:
                 _log.info(
                     "Re-established connection to %s. Attempting login...",
                     self.server_info.host,
                 )
-                logged_in_ok = await self.bot.loop.run_in_executor(
-                    None, self.login, True
-                )
+                logged_in_ok = await self._attempt_login()
                 if logged_in_ok:
                     _log.info(
                         "Successfully reconnected and logged in to %s.",
@@ -1740,10 +3173,45 @@ class TeamTalkInstance(sdk.TeamTalk):
                     self.server_info.host,
                 )
 
+    def _is_pumped(self) -> bool:
+        """Whether the bot is currently pumping this instance's events."""
+        return self.bot._pumping and self in self.bot.teamtalks
+
+    async def _attempt_connect(self) -> bool:
+        # While the bot pumps our events the result can be awaited on the loop;
+        # otherwise fall back to polling for it on a worker thread.
+        if self._is_pumped():
+            return await self.async_connect()
+        return await self.bot.loop.run_in_executor(None, self.connect)
+
+    async def _attempt_login(self) -> bool:
+        if self._is_pumped():
+            return await self.async_login()
+        return await self.bot.loop.run_in_executor(None, self.login, True)
+
     def _get_channel_info(self, channel_id: int) -> tuple[sdk.Channel, str]:
-        _channel = super().getChannel(channel_id)
-        _channel_path = sdk.ttstr(super().getChannelPath(channel_id))
-        return _channel, _channel_path
+        return self._get_channel_struct(channel_id), self._get_channel_path(channel_id)
+
+    def _get_channel_struct(self, channel_id: int) -> sdk.Channel:
+        _channel = self._state.channel(channel_id)
+        if _channel is None:
+            _channel = super().getChannel(channel_id)
+            self._state.store_channel(_channel)
+        return _channel
+
+    def _get_channel_path(self, channel_id: int) -> str:
+        _channel_path = self._state.path(channel_id)
+        if _channel_path is None:
+            _channel_path = sdk.ttstr(super().getChannelPath(channel_id))
+            self._state.store_path(channel_id, _channel_path)
+        return _channel_path
+
+    def _get_user_info(self, user_id: int) -> sdk.User:
+        _user = self._state.user(user_id)
+        if _user is None:
+            _user = super().getUser(user_id)
+            self._state.store_user(_user)
+        return _user
 
     def _get_my_permissions(self) -> int:
         return cast("int", sdk._GetMyUserRights(self._tt))
@@ -1,12 +1,15 @@
 """Module contains the Message class and its subclasses."""
 
+from functools import cached_property
 from typing import TYPE_CHECKING, cast
 
 from .exceptions import PytalkPermissionError
 from .implementation.TeamTalkPy import TeamTalk5 as sdk
 
 if TYPE_CHECKING:
+    from .channel import Channel as TeamTalkChannel
     from .instance import TeamTalkInstance
+    from .user import User as TeamTalkUser
 
 
 class Message:
@@ -30,7 +33,11 @@ class Message:
         self.from_id = msg.nFromUserID
         self.to_id = msg.nToUserID
         self.content = sdk.ttstr(msg.szMessage)
-        self.user = self.teamtalk_instance.get_user(self.from_id)
+
+    @cached_property
+    def user(self) -> "TeamTalkUser":
+        """The user who sent the message, resolved on first access."""
+        return self.teamtalk_instance.get_user(self.from_id)
 
     def reply(self, content: str, **kwargs: object) -> None:
         """Reply to the message.
@@ -124,7 +131,11 @@ class ChannelMessage(Message):
         super().__init__(teamtalk_instance, msg)
         self.to_id = msg.nChannelID
         self.channel_id = msg.nChannelID
-        self.channel = self.teamtalk_instance.get_channel(self.channel_id)
+
+    @cached_property
+    def channel(self) -> "TeamTalkChannel":
+        """The channel the message was sent to, resolved on first access."""
+        return self.teamtalk_instance.get_channel(self.channel_id)
 
 
 class DirectMessage(Message):
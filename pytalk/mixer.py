@@ -0,0 +1,396 @@
+"""Mixing several audio sources into the one stream a bot sends.
+
+A `Mixer` owns a single `Streamer` and sums every `MixerSource` into it, a
+block at a time, so a music bed, announcements and relayed voice play at once
+without a second connection, and without several streamers competing for the
+SDK's queue. Each source has its own gain, and sources added with
+``duck=True`` lower every other source while they play.
+
+Mixing uses NumPy, from the ``numpy`` extra.
+
+Example:
+-------
+
+    .. code-block:: python3
+
+        mixer = pytalk.mixer.Mixer.get_mixer_for_channel(channel)
+        music = mixer.add_source(gain=0.5)
+        music.play("radio.mp3")
+        announcements = mixer.add_source(duck=True)
+
+        @bot.event
+        async def on_message(message):
+            if message.content == "news":
+                announcements.play("news.wav")
+
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+from typing import TYPE_CHECKING, Any
+
+from .decoders import default_decoders, open_source
+from .ringbuffer import PcmRingBuffer
+from .streamer import Pacing, Streamer
+
+if TYPE_CHECKING:
+    from .channel import Channel as TeamTalkChannel
+    from .decoders import Decoder
+    from .instance import TeamTalkInstance
+
+_SAMPLE_BYTES = 2
+_INT16_MIN = -32768
+_INT16_MAX = 32767
+
+_mixers: dict[TeamTalkInstance, Mixer] = {}
+
+
+class MixerSource:
+    """One input of a `Mixer`. Create it with `Mixer.add_source`.
+
+    Samples are 16-bit PCM in the mixer's sample rate and channel count.
+
+    Attributes:
+        gain: The linear gain of the source. Changes are ramped in over
+            `Mixer.duck_time`.
+        duck: Whether the other sources are lowered while this one plays.
+
+    """
+
+    def __init__(
+        self, mixer: Mixer, gain: float, duck: bool, buffer_bytes: int
+    ) -> None:
+        """Create a source. Use `Mixer.add_source`."""
+        self.gain = gain
+        self.duck = duck
+        self._mixer = mixer
+        self._cond = mixer._cond
+        self._ring = PcmRingBuffer(buffer_bytes)
+        # The gain applied to the last block, ramped towards the target.
+        self._applied = gain
+        # Whether samples short of a whole block should be mixed anyway.
+        self._draining = False
+        # Bumped by `stop`, so an outdated `play` thread writes nothing.
+        self._generation = 0
+        self._closed = False
+
+    @property
+    def overwritten(self) -> int:
+        """How many bytes `feed_nowait` dropped because the source was full."""
+        return self._ring.overwritten
+
+    def __len__(self) -> int:
+        """Return the number of bytes waiting to be mixed."""
+        return len(self._ring)
+
+    def feed(self, data: bytes | bytearray | memoryview) -> bool:
+        """Add samples, waiting while the source's buffer is full.
+
+        Do not call this from the event loop; use `feed_nowait` there.
+
+        Args:
+            data: 16-bit PCM samples in any object supporting the buffer
+                protocol.
+
+        Returns:
+            bool: False if the source was closed or stopped first.
+
+        """
+        return self._write(memoryview(data).cast("B"), self._generation)
+
+    def feed_nowait(self, data: bytes | bytearray | memoryview) -> None:
+        """Add samples without waiting, dropping the oldest if the buffer is full.
+
+        Meant for live audio, e.g. relayed voice, and for the event loop.
+
+        Args:
+            data: 16-bit PCM samples in any object supporting the buffer
+                protocol.
+
+        """
+        with self._cond:
+            if self._closed:
+                return
+            self._ring.write(data)
+            self._cond.notify_all()
+
+    def flush(self) -> None:
+        """Mix the samples left over, even if they do not fill a block."""
+        with self._cond:
+            self._draining = True
+            self._cond.notify_all()
+
+    def play(self, path: str) -> None:
+        """Decode a file or an url into the source from a background thread.
+
+        Whatever the source was playing is stopped first.
+
+        Args:
+            path: The file or url to play, opened with `Mixer.decoders`.
+
+        """
+        self.stop()
+        threading.Thread(
+            target=self._play, args=(path, self._generation), daemon=True
+        ).start()
+
+    def stop(self) -> None:
+        """Stop `play` and drop the samples waiting to be mixed."""
+        with self._cond:
+            self._generation += 1
+            self._ring.clear()
+            self._draining = False
+            self._cond.notify_all()
+
+    def close(self) -> None:
+        """Stop the source and remove it from the mixer."""
+        self.stop()
+        with self._cond:
+            self._closed = True
+            self._mixer._sources.remove(self)
+            self._cond.notify_all()
+
+    def _write(self, view: memoryview, generation: int) -> bool:
+        capacity = self._ring.capacity
+        with self._cond:
+            offset = 0
+            while offset < len(view):
+                self._cond.wait_for(
+                    lambda: self._closed
+                    or self._generation != generation
+                    or len(self._ring) < capacity
+                )
+                if self._closed or self._generation != generation:
+                    return False
+                size = min(len(view) - offset, capacity - len(self._ring))
+                self._ring.write(view[offset : offset + size])
+                offset += size
+                self._cond.notify_all()
+            return True
+
+    def _play(self, path: str, generation: int) -> None:
+        mixer = self._mixer
+        source = open_source(mixer.decoders, path, mixer.sample_rate, mixer.channels)
+        try:
+            chunk = memoryview(bytearray(mixer.block_bytes))
+            while size := source.readinto(chunk):
+                if not self._write(chunk[:size], generation):
+                    return
+            with self._cond:
+                if self._generation == generation:
+                    self._draining = True
+                    self._cond.notify_all()
+        finally:
+            source.close()
+
+    def _ready(self, block_bytes: int) -> bool:
+        size = len(self._ring)
+        if self._draining and not size:
+            self._draining = False
+        return size >= block_bytes or (self._draining and size > 0)
+
+
+class Mixer:
+    """Sums any number of sources into one paced stream.
+
+    There is one mixer per `TeamTalkInstance`. It plays into whichever channel
+    the bot is in.
+
+    Attributes:
+        output: The streamer that sends the mixed blocks.
+        decoders: The decoders `MixerSource.play` tries in turn.
+        duck_gain: The factor applied to the other sources while a ducking
+            source plays.
+        duck_time: How many seconds a gain change, including ducking, is
+            ramped over.
+
+    """
+
+    @staticmethod
+    def get_mixer_for_channel(
+        channel: TeamTalkChannel, sample_rate: int = 48000, channels: int = 2
+    ) -> Mixer:
+        """Get the mixer of the channel's instance, creating it if needed.
+
+        Args:
+            channel: A channel of the instance to mix for.
+            sample_rate: The sample rate of a new mixer. Defaults to 48000.
+            channels: The channel count of a new mixer. Defaults to 2.
+
+        Returns:
+            Mixer: The mixer of the instance.
+
+        """
+        teamtalk = channel.teamtalk
+        if teamtalk not in _mixers:
+            _mixers[teamtalk] = Mixer(channel, sample_rate, channels)
+        return _mixers[teamtalk]
+
+    def __init__(
+        self,
+        channel: TeamTalkChannel,
+        sample_rate: int = 48000,
+        channels: int = 2,
+        block_msec: int = 20,
+        target_latency: float = 0.1,
+    ) -> None:
+        """Create a mixer and start its thread.
+
+        Args:
+            channel: A channel of the instance to send from.
+            sample_rate: The sample rate of every source. Defaults to 48000.
+            channels: The channel count of every source. Defaults to 2.
+            block_msec: The length of a mixed block. Defaults to 20.
+            target_latency: How many seconds are mixed ahead of playback.
+                Changes such as ducking are heard this much later. Defaults
+                to 0.1.
+
+        Raises:
+            ImportError: If NumPy is not installed.
+
+        """
+        try:
+            import numpy as np  # noqa: PLC0415
+        except ImportError as exc:
+            raise ImportError(
+                "Mixer requires numpy, install py-talk-ex[numpy]"
+            ) from exc
+        self._np = np
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.frames = sample_rate * block_msec // 1000
+        self.block_bytes = self.frames * channels * _SAMPLE_BYTES
+        self.block_duration = self.frames / sample_rate
+        self.duck_gain = 0.3
+        self.duck_time = 0.2
+        self.decoders: list[Decoder] = default_decoders()
+        self.output = Streamer(
+            channel,
+            sample_rate,
+            channels,
+            Pacing(
+                block_size=self.block_bytes,
+                max_blocks=math.ceil(target_latency / self.block_duration) + 1,
+                target_latency=target_latency,
+            ),
+        )
+        self._sources: list[MixerSource] = []
+        self._cond = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._mix_loop, name="pytalk-mixer", daemon=True
+        )
+        self._thread.start()
+
+    @property
+    def sources(self) -> list[MixerSource]:
+        """The sources being mixed."""
+        with self._cond:
+            return list(self._sources)
+
+    def add_source(
+        self, gain: float = 1.0, duck: bool = False, buffer_msec: int = 1000
+    ) -> MixerSource:
+        """Add an input to the mix.
+
+        Args:
+            gain: The linear gain of the source. Defaults to 1.0.
+            duck: Whether the other sources are lowered to `duck_gain` while
+                this one plays. Defaults to False.
+            buffer_msec: How much audio the source buffers. Defaults to 1000.
+
+        Returns:
+            MixerSource: The new source.
+
+        """
+        frames = self.sample_rate * buffer_msec // 1000
+        buffer_bytes = max(frames, self.frames) * self.channels * _SAMPLE_BYTES
+        source = MixerSource(self, gain, duck, buffer_bytes)
+        with self._cond:
+            self._sources.append(source)
+        return source
+
+    def close(self) -> None:
+        """Close every source, stop mixing and close the output streamer."""
+        for source in self.sources:
+            source.close()
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self.output.close()
+        self._thread.join()
+        for teamtalk, mixer in list(_mixers.items()):
+            if mixer is self:
+                del _mixers[teamtalk]
+
+    def _take_blocks(self, wait: float | None) -> list[tuple[MixerSource, bytes]]:
+        """Wait for sources with a block's worth of samples and read them."""
+        with self._cond:
+            self._cond.wait_for(
+                lambda: self._closed
+                or any(s._ready(self.block_bytes) for s in self._sources),
+                wait,
+            )
+            if self._closed:
+                return []
+            blocks = [
+                (source, source._ring.read(self.block_bytes))
+                for source in self._sources
+                if source._ready(self.block_bytes)
+            ]
+            self._cond.notify_all()
+            return blocks
+
+    def _mix_loop(self) -> None:
+        mix = self._np.zeros((self.frames, self.channels), dtype=self._np.float32)
+        active = False
+        while not self._closed:
+            # While sending, give a live source a block's time to catch up
+            # before the stream is ended.
+            blocks = self._take_blocks(self.block_duration if active else None)
+            if not blocks:
+                if active:
+                    self.output.blocks.flush(end=True)
+                    active = False
+                continue
+            active = True
+            self.output.feed(self._mix(blocks, mix))
+
+    def _mix(self, blocks: list[tuple[MixerSource, bytes]], mix: Any) -> Any:  # noqa: ANN401
+        """Sum the blocks into the float32 `mix` and return them as int16."""
+        np = self._np
+        ducked = any(source.duck for source, _ in blocks)
+        mix.fill(0)
+        for source, data in blocks:
+            samples = np.frombuffer(data, dtype=np.int16)
+            frames = len(samples) // self.channels
+            gain = source.gain
+            if ducked and not source.duck:
+                gain *= self.duck_gain
+            ramp = self._ramp(source, gain)
+            if not isinstance(ramp, float):
+                ramp = ramp[:frames]
+            mix[:frames] += (
+                samples[: frames * self.channels].reshape(frames, self.channels) * ramp
+            )
+        np.clip(mix, _INT16_MIN, _INT16_MAX, out=mix)
+        return mix.astype(np.int16)
+
+    def _ramp(self, source: MixerSource, target: float) -> float | Any:  # noqa: ANN401
+        """Move a source's gain towards `target`.
+
+        Returns the gain, or a column of per-frame gains while it changes.
+        """
+        start = source._applied
+        if self.duck_time <= 0:
+            start = target
+        step = self.block_duration / self.duck_time if self.duck_time > 0 else 0
+        end = start + max(min(target - start, step), -step)
+        source._applied = end
+        if start == end:
+            return float(start)
+        return self._np.linspace(
+            start, end, self.frames, endpoint=False, dtype=self._np.float32
+        )[:, None]
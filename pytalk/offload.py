@@ -0,0 +1,374 @@
+"""Analysing received audio in worker processes.
+
+Transcription, fingerprinting or loudness analysis in an ``on_user_audio``
+handler runs on the event loop, and holds up every other event while it does.
+`TeamTalkInstance.offload_audio` hands the audio to an `AudioWorkerPool`
+instead, which runs a function on it in other processes, so the analysis of
+several speakers is spread over the cores of the machine.
+
+The samples are not pickled: the pool gathers each speaker's audio into
+windows of a fixed length, in slots of one block of shared memory that the
+workers map when they start, and only the position of a window is sent to a
+worker. What the function returns is dispatched as an ``on_audio_result``
+event with an `AudioResult`.
+
+Workers are started with the ``spawn`` method, which re-imports the main
+module, so start the bot under ``if __name__ == "__main__":``.
+
+Example:
+-------
+
+    .. code-block:: python3
+
+        # In an importable module, since workers import the function by name.
+        def loudness(samples, sample_rate, channels):
+            pcm = numpy.frombuffer(samples, dtype=numpy.int16)
+            return float(numpy.sqrt(numpy.mean(pcm.astype(numpy.float32) ** 2)))
+
+        pool = pytalk.offload.AudioWorkerPool(loudness, window_msec=500)
+
+        @bot.event
+        async def on_my_login(server):
+            teamtalk = server.teamtalk_instance
+            teamtalk.offload_audio(pool, channel=teamtalk.get_channel(1))
+
+        @bot.event
+        async def on_audio_result(result):
+            print(result.user_id, result.value)
+
+"""
+
+from __future__ import annotations
+
+import ctypes
+import logging
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from multiprocessing import get_context, shared_memory
+from typing import TYPE_CHECKING, Any, cast
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from concurrent.futures import Future
+
+    from .capture import AudioCapture
+    from .implementation.TeamTalkPy import TeamTalk5 as sdk
+    from .instance import TeamTalkInstance
+
+_log = logging.getLogger(__name__)
+
+_SAMPLE_BYTES = 2
+# TeamTalk audio is at most 48 kHz stereo.
+_MAX_BYTES_PER_SECOND = 48000 * 2 * _SAMPLE_BYTES
+
+# The shared memory and the function of a worker process, set by _start_worker.
+_worker_memory: shared_memory.SharedMemory | None = None
+_worker_buffer: memoryview | None = None
+_worker_analyze: Callable[[memoryview, int, int], Any] | None = None
+
+
+def _start_worker(name: str, analyze: Callable[[memoryview, int, int], Any]) -> None:
+    global _worker_memory, _worker_buffer, _worker_analyze  # noqa: PLW0603
+    _worker_memory = shared_memory.SharedMemory(name)
+    _worker_buffer = cast("memoryview", _worker_memory.buf)
+    _worker_analyze = analyze
+
+
+def _analyze_window(offset: int, size: int, sample_rate: int, channels: int) -> Any:  # noqa: ANN401
+    assert _worker_buffer is not None  # noqa: S101
+    assert _worker_analyze is not None  # noqa: S101
+    with _worker_buffer[offset : offset + size] as samples:
+        return _worker_analyze(samples, sample_rate, channels)
+
+
+class AudioResult:
+    """What the function of an `AudioWorkerPool` returned for one window.
+
+    Attributes:
+        teamtalk: The instance the audio was received on.
+        user_id: The ID of the speaker, or `sdk.TT_MUXED_USERID`.
+        sample_rate: The sample rate of the window.
+        channels: The channel count of the window.
+        duration: The length of the window in seconds.
+        start: The `time.time` the first block of the window was received.
+        value: The return value of the function.
+
+    """
+
+    __slots__ = (
+        "channels",
+        "duration",
+        "sample_rate",
+        "start",
+        "teamtalk",
+        "user_id",
+        "value",
+    )
+
+    def __init__(
+        self,
+        teamtalk: TeamTalkInstance,
+        window: _Window,
+        size: int,
+        value: Any,  # noqa: ANN401
+    ) -> None:
+        """Create a result. They are made by an `AudioWorkerPool`.
+
+        Args:
+            teamtalk: The instance the audio was received on.
+            window: The window that was analysed.
+            size: The number of bytes in the window.
+            value: The return value of the function.
+
+        """
+        self.teamtalk = teamtalk
+        self.user_id = window.user_id
+        self.sample_rate, self.channels = window.format
+        self.duration = size / (self.sample_rate * self.channels * _SAMPLE_BYTES)
+        self.start = window.start
+        self.value = value
+
+    def __repr__(self) -> str:
+        """Return a representation of the result."""
+        return (
+            f"<AudioResult user_id={self.user_id} duration={self.duration:.2f}s "
+            f"value={self.value!r}>"
+        )
+
+
+class _Window:
+    """A slot being filled with the audio of one speaker."""
+
+    __slots__ = ("capacity", "filled", "format", "slot", "start", "user_id")
+
+    def __init__(
+        self, user_id: int, slot: int, audio_format: tuple[int, int], capacity: int
+    ) -> None:
+        self.user_id = user_id
+        self.slot = slot
+        self.format = audio_format
+        self.capacity = capacity
+        self.filled = 0
+        self.start = time.time()
+
+
+class AudioWorkerPool:
+    """Runs a function on windows of received audio in worker processes.
+
+    The function is called in a worker as ``analyze(samples, sample_rate,
+    channels)``, where `samples` is a read-only `memoryview` of interleaved
+    16-bit PCM in shared memory. It is only valid during the call: copy what
+    the return value needs instead of returning the view or an array on it.
+    The function must be picklable, i.e. defined at the top level of a module,
+    and so must its return value.
+
+    A window is sent to a worker once it is full, when the speaker stops
+    transmitting or leaves, or when the format of their audio changes. When
+    every slot is waiting for a worker, received audio is dropped and counted
+    in `dropped`, so slow analysis never holds up the SDK.
+
+    Attributes:
+        window_msec: The length of the windows in milliseconds.
+        slots: The number of windows that can wait for or be in a worker.
+        windows: The number of windows sent to a worker.
+        dropped: The number of blocks dropped because every slot was busy.
+
+    """
+
+    def __init__(
+        self,
+        analyze: Callable[[memoryview, int, int], Any],
+        *,
+        workers: int | None = None,
+        window_msec: int = 100,
+        slots: int = 64,
+    ) -> None:
+        """Start the worker processes.
+
+        Args:
+            analyze: The function to run on each window.
+            workers: The number of worker processes. Defaults to the number
+                of processors.
+            window_msec: The length of the windows in milliseconds. Defaults
+                to 100.
+            slots: The number of windows that can wait for or be in a worker.
+                Defaults to 64.
+
+        Raises:
+            ValueError: If `window_msec` or `slots` is less than 1.
+
+        """
+        if window_msec < 1 or slots < 1:
+            raise ValueError("window_msec and slots must be at least 1")
+        self.window_msec = window_msec
+        self.slots = slots
+        self.windows = 0
+        self.dropped = 0
+        self._slot_bytes = _MAX_BYTES_PER_SECOND * window_msec // 1000
+        self._memory = shared_memory.SharedMemory(
+            create=True, size=self._slot_bytes * slots
+        )
+        self._buffer = (ctypes.c_char * self._memory.size).from_buffer(
+            cast("memoryview", self._memory.buf)
+        )
+        self._address = ctypes.addressof(self._buffer)
+        # Slots are freed from the executor's thread when a result arrives.
+        self._free = list(range(slots))
+        self._free_lock = threading.Lock()
+        self._open: dict[tuple[TeamTalkInstance, int], _Window] = {}
+        self._captures: list[AudioCapture] = []
+        self._closed = False
+        self._executor = ProcessPoolExecutor(
+            workers,
+            mp_context=get_context("spawn"),
+            initializer=_start_worker,
+            initargs=(self._memory.name, analyze),
+        )
+
+    @property
+    def busy(self) -> int:
+        """The number of windows waiting for or being analysed by a worker."""
+        with self._free_lock:
+            return self.slots - len(self._free) - len(self._open)
+
+    def close(self) -> None:
+        """Stop analysing and the workers.
+
+        Captures that feed the pool are released, windows that are not full
+        yet are dropped, and windows that no worker has started on are
+        cancelled. The call waits for the windows being analysed.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        for capture in self._captures:
+            capture.release()
+        self._captures.clear()
+        self._open.clear()
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        del self._buffer
+        self._memory.close()
+        self._memory.unlink()
+
+    def _feed(
+        self,
+        teamtalk: TeamTalkInstance,
+        user_id: int,
+        block: sdk.AudioBlock,
+        size: int,
+    ) -> None:
+        """Copy the samples of an acquired SDK block into the speaker's window."""
+        if self._closed:
+            return
+        key = (teamtalk, user_id)
+        audio_format = (block.nSampleRate, block.nChannels)
+        window = self._open.get(key)
+        if window is not None and window.format != audio_format:
+            self._submit(key)
+            window = None
+        copied = 0
+        while copied < size:
+            if window is None:
+                window = self._open_window(key, audio_format)
+                if window is None:
+                    self.dropped += 1
+                    return
+            count = min(size - copied, window.capacity - window.filled)
+            ctypes.memmove(
+                self._address + window.slot * self._slot_bytes + window.filled,
+                block.lpRawAudio + copied,
+                count,
+            )
+            window.filled += count
+            copied += count
+            if window.filled == window.capacity:
+                self._submit(key)
+                window = None
+
+    def _flush(self, teamtalk: TeamTalkInstance, user_id: int) -> None:
+        """Send the window of a speaker who stopped, however full it is."""
+        if (teamtalk, user_id) in self._open:
+            self._submit((teamtalk, user_id))
+
+    def _flush_all(self, teamtalk: TeamTalkInstance) -> None:
+        """Send the windows of every speaker of an instance whose session ended."""
+        for key in [key for key in self._open if key[0] is teamtalk]:
+            self._submit(key)
+
+    def _open_window(
+        self, key: tuple[TeamTalkInstance, int], audio_format: tuple[int, int]
+    ) -> _Window | None:
+        with self._free_lock:
+            if not self._free:
+                return None
+            slot = self._free.pop()
+        sample_rate, channels = audio_format
+        frame_bytes = channels * _SAMPLE_BYTES
+        frames = max(sample_rate * self.window_msec // 1000, 1)
+        # Formats above 48 kHz stereo get shorter windows rather than a crash.
+        capacity = min(
+            frames * frame_bytes, self._slot_bytes // frame_bytes * frame_bytes
+        )
+        window = self._open[key] = _Window(key[1], slot, audio_format, capacity)
+        return window
+
+    def _submit(self, key: tuple[TeamTalkInstance, int]) -> None:
+        window = self._open.pop(key)
+        if not window.filled:
+            self._release_slot(window.slot)
+            return
+        sample_rate, channels = window.format
+        future = self._executor.submit(
+            _analyze_window,
+            window.slot * self._slot_bytes,
+            window.filled,
+            sample_rate,
+            channels,
+        )
+        self.windows += 1
+        future.add_done_callback(partial(self._done, key[0], window, window.filled))
+
+    def _done(
+        self,
+        teamtalk: TeamTalkInstance,
+        window: _Window,
+        size: int,
+        future: Future[Any],
+    ) -> None:
+        """Dispatch the result of an analysed window and free its slot."""
+        try:
+            self._dispatch(teamtalk, window, size, future)
+        finally:
+            self._release_slot(window.slot)
+
+    def _dispatch(
+        self,
+        teamtalk: TeamTalkInstance,
+        window: _Window,
+        size: int,
+        future: Future[Any],
+    ) -> None:
+        if future.cancelled():
+            return
+        exc = future.exception()
+        if exc is not None:
+            _log.error(
+                "Analysing the audio of user %s failed",
+                window.user_id,
+                exc_info=exc,
+            )
+            return
+        result = AudioResult(teamtalk, window, size, future.result())
+        try:
+            teamtalk.bot.loop.call_soon_threadsafe(
+                teamtalk.bot.dispatch, "audio_result", result
+            )
+        except RuntimeError:
+            # The loop was closed under us; there is no one left to notify.
+            return
+
+    def _release_slot(self, slot: int) -> None:
+        with self._free_lock:
+            self._free.append(slot)
@@ -0,0 +1,332 @@
+"""A queue of tracks played back to back by a `Streamer`.
+
+Tracks added to a `Playlist` are resolved and opened ahead of time by a
+prefetch thread: search terms are looked up with yt-dlp, the decoder is
+started and the first second or so is decoded into memory. The player thread
+writes each track's samples into the streamer's block queue right after the
+previous track's last sample, without an end marker in between, so there is no
+gap. Optionally the end of a track is crossfaded into the start of the next.
+
+Example:
+-------
+
+    .. code-block:: python3
+
+        streamer = pytalk.Streamer.get_streamer_for_channel(channel)
+        streamer.playlist.crossfade = 2.0
+        streamer.enqueue("intro.wav")
+        streamer.enqueue("https://www.example.com/some/song")
+        streamer.enqueue("artist - title")  # searched with yt-dlp
+
+"""
+
+from __future__ import annotations
+
+import array
+import collections
+import itertools
+import logging
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from .decoders import open_source, search
+
+if TYPE_CHECKING:
+    from .decoders import AudioSource
+    from .streamer import Streamer
+
+_log = logging.getLogger(__name__)
+
+_SAMPLE_BYTES = 2
+
+
+class _Entry:
+    """A queued track and what the prefetch thread prepared for it."""
+
+    __slots__ = ("dropped", "error", "head", "query", "ready", "source", "started")
+
+    def __init__(self, query: str) -> None:
+        self.query = query
+        self.source: AudioSource | None = None
+        # The decoded start of the track.
+        self.head = bytearray()
+        self.error: Exception | None = None
+        self.started = False
+        self.dropped = False
+        self.ready = threading.Event()
+
+    def close(self) -> None:
+        if self.source is not None:
+            self.source.close()
+            self.source = None
+
+
+def _crossfade(out: bytes | bytearray, into: bytes | bytearray, channels: int) -> bytes:
+    """Fade `out` out while fading `into` in. Both hold the same frame count."""
+    old = array.array("h", out)
+    new = array.array("h", into)
+    frames = max(len(old) // channels, 1)
+    mixed = array.array(
+        "h",
+        (
+            a + (b - a) * (i // channels) // frames
+            for i, (a, b) in enumerate(zip(old, new, strict=True))
+        ),
+    )
+    return mixed.tobytes()
+
+
+class Playlist:
+    """Plays queued tracks without gaps. Use `Streamer.playlist`.
+
+    Attributes:
+        prefetch: How many tracks after the current one are resolved and
+            opened ahead of time.
+        preload: How many seconds of each prefetched track are decoded into
+            memory before it starts.
+        crossfade: How many seconds the end of a track overlaps the start of
+            the next. 0 splices them back to back.
+        current: The entry being played, or None.
+
+    """
+
+    def __init__(
+        self,
+        streamer: Streamer,
+        prefetch: int = 2,
+        preload: float = 1.0,
+        crossfade: float = 0.0,
+    ) -> None:
+        """Create an empty playlist. Its threads start with the first track.
+
+        Args:
+            streamer: The streamer that plays the tracks.
+            prefetch: How many upcoming tracks are prepared. Defaults to 2.
+            preload: Seconds decoded ahead per track. Defaults to 1.0.
+            crossfade: Seconds of overlap between tracks. Defaults to 0.0.
+
+        """
+        self.prefetch = prefetch
+        self.preload = preload
+        self.crossfade = crossfade
+        self.current: str | None = None
+        self._streamer = streamer
+        self._entries: collections.deque[_Entry] = collections.deque()
+        self._playing: _Entry | None = None
+        self._cond = threading.Condition()
+        self._closed = False
+        self._threads: list[threading.Thread] = []
+
+    def __len__(self) -> int:
+        """Return the number of tracks waiting to be played."""
+        return len(self._entries)
+
+    @property
+    def entries(self) -> list[str]:
+        """The tracks waiting to be played, in order."""
+        with self._cond:
+            return [entry.query for entry in self._entries]
+
+    def add(self, entry: str) -> None:
+        """Queue a track.
+
+        Args:
+            entry: A local file, an url, or search terms for yt-dlp.
+
+        Raises:
+            RuntimeError: If the playlist has been closed.
+
+        """
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("The playlist is closed.")
+            self._entries.append(_Entry(entry))
+            if not self._threads:
+                self._threads = [
+                    threading.Thread(target=target, name=name, daemon=True)
+                    for target, name in (
+                        (self._prefetch_loop, "pytalk-prefetch"),
+                        (self._play_loop, "pytalk-playlist"),
+                    )
+                ]
+                for thread in self._threads:
+                    thread.start()
+            self._cond.notify_all()
+
+    def skip(self) -> None:
+        """Stop the current track and go on with the next one."""
+        with self._cond:
+            if self._playing is not None:
+                self._drop(self._playing)
+        self._streamer.blocks.clear()
+
+    def clear(self) -> None:
+        """Stop the current track and drop every queued one."""
+        with self._cond:
+            for entry in self._entries:
+                self._drop(entry)
+                # Nobody reads a queued track. One still being prepared is
+                # closed by the prefetch thread.
+                if entry.source is not None:
+                    entry.close()
+            self._entries.clear()
+            if self._playing is not None:
+                self._drop(self._playing)
+        self._streamer.blocks.clear()
+
+    def close(self) -> None:
+        """Clear the playlist and stop its threads."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self.clear()
+        for thread in self._threads:
+            if thread is not threading.current_thread():
+                thread.join()
+
+    def _drop(self, entry: _Entry) -> None:
+        # Called with the lock held. Wakes the player if it waits for the
+        # entry to be prepared; the source is closed by whoever reads it.
+        entry.dropped = True
+        entry.ready.set()
+
+    def _frame_bytes(self) -> int:
+        return self._streamer.channels * _SAMPLE_BYTES
+
+    def _seconds_to_bytes(self, seconds: float) -> int:
+        frames = int(seconds * self._streamer.sample_rate)
+        return frames * self._frame_bytes()
+
+    def _prefetch_loop(self) -> None:
+        while True:
+            with self._cond:
+                while True:
+                    if self._closed:
+                        return
+                    window = itertools.islice(self._entries, self.prefetch)
+                    entry = next((e for e in window if not e.started), None)
+                    if entry is not None:
+                        break
+                    self._cond.wait()
+                entry.started = True
+            self._prepare(entry)
+
+    def _prepare(self, entry: _Entry) -> None:
+        streamer = self._streamer
+        source = None
+        head = bytearray()
+        try:
+            path: str | None = entry.query
+            if not entry.query.startswith("http") and not Path(entry.query).exists():
+                path = search(entry.query)
+            if path is None:
+                raise RuntimeError(f"No results found for {entry.query}.")
+            source = open_source(
+                streamer.decoders, path, streamer.sample_rate, streamer.channels
+            )
+            size = self._seconds_to_bytes(max(self.preload, self.crossfade))
+            head = bytearray(size)
+            view = memoryview(head)
+            filled = 0
+            while filled < size:
+                read = source.readinto(view[filled:])
+                if not read:
+                    break
+                filled += read
+            view.release()
+            del head[filled:]
+        except (OSError, RuntimeError) as exc:
+            _log.warning("Could not open %s: %s", entry.query, exc)
+            entry.error = exc
+        with self._cond:
+            entry.source = source
+            entry.head = head
+            if entry.dropped:
+                entry.close()
+            entry.ready.set()
+
+    def _next(self, tail: bytearray) -> _Entry | None:
+        """Wait for the next track, playing out `tail` if there is none yet."""
+        with self._cond:
+            idle = not self._entries
+        if idle:
+            # Nothing to splice into: play the end and mark it, so the wait
+            # for the next track does not count as an underrun.
+            self._streamer.feed(tail)
+            del tail[:]
+            self._streamer.blocks.flush(end=True)
+        with self._cond:
+            while not self._entries and not self._closed:
+                self._cond.wait()
+            if self._closed:
+                return None
+            entry = self._playing = self._entries.popleft()
+            self.current = entry.query
+            prepare = not entry.started
+            entry.started = True
+            # The prefetch window moved on.
+            self._cond.notify_all()
+        if prepare:
+            self._prepare(entry)
+        return entry
+
+    def _play_loop(self) -> None:
+        tail = bytearray()
+        while (entry := self._next(tail)) is not None:
+            entry.ready.wait()
+            if entry.dropped:
+                # Skipped: the end of the previous track goes too.
+                del tail[:]
+            elif entry.source is not None:
+                tail = self._play(entry, tail)
+            with self._cond:
+                entry.close()
+                self._playing = None
+                self.current = None
+                dropped = entry.dropped
+            if dropped:
+                # Drop what was written while the skip was noticed.
+                self._streamer.blocks.clear()
+
+    def _play(self, entry: _Entry, tail: bytearray) -> bytearray:
+        """Play a track after `tail`, and return the end held back for a fade."""
+        streamer = self._streamer
+        source = entry.source
+        assert source is not None  # noqa: S101
+        frame_bytes = self._frame_bytes()
+        fade = self._seconds_to_bytes(self.crossfade)
+        head = entry.head
+        overlap = min(len(tail), len(head)) // frame_bytes * frame_bytes
+        if tail:
+            streamer.feed(tail[: len(tail) - overlap])
+            streamer.feed(
+                _crossfade(
+                    tail[len(tail) - overlap :], head[:overlap], streamer.channels
+                )
+            )
+        pending = bytearray(memoryview(head)[overlap:])
+        chunk = memoryview(bytearray(streamer.block_size))
+        while not entry.dropped:
+            # Everything but the last `fade` bytes can be sent. Keeping up to
+            # twice that before sending limits how often `pending` is moved.
+            if len(pending) > 2 * fade:
+                cut = len(pending) - fade
+                with memoryview(pending) as view, view[:cut] as part:
+                    streamer.feed(part)
+                del pending[:cut]
+            size = source.readinto(chunk)
+            if not size:
+                break
+            if fade:
+                pending += chunk[:size]
+            else:
+                streamer.feed(chunk[:size])
+        if entry.dropped:
+            return bytearray()
+        if len(pending) > fade:
+            cut = len(pending) - fade
+            with memoryview(pending) as view, view[:cut] as part:
+                streamer.feed(part)
+            del pending[:cut]
+        return pending
@@ -0,0 +1,386 @@
+"""Recording of received audio to one file per speaker.
+
+A `Recorder` collects the samples of each user it is fed and writes them from a
+background thread, so no file I/O happens on the event loop. Samples are
+gathered per user and handed to the writer in large chunks, and files are
+rotated once they reach a size or a length.
+
+Gaps between talk spurts are not kept in memory: only their length is noted,
+and the writer either pads the track with silence, keeping it aligned with
+wall-clock time, or skips the gap.
+
+WAV files are written with the standard library. FLAC files require the
+``flac`` extra (``soundfile``).
+
+Example:
+-------
+
+    .. code-block:: python3
+
+        recorder = pytalk.recorder.Recorder("recordings", max_seconds=3600)
+
+        @bot.event
+        async def on_my_login(server):
+            teamtalk = server.teamtalk_instance
+            teamtalk.record_audio(recorder, channel=teamtalk.get_channel(1))
+
+        # Later, e.g. on shutdown:
+        recorder.close()
+
+"""
+
+from __future__ import annotations
+
+import datetime
+import logging
+import threading
+import wave
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Protocol
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from .capture import AudioCapture
+
+_log = logging.getLogger(__name__)
+
+_SAMPLE_BYTES = 2
+_ZEROS = bytes(64 * 1024)
+# The sample rate and channel count of a chunk of samples.
+_Format = tuple[int, int]
+
+
+class _TrackFile(Protocol):
+    def write(self, data: bytes | bytearray | memoryview) -> None: ...
+
+    def close(self) -> None: ...
+
+
+class _WavFile:
+    def __init__(self, path: Path, sample_rate: int, channels: int) -> None:
+        self._wave = wave.open(str(path), "wb")  # noqa: SIM115
+        self._wave.setnchannels(channels)
+        self._wave.setsampwidth(_SAMPLE_BYTES)
+        self._wave.setframerate(sample_rate)
+
+    def write(self, data: bytes | bytearray | memoryview) -> None:
+        # The header is patched once, on close.
+        self._wave.writeframesraw(data)
+
+    def close(self) -> None:
+        self._wave.close()
+
+
+class _FlacFile:
+    def __init__(self, path: Path, sample_rate: int, channels: int) -> None:
+        try:
+            import soundfile  # noqa: PLC0415
+        except ImportError as exc:
+            raise ImportError(
+                "Recording FLAC requires soundfile, install py-talk-ex[flac]"
+            ) from exc
+        self._file = soundfile.SoundFile(
+            path,
+            "w",
+            samplerate=sample_rate,
+            channels=channels,
+            format="FLAC",
+            subtype="PCM_16",
+        )
+
+    def write(self, data: bytes | bytearray | memoryview) -> None:
+        self._file.buffer_write(data, dtype="int16")
+
+    def close(self) -> None:
+        self._file.close()
+
+
+_FORMATS: dict[str, Callable[[Path, int, int], _TrackFile]] = {
+    "wav": _WavFile,
+    "flac": _FlacFile,
+}
+
+
+class _Track:
+    """The state of one speaker's recording."""
+
+    __slots__ = (
+        "file",
+        "file_bytes",
+        "file_format",
+        "format",
+        "last_seen",
+        "limit",
+        "part",
+        "path",
+        "pending",
+        "started",
+    )
+
+    def __init__(self) -> None:
+        self.format: _Format | None = None
+        self.last_seen: float | None = None
+        # Chunks waiting for the writer: (format, samples or silence in bytes).
+        self.pending: list[tuple[_Format, bytearray | int]] = []
+        self.file: _TrackFile | None = None
+        self.file_format: _Format | None = None
+        self.path: Path | None = None
+        self.file_bytes = 0
+        self.limit = 0
+        self.part = 0
+        self.started: datetime.datetime | None = None
+
+
+class Recorder:
+    """Writes received audio to one rotating file per speaker.
+
+    Feed it with `TeamTalkInstance.record_audio`. The recorder is thread-safe:
+    samples are added on the event loop and written by its own thread.
+
+    Attributes:
+        directory: The directory the files are written to.
+        files: The paths of every file the recorder has finished.
+        dropped_bytes: The number of sample bytes dropped because the writer
+            fell more than `max_pending_bytes` behind.
+
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        directory: str | Path,
+        *,
+        format: str = "wav",  # noqa: A002
+        max_bytes: int | None = None,
+        max_seconds: float | None = None,
+        fill_silence: bool = True,
+        gap_msec: int = 200,
+        chunk_bytes: int = 256 * 1024,
+        flush_interval: float = 1.0,
+        max_pending_bytes: int = 64 * 1024 * 1024,
+        name_format: str = "{track}-{started:%Y%m%d-%H%M%S}-{part}",
+    ) -> None:
+        """Create the recorder and start its writer thread.
+
+        Args:
+            directory: The directory to write the files to. It is created if
+                needed.
+            format: ``"wav"`` or ``"flac"``. Defaults to ``"wav"``.
+            max_bytes: Start a new file once a file holds this many bytes of
+                samples. Defaults to None, no limit.
+            max_seconds: Start a new file once a file holds this much audio.
+                Defaults to None, no limit.
+            fill_silence: Whether gaps between talk spurts are written as
+                silence, so the position in a file matches wall-clock time.
+                Otherwise the talk spurts are written back to back. Defaults
+                to True.
+            gap_msec: How late a block must arrive before the time since the
+                previous one counts as a gap. Defaults to 200.
+            chunk_bytes: How many bytes a speaker's buffer holds before the
+                writer is woken up. Defaults to 256 KiB.
+            flush_interval: The longest time in seconds samples wait before
+                they are written. Defaults to 1.0.
+            max_pending_bytes: The most bytes of samples waiting for the
+                writer. Further samples are dropped and counted in
+                `dropped_bytes`. Defaults to 64 MiB.
+            name_format: The file name without extension, formatted with
+                ``track`` (the user ID, or ``muxed``), ``started`` (the local
+                time the file was opened) and ``part``.
+
+        Raises:
+            ValueError: If `format` is not supported.
+
+        """
+        if format not in _FORMATS:
+            raise ValueError(f"Unsupported recording format: {format!r}")
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.format = format
+        self.max_bytes = max_bytes
+        self.max_seconds = max_seconds
+        self.fill_silence = fill_silence
+        self.gap_msec = gap_msec
+        self.chunk_bytes = chunk_bytes
+        self.flush_interval = flush_interval
+        self.max_pending_bytes = max_pending_bytes
+        self.name_format = name_format
+        self.files: list[Path] = []
+        self.dropped_bytes = 0
+        self._tracks: dict[int | str, _Track] = {}
+        self._pending_bytes = 0
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._captures: list[AudioCapture] = []
+        self._writer = threading.Thread(
+            target=self._write_loop, name="pytalk-recorder", daemon=True
+        )
+        self._writer.start()
+
+    @property
+    def closed(self) -> bool:
+        """Whether the recorder has been closed."""
+        return self._closed
+
+    def feed(
+        self,
+        track: int | str,
+        sample_rate: int,
+        channels: int,
+        data: bytes | bytearray | memoryview,
+        now: float,
+    ) -> None:
+        """Add received samples to a speaker's track.
+
+        Args:
+            track: The user ID, or ``"muxed"``.
+            sample_rate: The sample rate of the samples.
+            channels: The channel count of the samples.
+            data: Interleaved 16-bit PCM. It is copied before returning.
+            now: The `time.monotonic` time the samples were received.
+
+        """
+        size = len(data)
+        if self._closed or not size:
+            return
+        fmt = (sample_rate, channels)
+        wake = False
+        with self._lock:
+            track_state = self._tracks.get(track)
+            if track_state is None:
+                track_state = self._tracks[track] = _Track()
+            if self._pending_bytes + size > self.max_pending_bytes:
+                self.dropped_bytes += size
+                track_state.last_seen = now
+                return
+            pending = track_state.pending
+            if track_state.last_seen is not None and track_state.format == fmt:
+                frame_bytes = channels * _SAMPLE_BYTES
+                duration = size / (frame_bytes * sample_rate)
+                gap = now - track_state.last_seen - duration
+                if gap * 1000 > self.gap_msec and self.fill_silence:
+                    frames = round(gap * sample_rate)
+                    pending.append((fmt, frames * frame_bytes))
+            track_state.format = fmt
+            track_state.last_seen = now
+            if (
+                pending
+                and pending[-1][0] == fmt
+                and isinstance(pending[-1][1], bytearray)
+            ):
+                chunk = pending[-1][1]
+                chunk += data
+            else:
+                chunk = bytearray(data)
+                pending.append((fmt, chunk))
+            self._pending_bytes += size
+            wake = len(chunk) >= self.chunk_bytes
+        if wake:
+            self._wakeup.set()
+
+    def close(self) -> None:
+        """Write everything that is buffered, close the files and stop.
+
+        Captures that feed the recorder are released.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        for capture in self._captures:
+            capture.release()
+        self._captures.clear()
+        self._wakeup.set()
+        self._writer.join()
+
+    def _write_loop(self) -> None:
+        while not self._closed:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self._flush()
+        self._flush()
+        with self._lock:
+            tracks = list(self._tracks.items())
+        for track, state in tracks:
+            self._close_file(track, state)
+
+    def _flush(self) -> None:
+        with self._lock:
+            work = [
+                (track, state, state.pending)
+                for track, state in self._tracks.items()
+                if state.pending
+            ]
+            for _, state, _ in work:
+                state.pending = []
+            self._pending_bytes = 0
+        for track, state, chunks in work:
+            for fmt, payload in chunks:
+                try:
+                    self._write(track, state, fmt, payload)
+                except Exception:  # noqa: BLE001 - keep the writer thread alive
+                    _log.exception("Failed to write the recording of %s", track)
+
+    def _write(
+        self, track: int | str, state: _Track, fmt: _Format, payload: bytearray | int
+    ) -> None:
+        if isinstance(payload, int):
+            while payload > 0:
+                size = min(payload, len(_ZEROS))
+                self._write_bytes(track, state, fmt, memoryview(_ZEROS)[:size])
+                payload -= size
+            return
+        self._write_bytes(track, state, fmt, memoryview(payload))
+
+    def _write_bytes(
+        self, track: int | str, state: _Track, fmt: _Format, view: memoryview
+    ) -> None:
+        while len(view):
+            if state.file is None or state.file_format != fmt:
+                self._open_file(track, state, fmt)
+            assert state.file is not None  # noqa: S101
+            room = state.limit - state.file_bytes if state.limit else len(view)
+            part = view[:room]
+            state.file.write(part)
+            state.file_bytes += len(part)
+            view = view[len(part) :]
+            if state.limit and state.file_bytes >= state.limit:
+                self._close_file(track, state)
+
+    def _open_file(self, track: int | str, state: _Track, fmt: _Format) -> None:
+        self._close_file(track, state)
+        sample_rate, channels = fmt
+        frame_bytes = channels * _SAMPLE_BYTES
+        limits = []
+        if self.max_bytes:
+            limits.append(self.max_bytes)
+        if self.max_seconds:
+            limits.append(int(self.max_seconds * sample_rate) * frame_bytes)
+        state.limit = max(min(limits) // frame_bytes, 1) * frame_bytes if limits else 0
+        state.started = datetime.datetime.now()  # noqa: DTZ005
+        state.part += 1
+        name = self.name_format.format(
+            track=track, started=state.started, part=state.part
+        )
+        state.path = self.directory / f"{name}.{self.format}"
+        state.file = _FORMATS[self.format](state.path, sample_rate, channels)
+        state.file_format = fmt
+        state.file_bytes = 0
+
+    def _close_file(self, track: int | str, state: _Track) -> None:
+        if state.file is None:
+            return
+        try:
+            state.file.close()
+        except Exception:  # noqa: BLE001 - keep the writer thread alive
+            _log.exception("Failed to close the recording of %s", track)
+        state.file = None
+        if state.path is not None:
+            self.files.append(state.path)
+
+    def __enter__(self) -> Recorder:
+        """Return the recorder itself."""
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:  # noqa: ANN401
+        """Close the recorder."""
+        self.close()
@@ -0,0 +1,290 @@
+"""Pull-based access to received audio.
+
+`TeamTalkInstance.open_audio_stream` returns an `AudioStream` for one user, or
+for the muxed stream of the bot's channel. The audio block decoder writes the
+samples straight into the stream's fixed-size ring buffer, without creating a
+wrapper or a task per block, and the consumer reads them at its own pace.
+
+Example:
+-------
+
+    .. code-block:: python3
+
+        @bot.event
+        async def on_user_join(user, channel):
+            stream = user.teamtalk_instance.open_audio_stream(user)
+            async for frame in stream:  # 20 ms of 16-bit PCM per frame
+                recognizer.feed(frame)
+
+If the consumer falls behind by more than the ring's capacity, the oldest
+samples are overwritten and counted in `AudioStream.overruns`.
+
+"""
+
+import asyncio
+import ctypes
+from collections.abc import AsyncIterator, Callable
+
+from .implementation.TeamTalkPy import TeamTalk5 as sdk
+
+_SAMPLE_BYTES = 2
+
+
+class PcmRingBuffer:
+    """A fixed-size ring of bytes that overwrites its oldest data when full.
+
+    Attributes:
+        capacity: The size of the ring in bytes.
+        overwritten: The number of bytes lost because the ring was full.
+
+    """
+
+    def __init__(self, capacity: int) -> None:
+        """Allocate the ring.
+
+        Args:
+            capacity: The size of the ring in bytes.
+
+        Raises:
+            ValueError: If `capacity` is less than 1.
+
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.overwritten = 0
+        self._buffer = (ctypes.c_char * capacity)()
+        self._address = ctypes.addressof(self._buffer)
+        self._view = memoryview(self._buffer).cast("B")
+        self._start = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        """Return the number of bytes that can be read."""
+        return self._size
+
+    def write_from(self, address: int, size: int) -> None:
+        """Copy `size` bytes at `address` into the ring.
+
+        Args:
+            address: The address of the data, e.g. an SDK audio block.
+            size: The number of bytes to copy.
+
+        """
+        if size > self.capacity:
+            address += size - self.capacity
+            self.overwritten += size - self.capacity
+            size = self.capacity
+        end = (self._start + self._size) % self.capacity
+        first = min(size, self.capacity - end)
+        ctypes.memmove(self._address + end, address, first)
+        if first < size:
+            ctypes.memmove(self._address, address + first, size - first)
+        self._grow(size)
+
+    def write(self, data: bytes | bytearray | memoryview) -> None:
+        """Copy a bytes-like object into the ring.
+
+        Args:
+            data: The data to copy.
+
+        """
+        view = memoryview(data).cast("B")
+        if len(view) > self.capacity:
+            self.overwritten += len(view) - self.capacity
+            view = view[-self.capacity :]
+        size = len(view)
+        end = (self._start + self._size) % self.capacity
+        first = min(size, self.capacity - end)
+        self._view[end : end + first] = view[:first]
+        if first < size:
+            self._view[: size - first] = view[first:]
+        self._grow(size)
+
+    def read(self, size: int) -> bytes:
+        """Remove and return up to `size` bytes from the ring.
+
+        Args:
+            size: The most bytes to read.
+
+        Returns:
+            The oldest bytes in the ring.
+
+        """
+        size = min(size, self._size)
+        first = min(size, self.capacity - self._start)
+        data = self._view[self._start : self._start + first].tobytes()
+        if first < size:
+            data += self._view[: size - first].tobytes()
+        self._start = (self._start + size) % self.capacity
+        self._size -= size
+        return data
+
+    def clear(self) -> None:
+        """Discard everything in the ring."""
+        self._start = 0
+        self._size = 0
+
+    def _grow(self, size: int) -> None:
+        self._size += size
+        if self._size > self.capacity:
+            lost = self._size - self.capacity
+            self.overwritten += lost
+            self._start = (self._start + lost) % self.capacity
+            self._size = self.capacity
+
+
+class AudioStream:
+    """Received audio of one user, or of the muxed stream, read on demand.
+
+    The ring buffer is allocated when the first block arrives, since only then
+    are the sample rate and channel count known. Reading sizes are given in
+    samples per channel; the returned bytes hold interleaved 16-bit PCM.
+
+    Attributes:
+        user_id: The ID of the user, or `sdk.TT_MUXED_USERID`.
+        buffer_msec: The length of audio the ring holds.
+        frame_msec: The length of the frames yielded by ``async for``.
+        sample_rate: The sample rate, or None before the first block.
+        channels: The channel count, or None before the first block.
+
+    """
+
+    def __init__(
+        self,
+        user_id: int,
+        buffer_msec: int = 2000,
+        frame_msec: int = 20,
+        on_close: Callable[["AudioStream"], None] | None = None,
+    ) -> None:
+        """Create an audio stream. Use `TeamTalkInstance.open_audio_stream`.
+
+        Args:
+            user_id: The ID of the user, or `sdk.TT_MUXED_USERID`.
+            buffer_msec: The length of audio the ring holds. Defaults to 2000.
+            frame_msec: The length of the frames yielded by ``async for``.
+                Defaults to 20.
+            on_close: Called when the stream is closed.
+
+        """
+        self.user_id = user_id
+        self.buffer_msec = buffer_msec
+        self.frame_msec = frame_msec
+        self.sample_rate: int | None = None
+        self.channels: int | None = None
+        self._ring: PcmRingBuffer | None = None
+        self._wanted = 0
+        self._waiter: asyncio.Future[None] | None = None
+        self._closed = False
+        self._on_close = on_close
+
+    @property
+    def closed(self) -> bool:
+        """Whether the stream has been closed."""
+        return self._closed
+
+    @property
+    def available(self) -> int:
+        """The number of samples per channel that can be read right away."""
+        if self._ring is None or not self.channels:
+            return 0
+        return len(self._ring) // (self.channels * _SAMPLE_BYTES)
+
+    @property
+    def overruns(self) -> int:
+        """The number of samples per channel lost because nobody read them."""
+        if self._ring is None or not self.channels:
+            return 0
+        return self._ring.overwritten // (self.channels * _SAMPLE_BYTES)
+
+    def read_nowait(self, samples: int) -> bytes:
+        """Read up to `samples` samples per channel without waiting.
+
+        Args:
+            samples: The most samples per channel to read.
+
+        Returns:
+            The samples, possibly fewer than asked for or none.
+
+        """
+        if self._ring is None or not self.channels:
+            return b""
+        return self._ring.read(samples * self.channels * _SAMPLE_BYTES)
+
+    async def read(self, samples: int) -> bytes:
+        """Wait until `samples` samples per channel are buffered and read them.
+
+        Args:
+            samples: The number of samples per channel to read.
+
+        Returns:
+            The samples. Fewer, possibly none, are returned only when the
+            stream is closed.
+
+        Raises:
+            RuntimeError: If another coroutine is already reading the stream.
+
+        """
+        if self._waiter is not None:
+            raise RuntimeError("The audio stream is already being read")
+        while not self._closed and self.available < samples:
+            self._wanted = samples
+            self._waiter = asyncio.get_running_loop().create_future()
+            try:
+                await self._waiter
+            finally:
+                self._waiter = None
+        return self.read_nowait(samples)
+
+    def __aiter__(self) -> AsyncIterator[bytes]:
+        """Iterate over frames of `frame_msec` until the stream is closed."""
+        return self._frames()
+
+    async def _frames(self) -> AsyncIterator[bytes]:
+        while True:
+            await self._wait_for_format()
+            if self.sample_rate is None:
+                return
+            frame = await self.read(self.sample_rate * self.frame_msec // 1000)
+            if not frame:
+                return
+            yield frame
+
+    async def _wait_for_format(self) -> None:
+        while self.sample_rate is None and not self._closed:
+            self._wanted = 1
+            self._waiter = asyncio.get_running_loop().create_future()
+            try:
+                await self._waiter
+            finally:
+                self._waiter = None
+
+    def close(self) -> None:
+        """Stop receiving audio. Buffered samples can still be read."""
+        if self._closed:
+            return
+        self._closed = True
+        self._wake()
+        if self._on_close is not None:
+            self._on_close(self)
+
+    def _feed(self, block: sdk.AudioBlock, size: int) -> None:
+        """Copy the samples of an acquired SDK block into the ring."""
+        if self._closed or not size:
+            return
+        if (
+            self._ring is None
+            or block.nSampleRate != self.sample_rate
+            or block.nChannels != self.channels
+        ):
+            self.sample_rate = block.nSampleRate
+            self.channels = block.nChannels
+            frames = self.sample_rate * self.buffer_msec // 1000
+            self._ring = PcmRingBuffer(max(frames, 1) * self.channels * _SAMPLE_BYTES)
+        self._ring.write_from(block.lpRawAudio, size)
+        if self._waiter is not None and self.available >= self._wanted:
+            self._wake()
+
+    def _wake(self) -> None:
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
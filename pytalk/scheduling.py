@@ -0,0 +1,342 @@
+"""Bounded scheduling of event handlers.
+
+By default every dispatched event starts a new task for its handler. Under a
+flood of audio blocks or chat messages that piles up pending tasks without
+bound. An `EventLimit` caps how many handlers of one event run at once and how
+many may wait for a slot, and decides what happens when that queue is full.
+
+Example:
+-------
+
+    .. code-block:: python3
+
+        from pytalk.scheduling import EventLimit, OverflowPolicy
+
+        # Keep only the 50 most recent audio blocks while a handler is busy.
+        bot.set_event_limit("user_audio", EventLimit(queue_size=50))
+        # Never lose a message; stop reading events while 500 are waiting.
+        bot.set_event_limit(
+            "message",
+            EventLimit(concurrency=4, queue_size=500, overflow=OverflowPolicy.BLOCK),
+        )
+        # Run a cheap handler on the event pump itself.
+        bot.set_event_limit("user_update", EventLimit(inline=True))
+
+"""
+
+import asyncio
+import contextvars
+from collections import deque
+from collections.abc import Callable, Coroutine
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any
+
+_Handler = Callable[..., Coroutine[Any, Any, Any]]
+_Runner = Callable[..., Coroutine[Any, Any, None]]
+_Call = tuple[_Handler, tuple[Any, ...], dict[str, Any]]
+
+# The task of the event pump while it awaits an inline handler. Tasks the
+# handler starts inherit it, but are not the pump.
+_inline_pump: contextvars.ContextVar[asyncio.Task[Any] | None] = contextvars.ContextVar(
+    "_inline_pump", default=None
+)
+
+
+def _check_not_inline(what: str) -> None:
+    """Raise if called from an inline handler, which the event pump awaits.
+
+    Whatever the handler waits for from the server would be delivered by the
+    pump, so the wait could only end by timing out.
+
+    Raises:
+        RuntimeError: If the caller is an inline handler.
+
+    """
+    pump = _inline_pump.get()
+    if pump is not None and pump is asyncio.current_task():
+        raise RuntimeError(
+            f"{what} cannot be awaited in an inline handler, which holds up "
+            "the event pump; start a task for it instead"
+        )
+
+
+class OverflowPolicy(Enum):
+    """What to do with an event when its handler queue is full."""
+
+    #: Discard the oldest waiting event to make room for the new one.
+    DROP_OLDEST = 0
+    #: Discard the new event.
+    DROP_NEWEST = 1
+    #: Replace the newest waiting event with the new one, so a burst of
+    #: updates is handled once with the latest data.
+    COALESCE = 2
+    #: Queue the event anyway and stop the event pump until the queue is back
+    #: below its limit. Events then wait in the SDK instead of in Python, and
+    #: so do the answers to commands and the events `TeamTalkBot.wait_for`
+    #: waits for: a handler of the event must not wait for them.
+    BLOCK = 3
+
+
+@dataclass(frozen=True)
+class EventLimit:
+    """Limits for the handlers of one event.
+
+    Attributes:
+        concurrency: How many handlers of the event may run at the same time.
+        queue_size: How many events may wait for a free slot.
+        overflow: What to do with an event when the queue is full.
+        inline: Whether the event pump awaits the handler itself instead of
+            starting a task for it. Inline handlers run one at a time, in
+            order, and hold up the pump while they run, so they should be
+            short. `concurrency` does not apply to them. They cannot await an
+            answer from the server, i.e. an ``async_*`` command or
+            `TeamTalkBot.wait_for`, which raise `RuntimeError` there.
+
+    """
+
+    concurrency: int = 1
+    queue_size: int = 100
+    overflow: OverflowPolicy = OverflowPolicy.DROP_OLDEST
+    inline: bool = False
+
+    def __post_init__(self) -> None:
+        """Validate the limits.
+
+        Raises:
+            ValueError: If `concurrency` or `queue_size` is less than 1.
+
+        """
+        if self.concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        if self.queue_size < 1:
+            raise ValueError("queue_size must be at least 1")
+
+
+@dataclass(frozen=True)
+class EventStats:
+    """Queue metrics for one limited event.
+
+    Attributes:
+        running: Handlers currently running.
+        queued: Events waiting for a free slot.
+        max_queued: The highest number of waiting events seen.
+        processed: Handlers that have finished.
+        dropped: Events discarded by the overflow policy.
+        coalesced: Events merged into a waiting one.
+        blocked: How many times the event pump was stopped for this event.
+
+    """
+
+    running: int
+    queued: int
+    max_queued: int
+    processed: int
+    dropped: int
+    coalesced: int
+    blocked: int
+
+
+class _EventQueue:
+    __slots__ = (
+        "blocked",
+        "coalesced",
+        "dropped",
+        "limit",
+        "max_queued",
+        "name",
+        "pending",
+        "processed",
+        "running",
+        "scheduler",
+    )
+
+    def __init__(
+        self, scheduler: "EventScheduler", name: str, limit: EventLimit
+    ) -> None:
+        self.scheduler = scheduler
+        self.name = name
+        self.limit = limit
+        self.pending: deque[_Call] = deque()
+        self.running = 0
+        self.max_queued = 0
+        self.processed = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.blocked = 0
+
+    def submit(self, call: _Call) -> None:
+        limit = self.limit
+        if not limit.inline and self.running < limit.concurrency:
+            self._start(call)
+            return
+        pending = self.pending
+        if len(pending) >= limit.queue_size:
+            overflow = limit.overflow
+            if overflow is OverflowPolicy.DROP_NEWEST:
+                self.dropped += 1
+                self.scheduler._discard(self.name, call)
+                return
+            if overflow is OverflowPolicy.DROP_OLDEST:
+                self.scheduler._discard(self.name, pending.popleft())
+                self.dropped += 1
+            elif overflow is OverflowPolicy.COALESCE:
+                self.scheduler._discard(self.name, pending[-1])
+                pending[-1] = call
+                self.coalesced += 1
+                return
+            elif not limit.inline:
+                # Inline handlers are drained by the pump before it goes on anyway.
+                self.blocked += 1
+                self.scheduler._block()
+        pending.append(call)
+        self.max_queued = max(self.max_queued, len(pending))
+        if limit.inline:
+            self.scheduler._inline_ready = True
+
+    def _start(self, call: _Call) -> None:
+        self.running += 1
+        handler, args, kwargs = call
+        task = self.scheduler._loop().create_task(
+            self.scheduler._runner(handler, self.name, *args, **kwargs),
+            name=f"teamtalk.py: {self.name}",
+        )
+        task.add_done_callback(self._finished)
+
+    def _finished(self, _task: asyncio.Task[None]) -> None:
+        self.running -= 1
+        self.processed += 1
+        if self.pending:
+            self._start(self.pending.popleft())
+        self.scheduler._maybe_unblock()
+
+    async def run_inline(self) -> None:
+        pending = self.pending
+        while pending:
+            handler, args, kwargs = pending.popleft()
+            self.running = 1
+            token = _inline_pump.set(asyncio.current_task())
+            try:
+                await self.scheduler._runner(handler, self.name, *args, **kwargs)
+            finally:
+                _inline_pump.reset(token)
+                self.running = 0
+                self.processed += 1
+
+    def over_limit(self) -> bool:
+        return len(self.pending) > self.limit.queue_size
+
+    def stats(self) -> EventStats:
+        return EventStats(
+            running=self.running,
+            queued=len(self.pending),
+            max_queued=self.max_queued,
+            processed=self.processed,
+            dropped=self.dropped,
+            coalesced=self.coalesced,
+            blocked=self.blocked,
+        )
+
+
+class EventScheduler:
+    """Runs the handlers of limited events for a `TeamTalkBot`.
+
+    Events without a limit are not handled here; the bot starts a task for
+    each of them as before.
+    """
+
+    def __init__(
+        self,
+        runner: _Runner,
+        loop: Callable[[], asyncio.AbstractEventLoop],
+        discard: Callable[[str, tuple[Any, ...]], None] | None = None,
+    ) -> None:
+        """Initialize the scheduler.
+
+        Args:
+            runner: The coroutine function that runs a handler, called with the
+                handler, the handler's name and the event's arguments.
+            loop: Returns the event loop to create tasks on.
+            discard: Called with the handler's name and the event's arguments
+                when an event is dropped or coalesced away.
+
+        """
+        self._runner = runner
+        self._loop = loop
+        self._on_discard = discard
+        self._queues: dict[str, _EventQueue] = {}
+        self._inline_ready = False
+        self._unblocked: asyncio.Event | None = None
+
+    @property
+    def needs_pump(self) -> bool:
+        """Whether the event pump has to call `drain` before going on."""
+        return self._inline_ready or self._unblocked is not None
+
+    def is_blocked(self) -> bool:
+        """Check if a full queue with `OverflowPolicy.BLOCK` stopped the pump.
+
+        The pump checks this after every event, so it stops reading in the
+        middle of a batch rather than queueing the rest of it.
+        """
+        return self._unblocked is not None
+
+    def set_limit(self, method: str, limit: EventLimit | None) -> None:
+        """Set or remove the limit for the handler `method`.
+
+        Events already waiting keep their place in the queue. When the limit is
+        removed, they are all started at once.
+
+        Args:
+            method: The name of the handler, e.g. ``on_message``.
+            limit: The new limit, or None to go back to a task per event.
+
+        """
+        queue = self._queues.get(method)
+        if limit is None:
+            if queue is not None:
+                del self._queues[method]
+                while queue.pending:
+                    queue._start(queue.pending.popleft())
+                self._maybe_unblock()
+            return
+        if queue is None:
+            self._queues[method] = _EventQueue(self, method, limit)
+        else:
+            queue.limit = limit
+
+    def get(self, method: str) -> "_EventQueue | None":
+        """Get the queue of the handler `method`, if it is limited."""
+        return self._queues.get(method)
+
+    def stats(self) -> dict[str, EventStats]:
+        """Return the queue metrics of every limited event, by handler name."""
+        return {method: queue.stats() for method, queue in self._queues.items()}
+
+    async def drain(self) -> None:
+        """Run the waiting inline handlers and wait until no queue is blocked."""
+        while self.needs_pump:
+            if self._inline_ready:
+                self._inline_ready = False
+                for queue in list(self._queues.values()):
+                    if queue.limit.inline and queue.pending:
+                        await queue.run_inline()
+                self._maybe_unblock()
+            if self._unblocked is not None:
+                await self._unblocked.wait()
+
+    def _discard(self, method: str, call: _Call) -> None:
+        if self._on_discard is not None:
+            self._on_discard(method, call[1])
+
+    def _block(self) -> None:
+        if self._unblocked is None:
+            self._unblocked = asyncio.Event()
+
+    def _maybe_unblock(self) -> None:
+        if self._unblocked is None:
+            return
+        if any(queue.over_limit() for queue in self._queues.values()):
+            return
+        self._unblocked.set()
+        self._unblocked = None
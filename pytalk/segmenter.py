@@ -0,0 +1,371 @@
+"""Cutting received audio into utterances.
+
+A `Segmenter` follows the level of each speaker's audio blocks with the voice
+activity detector of `pytalk.dsp` and collects the blocks of one stretch of
+speech. When the speaker pauses for longer than the hangover, the stretch is
+dispatched as a single ``on_utterance`` event with the samples and the time
+it started and ended, instead of one ``on_user_audio`` event per block. A
+short pre-roll keeps the start of the first word, which is heard before the
+detector is sure speech started.
+
+Segmenting uses NumPy, from the ``numpy`` extra.
+
+Example:
+-------
+
+    .. code-block:: python3
+
+        segmenter = pytalk.segmenter.Segmenter(sample_rate=16000, channels=1)
+
+        @bot.event
+        async def on_my_login(server):
+            teamtalk = server.teamtalk_instance
+            teamtalk.segment_audio(segmenter, channel=teamtalk.get_channel(1))
+
+        @bot.event
+        async def on_utterance(utterance):
+            text = await transcribe(utterance.data, utterance.sample_rate)
+            print(f"{utterance.user.username}: {text}")
+
+"""
+
+from __future__ import annotations
+
+import collections
+import time
+from typing import TYPE_CHECKING, Any
+
+from .dsp import AudioProcessor, VoiceActivityDetector, to_dbfs
+from .implementation.TeamTalkPy import TeamTalk5 as sdk
+from .user import User as TeamTalkUser
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from .capture import AudioCapture
+    from .instance import TeamTalkInstance
+
+_SAMPLE_BYTES = 2
+
+
+class Utterance:
+    """One stretch of speech, from the first to the last voiced block.
+
+    Attributes:
+        teamtalk: The instance the audio was received on.
+        user_id: The ID of the speaker, or `sdk.TT_MUXED_USERID`.
+        data: The interleaved 16-bit PCM samples.
+        sample_rate: The sample rate of the samples.
+        channels: The channel count of the samples.
+        start: The `time.time` the first sample was received.
+        end: The `time.time` the last voiced block was received.
+
+    """
+
+    __slots__ = (
+        "channels",
+        "data",
+        "end",
+        "sample_rate",
+        "start",
+        "teamtalk",
+        "user_id",
+    )
+
+    def __init__(  # noqa: PLR0913
+        self,
+        teamtalk: TeamTalkInstance,
+        user_id: int,
+        data: bytes,
+        sample_rate: int,
+        channels: int,
+        end: float,
+    ) -> None:
+        """Create an utterance. They are made by a `Segmenter`.
+
+        Args:
+            teamtalk: The instance the audio was received on.
+            user_id: The ID of the speaker, or `sdk.TT_MUXED_USERID`.
+            data: The interleaved 16-bit PCM samples.
+            sample_rate: The sample rate of the samples.
+            channels: The channel count of the samples.
+            end: The `time.time` the last voiced block was received.
+
+        """
+        self.teamtalk = teamtalk
+        self.user_id = user_id
+        self.data = data
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.end = end
+        self.start = end - self.duration
+
+    @property
+    def duration(self) -> float:
+        """The length of the utterance in seconds."""
+        frame_bytes = self.channels * _SAMPLE_BYTES
+        return len(self.data) / (frame_bytes * self.sample_rate)
+
+    @property
+    def user(self) -> TeamTalkUser | None:
+        """The speaker, or None for the muxed stream."""
+        if self.user_id == sdk.TT_MUXED_USERID:
+            return None
+        return TeamTalkUser(self.teamtalk, self.user_id)
+
+    def array(self) -> np.ndarray[Any, np.dtype[np.int16]]:
+        """Get the samples as a NumPy array, without copying them.
+
+        Returns:
+            A read-only 1-D int16 array of interleaved samples.
+
+        """
+        import numpy as np  # noqa: PLC0415
+
+        return np.frombuffer(self.data, dtype=np.int16)
+
+    def __repr__(self) -> str:
+        """Return a representation of the utterance."""
+        return (
+            f"<Utterance user_id={self.user_id} duration={self.duration:.2f}s "
+            f"sample_rate={self.sample_rate} channels={self.channels}>"
+        )
+
+
+class _Speaker:
+    """The state of one speaker's audio."""
+
+    __slots__ = (
+        "buffer",
+        "end",
+        "format",
+        "pre_roll",
+        "pre_roll_bytes",
+        "processor",
+        "voiced",
+    )
+
+    def __init__(self, processor: AudioProcessor) -> None:
+        self.processor = processor
+        # The blocks before speech started, oldest first.
+        self.pre_roll: collections.deque[bytes] = collections.deque()
+        self.pre_roll_bytes = 0
+        # The samples of the utterance, or None between utterances.
+        self.buffer: bytearray | None = None
+        # The length of `buffer` up to the last voiced block, and its time.
+        self.voiced = 0
+        self.end = 0.0
+        # The sample rate and channel count of the processed samples.
+        self.format = (0, 0)
+
+
+class Segmenter:
+    """Turns the audio of each speaker into `Utterance` events.
+
+    Feed it with `TeamTalkInstance.segment_audio`. Every speaker gets their
+    own `AudioProcessor`, which converts the blocks to `sample_rate` and
+    `channels` if given and measures their level. One segmenter can serve
+    several targets, also of several instances.
+
+    Attributes:
+        threshold: The RMS level, in dBFS, of a voiced block.
+        attack: How many seconds of voiced blocks start an utterance.
+        hangover: How many seconds without a voiced block end it.
+        pre_roll: How many seconds before the start are kept.
+        min_duration: Shorter utterances, e.g. clicks, are dropped.
+        max_duration: Longer utterances are cut and continued in a new one.
+        sample_rate: The rate utterances are resampled to, or None.
+        channels: The channel count utterances are mixed to, or None.
+
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        *,
+        threshold: float = -40.0,
+        attack: float = 0.04,
+        hangover: float = 0.5,
+        pre_roll: float = 0.2,
+        min_duration: float = 0.2,
+        max_duration: float = 30.0,
+        sample_rate: int | None = None,
+        channels: int | None = None,
+    ) -> None:
+        """Create a segmenter.
+
+        Args:
+            threshold: The RMS level, in dBFS, of a voiced block. Defaults to
+                -40.
+            attack: How many seconds of voiced blocks start an utterance.
+                Defaults to 0.04.
+            hangover: How many seconds without a voiced block end an
+                utterance. Defaults to 0.5.
+            pre_roll: How many seconds before the start are kept. Defaults to
+                0.2.
+            min_duration: Shorter utterances, e.g. clicks, are dropped.
+                Defaults to 0.2.
+            max_duration: Utterances are cut after this many seconds, and
+                speech goes on in a new one. Defaults to 30.
+            sample_rate: The rate to resample to, e.g. 16000 for speech
+                recognition. Defaults to the received rate.
+            channels: The channel count to mix to. Defaults to the received
+                count.
+
+        Raises:
+            ImportError: If NumPy is not installed.
+
+        """
+        self.threshold = threshold
+        self.attack = attack
+        self.hangover = hangover
+        self.pre_roll = pre_roll
+        self.min_duration = min_duration
+        self.max_duration = max_duration
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self._speakers: dict[tuple[TeamTalkInstance, int], _Speaker] = {}
+        self._captures: list[AudioCapture] = []
+        # Fail now rather than on the first block.
+        AudioProcessor()
+
+    def feed(
+        self,
+        teamtalk: TeamTalkInstance,
+        user_id: int,
+        block: sdk.AudioBlock,
+        data: bytes | bytearray | memoryview,
+    ) -> Utterance | None:
+        """Add the samples of a received block.
+
+        Args:
+            teamtalk: The instance the block was received on.
+            user_id: The ID of the speaker, or `sdk.TT_MUXED_USERID`.
+            block: The SDK block, for its format.
+            data: The samples of the block. They are copied before returning.
+
+        Returns:
+            The utterance this block ended, if any.
+
+        """
+        speaker = self._speakers.get((teamtalk, user_id))
+        if speaker is None:
+            speaker = self._speakers[teamtalk, user_id] = _Speaker(
+                AudioProcessor(
+                    self.sample_rate,
+                    self.channels,
+                    vad=VoiceActivityDetector(
+                        self.threshold, self.attack, self.hangover
+                    ),
+                )
+            )
+        processor = speaker.processor
+        samples = processor.process(data, block.nSampleRate, block.nChannels)
+        sample_rate = processor.sample_rate or block.nSampleRate
+        channels = processor.channels or block.nChannels
+        ended = None
+        if speaker.format != (sample_rate, channels):
+            # Samples of another format cannot be joined to the earlier ones.
+            ended = self._finish(teamtalk, user_id)
+            speaker.pre_roll.clear()
+            speaker.pre_roll_bytes = 0
+            speaker.format = (sample_rate, channels)
+        return self._add(teamtalk, user_id, speaker, samples.data) or ended
+
+    def end(self, teamtalk: TeamTalkInstance, user_id: int) -> Utterance | None:
+        """End the current utterance of a speaker, e.g. when they stop talking.
+
+        Args:
+            teamtalk: The instance the speaker is on.
+            user_id: The ID of the speaker, or `sdk.TT_MUXED_USERID`.
+
+        Returns:
+            The utterance that was ended, if any.
+
+        """
+        speaker = self._speakers.get((teamtalk, user_id))
+        if speaker is None:
+            return None
+        utterance = self._finish(teamtalk, user_id)
+        speaker.processor.reset()
+        speaker.pre_roll.clear()
+        speaker.pre_roll_bytes = 0
+        return utterance
+
+    def forget(self, teamtalk: TeamTalkInstance, user_id: int) -> None:
+        """Drop the state of a speaker who left, without an utterance.
+
+        Args:
+            teamtalk: The instance the speaker was on.
+            user_id: The ID of the speaker.
+
+        """
+        self._speakers.pop((teamtalk, user_id), None)
+
+    def close(self) -> None:
+        """Stop segmenting. Captures that feed the segmenter are released."""
+        for capture in self._captures:
+            capture.release()
+        self._captures.clear()
+        self._speakers.clear()
+
+    def _speaker_ids(self, teamtalk: TeamTalkInstance) -> list[int]:
+        """Return the IDs of the speakers of an instance being segmented."""
+        return [user_id for instance, user_id in self._speakers if instance is teamtalk]
+
+    def _add(
+        self,
+        teamtalk: TeamTalkInstance,
+        user_id: int,
+        speaker: _Speaker,
+        samples: memoryview,
+    ) -> Utterance | None:
+        processor = speaker.processor
+        sample_rate, channels = speaker.format
+        bytes_per_second = sample_rate * channels * _SAMPLE_BYTES
+        now = time.time()
+        if speaker.buffer is None:
+            if not processor.speaking:
+                self._keep_pre_roll(speaker, bytes(samples), bytes_per_second)
+                return None
+            speaker.buffer = bytearray().join(speaker.pre_roll)
+            speaker.pre_roll.clear()
+            speaker.pre_roll_bytes = 0
+        speaker.buffer += samples
+        if to_dbfs(processor.rms) >= self.threshold:
+            speaker.voiced = len(speaker.buffer)
+            speaker.end = now
+        if not processor.speaking:
+            return self._finish(teamtalk, user_id)
+        if len(speaker.buffer) >= self.max_duration * bytes_per_second:
+            # Speech goes on, so nothing is left out at the cut.
+            speaker.voiced = len(speaker.buffer)
+            speaker.end = now
+            utterance = self._finish(teamtalk, user_id)
+            speaker.buffer = bytearray()
+            return utterance
+        return None
+
+    def _keep_pre_roll(
+        self, speaker: _Speaker, samples: bytes, bytes_per_second: int
+    ) -> None:
+        speaker.pre_roll.append(samples)
+        speaker.pre_roll_bytes += len(samples)
+        limit = self.pre_roll * bytes_per_second
+        while speaker.pre_roll and speaker.pre_roll_bytes > limit:
+            speaker.pre_roll_bytes -= len(speaker.pre_roll.popleft())
+
+    def _finish(self, teamtalk: TeamTalkInstance, user_id: int) -> Utterance | None:
+        speaker = self._speakers[teamtalk, user_id]
+        buffer, speaker.buffer = speaker.buffer, None
+        if buffer is None:
+            return None
+        # Leave out the silence of the hangover.
+        del buffer[speaker.voiced :]
+        speaker.voiced = 0
+        sample_rate, channels = speaker.format
+        bytes_per_second = sample_rate * channels * _SAMPLE_BYTES
+        if len(buffer) < self.min_duration * bytes_per_second:
+            return None
+        return Utterance(
+            teamtalk, user_id, bytes(buffer), sample_rate, channels, speaker.end
+        )
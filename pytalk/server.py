@@ -4,6 +4,8 @@ import ctypes
 from typing import TYPE_CHECKING, cast
 
 from ._utils import (
+    _async_wait_for_cmd,
+    _class_attributes,
     _get_tt_obj_attribute,
     _set_tt_obj_attribute,
     _tt_attr_to_py_attr,
@@ -117,8 +119,7 @@ class Server:
             The pytalk.Channel instance representing the channel with the specified ID.
 
         """
-        channel = self.teamtalk_instance.getChannel(channel_id)
-        return TeamTalkChannel(self.teamtalk_instance, channel)
+        return TeamTalkChannel(self.teamtalk_instance, channel_id)
 
     def get_user(self, user_id: int) -> TeamTalkUser:
         """Get the user with the specified ID.
@@ -130,8 +131,7 @@ class Server:
             The pytalk.User instance representing the user with the specified ID.
 
         """
-        user = self.teamtalk_instance.getUser(user_id)
-        return TeamTalkUser(self.teamtalk_instance, user)
+        return TeamTalkUser(self.teamtalk_instance, user_id)
 
     def join_channel(
         self, channel: TeamTalkChannel | str | int, password: str = ""
@@ -280,6 +280,34 @@ class Server:
                 properties.
 
         """
+        cmd_result, cmd_err = _wait_for_cmd(
+            self.teamtalk_instance, self._send_update_server(properties), 2000
+        )
+        if not cmd_result:
+            self._raise_update_properties_error(cmd_err)
+
+    async def async_update_properties(self, properties: "ServerProperties") -> None:
+        """Update the properties of the server without blocking the event loop.
+
+        Awaitable variant of :meth:`update_properties`.
+
+        Args:
+            properties: The updated properties. See pytalk.ServerProperties for more
+                information.
+
+        Raises:
+            PytalkPermissionError: If the bot does not have the permission to update the
+                properties.
+            TimeoutError: If the server did not answer in time.
+
+        """
+        cmd_result, cmd_err = await _async_wait_for_cmd(
+            self.teamtalk_instance, self._send_update_server(properties), 2000
+        )
+        if not cmd_result:
+            self._raise_update_properties_error(cmd_err)
+
+    def _send_update_server(self, properties: "ServerProperties") -> int:
         if not self.teamtalk_instance.has_permission(
             cast("int", Permission.UPDATE_SERVERPROPERTIES)
         ):
@@ -292,19 +320,20 @@ class Server:
         )
         if result == -1:
             raise ValueError("Server properties could not be updated")
-        cmd_result, cmd_err = _wait_for_cmd(self.teamtalk_instance, result, 2000)
-        if not cmd_result:
-            err_nr = cmd_err.nErrorNo
-            if err_nr == sdk.ClientError.CMDERR_NOT_LOGGEDIN:
-                raise PytalkPermissionError("The bot is not logged in")
-            if err_nr == sdk.ClientError.CMDERR_NOT_AUTHORIZED:
-                raise PytalkPermissionError(
-                    "The bot does not have permission to update server properties"
-                )
-            raise ValueError(
-                f"Server properties update failed with error: "
-                f"{sdk.ttstr(cmd_err.szErrorMsg)}"
+        return cast("int", result)
+
+    def _raise_update_properties_error(self, cmd_err: "sdk.ClientErrorMsg") -> None:
+        err_nr = cmd_err.nErrorNo
+        if err_nr == sdk.ClientError.CMDERR_NOT_LOGGEDIN:
+            raise PytalkPermissionError("The bot is not logged in")
+        if err_nr == sdk.ClientError.CMDERR_NOT_AUTHORIZED:
+            raise PytalkPermissionError(
+                "The bot does not have permission to update server properties"
             )
+        raise ValueError(
+            f"Server properties update failed with error: "
+            f"{sdk.ttstr(cmd_err.szErrorMsg)}"
+        )
 
     def __getattr__(self, name: str) -> object:
         """Try to get the specified attribute on server.
@@ -320,8 +349,8 @@ class Server:
                 default behavior.
 
         """
-        if name in dir(self):
-            return self.__dict__[name]
+        if name in _class_attributes(type(self)):
+            return object.__getattribute__(self, name)
         return getattr(self.info, name)
 
 
@@ -386,8 +415,8 @@ class ServerProperties(metaclass=_ServerPropertiesMeta):
                 default behavior.
 
         """
-        if name in dir(self):
-            return self.__dict__[name]
+        if name in _class_attributes(type(self)):
+            return object.__getattribute__(self, name)
         value = _get_tt_obj_attribute(self.properties, name)
         if isinstance(value, (bytes, sdk.TTCHAR, sdk.TTCHAR_P)):
             return sdk.ttstr(cast("sdk.TTCHAR_P", value))
@@ -404,8 +433,12 @@ class ServerProperties(metaclass=_ServerPropertiesMeta):
                 AttributeError: If the specified attribute is not found.
 
         """
-        if name in dir(self) or name in ["teamtalk_instance", "properties"]:
-            self.__dict__[name] = value
+        if (
+            name in self.__dict__
+            or name in _class_attributes(type(self))
+            or name in ["teamtalk_instance", "properties"]
+        ):
+            object.__setattr__(self, name, value)
         else:
             _get_tt_obj_attribute(self.properties, name)
             _set_tt_obj_attribute(self.properties, name, value)
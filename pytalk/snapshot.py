@@ -0,0 +1,369 @@
+"""Compact, read-only snapshots of event payloads.
+
+When a bot is created with ``snapshot_events=True``, the user, channel,
+message, audio and file transfer events receive these objects instead of the
+regular wrappers. A snapshot copies the interesting fields out of the SDK
+struct when the event is decoded and keeps no reference to it, and it uses
+``__slots__`` instead of a per-object ``__dict__``. This makes them cheap to
+create and hold on to under heavy audio or chat traffic.
+
+Snapshots only carry data. To act on the object, look it up through the
+instance the snapshot came from, for example
+``snapshot.teamtalk_instance.get_user(snapshot.id)``.
+
+Example:
+-------
+
+    .. code-block:: python3
+
+        bot = pytalk.TeamTalkBot(snapshot_events=True)
+
+        @bot.event
+        async def on_message(message):
+            # message is a pytalk.snapshot.MessageSnapshot
+            print(message.from_username, message.content)
+
+"""
+
+from typing import TYPE_CHECKING, Any
+
+from .implementation.TeamTalkPy import TeamTalk5 as sdk
+
+if TYPE_CHECKING:
+    from .instance import TeamTalkInstance
+
+_set = object.__setattr__
+
+
+class Snapshot:
+    """Base class for the snapshot types.
+
+    Snapshots compare equal when they are of the same type and hold the same
+    data. The instance they came from is not part of the comparison.
+    """
+
+    __slots__ = ("teamtalk_instance",)
+    teamtalk_instance: "TeamTalkInstance"
+
+    def __setattr__(self, name: str, value: object) -> None:
+        """Refuse to modify the snapshot.
+
+        Raises:
+            AttributeError: Always, snapshots are read-only.
+
+        """
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __delattr__(self, name: str) -> None:
+        """Refuse to modify the snapshot.
+
+        Raises:
+            AttributeError: Always, snapshots are read-only.
+
+        """
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def _values(self) -> tuple[Any, ...]:
+        return tuple(getattr(self, name) for name in type(self).__slots__)
+
+    def __eq__(self, other: object) -> bool:
+        """Check if two snapshots hold the same data."""
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._values() == other._values()  # type: ignore [attr-defined]
+
+    def __hash__(self) -> int:
+        """Return the hash of the snapshot's data."""
+        return hash((type(self), self._values()))
+
+    def __repr__(self) -> str:
+        """Return a string representation of the snapshot."""
+        fields = ", ".join(
+            f"{name}={getattr(self, name)!r}" for name in type(self).__slots__
+        )
+        return f"pytalk.{type(self).__name__}({fields})"
+
+
+class UserSnapshot(Snapshot):
+    """A snapshot of a user.
+
+    Attributes:
+        id: The ID of the user.
+        username: The username of the user's account.
+        nickname: The nickname of the user.
+        channel_id: The ID of the channel the user is in, 0 if none.
+        status_mode: The user's status mode.
+        status_msg: The user's status message.
+        user_type: The type of the user's account.
+        user_state: The user's state flags, e.g. whether they are talking.
+        ip_address: The IP address of the user, if visible to the bot.
+        client_name: The name of the client the user is connected with.
+        user_data: User-defined data associated with the account.
+
+    """
+
+    __slots__ = (
+        "id",
+        "username",
+        "nickname",
+        "channel_id",
+        "status_mode",
+        "status_msg",
+        "user_type",
+        "user_state",
+        "ip_address",
+        "client_name",
+        "user_data",
+    )
+    id: int
+    username: str
+    nickname: str
+    channel_id: int
+    status_mode: int
+    status_msg: str
+    user_type: int
+    user_state: int
+    ip_address: str
+    client_name: str
+    user_data: int
+
+    def __init__(self, teamtalk_instance: "TeamTalkInstance", user: sdk.User) -> None:
+        """Copy the fields of a user struct.
+
+        Args:
+            teamtalk_instance: The instance the user belongs to.
+            user: The SDK struct to copy.
+
+        """
+        _set(self, "teamtalk_instance", teamtalk_instance)
+        _set(self, "id", user.nUserID)
+        _set(self, "username", sdk.ttstr(user.szUsername))
+        _set(self, "nickname", sdk.ttstr(user.szNickname))
+        _set(self, "channel_id", user.nChannelID)
+        _set(self, "status_mode", user.nStatusMode)
+        _set(self, "status_msg", sdk.ttstr(user.szStatusMsg))
+        _set(self, "user_type", user.uUserType)
+        _set(self, "user_state", user.uUserState)
+        _set(self, "ip_address", sdk.ttstr(user.szIPAddress))
+        _set(self, "client_name", sdk.ttstr(user.szClientName))
+        _set(self, "user_data", user.nUserData)
+
+
+class ChannelSnapshot(Snapshot):
+    """A snapshot of a channel.
+
+    Attributes:
+        id: The ID of the channel.
+        parent_id: The ID of the parent channel, 0 for the root channel.
+        name: The name of the channel.
+        path: The full path of the channel.
+        topic: The topic of the channel.
+        password_protected: Whether joining the channel requires a password.
+        channel_type: The channel type flags.
+        max_users: The maximum number of users allowed in the channel.
+        disk_quota: The disk quota for files in the channel.
+        user_data: User-defined data associated with the channel.
+
+    """
+
+    __slots__ = (
+        "id",
+        "parent_id",
+        "name",
+        "path",
+        "topic",
+        "password_protected",
+        "channel_type",
+        "max_users",
+        "disk_quota",
+        "user_data",
+    )
+    id: int
+    parent_id: int
+    name: str
+    path: str
+    topic: str
+    password_protected: bool
+    channel_type: int
+    max_users: int
+    disk_quota: int
+    user_data: int
+
+    def __init__(
+        self, teamtalk_instance: "TeamTalkInstance", channel: sdk.Channel, path: str
+    ) -> None:
+        """Copy the fields of a channel struct.
+
+        Args:
+            teamtalk_instance: The instance the channel belongs to.
+            channel: The SDK struct to copy.
+            path: The full path of the channel.
+
+        """
+        _set(self, "teamtalk_instance", teamtalk_instance)
+        _set(self, "id", channel.nChannelID)
+        _set(self, "parent_id", channel.nParentID)
+        _set(self, "name", sdk.ttstr(channel.szName))
+        _set(self, "path", path)
+        _set(self, "topic", sdk.ttstr(channel.szTopic))
+        _set(self, "password_protected", bool(channel.bPassword))
+        _set(self, "channel_type", channel.uChannelType)
+        _set(self, "max_users", channel.nMaxUsers)
+        _set(self, "disk_quota", channel.nDiskQuota)
+        _set(self, "user_data", channel.nUserData)
+
+
+class MessageSnapshot(Snapshot):
+    """A snapshot of a text message.
+
+    Attributes:
+        type: The message type, one of `sdk.TextMsgType`.
+        from_id: The ID of the sender.
+        from_username: The username of the sender.
+        to_id: The ID of the receiving user, or of the channel for channel
+            messages.
+        channel_id: The ID of the channel for channel messages, 0 otherwise.
+        content: The text of the message.
+
+    """
+
+    __slots__ = ("type", "from_id", "from_username", "to_id", "channel_id", "content")
+    type: int
+    from_id: int
+    from_username: str
+    to_id: int
+    channel_id: int
+    content: str
+
+    def __init__(
+        self, teamtalk_instance: "TeamTalkInstance", msg: sdk.TextMessage
+    ) -> None:
+        """Copy the fields of a text message struct.
+
+        Args:
+            teamtalk_instance: The instance the message was received on.
+            msg: The SDK struct to copy.
+
+        """
+        msg_type = msg.nMsgType
+        is_channel = msg_type == sdk.TextMsgType.MSGTYPE_CHANNEL
+        _set(self, "teamtalk_instance", teamtalk_instance)
+        _set(self, "type", msg_type)
+        _set(self, "from_id", msg.nFromUserID)
+        _set(self, "from_username", sdk.ttstr(msg.szFromUsername))
+        _set(self, "to_id", msg.nChannelID if is_channel else msg.nToUserID)
+        _set(self, "channel_id", msg.nChannelID if is_channel else 0)
+        _set(self, "content", sdk.ttstr(msg.szMessage))
+
+
+class AudioBlockSnapshot(Snapshot):
+    """A snapshot of an audio block, including a copy of its samples.
+
+    Attributes:
+        user_id: The ID of the user the audio is from, or `sdk.TT_MUXED_USERID`
+            for muxed audio.
+        stream_id: The stream ID of the audio block.
+        sample_rate: The sample rate of the audio data.
+        channels: The number of channels in the audio data.
+        samples: The number of samples per channel in the audio data.
+        sample_index: The index of the first sample in the stream.
+        data: The 16-bit PCM audio data.
+
+    """
+
+    __slots__ = (
+        "user_id",
+        "stream_id",
+        "sample_rate",
+        "channels",
+        "samples",
+        "sample_index",
+        "data",
+    )
+    user_id: int
+    stream_id: int
+    sample_rate: int
+    channels: int
+    samples: int
+    sample_index: int
+    data: bytes
+
+    def __init__(
+        self,
+        teamtalk_instance: "TeamTalkInstance",
+        user_id: int,
+        block: sdk.AudioBlock,
+        data: bytes,
+    ) -> None:
+        """Copy the fields of an audio block struct.
+
+        Args:
+            teamtalk_instance: The instance the audio was received on.
+            user_id: The ID of the user the audio is from.
+            block: The SDK struct to copy.
+            data: The audio data, copied while the SDK block was still acquired.
+
+        """
+        _set(self, "teamtalk_instance", teamtalk_instance)
+        _set(self, "user_id", user_id)
+        _set(self, "stream_id", block.nStreamID)
+        _set(self, "sample_rate", block.nSampleRate)
+        _set(self, "channels", block.nChannels)
+        _set(self, "samples", block.nSamples)
+        _set(self, "sample_index", block.uSampleIndex)
+        _set(self, "data", data)
+
+
+class FileTransferSnapshot(Snapshot):
+    """A snapshot of a file transfer.
+
+    Attributes:
+        transfer_id: The ID of the file transfer.
+        channel_id: The ID of the channel the file belongs to.
+        status: The status of the file transfer.
+        local_path: The path of the local file.
+        remote_name: The name of the file on the server.
+        file_size: The total size of the file in bytes.
+        transferred: The number of bytes transferred so far.
+        inbound: Whether the file is being downloaded.
+
+    """
+
+    __slots__ = (
+        "transfer_id",
+        "channel_id",
+        "status",
+        "local_path",
+        "remote_name",
+        "file_size",
+        "transferred",
+        "inbound",
+    )
+    transfer_id: int
+    channel_id: int
+    status: int
+    local_path: str
+    remote_name: str
+    file_size: int
+    transferred: int
+    inbound: bool
+
+    def __init__(
+        self, teamtalk_instance: "TeamTalkInstance", transfer: sdk.FileTransfer
+    ) -> None:
+        """Copy the fields of a file transfer struct.
+
+        Args:
+            teamtalk_instance: The instance the transfer belongs to.
+            transfer: The SDK struct to copy.
+
+        """
+        _set(self, "teamtalk_instance", teamtalk_instance)
+        _set(self, "transfer_id", transfer.nTransferID)
+        _set(self, "channel_id", transfer.nChannelID)
+        _set(self, "status", transfer.nStatus)
+        _set(self, "local_path", sdk.ttstr(transfer.szLocalFilePath))
+        _set(self, "remote_name", sdk.ttstr(transfer.szRemoteFileName))
+        _set(self, "file_size", transfer.nFileSize)
+        _set(self, "transferred", transfer.nTransferred)
+        _set(self, "inbound", bool(transfer.bInbound))
@@ -4,7 +4,8 @@ This module contains the Streamer class, which is used to stream audio data to a
 TeamTalk channel.
 
 .. warning::
-   To use other files than .wav files, you need to have ffmpeg installed on your system.
+   To use other files than .wav files in the streamer's format and raw .pcm files,
+   you need to have ffmpeg installed on your system. See `pytalk.decoders`.
 
 .. warning::
    To stream urls, you need to have yt-dlp installed on your system.
@@ -26,6 +27,8 @@ To do this, you need to set the correct sample rate and number of channels on
 initialization,
 and then feed the data to the streamer as it becomes available.
 The data needs to be in 16 bit PCM format (pcm_s16le).
+`Streamer.feed` waits while the streamer's queue is full, so call it from a
+thread of your own, or await `Streamer.feed_async` on the event loop.
 
 Example:
     >>> import teamtalk
@@ -46,33 +49,270 @@ Example:
     ...             )  # we are reading 16 chunks at a time to combat buffering
     >>>             if data == 0:
     >>>                 break
-    >>>             # add the data to the streamer
-    >>>             streamer.feed(data)
+    >>>             # add the data to the streamer, without holding up the loop
+    >>>             await streamer.feed_async(data)
     >>>         # close the connection to our microphone
 
 """
 
+import asyncio
+import collections
 import ctypes
-import multiprocessing
-import random
-import subprocess
+import itertools
+import math
 import threading
+import time
+from dataclasses import dataclass
 
 from .channel import Channel as TeamTalkChannel
+from .decoders import (
+    Decoder,
+    default_decoders,
+    ffmpeg_available,
+    open_source,
+    search,
+    yt_dlp_available,
+)
+from .dsp import AudioProcessor
 from .implementation.TeamTalkPy import TeamTalk5 as sdk
+from .playlist import Playlist
 
 _audio_streamers = {}
+# The longest wait, in blocks, between retries of a rejected insert.
+_MAX_INSERT_BACKOFF = 4
+# Stream IDs are handed out in turn, so no two open streamers share one.
+_STREAM_IDS = range(6000, 7000)
+_stream_ids = itertools.cycle(_STREAM_IDS)
+_stream_ids_in_use: set[int] = set()
+_stream_ids_lock = threading.Lock()
+
+
+def _allocate_stream_id() -> int:
+    with _stream_ids_lock:
+        for _ in _STREAM_IDS:
+            stream_id = next(_stream_ids)
+            if stream_id not in _stream_ids_in_use:
+                _stream_ids_in_use.add(stream_id)
+                return stream_id
+    raise RuntimeError("Every stream ID is taken. Close unused streamers.")
+
+
+def _release_stream_id(stream_id: int) -> None:
+    with _stream_ids_lock:
+        _stream_ids_in_use.discard(stream_id)
+
+
+class _BlockRing:
+    """A bounded FIFO of audio blocks shared by a producer and the stream thread.
+
+    The blocks are preallocated ctypes buffers of `block_size` bytes. `write`
+    copies the producer's data straight into them, and the stream thread
+    hands a buffer's address to the SDK as is, so the samples are copied once
+    on the way in. A block is only reused after `release`.
+
+    Both sides block on a condition instead of polling: `write` waits while
+    the ring is full and `peek` while it is empty, so an idle streamer uses no
+    CPU. Every `write` that has to wait is counted in `overruns`.
+
+    End-of-stream markers do not take a block: they are kept as the number of
+    blocks queued before them, so ending a stream never waits for room.
+    """
+
+    def __init__(self, capacity: int, block_size: int) -> None:
+        self.capacity = capacity
+        self.block_size = block_size
+        self.overruns = 0
+        self._buffers = [(ctypes.c_char * block_size)() for _ in range(capacity)]
+        self._views = [memoryview(buffer).cast("B") for buffer in self._buffers]
+        self._sizes = [0] * capacity
+        self._head = 0
+        self._count = 0
+        # Bytes written to the block after the last complete one.
+        self._fill = 0
+        # Blocks released so far, and the position of each pending end marker
+        # counted in the same way.
+        self._released = 0
+        self._ends: collections.deque[int] = collections.deque()
+        self._reading = False
+        self._reading_end = False
+        self._closed = False
+        self._cond = threading.Condition()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def write(self, data: bytes | bytearray | memoryview) -> bool:
+        """Copy `data` into the ring, waiting for room. Returns False once closed.
+
+        Data that does not fill a whole block is kept until more is written or
+        `flush` is called.
+        """
+        view = memoryview(data)
+        if view.format != "B":
+            view = view.cast("B")
+        offset = 0
+        total = len(view)
+        block_size = self.block_size
+        with self._cond:
+            if self._closed:
+                return False
+            while offset < total:
+                if self._count == self.capacity and not self._wait_for_room():
+                    return False
+                tail = (self._head + self._count) % self.capacity
+                fill = self._fill
+                size = min(total - offset, block_size - fill)
+                self._views[tail][fill : fill + size] = view[offset : offset + size]
+                offset += size
+                self._fill = fill + size
+                if self._fill == block_size:
+                    self._commit(tail)
+            return True
+
+    def flush(self, end: bool = False) -> bool:
+        """Queue the partly written block, and an end marker if `end`.
+
+        Returns False once closed.
+        """
+        with self._cond:
+            if self._fill:
+                if not self._wait_for_room():
+                    return False
+                self._commit((self._head + self._count) % self.capacity)
+            if end:
+                self._ends.append(self._released + self._count)
+                self._cond.notify_all()
+            return not self._closed
+
+    def peek(self) -> tuple[ctypes.Array[ctypes.c_char], int] | None:
+        """Wait for the oldest block and return it with its size in bytes.
+
+        A size of 0 marks the end of a stream. The block stays queued until
+        `release`. Returns None once closed.
+        """
+        with self._cond:
+            while not self._count and not self._ends and not self._closed:
+                self._cond.wait()
+            if self._ends and self._ends[0] == self._released:
+                self._reading_end = True
+                return self._buffers[self._head], 0
+            if not self._count:
+                return None
+            self._reading = True
+            return self._buffers[self._head], self._sizes[self._head]
+
+    def release(self) -> None:
+        """Drop the block returned by `peek`, making it free for `write`."""
+        with self._cond:
+            if self._reading_end:
+                self._reading_end = False
+                self._ends.popleft()
+            elif self._reading:
+                self._reading = False
+                self._head = (self._head + 1) % self.capacity
+                self._count -= 1
+                self._released += 1
+                self._cond.notify_all()
+
+    def clear(self) -> None:
+        """Drop every queued block, except one the stream thread is sending."""
+        with self._cond:
+            self._count = 1 if self._reading else 0
+            self._fill = 0
+            self._ends.clear()
+            if self._reading_end:
+                # Keep the marker being sent, so `release` can drop it.
+                self._ends.append(self._released)
+            self._cond.notify_all()
+
+    def wait_for_blocks(self, count: int, timeout: float) -> bool:
+        """Wait until `count` blocks are queued or `timeout` passed.
+
+        Returns True if closed.
+        """
+        with self._cond:
+            self._cond.wait_for(
+                lambda: self._closed or self._count >= count, max(timeout, 0)
+            )
+            return self._closed
+
+    def wait(self, timeout: float) -> bool:
+        """Sleep for `timeout` seconds unless closed first. Returns True if closed."""
+        with self._cond:
+            return self._cond.wait_for(lambda: self._closed, timeout)
+
+    def close(self) -> None:
+        """Wake both sides up for good."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def _wait_for_room(self) -> bool:
+        if self._count == self.capacity:
+            self.overruns += 1
+        while self._count == self.capacity and not self._closed:
+            self._cond.wait()
+        return not self._closed
+
+    def _commit(self, tail: int) -> None:
+        self._sizes[tail] = self._fill
+        self._fill = 0
+        self._count += 1
+        self._cond.notify_all()
+
+
+@dataclass(frozen=True)
+class Pacing:
+    """How a streamer splits, queues and paces its audio.
+
+    Attributes:
+        block_size: The size of the blocks handed to the SDK, in bytes.
+        max_blocks: The most blocks waiting to be sent. `Streamer.feed` waits
+            while the queue is full.
+        target_latency: How many seconds of audio are buffered before a
+            stream starts, and again after an underrun. The blocks are then
+            handed to the SDK at the rate they play, which smooths out a
+            bursty producer.
+
+    """
+
+    block_size: int = 4 * 1024
+    max_blocks: int = 64
+    target_latency: float = 0.1
+
+    def __post_init__(self) -> None:
+        """Validate the settings.
+
+        Raises:
+            ValueError: If `block_size` or `max_blocks` is less than 1, or
+                `target_latency` is negative.
+
+        """
+        if self.block_size < 1:
+            raise ValueError("block_size must be at least 1")
+        if self.max_blocks < 1:
+            raise ValueError("max_blocks must be at least 1")
+        if self.target_latency < 0:
+            raise ValueError("target_latency must not be negative")
 
 
 class Streamer:
-    """A class representing a streamer for audio data to a TeamTalk channel."""
+    """A class representing a streamer for audio data to a TeamTalk channel.
+
+    Attributes:
+        decoders: The decoders `stream` tries in turn, see `pytalk.decoders`.
+            Defaults to `pytalk.decoders.default_decoders`.
+        playlist: The tracks played back to back after the current one, see
+            `pytalk.playlist`.
+
+    """
 
     @staticmethod
     def get_streamer_for_channel(
         channel: TeamTalkChannel,
         sample_rate: int = 48000,
         channels: int = 2,
-        block_size: int = 4 * 1024,
+        pacing: Pacing | None = None,
     ) -> "Streamer":
         """Get a streamer for a channel.
 
@@ -84,17 +324,15 @@ class Streamer:
                 Defaults to 48000.
             channels (int, optional): The number of channels in the audio data.
                 Defaults to 2.
-            block_size (int, optional): The block size of the audio data.
-                Defaults to 4 * 1024 (4kb)
+            pacing (Pacing, optional): How the audio is split into blocks,
+                queued and paced out. Defaults to `Pacing()`.
 
         Returns:
             Streamer: The streamer for the channel.
 
         """
         if channel not in _audio_streamers:
-            _audio_streamers[channel] = Streamer(
-                channel, sample_rate, channels, block_size
-            )
+            _audio_streamers[channel] = Streamer(channel, sample_rate, channels, pacing)
         return _audio_streamers[channel]
 
     def __init__(
@@ -102,7 +340,7 @@ class Streamer:
         channel: TeamTalkChannel,
         sample_rate: int = 48000,
         channels: int = 2,
-        block_size: int = 4 * 1024,
+        pacing: Pacing | None = None,
     ) -> None:
         """Initialize a new instance of the TeamTalkStreamer class.
 
@@ -113,19 +351,24 @@ class Streamer:
                 Defaults to 48000.
             channels (int, optional): The number of channels in the audio data.
                 Defaults to 2.
-            block_size (int, optional): The block size of the audio data. Defaults
-                to 4 * 1024 (4kb)
+            pacing (Pacing, optional): How the audio is split into blocks,
+                queued and paced out. Defaults to `Pacing()`.
 
         """
+        if pacing is None:
+            pacing = Pacing()
         self.channel = channel
         self.sample_rate = sample_rate
         self.channels = channels
-        self.block_size = block_size
-        self.blocks: list[bytes] = []
-        self.current_data = b""
-        self.stream_id = random.randint(6000, 6999)  # noqa: S311
-        self.ffmpeg_available = self._has_ffmpeg()
-        self.yt_dlp_available = self._has_yt_dlp()
+        self.pacing = pacing
+        self.block_size = pacing.block_size
+        self.blocks = _BlockRing(pacing.max_blocks, pacing.block_size)
+        self.target_latency = pacing.target_latency
+        self.underruns = 0
+        self.stream_id = _allocate_stream_id()
+        self.decoders: list[Decoder] = default_decoders()
+        self.playlist = Playlist(self)
+        self._processor: AudioProcessor | None = None
         self.running = True
         self._streamer_thread = threading.Thread(target=self._do_stream, daemon=True)
         self._streamer_thread.start()
@@ -133,17 +376,48 @@ class Streamer:
         self._current_streamer_running = False
         self._stream_lock = threading.Lock()
 
-        def __del__(self: "Streamer") -> None:  # noqa: N807
-            """Shuts down the streamer by adding a null-block to the blocks list and.
+    @property
+    def ffmpeg_available(self) -> bool:
+        """Whether ffmpeg is installed. Checked once per process."""
+        return self._has_ffmpeg()
+
+    @property
+    def yt_dlp_available(self) -> bool:
+        """Whether yt-dlp is installed. Checked once per process."""
+        return self._has_yt_dlp()
 
-            waiting for the blocks list to be empty.
+    @property
+    def processor(self) -> AudioProcessor:
+        """Processes the samples the streamer sends, see `pytalk.dsp`.
 
-            """
-            self.blocks.append(b"")
+        Created on first use, after which everything fed or streamed goes
+        through it. Its `gain` changes the level of this streamer alone,
+        without a call into the SDK, and `rms`, `peak` and `speaking`
+        describe the last block sent. Requires NumPy.
+        """
+        if self._processor is None:
+            self._processor = AudioProcessor(self.sample_rate, self.channels)
+        return self._processor
+
+    @property
+    def overruns(self) -> int:
+        """How often `feed` had to wait because the block queue was full."""
+        return self.blocks.overruns
 
-        while len(self.blocks) > 0:
-            pass
+    def close(self) -> None:
+        """Stop the current stream and shut the streamer's thread down.
+
+        `get_streamer_for_channel` then creates a new streamer for the channel.
+        """
+        self.stop()
         self.running = False
+        self.blocks.close()
+        self.playlist.close()
+        self._streamer_thread.join()
+        _release_stream_id(self.stream_id)
+        for channel, streamer in list(_audio_streamers.items()):
+            if streamer is self:
+                del _audio_streamers[channel]
 
     def search_and_stream(self, query: str) -> None:
         """Search for a song and stream it to the channel.
@@ -154,20 +428,15 @@ class Streamer:
         Returns:
             None
 
+        Raises:
+            RuntimeError: If yt-dlp is not installed.
+
         """
         self.stop()
         self.channel.teamtalk.bot.loop.create_task(
             self.channel.send_message(f"Searching for {query}...")
         )
-        yt_dlp_command = f'yt-dlp -f bestaudio --extract-audio --audio-format best --audio-quality 0 --quiet --get-url "ytsearch:{query}"'  # noqa
-        result = subprocess.run(  # noqa: S602
-            yt_dlp_command,
-            check=False,
-            shell=True,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-        )
-        song = result.stdout.decode("utf-8").strip()
+        song = search(query)
         if not song:
             self.channel.teamtalk.bot.loop.create_task(
                 self.channel.send_message("No results found.")
@@ -176,7 +445,8 @@ class Streamer:
         self.stream(song)
 
     def stop(self) -> None:
-        """Stop the current stream."""
+        """Stop the current stream and clear the playlist."""
+        self.playlist.clear()
         self.blocks.clear()
         self._request_stop_stream()
         self._wait_for_cleanup()
@@ -184,6 +454,9 @@ class Streamer:
     def stream(self, path: str) -> None:
         """Streams a file or an url to the channel.
 
+        Whatever is playing stops and the playlist is cleared. Use `enqueue`
+        to play tracks one after the other instead.
+
         Args:
             path(str): The file or url to stream.
 
@@ -192,11 +465,25 @@ class Streamer:
                 file could not be converted to a wav file.
 
         """
+        self.playlist.clear()
         with self._stream_lock:
             self._request_stop_stream()
             self._wait_for_cleanup()
             self._start_new_stream(path)
 
+    def enqueue(self, entry: str) -> None:
+        """Add a track to the playlist.
+
+        It starts right after the last queued track ends, with no gap, or at
+        once if nothing is queued. The next tracks are opened and partly
+        decoded in the background while the current one plays.
+
+        Args:
+            entry: A local file, an url, or search terms for yt-dlp.
+
+        """
+        self.playlist.add(entry)
+
     def _request_stop_stream(self) -> None:
         if self._current_streamer_thread is not None:
             self._current_streamer_running = False
@@ -205,7 +492,9 @@ class Streamer:
         if self._current_streamer_thread:
             self._current_streamer_running = False
             self.blocks.clear()
-            self.blocks.append(b"")
+            self.blocks.flush(end=True)
+        if self._processor is not None:
+            self._processor.reset()
 
     def _start_new_stream(self, path: str) -> None:
         self._current_streamer_running = True
@@ -216,48 +505,19 @@ class Streamer:
             self._current_streamer_thread.start()
 
     def _stream(self, path: str) -> None:
-        if not self.ffmpeg_available:
-            raise RuntimeError(
-                "Could not convert file to wav. ffmpeg is not installed."
-            )
-        if path.startswith("http"):
-            if not self.yt_dlp_available:
-                raise RuntimeError("Could not download file. yt-dlp is not installed.")
-            ffmpeg_process, yt_dlp_process = self._get_url_data(path)
-        else:
-            ffmpeg_command = [
-                "ffmpeg",
-                "-i",
-                path,
-                "-f",
-                "wav",
-                "-acodec",
-                "pcm_s16le",
-                "-ar",
-                f"{str(self.sample_rate)}",
-                "-ac",
-                str(self.channels),
-                "-threads",
-                str(multiprocessing.cpu_count()),
-                "-hide_banner",
-                "-loglevel",
-                "error",
-                "-",
-            ]
-            ffmpeg_process = subprocess.Popen(ffmpeg_command, stdout=subprocess.PIPE)
+        source = open_source(self.decoders, path, self.sample_rate, self.channels)
         try:
-            if ffmpeg_process.stdout:
-                while self._current_streamer_running:
-                    block = ffmpeg_process.stdout.read(self.block_size)
-                    if len(block) == 0:
-                        break
-                    self.feed(block)
-        except KeyboardInterrupt:
-            raise
+            chunk = memoryview(bytearray(self.block_size))
+            while self._current_streamer_running:
+                size = source.readinto(chunk)
+                if not size:
+                    # Send the rest and mark the end, so the gap until the
+                    # next stream does not count as an underrun.
+                    self.blocks.flush(end=True)
+                    break
+                self.feed(chunk[:size])
         finally:
-            self._graceful_shutdown(ffmpeg_process)
-            if path.startswith("http"):
-                self._graceful_shutdown(yt_dlp_process)
+            source.close()
 
     @property
     def volume(self) -> int:
@@ -354,131 +614,135 @@ class Streamer:
             self.channel.server.teamtalk_instance._tt, pre_processor
         )
 
-    def _get_url_data(
-        self, url: str
-    ) -> tuple[subprocess.Popen[bytes], subprocess.Popen[bytes]]:
-        yt_dlp_command = [
-            "yt-dlp",
-            "-f",
-            "bestaudio",
-            "--extract-audio",
-            "--audio-format",
-            "best",
-            "--audio-quality",
-            "0",
-            "--quiet",
-            "-o",
-            "-",
-            url,
-        ]
-        ffmpeg_command = [
-            "ffmpeg",
-            "-i",
-            "pipe:0",
-            "-f",
-            "wav",
-            "-acodec",
-            "pcm_s16le",
-            "-ar",
-            str(self.sample_rate),
-            "-ac",
-            str(self.channels),
-            "-threads",
-            str(multiprocessing.cpu_count()),
-            "-hide_banner",
-            "-loglevel",
-            "error",
-            "-",
-        ]
-
-        yt_dlp_process = subprocess.Popen(yt_dlp_command, stdout=subprocess.PIPE)
-        return (
-            subprocess.Popen(
-                ffmpeg_command, stdin=yt_dlp_process.stdout, stdout=subprocess.PIPE
-            ),
-            yt_dlp_process,
-        )
-
-    def _graceful_shutdown(self, process: subprocess.Popen[bytes]) -> None:
-        if process:
-            process.terminate()
-            try:
-                process.wait(timeout=2)
-            except subprocess.TimeoutExpired:
-                process.kill()
-            finally:
-                if process.stdout:
-                    process.stdout.close()
-                if process.stderr:
-                    process.stderr.close()
-
-    def feed(self, data: bytes) -> int:
+    def feed(
+        self,
+        data: bytes | bytearray | memoryview,
+        sample_rate: int | None = None,
+        channels: int | None = None,
+    ) -> int:
         """Feed data to the streamer.
 
+        The data is copied straight into the streamer's preallocated blocks.
+        A block is sent once it is full; call `flush` to send a partial one.
+        Waits while the streamer's queue is full, so do not call this from
+        the event loop; use `feed_async` there.
+
+        Data in another format, and all data once `processor` has been used,
+        goes through the processor first.
+
         Args:
-            data (bytes): The data to feed to the streamer.
+            data: 16-bit PCM samples in any object supporting the buffer
+                protocol, e.g. bytes, a bytearray, a memoryview or a
+                C-contiguous NumPy int16 array.
+            sample_rate: The sample rate of `data`, if it is not the
+                streamer's. It is resampled, which requires NumPy.
+            channels: The channel count of `data`, if it is not the
+                streamer's. It is mixed, which requires NumPy.
 
         Returns:
             int: The stream id of the stream.
 
         """
-        self.current_data += data
-        if len(self.current_data) >= self.block_size:
-            chunks = [
-                self.current_data[i : i + self.block_size]
-                for i in range(0, len(self.current_data), self.block_size)
-            ]
-            self.blocks.extend(chunks[:-1])
-            self.current_data = chunks[-1]
-        else:
-            self.blocks.append(data)
+        sample_rate = sample_rate or self.sample_rate
+        channels = channels or self.channels
+        if (
+            self._processor is not None
+            or sample_rate != self.sample_rate
+            or channels != self.channels
+        ):
+            data = self.processor.process(data, sample_rate, channels).data
+        self.blocks.write(data)
         return self.stream_id
 
+    async def feed_async(
+        self,
+        data: bytes | bytearray | memoryview,
+        sample_rate: int | None = None,
+        channels: int | None = None,
+    ) -> int:
+        """Feed data to the streamer from the event loop.
+
+        Runs `feed` in the loop's default executor, so waiting for room in the
+        queue does not hold up other events. `data` must not be changed until
+        the call returns.
+
+        Args:
+            data: 16-bit PCM samples, as for `feed`.
+            sample_rate: The sample rate of `data`, if it is not the
+                streamer's.
+            channels: The channel count of `data`, if it is not the
+                streamer's.
+
+        Returns:
+            int: The stream id of the stream.
+
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.feed, data, sample_rate, channels)
+
+    def flush(self) -> None:
+        """Send the samples of a partly filled block without waiting for more."""
+        self.blocks.flush()
+
     def _do_stream(self) -> None:
+        bytes_per_second = 2 * self.channels * self.sample_rate
+        block_duration = self.block_size / bytes_per_second
+        prefill = max(math.ceil(self.target_latency / block_duration), 1)
+        audio_block = sdk.AudioBlock()
+        audio_block.nStreamID = self.stream_id
+        audio_block.nSampleRate = self.sample_rate
+        audio_block.nChannels = self.channels
+        audio_block.uStreamTypes = sdk.StreamType.STREAMTYPE_VOICE
+        # When the next block is due, or None until a stream has started.
+        due: float | None = None
         while self.running:
-            if len(self.blocks) > 0:
-                block = self.blocks[0]
-                audio_block = sdk.AudioBlock()
-                audio_block.nStreamID = self.stream_id
-                audio_block.nSampleRate = self.sample_rate
-                audio_block.nChannels = self.channels
-                audio_block.nSamples = len(block) // 4
-                audio_block.lpRawAudio = ctypes.cast(
-                    (ctypes.c_char * len(block)).from_buffer_copy(block),
-                    ctypes.c_void_p,
-                )
-                audio_block.uStreamTypes = sdk.StreamType.STREAMTYPE_VOICE
-                result = 0
-                while result == 0:
-                    result = sdk._InsertAudioBlock(
-                        self.channel.teamtalk._tt, audio_block
-                    )
-                self.blocks = self.blocks[1:]
+            if due is not None:
+                delay = due - time.monotonic()
+                if delay > 0 and self.blocks.wait(delay):
+                    return
+                if not len(self.blocks):
+                    self.underruns += 1
+                    due = None
+            block = self.blocks.peek()
+            if block is None:
+                return
+            buffer, size = block
+            if due is None and size:
+                if self.blocks.wait_for_blocks(prefill, self.target_latency):
+                    return
+                due = time.monotonic()
+            audio_block.nSamples = size // (2 * self.channels)
+            audio_block.lpRawAudio = ctypes.addressof(buffer)
+            self._insert(audio_block)
+            # The SDK copied the samples, so the block can be refilled.
+            self.blocks.release()
+            if not size or due is None:
+                due = None
+                continue
+            # Catch up at most `target_latency` after a stall instead of
+            # bursting out everything that piled up.
+            due = max(
+                due + size / bytes_per_second,
+                time.monotonic() - self.target_latency,
+            )
+
+    def _insert(self, audio_block: sdk.AudioBlock) -> None:
+        """Insert a block, backing off while the SDK's queue is full.
+
+        The SDK rejects a block while its queue is full and drains the queue
+        in real time, so retrying before a block's worth of audio has played
+        is pointless. The wait starts at half a block and doubles up to
+        `_MAX_INSERT_BACKOFF` blocks.
+        """
+        block_duration = self.block_size / (2 * self.channels * self.sample_rate)
+        delay = block_duration / 2
+        while not sdk._InsertAudioBlock(self.channel.teamtalk._tt, audio_block):
+            if self.blocks.wait(delay):
+                return
+            delay = min(delay * 2, block_duration * _MAX_INSERT_BACKOFF)
 
     def _has_ffmpeg(self) -> bool:
-        try:
-            result = subprocess.run(
-                ["ffmpeg", "-version"],  # noqa: S607
-                check=False,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-            )
-            if result.returncode != 0:
-                return False
-        except FileNotFoundError:
-            return False
-        return True
+        return ffmpeg_available()
 
     def _has_yt_dlp(self) -> bool:
-        try:
-            result = subprocess.run(
-                ["yt-dlp", "--version"],  # noqa: S607
-                check=False,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-            )
-            if result.returncode != 0:
-                return False
-        except FileNotFoundError:
-            return False
-        return True
+        return yt_dlp_available()
@@ -3,6 +3,7 @@
 from typing import TYPE_CHECKING, cast
 
 from ._utils import (
+    _class_attributes,
     _get_tt_obj_attribute,
     _set_tt_obj_attribute,
 )
@@ -54,8 +55,8 @@ class RemoteFile:
             AttributeError: If the attribute does not exist.
 
         """
-        if name in dir(self):
-            return self.__dict__[name]
+        if name in _class_attributes(type(self)):
+            return object.__getattribute__(self, name)
         value = _get_tt_obj_attribute(self.payload, name)
         if isinstance(value, (bytes, sdk.TTCHAR, sdk.TTCHAR_P)):
             return sdk.ttstr(cast("sdk.TTCHAR_P", value))
@@ -127,8 +128,8 @@ class FileTransfer:
             AttributeError: If the attribute does not exist.
 
         """
-        if name in dir(self):
-            return self.__dict__[name]
+        if name in _class_attributes(type(self)):
+            return object.__getattribute__(self, name)
         value = _get_tt_obj_attribute(self.payload, name)
         if isinstance(value, (bytes, sdk.TTCHAR, sdk.TTCHAR_P)):
             return sdk.ttstr(cast("sdk.TTCHAR_P", value))
@@ -145,8 +146,12 @@ class FileTransfer:
             AttributeError: If the attribute does not exist.
 
         """
-        if name in dir(self) or name == "payload":
-            self.__dict__[name] = value
+        if (
+            name in self.__dict__
+            or name in _class_attributes(type(self))
+            or name == "payload"
+        ):
+            object.__setattr__(self, name, value)
         else:
             _get_tt_obj_attribute(self.payload, name)  # Check if attribute exists
             _set_tt_obj_attribute(self.payload, name, value)
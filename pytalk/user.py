@@ -1,8 +1,9 @@
 """Module defines a User class that represents a user on a TeamTalk server."""
 
+from functools import cached_property
 from typing import TYPE_CHECKING, cast
 
-from ._utils import _get_tt_obj_attribute
+from ._utils import _class_attributes, _get_tt_obj_attribute
 
 if TYPE_CHECKING:
     from .channel import Channel as TeamTalkChannel
@@ -10,6 +11,7 @@ from .implementation.TeamTalkPy import TeamTalk5 as sdk
 
 if TYPE_CHECKING:
     from .instance import TeamTalkInstance
+    from .server import Server as TeamTalkServer
 
 from .subscription import Subscription
 
@@ -41,7 +43,7 @@ class User:
         if isinstance(user, str):
             self._user = self.teamtalk_instance.getUserByUsername(sdk.ttstr(user))  # type: ignore [arg-type]
         elif isinstance(user, int):
-            self._user = self.teamtalk_instance.getUser(user)
+            self._user = self.teamtalk_instance._get_user_info(user)
         elif isinstance(user, sdk.User):
             self._user = user
         else:
@@ -50,8 +52,16 @@ class User:
                 f"Argument has type: {str(type(user))}."
             )
         self.id = self.user_id
-        self.channel = self.teamtalk_instance.get_channel(self._user.nChannelID)
-        self.server = self.channel.server
+
+    @cached_property
+    def channel(self) -> "TeamTalkChannel":
+        """The channel the user is in, resolved on first access."""
+        return self.teamtalk_instance.get_channel(self._user.nChannelID)
+
+    @cached_property
+    def server(self) -> "TeamTalkServer":
+        """The server the user is on."""
+        return self.teamtalk_instance.server
 
     @property
     def user_id(self) -> int:
@@ -173,8 +183,8 @@ class User:
                 default behavior. # noqa
 
         """
-        if name in dir(self):
-            return self.__dict__[name]
+        if name in _class_attributes(type(self)):
+            return object.__getattribute__(self, name)
         value = _get_tt_obj_attribute(self._user, name)
         if isinstance(value, (bytes, sdk.TTCHAR, sdk.TTCHAR_P)):
             return sdk.ttstr(cast("sdk.TTCHAR_P", value))
@@ -7,7 +7,7 @@ while the User class represents a user that is currently connected to the server
 
 from typing import TYPE_CHECKING, cast
 
-from ._utils import _get_tt_obj_attribute
+from ._utils import _class_attributes, _get_tt_obj_attribute
 from .implementation.TeamTalkPy import TeamTalk5 as sdk
 
 if TYPE_CHECKING:
@@ -52,8 +52,8 @@ class UserAccount:
                 default behavior. # noqa
 
         """
-        if name in dir(self):
-            return self.__dict__[name]
+        if name in _class_attributes(type(self)):
+            return object.__getattribute__(self, name)
         value = _get_tt_obj_attribute(self._account, name)
         if isinstance(value, (bytes, sdk.TTCHAR, sdk.TTCHAR_P)):
             return sdk.ttstr(cast("sdk.TTCHAR_P", value))
@@ -0,0 +1,33 @@
+"""Helpers for the tests of the audio modules."""
+
+import array
+import ctypes
+import unittest
+
+from pytalk.implementation.TeamTalkPy import TeamTalk5 as sdk
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+requires_numpy = unittest.skipIf(numpy is None, "requires numpy")
+
+
+def pcm(*values):
+    return array.array("h", values).tobytes()
+
+
+def samples(data):
+    return array.array("h", data).tolist()
+
+
+def audio_block(data=b"", sample_rate=1000, channels=1):
+    # The caller keeps the source alive for as long as the block is used.
+    source = ctypes.create_string_buffer(data, len(data))
+    block = sdk.AudioBlock()
+    block.nSampleRate = sample_rate
+    block.nChannels = channels
+    block.nSamples = len(data) // (2 * channels)
+    block.lpRawAudio = ctypes.addressof(source)
+    return block, source
@@ -0,0 +1,60 @@
+import asyncio
+import ctypes
+import unittest
+
+from _audio import pcm, samples
+from pytalk.audio import AudioBlock, AudioBufferPool
+from pytalk.bot import TeamTalkBot
+from pytalk.implementation.TeamTalkPy import TeamTalk5 as sdk
+
+
+class TestAudioBufferPool(unittest.TestCase):
+    def test_buffers_are_reused(self):
+        pool = AudioBufferPool()
+        source = ctypes.create_string_buffer(pcm(1, 2, 3, 4), 8)
+
+        first = pool.copy_from(ctypes.addressof(source), 8)
+        pool.release(first)
+        second = pool.copy_from(ctypes.addressof(source), 8)
+
+        self.assertIs(first, second)
+        self.assertEqual((pool.allocated, pool.reused), (1, 1))
+        self.assertEqual(samples(bytes(second)), [1, 2, 3, 4])
+
+
+class TestAudioBlock(unittest.TestCase):
+    def setUp(self):
+        self.pool = AudioBufferPool()
+        source = ctypes.create_string_buffer(pcm(-1, 0, 1, 2), 8)
+        self.buffer = self.pool.copy_from(ctypes.addressof(source), 8)
+        self.block = AudioBlock(None, sdk.AudioBlock(), self.buffer, self.pool)
+
+    def test_buffer_and_data(self):
+        self.assertEqual(self.block.buffer.tolist(), [-1, 0, 1, 2])
+        self.assertEqual(self.block.data, bytes(self.buffer))
+
+    def test_buffer_recycled_after_handler(self):
+        async def run():
+            bot = TeamTalkBot()
+            bot.loop = asyncio.get_running_loop()
+            seen = []
+
+            async def on_user_audio(block):
+                seen.append(block.buffer.tolist())
+
+            bot.event(on_user_audio)
+            bot.dispatch("user_audio", self.block)
+            self.block._release()
+            self.assertIsNotNone(self.block._buffer)
+            await asyncio.sleep(0)
+            return seen
+
+        self.assertEqual(asyncio.run(run()), [[-1, 0, 1, 2]])
+        self.assertIsNone(self.block._buffer)
+        self.assertIs(self.pool._free[8][0], self.buffer)
+        with self.assertRaises(ValueError):
+            self.block.buffer
+
+
+if __name__ == "__main__":
+    unittest.main()
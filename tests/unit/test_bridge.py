@@ -0,0 +1,103 @@
+import ctypes
+import unittest
+from unittest.mock import MagicMock, patch
+
+from _audio import audio_block
+from pytalk.implementation.TeamTalkPy import TeamTalk5 as sdk
+from pytalk.instance import TeamTalkInstance
+from pytalk.streamer import _stream_ids_in_use
+
+
+@patch("pytalk.instance.sdk._EnableAudioBlockEventEx")
+class TestAudioBridge(unittest.TestCase):
+    def setUp(self):
+        bot = MagicMock(
+            spec=[
+                "_listeners",
+                "capture_all_audio",
+                "snapshot_events",
+                "coalesce_window",
+            ],
+            _listeners={},
+            snapshot_events=False,
+            coalesce_window=None,
+        )
+        self.source = TeamTalkInstance(bot, MagicMock())
+        self.target = MagicMock(_tt=object())
+
+    @patch("pytalk.bridge.sdk._InsertAudioBlock", return_value=1)
+    def test_blocks_are_inserted_into_the_target(self, insert, enable):
+        bridge = self.source.bridge_audio(self.target, user=5)
+        block, source = audio_block(bytes(8))
+        block.nStreamID = 1
+
+        self.source._audio_streams[5][0]._feed(block, 8)
+
+        self.assertEqual(enable.call_args.args[1::3], (5, True))
+        tt, sent = insert.call_args.args
+        self.assertIs(tt, self.target._tt)
+        self.assertEqual(sent.nStreamID, bridge.stream_id)
+        self.assertEqual(sent.lpRawAudio, ctypes.addressof(source))
+        self.assertEqual((sent.nSamples, sent.nSampleRate), (4, 1000))
+        # The received block is left as it was for the event handlers.
+        self.assertEqual(block.nStreamID, 1)
+        self.assertEqual(bridge.blocks, 1)
+
+    @patch("pytalk.bridge.sdk._InsertAudioBlock", return_value=1)
+    @patch("pytalk.bridge.time.monotonic", side_effect=[10.0, 10.0, 10.0, 10.1])
+    def test_latency_counts_audio_still_queued(self, _monotonic, _insert, _):
+        bridge = self.source.bridge_audio(self.target, muxed=True)
+        # 0.04 s blocks: three at once, then one 0.1 s later.
+        for _ in range(4):
+            bridge._feed(audio_block(bytes(80))[0], 80)
+
+        self.assertAlmostEqual(bridge.latency, 0.02)
+        self.assertAlmostEqual(bridge.max_latency, 0.08)
+
+    @patch("pytalk.bridge.sdk._InsertAudioBlock", return_value=0)
+    def test_refused_blocks_are_counted(self, _insert, _):
+        bridge = self.source.bridge_audio(self.target, user=5)
+        bridge._feed(audio_block(bytes(8))[0], 8)
+
+        self.assertEqual((bridge.blocks, bridge.dropped), (0, 1))
+
+    def test_close_unregisters_the_bridge(self, enable):
+        bridge = self.source.bridge_audio(self.target, muxed=True)
+        self.assertIn(bridge.stream_id, _stream_ids_in_use)
+        bridge.close()
+        bridge.close()
+
+        self.assertEqual(self.source._audio_streams, {})
+        self.assertNotIn(bridge.stream_id, _stream_ids_in_use)
+        self.assertEqual(
+            [call.args[1::3] for call in enable.call_args_list],
+            [(sdk.TT_MUXED_USERID, True), (sdk.TT_MUXED_USERID, False)],
+        )
+
+    def test_exactly_one_target(self, _):
+        with self.assertRaises(ValueError):
+            self.source.bridge_audio(self.target)
+        with self.assertRaises(ValueError):
+            self.source.bridge_audio(self.target, user=5, muxed=True)
+
+    @patch("pytalk.instance._ReleaseUserAudioBlock")
+    @patch("pytalk.instance._AcquireUserAudioBlock")
+    @patch("pytalk.bridge.sdk._InsertAudioBlock", return_value=1)
+    def test_acquired_blocks_are_relayed_before_release(
+        self, insert, acquire, release, _
+    ):
+        block, _source = audio_block(bytes(8))
+        acquire.return_value = ctypes.addressof(block)
+        release.side_effect = lambda *_: self.assertEqual(insert.call_count, 1)
+        self.source.bridge_audio(self.target, user=5)
+        msg = sdk.TTMessage()
+        msg.nSource = 5
+        msg.nStreamType = sdk.StreamType.STREAMTYPE_VOICE
+
+        self.source._copy_audio_block(msg, None)
+
+        release.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from _audio import audio_block
+from pytalk.implementation.TeamTalkPy import TeamTalk5 as sdk
+from pytalk.instance import TeamTalkInstance
+
+
+def _statechange(user_id, channel_id, talking=True):
+    msg = sdk.TTMessage()
+    msg.nClientEvent = sdk.ClientEvent.CLIENTEVENT_USER_STATECHANGE
+    msg.user.nUserID = user_id
+    msg.user.nChannelID = channel_id
+    msg.user.uUserState = sdk.UserState.USERSTATE_VOICE if talking else 0
+    return msg
+
+
+@patch("pytalk.instance.sdk._EnableAudioBlockEventEx")
+class TestCaptureAudio(unittest.TestCase):
+    def setUp(self):
+        bot = MagicMock(
+            spec=[
+                "_listeners",
+                "dispatch",
+                "capture_all_audio",
+                "snapshot_events",
+                "coalesce_window",
+                "on_user_audio",
+            ],
+            _listeners={},
+            capture_all_audio=False,
+            snapshot_events=False,
+            coalesce_window=None,
+        )
+        self.instance = TeamTalkInstance(bot, MagicMock())
+
+    def enabled(self, enable):
+        return [call.args[1::3] for call in enable.call_args_list]
+
+    def test_only_captured_users_are_enabled(self, enable):
+        self.instance.capture_audio(user=5)
+        enable.reset_mock()
+
+        self.instance._process_message(_statechange(5, 1))
+        self.instance._process_message(_statechange(6, 1))
+
+        self.assertEqual(self.enabled(enable), [(5, True)])
+
+    def test_captures_are_reference_counted(self, enable):
+        first = self.instance.capture_audio(user=5)
+        with self.instance.capture_audio(user=5):
+            first.release()
+            first.release()
+            self.assertEqual(self.enabled(enable), [(5, True), (5, True)])
+        self.assertEqual(self.enabled(enable)[-1], (5, False))
+        self.assertFalse(self.instance._audio_captures)
+
+    def test_channel_capture(self, enable):
+        self.instance.capture_audio(channel=3)
+        enable.reset_mock()
+
+        self.instance._process_message(_statechange(7, 3))
+        self.instance._process_message(_statechange(8, 4))
+
+        self.assertEqual(self.enabled(enable), [(7, True)])
+
+    def test_muxed_capture_does_not_enable_users(self, enable):
+        self.instance.capture_audio(muxed=True)
+        self.instance._process_message(_statechange(5, 1))
+
+        self.assertEqual(self.enabled(enable), [(sdk.TT_MUXED_USERID, True)])
+
+    def test_exactly_one_target(self, enable):
+        with self.assertRaises(ValueError):
+            self.instance.capture_audio()
+        with self.assertRaises(ValueError):
+            self.instance.capture_audio(user=1, muxed=True)
+
+    def test_record_audio_routes_blocks(self, enable):
+        recorder = MagicMock(_captures=[])
+        capture = self.instance.record_audio(recorder, user=5)
+        block, _source = audio_block(bytes(4))
+
+        self.instance._feed_recorders(6, block, 4)
+        self.instance._feed_recorders(5, block, 4)
+        capture.release()
+        self.instance._feed_recorders(5, block, 4)
+
+        self.assertEqual(recorder._captures, [capture])
+        self.assertEqual(recorder.feed.call_count, 1)
+        self.assertEqual(recorder.feed.call_args.args[:3], (5, 1000, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -10,7 +10,7 @@ class TestChannel(unittest.TestCase):
         self.teamtalk_mock = MagicMock()
         self.channel_id = 1
 
-        # Mock the _get_channel_info method to return a mock channel and path
+        # Mock the channel lookups to return a mock channel and path
         self.sdk_channel = sdk.Channel()
         self.sdk_channel.nChannelID = self.channel_id
         self.sdk_channel.szName = sdk.ttstr("Test Channel")
@@ -19,7 +19,8 @@ class TestChannel(unittest.TestCase):
         self.sdk_channel.nDiskQuota = 1024
         self.sdk_channel.uChannelType = 0
 
-        self.teamtalk_mock._get_channel_info.return_value = (self.sdk_channel, "/Test Channel")
+        self.teamtalk_mock._get_channel_struct.return_value = self.sdk_channel
+        self.teamtalk_mock._get_channel_path.return_value = "/Test Channel"
 
         self.channel = Channel(self.teamtalk_mock, self.channel_id)
 
@@ -33,10 +34,10 @@ class TestChannel(unittest.TestCase):
         sdk_channel.nDiskQuota = 1024
         sdk_channel.uChannelType = 0
 
-        # Patch the _get_channel_info method to return our mock channel
+        # Patch the _get_channel_struct method to return our mock channel
         with patch.object(
-            self.teamtalk_mock, "_get_channel_info", return_value=(sdk_channel, "/Test Channel")
-        ) as mock_get_channel_info:
+            self.teamtalk_mock, "_get_channel_struct", return_value=sdk_channel
+        ) as mock_get_channel_struct:
             self.channel = Channel(self.teamtalk_mock, self.channel_id)
             # Test properties
             self.assertEqual(self.channel.id, self.channel_id)
@@ -47,7 +48,27 @@ class TestChannel(unittest.TestCase):
             self.assertEqual(self.channel.channel_type, 0)
 
             # Verify that the getChannel method was called
-            mock_get_channel_info.assert_called_with(self.channel_id)
+            mock_get_channel_struct.assert_called_with(self.channel_id)
+
+    def test_path_is_resolved_lazily(self):
+        self.teamtalk_mock._get_channel_path.assert_not_called()
+
+        self.assertEqual(self.channel.path, "/Test Channel")
+        self.assertEqual(self.channel.path, "/Test Channel")
+
+        self.teamtalk_mock._get_channel_path.assert_called_once_with(self.channel_id)
+
+    def test_setting_struct_attribute(self):
+        self.channel.name = "Renamed"
+        self.channel.max_users = 20
+
+        self.assertEqual(self.channel.name, "Renamed")
+        self.assertEqual(self.sdk_channel.nMaxUsers, 20)
+        self.assertNotIn("max_users", self.channel.__dict__)
+
+    def test_unknown_attribute_raises(self):
+        with self.assertRaises(AttributeError):
+            self.channel.no_such_field
 
 
 if __name__ == "__main__":
@@ -0,0 +1,114 @@
+import tempfile
+import threading
+import unittest
+import wave
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from pytalk import decoders
+from pytalk.streamer import Pacing, Streamer
+
+
+def _write_wav(path, sample_rate, channels, data, sample_width=2):
+    with wave.open(str(path), "wb") as file:
+        file.setnchannels(channels)
+        file.setsampwidth(sample_width)
+        file.setframerate(sample_rate)
+        file.writeframes(data)
+
+
+def _read_all(source, chunk_size=3):
+    chunk = memoryview(bytearray(chunk_size))
+    data = bytearray()
+    while size := source.readinto(chunk):
+        data += chunk[:size]
+    source.close()
+    return bytes(data)
+
+
+class TestDecoders(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+
+    def test_wave_decoder_reads_samples(self):
+        path = self.directory / "a.wav"
+        _write_wav(path, 8000, 2, bytes(range(16)))
+        # Trailing chunks after the samples must not be played.
+        with path.open("ab") as file:
+            file.write(b"LIST\x04\x00\x00\x00junk")
+
+        source = decoders.WaveDecoder().open(str(path), 8000, 2)
+
+        self.assertEqual(_read_all(source), bytes(range(16)))
+
+    def test_wave_decoder_skips_other_formats(self):
+        path = self.directory / "a.wav"
+        _write_wav(path, 8000, 1, bytes(4))
+        wide = self.directory / "b.wav"
+        _write_wav(wide, 8000, 2, bytes(6), sample_width=3)
+        broken = self.directory / "c.wav"
+        broken.write_bytes(b"not a wave file")
+        decoder = decoders.WaveDecoder()
+
+        self.assertIsNone(decoder.open(str(path), 8000, 2))
+        self.assertIsNone(decoder.open(str(path), 48000, 1))
+        self.assertIsNone(decoder.open(str(wide), 8000, 2))
+        self.assertIsNone(decoder.open(str(broken), 8000, 2))
+        self.assertIsNone(decoder.open("https://example.com/a.wav", 8000, 1))
+
+    def test_pcm_decoder_reads_raw_files(self):
+        path = self.directory / "a.pcm"
+        path.write_bytes(bytes(range(10)))
+        decoder = decoders.PcmDecoder()
+
+        self.assertEqual(_read_all(decoder.open(str(path), 8000, 1)), bytes(range(10)))
+        self.assertIsNone(decoder.open(str(self.directory / "a.mp3"), 8000, 1))
+
+    @patch("pytalk.decoders.subprocess.run")
+    def test_program_detection_is_cached(self, run):
+        decoders._program_available.cache_clear()
+        self.addCleanup(decoders._program_available.cache_clear)
+        run.return_value.returncode = 0
+
+        self.assertTrue(decoders.ffmpeg_available())
+        self.assertTrue(decoders.ffmpeg_available())
+        run.side_effect = FileNotFoundError
+        self.assertFalse(decoders.yt_dlp_available())
+        self.assertFalse(decoders.yt_dlp_available())
+
+        self.assertEqual(run.call_count, 2)
+
+    @patch("pytalk.decoders.ffmpeg_available", return_value=False)
+    def test_ffmpeg_decoder_requires_ffmpeg(self, _):
+        with self.assertRaises(RuntimeError):
+            decoders.FFmpegDecoder().open("a.mp3", 48000, 2)
+
+    @patch("pytalk.decoders.subprocess.Popen")
+    @patch("pytalk.decoders.ffmpeg_available", return_value=True)
+    def test_streamer_plays_wav_without_ffmpeg(self, available, popen):
+        path = self.directory / "a.wav"
+        _write_wav(path, 1000, 1, bytes(range(1, 9)) * 2)
+        inserted = []
+        done = threading.Event()
+
+        def insert(_tt, block):
+            inserted.append(block.nSamples)
+            if not block.nSamples:
+                done.set()
+            return 1
+
+        with patch("pytalk.streamer.sdk._InsertAudioBlock", side_effect=insert):
+            streamer = Streamer(MagicMock(), 1000, 1, Pacing(block_size=8, target_latency=0))
+            streamer.stream(str(path))
+            self.assertTrue(done.wait(1))
+            streamer.close()
+
+        self.assertEqual(inserted[:3], [4, 4, 0])
+        popen.assert_not_called()
+        available.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
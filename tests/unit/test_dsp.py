@@ -0,0 +1,170 @@
+import ctypes
+import math
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+from _audio import audio_block, numpy, pcm, requires_numpy, samples
+from pytalk.audio import AudioBlock
+from pytalk.dsp import VoiceActivityDetector, to_dbfs
+from pytalk.streamer import Pacing, Streamer
+
+if numpy is not None:
+    from pytalk.dsp import AudioProcessor, Resampler
+
+
+def _tone(frequency, rate, seconds=0.1):
+    t = numpy.arange(int(rate * seconds)) / rate
+    return (numpy.sin(2 * math.pi * frequency * t) * 10000).astype(numpy.int16)
+
+
+@requires_numpy
+class TestAudioProcessor(unittest.TestCase):
+    def test_stereo_is_mixed_down_by_averaging(self):
+        processor = AudioProcessor(channels=1)
+        out = processor.process(pcm(100, 300, -50, 50), 1000, 2)
+
+        self.assertEqual(out.tolist(), [200, 0])
+
+    def test_mono_is_copied_to_both_channels(self):
+        processor = AudioProcessor(channels=2)
+        out = processor.process(pcm(1, 2), 1000, 1)
+
+        self.assertEqual(out.tolist(), [1, 1, 2, 2])
+
+    def test_gain_is_rounded_and_clipped(self):
+        processor = AudioProcessor(gain=1.5)
+        out = processor.process(pcm(3, -3, 30000, -30000), 1000, 1)
+
+        self.assertEqual(out.tolist(), [4, -4, 32767, -32768])
+
+    def test_levels_are_relative_to_full_scale(self):
+        processor = AudioProcessor()
+        processor.process(pcm(16384, -16384, 16384, -16384), 1000, 1)
+
+        self.assertAlmostEqual(processor.rms, 0.5)
+        self.assertAlmostEqual(processor.peak, 0.5)
+        self.assertAlmostEqual(to_dbfs(processor.rms), -6.02, places=2)
+
+    def test_split_samples_are_kept_for_the_next_block(self):
+        processor = AudioProcessor()
+        data = pcm(1, 2, 3, 4)
+        first = processor.process(data[:3], 1000, 2)
+        second = processor.process(data[3:], 1000, 2)
+
+        self.assertEqual((first.tolist(), second.tolist()), ([], [1, 2, 3, 4]))
+
+    def test_more_channels_cannot_be_mixed_to_two(self):
+        processor = AudioProcessor(channels=2)
+        with self.assertRaises(ValueError):
+            processor.process(pcm(0, 0, 0), 1000, 3)
+
+    def test_resampling_48k_stereo_to_16k_mono(self):
+        tone = _tone(1000, 48000)
+        stereo = numpy.repeat(tone, 2)
+        processor = AudioProcessor(16000, 1)
+        out = numpy.concatenate(
+            [processor.process(block, 48000, 2) for block in numpy.split(stereo, 5)]
+        )
+
+        self.assertEqual(len(out), 1600)
+        # The filter delays the output by 16 input samples.
+        t = (numpy.arange(len(out)) * 3 - 16) / 48000
+        expected = numpy.sin(2 * math.pi * 1000 * t) * 10000
+        self.assertLess(numpy.abs(out[10:] - expected[10:]).max(), 100)
+
+
+@requires_numpy
+class TestResampler(unittest.TestCase):
+    def test_blocks_join_without_seams(self):
+        tone = _tone(440, 44100).astype(numpy.float32)[:, None]
+        whole = Resampler(44100, 48000).process(tone)
+        resampler = Resampler(44100, 48000)
+        parts = numpy.concatenate(
+            [resampler.process(block) for block in numpy.array_split(tone, 7)]
+        )
+
+        self.assertEqual(len(parts), len(whole))
+        numpy.testing.assert_allclose(parts, whole, atol=0.5)
+
+    def test_frequencies_above_the_new_nyquist_are_removed(self):
+        tone = _tone(12000, 48000).astype(numpy.float32)[:, None]
+        out = Resampler(48000, 16000).process(tone)
+
+        # A 12 kHz tone would alias to 4 kHz at 16 kHz.
+        self.assertLess(numpy.abs(out[20:]).max(), 100)
+
+
+class TestVoiceActivityDetector(unittest.TestCase):
+    def test_speech_starts_after_attack_and_ends_after_hangover(self):
+        vad = VoiceActivityDetector(threshold=-40, attack=0.04, hangover=0.1)
+        loud, quiet = 0.1, 0.001
+        levels = [loud, quiet, loud, loud, quiet, quiet, quiet, quiet, quiet]
+
+        states = [vad.update(level, 0.02) for level in levels]
+
+        self.assertEqual(
+            states, [False, False, False, True, True, True, True, True, False]
+        )
+
+
+@requires_numpy
+class TestAudioBlockProcess(unittest.TestCase):
+    def test_process_uses_the_block_format(self):
+        block, buffer = audio_block(pcm(10, 30, 50, 70), channels=2)
+        audio = AudioBlock(None, block, buffer)
+
+        out = audio.process(AudioProcessor(channels=1))
+
+        self.assertEqual(out.tolist(), [20, 60])
+
+
+@requires_numpy
+@patch.object(Streamer, "_has_yt_dlp", return_value=False)
+@patch.object(Streamer, "_has_ffmpeg", return_value=False)
+class TestStreamerProcessing(unittest.TestCase):
+    def setUp(self):
+        self.sent = []
+        self.done = threading.Event()
+
+        def insert(_tt, block):
+            if block.nSamples:
+                data = ctypes.string_at(block.lpRawAudio, block.nSamples * 4)
+                self.sent.append(samples(data))
+            else:
+                self.done.set()
+            return 1
+
+        patcher = patch("pytalk.streamer.sdk._InsertAudioBlock", side_effect=insert)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def stream(self, streamer, *feeds):
+        self.addCleanup(streamer.close)
+        for data, kwargs in feeds:
+            streamer.feed(data, **kwargs)
+        streamer.blocks.flush(end=True)
+        self.assertTrue(self.done.wait(1))
+        return [sample for block in self.sent for sample in block]
+
+    def test_other_formats_are_converted(self, *_):
+        # 2 kHz stereo, blocks of 4 frames.
+        streamer = Streamer(MagicMock(), 2000, 2, Pacing(16, target_latency=0))
+        sent = self.stream(
+            streamer, (pcm(5, 7, 9, 11), {"sample_rate": 1000, "channels": 1})
+        )
+
+        # The last half frame waits for the next samples.
+        self.assertEqual(sent, [5, 5, 6, 6, 7, 7, 8, 8, 9, 9, 10, 10, 11, 11])
+
+    def test_processor_gain_applies_to_fed_samples(self, *_):
+        streamer = Streamer(MagicMock(), 1000, 2, Pacing(8, target_latency=0))
+        streamer.processor.gain = 0.5
+        sent = self.stream(streamer, (pcm(100, 200, 300, 400), {}))
+
+        self.assertEqual(sent, [50, 100, 150, 200])
+        self.assertAlmostEqual(streamer.processor.peak, 200 / 32768)
+
+
+if __name__ == "__main__":
+    unittest.main()
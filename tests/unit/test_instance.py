@@ -1,13 +1,22 @@
+import asyncio
+import ctypes
+import queue
+import threading
 import unittest
 from unittest.mock import MagicMock, patch
 
-from pytalk.instance import TeamTalkInstance
+from _audio import audio_block
+from pytalk._utils import _async_wait_for_cmd, _wait_for_cmd
+from pytalk.bot import TeamTalkBot
+from pytalk.instance import MAX_EVENTS_PER_PASS, TeamTalkInstance
 from pytalk.implementation.TeamTalkPy import TeamTalk5 as sdk
 
 
 class TestInstance(unittest.TestCase):
     def setUp(self):
-        self.bot_mock = MagicMock()
+        self.bot_mock = MagicMock(
+            _pumping=False, teamtalks=[], snapshot_events=False, coalesce_window=None
+        )
         self.server_info_mock = MagicMock()
         self.instance = TeamTalkInstance(self.bot_mock, self.server_info_mock)
 
@@ -45,6 +54,453 @@ class TestInstance(unittest.TestCase):
         self.assertTrue(result)
         sdk._CancelFileTransfer.assert_called_with(self.instance._tt, 1)
 
+    def test_register_event_decoder(self):
+        decoder = MagicMock()
+        msg = sdk.TTMessage()
+        msg.nClientEvent = sdk.ClientEvent.CLIENTEVENT_HOTKEY
+
+        self.instance.register_event_decoder(
+            sdk.ClientEvent.CLIENTEVENT_HOTKEY, decoder
+        )
+        self.instance._process_message(msg)
+
+        decoder.assert_called_once_with(msg)
+
+    def test_register_event_decoder_refuses_builtin(self):
+        with self.assertRaises(ValueError):
+            self.instance.register_event_decoder(
+                sdk.ClientEvent.CLIENTEVENT_CMD_USER_TEXTMSG, MagicMock()
+            )
+
+    def test_unhandled_event_is_logged(self):
+        msg = sdk.TTMessage()
+        msg.nClientEvent = sdk.ClientEvent.CLIENTEVENT_HOTKEY
+
+        with self.assertLogs("pytalk.instance", level="WARNING"):
+            self.instance._process_message(msg)
+
+    def _message(self, event=sdk.ClientEvent.CLIENTEVENT_CMD_USER_UPDATE):
+        msg = sdk.TTMessage()
+        msg.nClientEvent = event
+        return msg
+
+    @patch.object(sdk.TeamTalk, "getMessage")
+    def test_process_events_stops_at_the_batch_cap(self, get_message):
+        get_message.return_value = self._message()
+        self.instance._process_message = MagicMock()
+
+        processed = asyncio.run(self.instance._process_events())
+
+        self.assertEqual(processed, MAX_EVENTS_PER_PASS)
+        self.assertEqual(get_message.call_count, MAX_EVENTS_PER_PASS)
+        self.assertEqual(
+            self.instance._process_message.call_count, MAX_EVENTS_PER_PASS
+        )
+        get_message.assert_called_with(0)
+
+    @patch.object(sdk.TeamTalk, "getMessage")
+    def test_process_events_stops_when_the_sdk_is_empty(self, get_message):
+        get_message.side_effect = [
+            self._message(),
+            self._message(),
+            self._message(sdk.ClientEvent.CLIENTEVENT_NONE),
+        ]
+        self.instance._process_message = MagicMock()
+
+        processed = asyncio.run(self.instance._process_events(max_events=10))
+
+        self.assertEqual(processed, 2)
+        self.assertEqual(self.instance._process_message.call_count, 2)
+
+    @patch.object(sdk.TeamTalk, "getMessage")
+    def test_process_events_ends_the_pass_when_told_to_stop(self, get_message):
+        get_message.return_value = self._message()
+        self.instance._process_message = MagicMock()
+        stop = MagicMock(side_effect=[False, False, True])
+
+        processed = asyncio.run(self.instance._process_events(stop=stop))
+
+        self.assertEqual(processed, 3)
+        self.assertEqual(get_message.call_count, 3)
+
+    def test_busy_pump_yields_to_the_loop_between_passes(self):
+        passes = 0
+
+        async def process_events(stop=None):
+            nonlocal passes
+            passes += 1
+            if passes > 100:
+                raise RuntimeError("the pump never yielded")
+            return MAX_EVENTS_PER_PASS
+
+        async def scenario():
+            bot = TeamTalkBot()
+            teamtalk = MagicMock()
+            teamtalk._process_events = process_events
+            bot.teamtalks = [teamtalk]
+            pump = asyncio.create_task(bot._start())
+            for expected in range(1, 4):
+                await asyncio.sleep(0)
+                # Each pass over a busy server is followed by one yield.
+                self.assertEqual(passes, expected)
+            pump.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await pump
+
+        asyncio.run(scenario())
+
+    @patch.object(sdk.TeamTalk, "getMessage")
+    def test_synchronous_wait_hands_other_events_to_the_pump(self, get_message):
+        other = self._message()
+        reply = self._message(sdk.ClientEvent.CLIENTEVENT_CMD_SUCCESS)
+        reply.nSource = 7
+        get_message.side_effect = [other, reply]
+        self.instance._process_message = MagicMock()
+
+        async def scenario():
+            self.bot_mock._pumping = True
+            self.bot_mock.teamtalks = [self.instance]
+            self.bot_mock.loop = asyncio.get_running_loop()
+            result, _ = _wait_for_cmd(self.instance, 7, 1000)
+            self.instance._process_message.assert_not_called()
+            await asyncio.sleep(0)
+            return result
+
+        self.assertTrue(asyncio.run(scenario()))
+        self.instance._process_message.assert_called_once_with(other)
+
+    @patch.object(sdk.TeamTalk, "getMessage")
+    def test_synchronous_wait_updates_the_state_when_not_pumped(self, get_message):
+        other = self._message()
+        reply = self._message(sdk.ClientEvent.CLIENTEVENT_CMD_ERROR)
+        reply.nSource = 7
+        get_message.side_effect = [other, reply]
+        self.instance._state.observe = MagicMock()
+
+        result, _ = _wait_for_cmd(self.instance, 7, 1000)
+
+        self.assertFalse(result)
+        self.instance._state.observe.assert_called_once_with(other)
+
+    def test_async_wait_for_cmd_resolved_by_pump(self):
+        async def scenario():
+            waiter = asyncio.ensure_future(
+                _async_wait_for_cmd(self.instance, 7, 1000)
+            )
+            await asyncio.sleep(0)
+            other = sdk.TTMessage()
+            other.nClientEvent = sdk.ClientEvent.CLIENTEVENT_CMD_SUCCESS
+            other.nSource = 8
+            self.instance._process_message(other)
+            self.assertFalse(waiter.done())
+            reply = sdk.TTMessage()
+            reply.nClientEvent = sdk.ClientEvent.CLIENTEVENT_CMD_ERROR
+            reply.nSource = 7
+            self.instance._process_message(reply)
+            return await waiter
+
+        result, _ = asyncio.run(scenario())
+
+        self.assertFalse(result)
+        self.assertEqual(self.instance._pending_commands, {})
+
+    def test_async_wait_for_cmd_times_out(self):
+        with self.assertRaises(TimeoutError):
+            asyncio.run(_async_wait_for_cmd(self.instance, 7, 10))
+        self.assertEqual(self.instance._pending_commands, {})
+
+    def test_user_updates_are_coalesced(self):
+        bot = MagicMock(coalesce_window=0.01, snapshot_events=False)
+        instance = TeamTalkInstance(bot, self.server_info_mock)
+
+        def update(user_id, nickname):
+            msg = sdk.TTMessage()
+            msg.nClientEvent = sdk.ClientEvent.CLIENTEVENT_CMD_USER_UPDATE
+            msg.user.nUserID = user_id
+            msg.user.szNickname = sdk.ttstr(nickname)
+            return msg
+
+        async def scenario():
+            for nickname in ("a", "b", "c"):
+                instance._process_message(update(5, nickname))
+            instance._process_message(update(6, "x"))
+            bot.dispatch.assert_not_called()
+            await asyncio.sleep(0.05)
+
+        asyncio.run(scenario())
+
+        delivered = {
+            call.args[1].id: (call.args[1].nickname, call.kwargs["coalesced"])
+            for call in bot.dispatch.call_args_list
+        }
+        self.assertEqual(delivered, {5: ("c", 2), 6: ("x", 0)})
+
+    def test_held_updates_are_dropped_when_the_connection_is_lost(self):
+        bot = MagicMock(coalesce_window=10, snapshot_events=False)
+        instance = TeamTalkInstance(bot, self.server_info_mock)
+        instance.reconnect_enabled = False
+
+        async def scenario():
+            msg = sdk.TTMessage()
+            msg.nClientEvent = sdk.ClientEvent.CLIENTEVENT_CMD_USER_UPDATE
+            msg.user.nUserID = 5
+            instance._process_message(msg)
+            ((_, _, handle),) = instance._coalescer._pending.values()
+            instance._on_con_lost(sdk.TTMessage())
+            return handle
+
+        handle = asyncio.run(scenario())
+
+        self.assertTrue(handle.cancelled())
+        self.assertEqual(instance._coalescer._pending, {})
+        self.assertNotIn(
+            "user_update", [call.args[0] for call in bot.dispatch.call_args_list]
+        )
+
+    def test_held_updates_are_dropped_on_the_loop(self):
+        bot = MagicMock(coalesce_window=10, snapshot_events=False)
+        instance = TeamTalkInstance(bot, self.server_info_mock)
+        threads = []
+        clear = instance._coalescer.clear
+
+        def record_thread():
+            threads.append(threading.get_ident())
+            clear()
+
+        instance._coalescer.clear = record_thread
+
+        async def scenario():
+            loop = bot.loop = asyncio.get_running_loop()
+            msg = sdk.TTMessage()
+            msg.nClientEvent = sdk.ClientEvent.CLIENTEVENT_CMD_USER_UPDATE
+            msg.user.nUserID = 5
+            instance._process_message(msg)
+            await loop.run_in_executor(None, instance._end_session)
+            return threading.get_ident()
+
+        loop_thread = asyncio.run(scenario())
+
+        self.assertEqual(threads, [loop_thread])
+        self.assertEqual(instance._coalescer._pending, {})
+
+    @patch("pytalk.instance._ReleaseUserAudioBlock")
+    @patch("pytalk.instance._AcquireUserAudioBlock")
+    def test_audio_buffer_is_returned_when_dispatch_fails(self, acquire, release):
+        self.instance.bot = MagicMock(
+            spec=["_listeners", "dispatch", "on_muxed_audio"], _listeners={}
+        )
+        self.instance.bot.dispatch.side_effect = RuntimeError("dispatch failed")
+        block, _source = audio_block(bytes(8), channels=2)
+        acquire.return_value = ctypes.addressof(block)
+        msg = sdk.TTMessage()
+        msg.nSource = sdk.TT_MUXED_USERID
+        msg.nStreamType = sdk.StreamType.STREAMTYPE_VOICE
+
+        with self.assertLogs("pytalk.instance", "ERROR"):
+            self.instance._on_user_audioblock(msg)
+
+        self.assertEqual(len(self.instance._audio_pool._free[8]), 1)
+        release.assert_called_once()
+
+    @patch("pytalk.instance.sdk._EnableAudioBlockEventEx")
+    def test_audio_consumers_are_closed_on_logout(self, enable):
+        self.instance.bot = MagicMock(
+            spec=["_listeners", "dispatch", "loop"], _listeners={}
+        )
+        self.instance.reconnect_enabled = False
+        user_stream = self.instance.open_audio_stream(5)
+        muxed_stream = self.instance.open_audio_stream(sdk.TT_MUXED_USERID)
+        pool = MagicMock(_captures=[])
+        capture = self.instance.offload_audio(pool, user=5)
+
+        msg = sdk.TTMessage()
+        msg.user.nUserID = 5
+        self.instance._on_user_loggedout(msg)
+
+        self.assertTrue(user_stream.closed)
+        self.assertTrue(capture.released)
+        self.assertEqual(self.instance._offloads, [])
+        self.assertFalse(muxed_stream.closed)
+
+        self.instance._on_con_lost(sdk.TTMessage())
+
+        self.assertTrue(muxed_stream.closed)
+        self.assertEqual(self.instance._audio_streams, {})
+
+    def test_session_ends_on_the_loop_when_ended_in_a_thread(self):
+        threads = []
+        close_audio = self.instance._close_audio
+
+        def record_thread(*args):
+            threads.append(threading.get_ident())
+            close_audio(*args)
+
+        self.instance._close_audio = record_thread
+
+        async def end_session():
+            loop = asyncio.get_running_loop()
+            self.instance.bot.loop = loop
+            await loop.run_in_executor(None, self.instance._end_session)
+            return threading.get_ident()
+
+        loop_thread = asyncio.run(end_session())
+        self.assertEqual(threads, [loop_thread])
+
+    @patch("pytalk.instance.sdk._EnableAudioBlockEventEx")
+    def test_audio_stream_enables_audio_events(self, enable):
+        self.instance.bot = MagicMock(spec=["_listeners"], _listeners={})
+
+        stream = self.instance.open_audio_stream(5)
+        self.assertIn(5, self.instance._audio_streams)
+        stream.close()
+
+        self.assertEqual(self.instance._audio_streams, {})
+        self.assertEqual(
+            [call.args[1::3] for call in enable.call_args_list],
+            [(5, True), (5, False)],
+        )
+
+
+
+class TestEventReader(unittest.TestCase):
+    def setUp(self):
+        self.instance = TeamTalkInstance(
+            MagicMock(snapshot_events=False, coalesce_window=None), MagicMock()
+        )
+        # What the SDK would return from getMessage, in order.
+        self.sdk_messages = queue.Queue()
+
+        def get_message(_tt, timeout):
+            try:
+                return self.sdk_messages.get(timeout=timeout / 1000)
+            except queue.Empty:
+                return sdk.TTMessage()
+
+        patcher = patch.object(sdk.TeamTalk, "getMessage", new=get_message)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.instance._stop_event_reader)
+
+    def message(self, event, source=0):
+        msg = sdk.TTMessage()
+        msg.nClientEvent = event
+        msg.nSource = source
+        self.sdk_messages.put(msg)
+        return msg
+
+    def test_messages_are_handed_to_the_loop(self):
+        async def scenario():
+            events = asyncio.Queue()
+            self.instance._start_event_reader(
+                asyncio.get_running_loop(), events, 4
+            )
+            msg = self.message(sdk.ClientEvent.CLIENTEVENT_CMD_SUCCESS, 3)
+            return await asyncio.wait_for(events.get(), 1), msg
+
+        (instance, received), sent = asyncio.run(scenario())
+
+        self.assertIs(instance, self.instance)
+        self.assertIs(received, sent)
+
+    def test_reader_stops_reading_while_the_queue_is_full(self):
+        async def scenario():
+            events = asyncio.Queue()
+            self.instance._start_event_reader(
+                asyncio.get_running_loop(), events, 2
+            )
+            for source in range(3):
+                self.message(sdk.ClientEvent.CLIENTEVENT_CMD_SUCCESS, source)
+            while events.qsize() < 2:
+                await asyncio.sleep(0.01)
+            await asyncio.sleep(0.05)
+            self.assertEqual(events.qsize(), 2)
+            self.assertEqual(self.sdk_messages.qsize(), 1)
+            # Handling a message frees a slot for the next one.
+            _, msg = events.get_nowait()
+            self.instance._process_queued_message(msg)
+            _, last = await asyncio.wait_for(events.get(), 1)
+            _, last = await asyncio.wait_for(events.get(), 1)
+            return last.nSource
+
+        self.assertEqual(asyncio.run(scenario()), 2)
+
+    def test_stop_joins_the_thread(self):
+        async def scenario():
+            self.instance._start_event_reader(
+                asyncio.get_running_loop(), asyncio.Queue(), 4
+            )
+            thread = self.instance._event_reader
+            await asyncio.sleep(0.01)
+            self.instance._stop_event_reader()
+            return thread
+
+        thread = asyncio.run(scenario())
+
+        self.assertFalse(thread.is_alive())
+        self.assertIsNone(self.instance._event_reader)
+        self.assertIsNone(self.instance._event_reader_target)
+
+    def test_synchronous_wait_takes_the_readers_messages(self):
+        async def scenario():
+            events = asyncio.Queue()
+            loop = asyncio.get_running_loop()
+            self.instance._start_event_reader(loop, events, 4)
+            waiter = loop.run_in_executor(
+                None, _wait_for_cmd, self.instance, 7, 1000
+            )
+            while self.instance._diverted is None:
+                await asyncio.sleep(0.005)
+            self.message(sdk.ClientEvent.CLIENTEVENT_CMD_SUCCESS, 7)
+            result, msg = await waiter
+            self.assertTrue(result)
+            self.assertEqual(msg.nSource, 7)
+            # Once the wait is over, messages go to the loop again.
+            self.message(sdk.ClientEvent.CLIENTEVENT_CMD_SUCCESS, 8)
+            _, after = await asyncio.wait_for(events.get(), 1)
+            return after.nSource
+
+        self.assertEqual(asyncio.run(scenario()), 8)
+
+    def test_synchronous_wait_reads_while_the_queue_is_full(self):
+        async def scenario():
+            events = asyncio.Queue()
+            self.instance._start_event_reader(asyncio.get_running_loop(), events, 1)
+            self.message(sdk.ClientEvent.CLIENTEVENT_CMD_SUCCESS, 3)
+            while events.empty():
+                await asyncio.sleep(0.005)
+            # The queued message holds the only slot, and the wait below holds
+            # up the loop that would handle it.
+            reply = threading.Timer(
+                0.05, self.message, (sdk.ClientEvent.CLIENTEVENT_CMD_SUCCESS, 7)
+            )
+            reply.start()
+            result, msg = _wait_for_cmd(self.instance, 7, 1000)
+            self.assertTrue(result)
+            self.assertEqual(msg.nSource, 7)
+            _, queued = events.get_nowait()
+            self.instance._process_queued_message(queued)
+            self.message(sdk.ClientEvent.CLIENTEVENT_CMD_SUCCESS, 8)
+            _, after = await asyncio.wait_for(events.get(), 1)
+            return after.nSource
+
+        self.assertEqual(asyncio.run(scenario()), 8)
+
+    def test_messages_skipped_by_a_wait_stay_in_order(self):
+        async def scenario():
+            events = asyncio.Queue()
+            self.instance._start_event_reader(asyncio.get_running_loop(), events, 4)
+            self.message(sdk.ClientEvent.CLIENTEVENT_CMD_USER_JOINED, 3)
+            while events.empty():
+                await asyncio.sleep(0.005)
+            self.message(sdk.ClientEvent.CLIENTEVENT_CMD_USER_LEFT, 4)
+            self.message(sdk.ClientEvent.CLIENTEVENT_CMD_SUCCESS, 7)
+            result, _ = _wait_for_cmd(self.instance, 7, 1000)
+            self.assertTrue(result)
+            await asyncio.sleep(0)
+            return [events.get_nowait()[1].nSource for _ in range(events.qsize())]
+
+        self.assertEqual(asyncio.run(scenario()), [3, 4])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,113 @@
+import asyncio
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from pytalk._listeners import ListenerRegistry
+from pytalk.bot import TeamTalkBot
+from pytalk.implementation.TeamTalkPy import TeamTalk5 as sdk
+from pytalk.snapshot import UserSnapshot
+from pytalk.user import User
+
+
+def _message(from_id, channel_id=0):
+    return SimpleNamespace(from_id=from_id, channel_id=channel_id)
+
+
+class TestListenerRegistry(unittest.TestCase):
+    def test_resolves_only_matching_waiters(self):
+        async def run():
+            registry = ListenerRegistry()
+            loop = asyncio.get_running_loop()
+            first, second, anyone = (loop.create_future() for _ in range(3))
+            registry.add("message", first, user_id=1)
+            registry.add("message", second, user_id=2, channel_id=7)
+            registry.add("message", anyone, lambda m: m.from_id == 2)
+
+            registry.resolve("message", (_message(2, 8),))
+            self.assertFalse(second.done())
+            self.assertTrue(anyone.done())
+
+            message = _message(2, 7)
+            registry.resolve("message", (message,))
+            self.assertIs(second.result(), message)
+            self.assertFalse(first.done())
+            self.assertEqual(len(registry), 1)
+
+        asyncio.run(run())
+
+    def test_cancelled_waiters_are_removed(self):
+        async def run():
+            registry = ListenerRegistry()
+            future = asyncio.get_running_loop().create_future()
+            registry.add("message", future, user_id=1)
+
+            future.cancel()
+            await asyncio.sleep(0)
+
+            self.assertNotIn("message", registry)
+
+        asyncio.run(run())
+
+    def test_check_exception_is_propagated(self):
+        async def run():
+            registry = ListenerRegistry()
+            future = asyncio.get_running_loop().create_future()
+            registry.add("message", future, lambda m: 1 / 0)
+
+            registry.resolve("message", (_message(1),))
+
+            with self.assertRaises(ZeroDivisionError):
+                future.result()
+
+        asyncio.run(run())
+
+    def test_user_events_match_the_channel_of_the_user(self):
+        async def run():
+            registry = ListenerRegistry()
+            loop = asyncio.get_running_loop()
+            wrapper, snapshot = loop.create_future(), loop.create_future()
+            registry.add("user_update", wrapper, channel_id=7)
+            registry.add("user_login", snapshot, channel_id=7)
+            sdk_user = sdk.User()
+            sdk_user.nUserID = 3
+            sdk_user.nChannelID = 7
+            user = User(MagicMock(), sdk_user)
+
+            registry.resolve("user_update", (user,))
+            registry.resolve("user_login", (UserSnapshot(MagicMock(), sdk_user),))
+
+            self.assertIs(wrapper.result(), user)
+            self.assertEqual(snapshot.result().channel_id, 7)
+
+        asyncio.run(run())
+
+    def test_unknown_discriminator(self):
+        registry = ListenerRegistry()
+
+        with self.assertRaises(ValueError):
+            registry.add("ready", None, user_id=1)
+
+
+class TestWaitFor(unittest.TestCase):
+    def test_wait_for(self):
+        async def run():
+            bot = TeamTalkBot()
+            task = asyncio.ensure_future(
+                bot.wait_for("command_success", cmd_id=12, timeout=1)
+            )
+            await asyncio.sleep(0)
+            bot.dispatch("command_success", "instance", 11)
+            bot.dispatch("command_success", "instance", 12)
+
+            self.assertEqual(await task, ("instance", 12))
+
+            with self.assertRaises(TimeoutError):
+                await bot.wait_for("message", user_id=1, timeout=0.01)
+            self.assertEqual(len(bot._listeners), 0)
+
+        asyncio.run(run())
+
+
+if __name__ == "__main__":
+    unittest.main()
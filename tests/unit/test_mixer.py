@@ -0,0 +1,111 @@
+import ctypes
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+from _audio import numpy, pcm, requires_numpy, samples
+from pytalk.streamer import Streamer
+
+if numpy is not None:
+    from pytalk.mixer import Mixer
+
+
+@requires_numpy
+@patch.object(Streamer, "_has_yt_dlp", return_value=False)
+@patch.object(Streamer, "_has_ffmpeg", return_value=False)
+class TestMixer(unittest.TestCase):
+    def setUp(self):
+        self.sent = []
+        self.count = threading.Semaphore(0)
+
+        def insert(_tt, block):
+            if block.nSamples:
+                data = ctypes.string_at(block.lpRawAudio, block.nSamples * 2)
+                self.sent.append(samples(data))
+                self.count.release()
+            return 1
+
+        patcher = patch("pytalk.streamer.sdk._InsertAudioBlock", side_effect=insert)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        # Blocks of 4 samples of 1 kHz mono.
+        self.mixer = Mixer(MagicMock(), 1000, 1, block_msec=4, target_latency=0)
+        self.addCleanup(self.mixer.close)
+
+    def blocks(self, count):
+        for _ in range(count):
+            self.assertTrue(self.count.acquire(timeout=1))
+        return self.sent[:count]
+
+    def feed(self, *pairs):
+        # Feed every source under the lock, so they land in the same block.
+        with self.mixer._cond:
+            for source, data in pairs:
+                source.feed_nowait(data)
+
+    def test_sources_are_summed_with_their_gain(self, *_):
+        music = self.mixer.add_source(gain=0.5)
+        voice = self.mixer.add_source()
+        self.feed(
+            (music, pcm(1000, 1000, -1000, 0)), (voice, pcm(*[200] * 4))
+        )
+
+        self.assertEqual(self.blocks(1), [[700, 700, -300, 200]])
+
+    def test_sum_is_clipped(self, *_):
+        first = self.mixer.add_source()
+        second = self.mixer.add_source()
+        loud = pcm(30000, -30000, 30000, -30000)
+        self.feed((first, loud), (second, loud))
+
+        self.assertEqual(self.blocks(1), [[32767, -32768, 32767, -32768]])
+
+    def test_ducking_lowers_other_sources(self, *_):
+        self.mixer.duck_time = 0
+        music = self.mixer.add_source()
+        announcement = self.mixer.add_source(duck=True)
+        self.feed((music, pcm(*[1000] * 8)), (announcement, pcm(*[0] * 4)))
+
+        self.assertEqual(self.blocks(2), [[300] * 4, [1000] * 4])
+
+    def test_gain_changes_are_ramped(self, *_):
+        # Half the way per 4 ms block.
+        self.mixer.duck_time = 0.008
+        music = self.mixer.add_source()
+        music.gain = 0
+        self.feed((music, pcm(*[1000] * 8)))
+
+        self.assertEqual(self.blocks(2), [[1000, 875, 750, 625], [500, 375, 250, 125]])
+
+    def test_flush_mixes_a_partial_block(self, *_):
+        source = self.mixer.add_source()
+        source.feed(pcm(5, 6))
+        source.flush()
+
+        self.assertEqual(self.blocks(1), [[5, 6, 0, 0]])
+
+    def test_feed_nowait_drops_the_oldest_samples(self, *_):
+        self.mixer.close()
+        source = self.mixer.add_source(buffer_msec=4)
+        source.feed_nowait(pcm(1, 2, 3, 4, 5))
+
+        self.assertEqual(source.overwritten, 2)
+
+
+class TestStreamIds(unittest.TestCase):
+    @patch.object(Streamer, "_has_yt_dlp", return_value=False)
+    @patch.object(Streamer, "_has_ffmpeg", return_value=False)
+    def test_stream_ids_are_unique(self, *_):
+        streamers = [Streamer(MagicMock()) for _ in range(3)]
+        ids = {streamer.stream_id for streamer in streamers}
+        closed = streamers.pop()
+        closed.close()
+        for streamer in streamers:
+            streamer.close()
+
+        self.assertEqual(len(ids), 3)
+        self.assertTrue(all(6000 <= stream_id < 7000 for stream_id in ids))
+
+
+if __name__ == "__main__":
+    unittest.main()
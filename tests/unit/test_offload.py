@@ -0,0 +1,163 @@
+import asyncio
+import ctypes
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from _audio import audio_block, pcm
+from pytalk.implementation.TeamTalkPy import TeamTalk5 as sdk
+from pytalk.instance import TeamTalkInstance
+from pytalk.offload import AudioWorkerPool
+
+
+def _describe(samples, sample_rate, channels):
+    return bytes(samples), sample_rate, channels
+
+
+def _fail(samples, sample_rate, channels):
+    raise ValueError("bad audio")
+
+
+def _ramp(start, count):
+    return pcm(*range(start, start + count))
+
+
+class TestAudioWorkerPool(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.addCleanup(self.loop.close)
+        self.teamtalk = MagicMock()
+        self.teamtalk.bot = MagicMock(spec=["dispatch", "loop"], loop=self.loop)
+
+    def pool(self, analyze=_describe, **kwargs):
+        pool = AudioWorkerPool(analyze, workers=1, **kwargs)
+        self.addCleanup(pool.close)
+        return pool
+
+    def feed(self, pool, data, user_id=5, **kwargs):
+        block, source = audio_block(data, **kwargs)
+        pool._feed(self.teamtalk, user_id, block, len(data))
+
+    def results(self, pool):
+        deadline = time.monotonic() + 30
+        while pool.busy and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.loop.run_until_complete(asyncio.sleep(0))
+        return [call.args[1] for call in self.teamtalk.bot.dispatch.call_args_list]
+
+    def test_windows_are_analysed_in_a_worker(self):
+        pool = self.pool(window_msec=50)
+        for start in (0, 20, 40):
+            self.feed(pool, _ramp(start, 20))
+        pool._flush(self.teamtalk, 5)
+
+        results = self.results(pool)
+        self.assertEqual(pool.windows, 2)
+        self.assertEqual(
+            [result.value for result in results],
+            [(_ramp(0, 50), 1000, 1), (_ramp(50, 10), 1000, 1)],
+        )
+        self.assertEqual([result.duration for result in results], [0.05, 0.01])
+        self.assertIs(results[0].teamtalk, self.teamtalk)
+        self.assertEqual(results[0].user_id, 5)
+
+    def test_errors_are_logged(self):
+        pool = self.pool(_fail)
+        self.feed(pool, _ramp(0, 20))
+        with self.assertLogs("pytalk.offload", "ERROR"):
+            pool._flush(self.teamtalk, 5)
+            self.assertEqual(self.results(pool), [])
+
+    def test_audio_is_dropped_when_every_slot_is_busy(self):
+        pool = self.pool(slots=1)
+        self.feed(pool, _ramp(0, 20), user_id=1)
+        self.feed(pool, _ramp(0, 20), user_id=2)
+
+        self.assertEqual((pool.dropped, pool.windows), (1, 0))
+
+    def test_flush_all_sends_every_window_of_the_instance(self):
+        pool = self.pool()
+        other = MagicMock()
+        self.feed(pool, _ramp(0, 20), user_id=1)
+        self.feed(pool, _ramp(0, 20), user_id=2)
+        pool._feed(other, 1, audio_block(_ramp(0, 20))[0], 40)
+        pool._flush_all(self.teamtalk)
+
+        self.assertEqual(pool.windows, 2)
+        self.assertEqual(list(pool._open), [(other, 1)])
+
+    @patch.object(AudioWorkerPool, "_submit")
+    def test_a_new_format_starts_a_new_window(self, submit):
+        pool = self.pool()
+        self.feed(pool, _ramp(0, 20))
+        self.feed(pool, _ramp(0, 40), channels=2)
+
+        submit.assert_called_once_with((self.teamtalk, 5))
+
+
+@patch("pytalk.instance.sdk._EnableAudioBlockEventEx")
+class TestOffloadAudio(unittest.TestCase):
+    def setUp(self):
+        bot = MagicMock(
+            spec=[
+                "_listeners",
+                "capture_all_audio",
+                "snapshot_events",
+                "coalesce_window",
+                "dispatch",
+                "loop",
+            ],
+            _listeners={},
+            snapshot_events=False,
+            coalesce_window=None,
+        )
+        self.teamtalk = TeamTalkInstance(bot, MagicMock())
+        self.pool = MagicMock(spec=AudioWorkerPool, _captures=[])
+
+    @patch("pytalk.instance._ReleaseUserAudioBlock")
+    @patch("pytalk.instance._AcquireUserAudioBlock")
+    def deliver(self, data, acquire, release):
+        block, source = audio_block(data)
+        acquire.return_value = ctypes.addressof(block)
+        msg = sdk.TTMessage()
+        msg.nSource = 5
+        msg.nStreamType = sdk.StreamType.STREAMTYPE_VOICE
+        self.teamtalk._copy_audio_block(msg, None)
+
+    def test_blocks_are_fed_and_flushed_when_the_user_stops(self, _):
+        self.teamtalk.offload_audio(self.pool, user=5)
+        self.deliver(_ramp(0, 20))
+
+        teamtalk, user_id, _, size = self.pool._feed.call_args.args
+        self.assertEqual((teamtalk, user_id, size), (self.teamtalk, 5, 40))
+
+        msg = sdk.TTMessage()
+        msg.user.nUserID = 5
+        msg.user.uUserState = 0
+        self.teamtalk._on_user_statechange(msg)
+        self.pool._flush.assert_called_once_with(self.teamtalk, 5)
+
+    def test_windows_are_flushed_when_the_connection_is_lost(self, _):
+        self.teamtalk.reconnect_enabled = False
+        self.teamtalk.offload_audio(self.pool, channel=1)
+        user = sdk.User()
+        user.nUserID = 5
+        self.teamtalk._state.users[5] = user
+
+        msg = sdk.TTMessage()
+        msg.nClientEvent = sdk.ClientEvent.CLIENTEVENT_CON_LOST
+        self.teamtalk._process_message(msg)
+
+        self.pool._flush_all.assert_called_once_with(self.teamtalk)
+
+    def test_released_capture_stops_feeding(self, _):
+        capture = self.teamtalk.offload_audio(self.pool, user=5)
+        capture.release()
+        self.deliver(_ramp(0, 20))
+
+        self.assertEqual(self.teamtalk._offloads, [])
+        self.pool._feed.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
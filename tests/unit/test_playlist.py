@@ -0,0 +1,144 @@
+import ctypes
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from _audio import pcm, samples
+from pytalk.decoders import PcmDecoder
+from pytalk.playlist import _crossfade
+from pytalk.streamer import Pacing, Streamer
+
+
+class _BlockingDecoder:
+    """Opens every path, blocking reads of `slow` until `release` is set."""
+
+    def __init__(self, slow):
+        self.slow = slow
+        self.opened = []
+        self.release = threading.Event()
+
+    def open(self, path, sample_rate, channels):
+        self.opened.append(path)
+        decoder = self
+
+        class Source:
+            def readinto(self, buffer):
+                if path == decoder.slow:
+                    decoder.release.wait(1)
+                return 0
+
+            def close(self):
+                pass
+
+        return Source()
+
+
+@patch.object(Streamer, "_has_yt_dlp", return_value=False)
+@patch.object(Streamer, "_has_ffmpeg", return_value=False)
+class TestPlaylist(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+        self.sent = []
+        self.ended = threading.Event()
+
+        def insert(_tt, block):
+            if not block.nSamples:
+                self.ended.set()
+            else:
+                self.sent.append(ctypes.string_at(block.lpRawAudio, block.nSamples * 2))
+            return 1
+
+        patcher = patch("pytalk.streamer.sdk._InsertAudioBlock", side_effect=insert)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def streamer(self):
+        streamer = Streamer(MagicMock(), 1000, 1, Pacing(block_size=4, target_latency=0))
+        streamer.decoders = [PcmDecoder()]
+        self.addCleanup(streamer.close)
+        return streamer
+
+    def track(self, name, data):
+        path = self.directory / name
+        path.write_bytes(data)
+        return str(path)
+
+    def enqueue(self, streamer, *tracks):
+        # Hold the lock, so the first track cannot end before the next one
+        # is queued.
+        with streamer.playlist._cond:
+            for i, data in enumerate(tracks):
+                streamer.enqueue(self.track(f"{i}.pcm", data))
+
+    def test_tracks_are_spliced_without_a_gap(self, *_):
+        streamer = self.streamer()
+        # Odd lengths, so the second track starts inside a block.
+        self.enqueue(streamer, pcm(1, 2, 3), pcm(4, 5, 6))
+
+        self.assertTrue(self.ended.wait(1))
+        self.assertEqual(b"".join(self.sent), pcm(1, 2, 3, 4, 5, 6))
+        self.assertEqual(len(self.sent), 3)
+
+    def test_crossfade(self, *_):
+        streamer = self.streamer()
+        # 4 samples at 1 kHz.
+        streamer.playlist.crossfade = 0.004
+        self.enqueue(streamer, pcm(*[1000] * 8), pcm(*[0] * 8))
+
+        self.assertTrue(self.ended.wait(1))
+        self.assertEqual(
+            samples(b"".join(self.sent)),
+            [1000] * 4 + [1000, 750, 500, 250] + [0] * 4,
+        )
+
+    def test_crossfade_mixes_frames(self, *_):
+        mixed = _crossfade(pcm(100, -100, 100, -100), pcm(0, 0, 0, 0), 2)
+
+        self.assertEqual(samples(mixed), [100, -100, 50, -50])
+
+    def test_next_track_is_opened_ahead(self, *_):
+        streamer = self.streamer()
+        decoder = _BlockingDecoder("http://a")
+        streamer.decoders = [decoder]
+        # Nothing is read ahead, so only the player reads the slow track.
+        streamer.playlist.preload = 0
+        streamer.enqueue("http://a")
+        streamer.enqueue("http://b")
+
+        for _ in range(100):
+            if decoder.opened == ["http://a", "http://b"]:
+                break
+            self.ended.wait(0.01)
+        self.assertEqual(decoder.opened, ["http://a", "http://b"])
+        self.assertEqual(streamer.playlist.current, "http://a")
+        self.assertEqual(streamer.playlist.entries, ["http://b"])
+        decoder.release.set()
+
+    @patch("pytalk.playlist.search", return_value=None)
+    def test_unknown_entries_are_searched_and_skipped(self, search, *_):
+        streamer = self.streamer()
+        streamer.enqueue("no such song")
+        streamer.enqueue(self.track("a.pcm", pcm(7, 8)))
+
+        self.assertTrue(self.ended.wait(1))
+        search.assert_called_once_with("no such song")
+        self.assertEqual(b"".join(self.sent), pcm(7, 8))
+
+    def test_stop_clears_the_playlist(self, *_):
+        streamer = self.streamer()
+        decoder = _BlockingDecoder("http://a")
+        streamer.decoders = [decoder]
+        streamer.enqueue("http://a")
+        streamer.enqueue("http://b")
+        decoder.release.set()
+        streamer.stop()
+
+        self.assertEqual(streamer.playlist.entries, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import tempfile
+import unittest
+import wave
+from pathlib import Path
+
+from _audio import pcm, samples
+from pytalk.recorder import Recorder
+
+
+def _read(path):
+    with wave.open(str(path), "rb") as f:
+        return f.getframerate(), samples(f.readframes(f.getnframes()))
+
+
+class TestRecorder(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.directory = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_one_file_per_speaker(self):
+        with Recorder(self.directory, name_format="{track}") as recorder:
+            recorder.feed(5, 1000, 1, pcm(1, 2), 0.0)
+            recorder.feed(6, 1000, 1, pcm(9), 0.0)
+            recorder.feed(5, 1000, 1, pcm(3), 0.001)
+
+        self.assertEqual(_read(self.directory / "5.wav"), (1000, [1, 2, 3]))
+        self.assertEqual(_read(self.directory / "6.wav"), (1000, [9]))
+        self.assertEqual(len(recorder.files), 2)
+
+    def test_gaps_are_filled_with_silence(self):
+        with Recorder(self.directory, gap_msec=10, name_format="{track}") as recorder:
+            recorder.feed(5, 1000, 1, pcm(1, 2), 0.002)
+            recorder.feed(5, 1000, 1, pcm(3, 4), 0.054)
+
+        self.assertEqual(_read(self.directory / "5.wav")[1], [1, 2] + [0] * 50 + [3, 4])
+
+    def test_gaps_are_skipped(self):
+        with Recorder(
+            self.directory, gap_msec=10, fill_silence=False, name_format="{track}"
+        ) as recorder:
+            recorder.feed(5, 1000, 1, pcm(1, 2), 0.002)
+            recorder.feed(5, 1000, 1, pcm(3, 4), 0.054)
+
+        self.assertEqual(_read(self.directory / "5.wav")[1], [1, 2, 3, 4])
+
+    def test_rotates_by_length(self):
+        with Recorder(
+            self.directory, max_seconds=0.003, name_format="{track}-{part}"
+        ) as recorder:
+            recorder.feed(5, 1000, 1, pcm(1, 2, 3, 4, 5), 0.0)
+
+        self.assertEqual(_read(self.directory / "5-1.wav")[1], [1, 2, 3])
+        self.assertEqual(_read(self.directory / "5-2.wav")[1], [4, 5])
+
+    def test_drops_when_writer_falls_behind(self):
+        with Recorder(self.directory, max_pending_bytes=4) as recorder:
+            recorder.feed(5, 1000, 1, pcm(1, 2), 0.0)
+            recorder.feed(5, 1000, 1, pcm(3), 0.001)
+
+        self.assertEqual(recorder.dropped_bytes, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import asyncio
+import ctypes
+import unittest
+
+from _audio import audio_block, pcm, samples
+from pytalk.ringbuffer import AudioStream, PcmRingBuffer
+
+
+class TestPcmRingBuffer(unittest.TestCase):
+    def test_wraps_around(self):
+        ring = PcmRingBuffer(8)
+        ring.write(b"abcdef")
+        self.assertEqual(ring.read(4), b"abcd")
+        ring.write(b"ghijk")
+
+        self.assertEqual(len(ring), 7)
+        self.assertEqual(ring.read(10), b"efghijk")
+        self.assertEqual(len(ring), 0)
+
+    def test_overwrites_oldest(self):
+        ring = PcmRingBuffer(4)
+        source = ctypes.create_string_buffer(b"abcdef", 6)
+        ring.write(b"xy")
+        ring.write_from(ctypes.addressof(source), 6)
+
+        self.assertEqual(ring.read(4), b"cdef")
+        self.assertEqual(ring.overwritten, 4)
+
+
+class TestAudioStream(unittest.TestCase):
+    def test_read_waits_forsamples(self):
+        async def run():
+            stream = AudioStream(1)
+            reader = asyncio.create_task(stream.read(4))
+            await asyncio.sleep(0)
+            data = pcm(1, 2, 3)
+            block, _source = audio_block(data)
+            stream._feed(block, len(data))
+            await asyncio.sleep(0)
+            self.assertFalse(reader.done())
+            data = pcm(4, 5)
+            block, _source = audio_block(data)
+            stream._feed(block, len(data))
+            data = await reader
+            return data, stream.available
+
+        data, available = asyncio.run(run())
+        self.assertEqual(samples(data), [1, 2, 3, 4])
+        self.assertEqual(available, 1)
+
+    def test_iterates_frames_until_closed(self):
+        closed = []
+
+        async def run():
+            stream = AudioStream(1, frame_msec=2, on_close=closed.append)
+            data = pcm(1, 2, 3, 4, 5)
+            block, _source = audio_block(data)
+            stream._feed(block, len(data))
+            frames = []
+            async for frame in stream:
+                frames.append(samples(frame))
+                if len(frames) == 2:
+                    stream.close()
+            return stream, frames
+
+        stream, frames = asyncio.run(run())
+        self.assertEqual(frames, [[1, 2], [3, 4], [5]])
+        self.assertEqual(closed, [stream])
+
+    def test_overruns_counted_insamples(self):
+        stream = AudioStream(1, buffer_msec=2)
+        data = pcm(1, 2, 3, 4, 5, 6)
+        block, _source = audio_block(data, channels=2)
+        stream._feed(block, len(data))
+
+        self.assertEqual(stream.overruns, 1)
+        self.assertEqual(samples(stream.read_nowait(2)), [3, 4, 5, 6])
+
+
+if __name__ == "__main__":
+    unittest.main()
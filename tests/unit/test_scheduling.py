@@ -0,0 +1,158 @@
+import asyncio
+import unittest
+from unittest.mock import MagicMock
+
+from pytalk.bot import TeamTalkBot
+from pytalk.scheduling import EventLimit, OverflowPolicy
+
+
+def _bot_with_handler(event, limit):
+    bot = TeamTalkBot()
+    bot.loop = asyncio.get_running_loop()
+    release = asyncio.Event()
+    seen = []
+
+    async def handler(value):
+        seen.append(value)
+        await release.wait()
+
+    handler.__name__ = "on_" + event
+    bot.event(handler)
+    bot.set_event_limit(event, limit)
+    return bot, release, seen
+
+
+class TestEventLimits(unittest.TestCase):
+    def test_drop_oldest(self):
+        async def run():
+            bot, release, seen = _bot_with_handler("tick", EventLimit(queue_size=2))
+            for value in range(5):
+                bot.dispatch("tick", value)
+            await asyncio.sleep(0)
+
+            stats = bot.event_stats()["tick"]
+            self.assertEqual((stats.running, stats.queued, stats.dropped), (1, 2, 2))
+
+            release.set()
+            for _ in range(5):
+                await asyncio.sleep(0)
+            self.assertEqual(seen, [0, 3, 4])
+
+        asyncio.run(run())
+
+    def test_coalesce_and_drop_newest(self):
+        async def run():
+            limit = EventLimit(queue_size=1, overflow=OverflowPolicy.COALESCE)
+            bot, release, seen = _bot_with_handler("tick", limit)
+            for value in range(4):
+                bot.dispatch("tick", value)
+            bot.set_event_limit(
+                "tick", EventLimit(queue_size=1, overflow=OverflowPolicy.DROP_NEWEST)
+            )
+            bot.dispatch("tick", 4)
+            release.set()
+            for _ in range(5):
+                await asyncio.sleep(0)
+
+            self.assertEqual(seen, [0, 3])
+            stats = bot.event_stats()["tick"]
+            self.assertEqual((stats.coalesced, stats.dropped), (2, 1))
+
+        asyncio.run(run())
+
+    def test_block_until_drained(self):
+        async def run():
+            limit = EventLimit(queue_size=1, overflow=OverflowPolicy.BLOCK)
+            bot, release, seen = _bot_with_handler("tick", limit)
+            for value in range(3):
+                bot.dispatch("tick", value)
+            self.assertTrue(bot._scheduler.needs_pump)
+
+            drain = asyncio.ensure_future(bot._scheduler.drain())
+            await asyncio.sleep(0)
+            self.assertFalse(drain.done())
+
+            release.set()
+            await asyncio.wait_for(drain, 1)
+            self.assertEqual(bot.event_stats()["tick"].blocked, 1)
+            self.assertFalse(bot._scheduler.needs_pump)
+
+        asyncio.run(run())
+
+    def test_block_stops_the_pump_in_the_middle_of_a_batch(self):
+        async def run():
+            limit = EventLimit(queue_size=1, overflow=OverflowPolicy.BLOCK)
+            bot, release, seen = _bot_with_handler("tick", limit)
+            teamtalk = MagicMock()
+            teamtalk._process_queued_message = lambda value: bot.dispatch("tick", value)
+            bot.teamtalks = [teamtalk]
+            pump = asyncio.create_task(bot._pump_queued_events())
+            await asyncio.sleep(0)
+            for value in range(10):
+                bot._event_queue.put_nowait((teamtalk, value))
+            for _ in range(5):
+                await asyncio.sleep(0)
+
+            # One handler runs, one event waits and the third blocked the pump.
+            self.assertEqual(bot._event_queue.qsize(), 7)
+            self.assertEqual(seen, [0])
+
+            release.set()
+            for _ in range(50):
+                await asyncio.sleep(0)
+            self.assertEqual(seen, list(range(10)))
+            pump.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await pump
+
+        asyncio.run(run())
+
+    def test_inline(self):
+        async def run():
+            bot, release, seen = _bot_with_handler("tick", EventLimit(inline=True))
+            release.set()
+            bot.dispatch("tick", 1)
+            bot.dispatch("tick", 2)
+            self.assertEqual(seen, [])
+
+            await bot._scheduler.drain()
+
+            self.assertEqual(seen, [1, 2])
+            self.assertEqual(bot.event_stats()["tick"].processed, 2)
+
+        asyncio.run(run())
+
+    def test_inline_handlers_cannot_wait_for_the_server(self):
+        async def run():
+            bot = TeamTalkBot()
+            bot.loop = asyncio.get_running_loop()
+            errors = []
+            tasks = []
+
+            async def on_tick():
+                try:
+                    await bot.wait_for("tock", timeout=1)
+                except RuntimeError as exc:
+                    errors.append(exc)
+                # A task of its own does not hold up the pump.
+                tasks.append(asyncio.create_task(bot.wait_for("tock", timeout=1)))
+
+            bot.event(on_tick)
+            bot.set_event_limit("tick", EventLimit(inline=True))
+            bot.dispatch("tick")
+            await bot._scheduler.drain()
+            await asyncio.sleep(0)
+            bot.dispatch("tock")
+
+            self.assertEqual(len(errors), 1)
+            self.assertIsNone(await tasks[0])
+
+        asyncio.run(run())
+
+    def test_invalid_limit(self):
+        with self.assertRaises(ValueError):
+            EventLimit(concurrency=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,155 @@
+import ctypes
+import unittest
+from unittest.mock import MagicMock, patch
+
+from _audio import audio_block, numpy, pcm, requires_numpy
+from pytalk.implementation.TeamTalkPy import TeamTalk5 as sdk
+from pytalk.instance import TeamTalkInstance
+
+if numpy is not None:
+    from pytalk.segmenter import Segmenter
+
+# 20 ms blocks of 1 kHz mono.
+LOUD = pcm(*[10000] * 20)
+QUIET = bytes(40)
+
+
+@requires_numpy
+class TestSegmenter(unittest.TestCase):
+    def setUp(self):
+        self.teamtalk = MagicMock()
+        self.segmenter = Segmenter(
+            attack=0.04, hangover=0.1, pre_roll=0.02, min_duration=0.05
+        )
+
+    def feed(self, *blocks, user_id=5):
+        utterances = []
+        for data in blocks:
+            block, _source = audio_block(data)
+            utterance = self.segmenter.feed(self.teamtalk, user_id, block, data)
+            if utterance is not None:
+                utterances.append(utterance)
+        return utterances
+
+    def test_speech_between_pauses_is_one_utterance(self):
+        utterances = self.feed(QUIET, QUIET, LOUD, LOUD, LOUD, *[QUIET] * 5)
+
+        self.assertEqual(len(utterances), 1)
+        utterance = utterances[0]
+        # The pre-roll keeps the first loud block, the hangover is left out.
+        self.assertEqual(utterance.data, LOUD * 3)
+        self.assertAlmostEqual(utterance.duration, 0.06)
+        self.assertAlmostEqual(utterance.end - utterance.start, 0.06, places=5)
+        self.assertEqual((utterance.sample_rate, utterance.channels), (1000, 1))
+        self.assertEqual(utterance.user_id, 5)
+
+    def test_nothing_is_dispatched_during_speech(self):
+        self.assertEqual(self.feed(LOUD, LOUD, LOUD, QUIET), [])
+
+    def test_short_bursts_are_dropped(self):
+        self.assertEqual(self.feed(LOUD, LOUD, *[QUIET] * 5), [])
+
+    def test_long_speech_is_cut(self):
+        self.segmenter.max_duration = 0.1
+        utterances = self.feed(*[LOUD] * 6)
+
+        self.assertEqual([len(u.data) for u in utterances], [200])
+
+    def test_speakers_are_kept_apart(self):
+        self.feed(LOUD, LOUD, LOUD, user_id=1)
+        self.feed(LOUD, LOUD, user_id=2)
+
+        utterance = self.segmenter.end(self.teamtalk, 1)
+        self.assertEqual(utterance.data, LOUD * 3)
+        self.assertIsNone(self.segmenter.end(self.teamtalk, 3))
+
+    def test_utterances_are_converted(self):
+        segmenter = Segmenter(sample_rate=500, channels=1, min_duration=0)
+        stereo = pcm(*[10000, 0] * 20)
+        block, _source = audio_block(stereo, channels=2)
+        for _ in range(3):
+            segmenter.feed(self.teamtalk, 5, block, stereo)
+
+        utterance = segmenter.end(self.teamtalk, 5)
+        self.assertEqual((utterance.sample_rate, utterance.channels), (500, 1))
+        self.assertEqual(len(utterance.array()), 30)
+
+
+@requires_numpy
+@patch("pytalk.instance.sdk._EnableAudioBlockEventEx")
+class TestSegmentAudio(unittest.TestCase):
+    def setUp(self):
+        bot = MagicMock(
+            spec=[
+                "_listeners",
+                "capture_all_audio",
+                "snapshot_events",
+                "coalesce_window",
+                "dispatch",
+                "loop",
+            ],
+            _listeners={},
+            snapshot_events=False,
+            coalesce_window=None,
+        )
+        self.teamtalk = TeamTalkInstance(bot, MagicMock())
+        self.segmenter = Segmenter(min_duration=0)
+
+    @patch("pytalk.instance._ReleaseUserAudioBlock")
+    @patch("pytalk.instance._AcquireUserAudioBlock")
+    def deliver(self, data, acquire, release):
+        block, _source = audio_block(data)
+        acquire.return_value = ctypes.addressof(block)
+        msg = sdk.TTMessage()
+        msg.nSource = 5
+        msg.nStreamType = sdk.StreamType.STREAMTYPE_VOICE
+        self.teamtalk._copy_audio_block(msg, None)
+        release.assert_called_once()
+
+    def dispatched(self):
+        return [
+            call.args[1]
+            for call in self.teamtalk.bot.dispatch.call_args_list
+            if call.args[0] == "utterance"
+        ]
+
+    def test_utterance_ends_when_the_user_stops_talking(self, _):
+        self.teamtalk.segment_audio(self.segmenter, user=5)
+        for _ in range(3):
+            self.deliver(LOUD)
+        self.assertEqual(self.dispatched(), [])
+
+        msg = sdk.TTMessage()
+        msg.user.nUserID = 5
+        msg.user.uUserState = 0
+        self.teamtalk._on_user_statechange(msg)
+
+        (utterance,) = self.dispatched()
+        self.assertIs(utterance.teamtalk, self.teamtalk)
+        self.assertEqual(utterance.data, LOUD * 3)
+
+    def test_utterance_ends_when_the_connection_is_lost(self, _):
+        self.teamtalk.reconnect_enabled = False
+        self.teamtalk.segment_audio(self.segmenter, user=5)
+        for _ in range(3):
+            self.deliver(LOUD)
+
+        msg = sdk.TTMessage()
+        msg.nClientEvent = sdk.ClientEvent.CLIENTEVENT_CON_LOST
+        self.teamtalk._process_message(msg)
+
+        (utterance,) = self.dispatched()
+        self.assertEqual(utterance.data, LOUD * 3)
+        self.assertEqual(self.segmenter._speakers, {})
+
+    def test_close_releases_the_capture(self, enable):
+        self.teamtalk.segment_audio(self.segmenter, user=5)
+        self.segmenter.close()
+        self.deliver(LOUD)
+
+        self.assertEqual(self.teamtalk._segmenters, [])
+        self.assertEqual(enable.call_args.args[1::3], (5, False))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+from unittest.mock import MagicMock
+
+from pytalk.implementation.TeamTalkPy import TeamTalk5 as sdk
+from pytalk.instance import TeamTalkInstance
+from pytalk.snapshot import MessageSnapshot, UserSnapshot
+
+
+def _user(user_id, nickname):
+    user = sdk.User()
+    user.nUserID = user_id
+    user.nChannelID = 1
+    user.szNickname = sdk.ttstr(nickname)
+    return user
+
+
+class TestSnapshot(unittest.TestCase):
+    def test_user_snapshot(self):
+        instance = MagicMock()
+        user = _user(5, "bot")
+
+        snapshot = UserSnapshot(instance, user)
+        user.szNickname = sdk.ttstr("changed")
+
+        self.assertEqual(snapshot.id, 5)
+        self.assertEqual(snapshot.nickname, "bot")
+        self.assertEqual(snapshot.channel_id, 1)
+        self.assertIs(snapshot.teamtalk_instance, instance)
+        self.assertFalse(hasattr(snapshot, "__dict__"))
+        self.assertEqual(snapshot, UserSnapshot(MagicMock(), _user(5, "bot")))
+        self.assertNotEqual(snapshot, UserSnapshot(instance, _user(6, "bot")))
+
+    def test_snapshot_is_read_only(self):
+        snapshot = UserSnapshot(MagicMock(), _user(5, "bot"))
+
+        with self.assertRaises(AttributeError):
+            snapshot.nickname = "other"
+        with self.assertRaises(AttributeError):
+            del snapshot.id
+
+    def test_instance_dispatches_snapshots(self):
+        bot = MagicMock(snapshot_events=True, coalesce_window=None)
+        instance = TeamTalkInstance(bot, MagicMock())
+        msg = sdk.TTMessage()
+        msg.nClientEvent = sdk.ClientEvent.CLIENTEVENT_CMD_USER_TEXTMSG
+        msg.textmessage.nMsgType = sdk.TextMsgType.MSGTYPE_USER
+        msg.textmessage.nFromUserID = 5
+        msg.textmessage.nToUserID = 6
+        msg.textmessage.szMessage = sdk.ttstr("hello")
+
+        instance._process_message(msg)
+
+        event, message = bot.dispatch.call_args.args
+        self.assertEqual(event, "message")
+        self.assertIsInstance(message, MessageSnapshot)
+        self.assertEqual((message.from_id, message.to_id), (5, 6))
+        self.assertEqual(message.content, "hello")
+
+
+if __name__ == "__main__":
+    unittest.main()
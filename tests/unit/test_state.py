@@ -0,0 +1,67 @@
+import unittest
+
+from pytalk._state import StateMirror
+from pytalk.implementation.TeamTalkPy import TeamTalk5 as sdk
+
+
+def _user_message(event, user_id, channel_id, source=0):
+    msg = sdk.TTMessage()
+    msg.nClientEvent = event
+    msg.nSource = source
+    msg.user.nUserID = user_id
+    msg.user.nChannelID = channel_id
+    return msg
+
+
+class TestStateMirror(unittest.TestCase):
+    def setUp(self):
+        self.state = StateMirror()
+        channel = sdk.Channel()
+        channel.nChannelID = 1
+        user = sdk.User()
+        user.nUserID = 5
+        user.nChannelID = 1
+        self.state.seed([user], [channel])
+
+    def test_lookups_return_copies(self):
+        user = self.state.user(5)
+        user.nChannelID = 42
+
+        self.assertEqual(self.state.user(5).nChannelID, 1)
+        self.assertIsNone(self.state.user(6))
+
+    def test_follows_user_events(self):
+        event = sdk.ClientEvent
+        self.state.observe(_user_message(event.CLIENTEVENT_CMD_USER_JOINED, 6, 1))
+        self.state.observe(_user_message(event.CLIENTEVENT_CMD_USER_LEFT, 5, 1, 1))
+
+        self.assertEqual(self.state.user(6).nChannelID, 1)
+        self.assertEqual(self.state.user(5).nChannelID, 0)
+
+        self.state.observe(_user_message(event.CLIENTEVENT_CMD_USER_LOGGEDOUT, 5, 0))
+
+        self.assertIsNone(self.state.user(5))
+
+    def test_channel_update_invalidates_paths(self):
+        self.state.store_path(1, "/")
+        msg = sdk.TTMessage()
+        msg.nClientEvent = sdk.ClientEvent.CLIENTEVENT_CMD_CHANNEL_UPDATE
+        msg.channel.nChannelID = 1
+
+        self.state.observe(msg)
+
+        self.assertIsNone(self.state.path(1))
+        self.assertIsNotNone(self.state.channel(1))
+
+    def test_connection_lost_clears(self):
+        msg = sdk.TTMessage()
+        msg.nClientEvent = sdk.ClientEvent.CLIENTEVENT_CON_LOST
+
+        self.state.observe(msg)
+
+        self.assertFalse(self.state.seeded)
+        self.assertIsNone(self.state.user(5))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,169 @@
+import array
+import asyncio
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from pytalk.streamer import Pacing, Streamer, _BlockRing
+
+
+def _get(ring):
+    block = ring.peek()
+    if block is None:
+        return None
+    buffer, size = block
+    data = buffer.raw[:size]
+    ring.release()
+    return data
+
+
+class TestBlockRing(unittest.TestCase):
+    def test_write_fills_fixed_blocks(self):
+        ring = _BlockRing(3, 2)
+        ring.write(b"abc")
+        ring.write(memoryview(bytearray(b"de")))
+        self.assertEqual(len(ring), 2)
+        ring.flush(end=True)
+
+        self.assertEqual([_get(ring) for _ in range(4)], [b"ab", b"cd", b"e", b""])
+
+    def test_accepts_int16_arrays(self):
+        ring = _BlockRing(2, 4)
+        ring.write(array.array("h", [1, -1]))
+
+        self.assertEqual(array.array("h", _get(ring)).tolist(), [1, -1])
+
+    def test_write_waits_for_room(self):
+        ring = _BlockRing(1, 1)
+        ring.write(b"a")
+        producer = threading.Thread(target=ring.write, args=(b"b",))
+        producer.start()
+        producer.join(0.05)
+        self.assertTrue(producer.is_alive())
+
+        self.assertEqual(_get(ring), b"a")
+        producer.join(1)
+        self.assertEqual(_get(ring), b"b")
+        self.assertEqual(ring.overruns, 1)
+
+    def test_clear_keeps_block_being_sent(self):
+        ring = _BlockRing(2, 1)
+        ring.write(b"ab")
+        buffer, _ = ring.peek()
+        ring.clear()
+        ring.write(b"c")
+        ring.release()
+
+        self.assertEqual(buffer.raw, b"a")
+        self.assertEqual(_get(ring), b"c")
+        self.assertEqual(len(ring), 0)
+
+    def test_close_wakes_consumer(self):
+        ring = _BlockRing(1, 1)
+        result = []
+        consumer = threading.Thread(target=lambda: result.append(ring.peek()))
+        consumer.start()
+        ring.close()
+        consumer.join(1)
+
+        self.assertEqual(result, [None])
+        self.assertFalse(ring.write(b"a"))
+
+
+@patch.object(Streamer, "_has_yt_dlp", return_value=False)
+@patch.object(Streamer, "_has_ffmpeg", return_value=False)
+class TestStreamer(unittest.TestCase):
+    def test_inserts_blocks_and_retries_when_full(self, *_):
+        inserted = []
+        done = threading.Event()
+        answers = iter([0, 0])
+
+        def insert(_tt, block):
+            inserted.append(block.nSamples)
+            if len(inserted) == 4:
+                done.set()
+            return next(answers, 1)
+
+        with patch("pytalk.streamer.sdk._InsertAudioBlock", side_effect=insert):
+            streamer = Streamer(MagicMock(), 1000, 1, Pacing(block_size=8))
+            streamer.feed(bytes(24))
+            streamer.feed(bytes(8))
+            self.assertTrue(done.wait(1))
+            streamer.close()
+
+        self.assertFalse(streamer._streamer_thread.is_alive())
+        # Two rejected attempts for the first block, then the other two.
+        self.assertEqual(inserted[:4], [4, 4, 4, 4])
+
+    def test_feed_async_waits_for_room_off_the_loop(self, *_):
+        async def scenario(streamer):
+            ticks = 0
+
+            async def tick():
+                nonlocal ticks
+                while True:
+                    ticks += 1
+                    await asyncio.sleep(0.005)
+
+            ticker = asyncio.create_task(tick())
+            await streamer.feed_async(bytes(24))
+            ticker.cancel()
+            return ticks
+
+        with patch("pytalk.streamer.sdk._InsertAudioBlock", return_value=0):
+            streamer = Streamer(MagicMock(), 1000, 1, Pacing(block_size=8, max_blocks=2))
+            # The queue holds two blocks, so the third waits until it is cleared.
+            threading.Timer(0.1, streamer.blocks.clear).start()
+            ticks = asyncio.run(scenario(streamer))
+            streamer.close()
+
+        # The loop kept running while feed waited.
+        self.assertGreater(ticks, 5)
+        self.assertEqual(streamer.overruns, 1)
+
+    def test_blocks_are_paced_in_real_time(self, *_):
+        sent = []
+
+        def insert(_tt, block):
+            sent.append((time.monotonic(), block.nSamples))
+            return 1
+
+        with patch("pytalk.streamer.sdk._InsertAudioBlock", side_effect=insert):
+            # 10 ms blocks of 1 kHz mono audio, 20 ms of latency.
+            streamer = Streamer(
+                MagicMock(), 1000, 1, Pacing(block_size=20, target_latency=0.02)
+            )
+            streamer.feed(bytes(140))
+            time.sleep(0.15)
+            streamer.feed(bytes(20))
+            while len(sent) < 8:
+                time.sleep(0.01)
+            streamer.close()
+
+        span = sent[6][0] - sent[0][0]
+        self.assertGreaterEqual(span, 0.055)
+        self.assertLess(span, 0.15)
+        self.assertEqual(streamer.underruns, 1)
+
+    def test_closed_streamer_is_not_handed_out_again(self, *_):
+        channel = MagicMock()
+        streamer = Streamer.get_streamer_for_channel(channel)
+        self.assertIs(Streamer.get_streamer_for_channel(channel), streamer)
+        streamer.close()
+
+        replacement = Streamer.get_streamer_for_channel(channel)
+        self.addCleanup(replacement.close)
+        self.assertIsNot(replacement, streamer)
+        self.assertTrue(replacement.running)
+
+
+class TestPacing(unittest.TestCase):
+    def test_settings_are_validated(self):
+        for settings in ({"block_size": 0}, {"max_blocks": 0}, {"target_latency": -1}):
+            with self.subTest(**settings), self.assertRaises(ValueError):
+                Pacing(**settings)
+
+
+if __name__ == "__main__":
+    unittest.main()